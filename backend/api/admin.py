@@ -9,8 +9,9 @@ from sqlalchemy import text
 
 #  Internal Modules
 from backend.core.db import get_engine
-from backend.core.security import is_system_admin
+from backend.core.security import is_system_admin, invalidate_principal
 from backend.models.schemas import Role, CreateTeamRequest, UpdateUserTeamRequest
+from backend.utils.llm_cache import llm_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -83,7 +84,7 @@ async def update_admin_user_settings(user_id: str, settings: dict, admin: dict =
         with get_engine().connect() as connection:
             with connection.begin():
                 # Verify user exists
-                user_check = connection.execute(text("SELECT id FROM users WHERE id = :user_id"), {"user_id": user_id}).fetchone()
+                user_check = connection.execute(text("SELECT id, email FROM users WHERE id = :user_id"), {"user_id": user_id}).fetchone()
                 if not user_check:
                     raise HTTPException(status_code=404, detail="User not found.")
                 
@@ -111,7 +112,9 @@ async def update_admin_user_settings(user_id: str, settings: dict, admin: dict =
                 # Insert new field contexts
                 if field_contexts:
                     connection.execute(text("INSERT INTO user_field_contexts (user_id, field_context_id) VALUES (:user_id, :fc_id)"), [{"user_id": user_id, "fc_id": fcid} for fcid in field_contexts])
-                    
+
+            # The new roles apply from the user's next request.
+            invalidate_principal(user_check.email)
             return {"message": "User settings updated successfully."}
     except HTTPException:
         raise
@@ -219,7 +222,7 @@ async def delete_user(user_id: str, admin: dict = Depends(is_system_admin)):
     try:
         with get_engine().begin() as connection:
             # Verify user exists
-            user_check = connection.execute(text("SELECT id FROM users WHERE id = :user_id"), {"user_id": user_id}).fetchone()
+            user_check = connection.execute(text("SELECT id, email FROM users WHERE id = :user_id"), {"user_id": user_id}).fetchone()
             if not user_check:
                 raise HTTPException(status_code=404, detail="User not found.")
 
@@ -231,8 +234,9 @@ async def delete_user(user_id: str, admin: dict = Depends(is_system_admin)):
             
             # Delete the user
             connection.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
-            
-            return {"message": "User deleted successfully."}
+
+        invalidate_principal(user_check.email)
+        return {"message": "User deleted successfully."}
     except HTTPException:
         raise
     except Exception as e:
@@ -275,3 +279,13 @@ async def get_admin_template_requests(admin: dict = Depends(is_system_admin)):
     except Exception as e:
         logger.error(f"[GET ADMIN TEMPLATE REQUESTS ERROR] {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Could not retrieve template requests.")
+
+
+@router.delete("/admin/llm-cache/{template_name}")
+async def invalidate_llm_cache(template_name: str, admin: dict = Depends(is_system_admin)):
+    """
+    Drops the cached LLM outputs generated from a template, e.g. after its prompts
+    or the agent configuration changed.
+    """
+    llm_cache.invalidate_template(template_name)
+    return {"message": f"LLM cache invalidated for {template_name}."}
@@ -27,7 +27,8 @@ from backend.core.security import (
     ENTRA_TENANT_ID,
     ENTRA_CLIENT_ID,
     ENTRA_CLIENT_SECRET,
-    ENTRA_REDIRECT_URI
+    ENTRA_REDIRECT_URI,
+    invalidate_principal,
 )
 from backend.models.schemas import UserSettings
 
@@ -420,6 +421,7 @@ async def request_role(request: Request, current_user: dict = Depends(get_curren
                 text("UPDATE users SET requested_role_id = :role_id WHERE id = :user_id"),
                 {"role_id": role_id, "user_id": user_id}
             )
+        invalidate_principal(current_user["email"])
         return JSONResponse(status_code=200, content={"message": "Role request submitted successfully."})
     except Exception as e:
         logging.error(f"[REQUEST ROLE ERROR] {e}")
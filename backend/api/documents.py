@@ -15,7 +15,9 @@ from slugify import slugify
 #  Internal Modules
 from backend.core.db import get_engine
 from backend.core.security import get_current_user
-from backend.core.config import load_proposal_template
+# load_proposal_template stays importable from this module for existing callers.
+from backend.core.config import load_compiled_template, load_proposal_template  # noqa: F401
+from backend.utils.reference_data import reference_resolver
 from backend.utils.doc_export import create_word_from_sections, create_pdf_from_sections, create_excel_from_sections
 
 # This router handles endpoints for generating and downloading final proposal documents.
@@ -64,23 +66,9 @@ async def generate_and_download_document(
         generated_sections = generated_sections if isinstance(generated_sections, dict) else {}
 
         # Resolve UUIDs to names
-        with get_engine().connect() as connection:
-            if form_data.get("Targeted Donor"):
-                donor_id = form_data["Targeted Donor"]
-                donor_name = connection.execute(text("SELECT name FROM donors WHERE id = :id"), {"id": donor_id}).scalar()
-                form_data["Targeted Donor"] = donor_name or form_data["Targeted Donor"]
-
-            if form_data.get("Main Outcome"):
-                outcome_ids = form_data["Main Outcome"]
-                if outcome_ids:
-                    outcome_uuids = [UUID(oid) for oid in outcome_ids]
-                    outcome_names = connection.execute(text("SELECT name FROM outcomes WHERE id = ANY(:ids)"), {"ids": outcome_uuids}).scalars().all()
-                    form_data["Main Outcome"] = ", ".join(outcome_names) if outcome_names else form_data["Main Outcome"]
-
-            if form_data.get("Country / Location(s)"):
-                fc_id = form_data["Country / Location(s)"]
-                fc_name = connection.execute(text("SELECT name FROM field_contexts WHERE id = :id"), {"id": fc_id}).scalar()
-                form_data["Country / Location(s)"] = fc_name or form_data["Country / Location(s)"]
+        form_data = reference_resolver.resolve_form_data(form_data)
+        if isinstance(form_data.get("Main Outcome"), list):
+            form_data["Main Outcome"] = ", ".join(str(o) for o in form_data["Main Outcome"] if o)
 
         # Load the template to get the correct section order and list.
         if not template_name:
@@ -88,8 +76,8 @@ async def generate_and_download_document(
             template_name = "proposal_template_unhcr.json"
             logger.warning(f"Proposal {proposal_id} has no template_name, falling back to default.")
 
-        proposal_template = load_proposal_template(template_name)
-        template_sections = [s.get("section_name") for s in proposal_template.get("sections", [])]
+        compiled_template = load_compiled_template(template_name)
+        template_sections = compiled_template.output_order
 
 
         # # Ensure all required sections are present before generating.
@@ -117,7 +105,7 @@ async def generate_and_download_document(
         else:
             # Return the DOCX file by default.
             try:
-                doc = create_word_from_sections(form_data, proposal_template, ordered_sections)
+                doc = create_word_from_sections(form_data, compiled_template.source, ordered_sections)
                 docx_buffer = io.BytesIO()
                 doc.save(docx_buffer)
                 docx_buffer.seek(0)
@@ -177,8 +165,8 @@ async def generate_and_download_tables(
             template_name = "proposal_template_unhcr.json"
             logger.warning(f"Proposal {proposal_id} has no template_name, falling back to default.")
 
-        proposal_template = load_proposal_template(template_name)
-        template_sections = [s.get("section_name") for s in proposal_template.get("sections", [])]
+        compiled_template = load_compiled_template(template_name)
+        template_sections = compiled_template.output_order
         ordered_sections = {section: generated_sections.get(section, "") for section in template_sections}
 
         # Standardized filename generation from form_data
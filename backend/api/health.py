@@ -1,11 +1,21 @@
+#  Standard Library
+import os
+
 #  Third-Party Libraries
 from fastapi import APIRouter, Request
 from datetime import datetime 
 import psutil  
 
 #  Internal Modules
-from backend.core.db import test_connection
-from backend.core.redis import redis_client
+from backend.core.db import pool_stats, test_connection
+from backend.core.event_hub import event_hub
+from backend.core.redis import DictStorage, redis_client
+from backend.core.llm_executor import llm_executor
+from backend.core.llm_rate_limiter import llm_rate_limiter
+from backend.core.principal_cache import principal_cache
+from backend.core.template_registry import template_registry
+from backend.utils.llm_cache import llm_cache
+from backend.utils.session_store import session_store
 
 # This module provides health check and debugging endpoints.
 # These are useful for monitoring the application's status and for troubleshooting.
@@ -21,9 +31,28 @@ def health():
     return {
         "status": "لْحَمْدُ لِلَّٰهِ -- API is running", 
         "timestamp": datetime.now().isoformat(),
-        "memory_usage": psutil.Process().memory_info().rss / 1024 / 1024
+        "memory_usage": psutil.Process().memory_info().rss / 1024 / 1024,
+        "llm_executor": llm_executor.stats(),
+        "llm_rate_limiter": llm_rate_limiter.stats(),
+        "llm_cache": llm_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "template_registry": template_registry.stats(),
+        "session_store": session_store.stats(),
+        "event_hub": event_hub.stats(),
+        "db_pools": pool_stats()["pools"],
+        # Only when running without Redis
+        "memory_store": redis_client.stats() if isinstance(redis_client, DictStorage) else None
         }
 
+@router.get("/health/db-pools")
+def db_pools():
+    """
+    Database connection pools of this worker process: the configuration of every
+    workload, the gauges (size, checked out, overflow) and checkout latency, wait and
+    timeout counters of the pools in use, and the connections they can hold open.
+    """
+    return {"pid": os.getpid(), **pool_stats()}
+
 # very cheap health endpoint
 @router.get("/healthz")
 async def kubernetes_health():
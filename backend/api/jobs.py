@@ -0,0 +1,72 @@
+#  Standard Library
+import logging
+from typing import Optional
+
+#  Third-Party Libraries
+from fastapi import APIRouter, Depends, HTTPException
+
+#  Internal Modules
+from backend.core.security import get_current_user
+from backend.utils.job_queue import job_queue
+
+# This router exposes the status of queued generation jobs (see backend/worker.py)
+# and lets their owner cancel them.
+
+router = APIRouter()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def _get_owned_job(job_id: str, current_user: dict) -> dict:
+    """Fetches a job and checks that the current user may access it."""
+    try:
+        job = job_queue.get(job_id)
+    except Exception as e:
+        logger.error(f"[GET JOB ERROR] {job_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Could not fetch job.")
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if job.get("created_by") != current_user["user_id"] and not current_user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="You do not have access to this job.")
+    return job
+
+
+@router.get("/jobs")
+async def list_jobs(
+    status: Optional[str] = None,
+    limit: int = 50,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Lists the current user's most recent generation jobs, optionally filtered by status.
+    """
+    try:
+        jobs = job_queue.list_jobs(
+            created_by=current_user["user_id"], status=status, limit=min(limit, 200)
+        )
+        return {"jobs": jobs}
+    except Exception as e:
+        logger.error(f"[LIST JOBS ERROR] {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Could not list jobs.")
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """
+    Returns the status, attempts and last error of a generation job.
+    """
+    return _get_owned_job(job_id, current_user)
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """
+    Cancels a queued or running generation job. A running job is not interrupted,
+    but it is no longer retried.
+    """
+    _get_owned_job(job_id, current_user)
+    if not job_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job is already finished.")
+    return {"message": "Job cancelled.", "job_id": job_id}
@@ -19,6 +19,7 @@ from fastapi import (
 from fastapi.responses import StreamingResponse
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncConnection
 import litellm
 from slugify import slugify
 from PyPDF2 import PdfReader
@@ -27,23 +28,21 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 
 from backend.core.db import get_engine
+from backend.core.db_pool import WORKLOAD_BACKGROUND, with_db_workload
 from backend.core.redis import redis_client
-from backend.core.security import get_current_user, check_user_group_access
+from backend.core.codec import redis_codec
+from backend.core.event_hub import event_hub
+from backend.core.llm_executor import LLMQueueFullError, run_in_llm_executor
+from backend.core.security import get_async_read_connection, get_current_user, check_user_group_access
 
-try:
-    from backend.core.redis import DictStorage
-except ImportError:
-    # This will fail when redis is connected, but that's fine.
-    class DictStorage:
-        pass
-
-
-from backend.core.config import load_proposal_template
+from backend.core.config import load_compiled_template, load_proposal_template
 from backend.core.llm import get_embedder_config
 from backend.utils.crew_reference import ReferenceIdentificationCrew
 from backend.utils.crew_knowledge import ContentGenerationCrew
 from backend.utils.scraper import scrape_url
 from backend.utils.embedding_utils import process_and_store_text
+from backend.utils.job_queue import dispatch_generation_job, JOB_KNOWLEDGE_CARD_GENERATION
+from backend.utils.pagination import ListPage, list_page
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 import litellm
 import numpy as np
@@ -371,62 +370,83 @@ async def get_knowledge_cards(
     outcome_id: Optional[List[uuid.UUID]] = Query(None),
     field_context_id: Optional[uuid.UUID] = None,
     current_user: dict = Depends(get_current_user),
+    page: ListPage = Depends(list_page),
+    connection: AsyncConnection = Depends(get_async_read_connection),
 ):
     """
-    Fetches knowledge cards from the database, with optional filtering.
+    Fetches knowledge cards from the database, with optional filtering, most recently
+    updated first. Paginated as described in `backend.utils.pagination`; the summary
+    projection leaves out the generated sections and the references.
     """
     try:
-        with get_engine().connect() as connection:
-            base_query = """
-                SELECT
-                    kc.id,
-                    kc.summary,
-                    kc.template_name,
-                    kc.status,
-                    kc.created_at,
-                    kc.updated_at,
-                    kc.generated_sections,
-                    kc.created_by,
-                    kc.donor_id,
-                    kc.outcome_id,
-                    kc.field_context_id,
-                    d.name as donor_name,
-                    o.name as outcome_name,
-                    fc.name as field_context_name,
-                    (SELECT json_agg(json_build_object('id', kcr.id, 'url', kcr.url, 'reference_type', kcr.reference_type, 'summary', kcr.summary, 'scraped_at', kcr.scraped_at, 'scraping_error', kcr.scraping_error, 'ingested_at', kcr.scraped_at))
-                     FROM knowledge_card_references kcr
-                     JOIN knowledge_card_to_references kctr ON kcr.id = kctr.reference_id
-                     WHERE kctr.knowledge_card_id = kc.id) as "references"
-                FROM
-                    knowledge_cards kc
-                LEFT JOIN
-                    donors d ON kc.donor_id = d.id
-                LEFT JOIN
-                    outcomes o ON kc.outcome_id = o.id
-                LEFT JOIN
-                    field_contexts fc ON kc.field_context_id = fc.id
-            """
-
-            filters = []
-            params = {}
-            if donor_id:
-                filters.append("kc.donor_id = :donor_id")
-                params["donor_id"] = donor_id
-            if outcome_id:
-                filters.append("kc.outcome_id = ANY(:outcome_id)")
-                params["outcome_id"] = outcome_id
-            if field_context_id:
-                filters.append("kc.field_context_id = :field_context_id")
-                params["field_context_id"] = field_context_id
-
+        full_columns = """,
+                kc.generated_sections,
+                (SELECT json_agg(json_build_object('id', kcr.id, 'url', kcr.url, 'reference_type', kcr.reference_type, 'summary', kcr.summary, 'scraped_at', kcr.scraped_at, 'scraping_error', kcr.scraping_error, 'ingested_at', kcr.scraped_at))
+                 FROM knowledge_card_references kcr
+                 JOIN knowledge_card_to_references kctr ON kcr.id = kctr.reference_id
+                 WHERE kctr.knowledge_card_id = kc.id) as "references"
+        """
+        base_query = f"""
+            SELECT
+                kc.id,
+                kc.summary,
+                kc.template_name,
+                kc.status,
+                kc.created_at,
+                kc.updated_at,
+                kc.created_by,
+                kc.donor_id,
+                kc.outcome_id,
+                kc.field_context_id,
+                d.name as donor_name,
+                o.name as outcome_name,
+                fc.name as field_context_name{"" if page.summary else full_columns}
+            FROM
+                knowledge_cards kc
+            LEFT JOIN
+                donors d ON kc.donor_id = d.id
+            LEFT JOIN
+                outcomes o ON kc.outcome_id = o.id
+            LEFT JOIN
+                field_contexts fc ON kc.field_context_id = fc.id
+        """
+
+        filters = []
+        params = {}
+        if donor_id:
+            filters.append("kc.donor_id = :donor_id")
+            params["donor_id"] = donor_id
+        if outcome_id:
+            filters.append("kc.outcome_id = ANY(:outcome_id)")
+            params["outcome_id"] = outcome_id
+        if field_context_id:
+            filters.append("kc.field_context_id = :field_context_id")
+            params["field_context_id"] = field_context_id
+
+        conditions = []
+        if filters:
+            conditions.append("(" + " OR ".join(filters) + ")")
+        keyset = page.keyset("kc.updated_at", "kc.id")
+        if keyset:
+            conditions.append(keyset)
+        if conditions:
+            base_query += " WHERE " + " AND ".join(conditions)
+
+        base_query += page.order_by("kc.updated_at", "kc.id") + page.limit_clause()
+
+        query = text(base_query)
+        result = await connection.execute(query, {**params, **page.params()})
+        rows, next_cursor = page.split(result.mappings().fetchall(), "updated_at")
+        cards = [dict(row) for row in rows]
+
+        total = None
+        if page.include_total:
+            count_query = "SELECT COUNT(*) FROM knowledge_cards kc"
             if filters:
-                base_query += " WHERE " + " OR ".join(filters)
-
-            base_query += " ORDER BY kc.updated_at DESC"
+                count_query += " WHERE " + " OR ".join(filters)
+            total = (await connection.execute(text(count_query), params)).scalar()
 
-            query = text(base_query)
-            result = connection.execute(query, params)
-            cards = [dict(row) for row in result.mappings().fetchall()]
+        if not page.summary:
             for card in cards:
                 if card.get("references") is None:
                     card["references"] = []
@@ -449,7 +469,7 @@ async def get_knowledge_cards(
                         card["generated_sections"] = {}
                 else:
                     card["generated_sections"] = {}
-            return {"knowledge_cards": cards}
+        return {"knowledge_cards": cards, **page.metadata(next_cursor, total)}
     except Exception as e:
         logger.error(f"[GET KNOWLEDGE CARDS ERROR] {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch knowledge cards.")
@@ -463,7 +483,7 @@ async def get_knowledge_card_history(
     Fetches the history of a knowledge card.
     """
     try:
-        with get_engine().connect() as connection:
+        with get_engine(readonly=True, consistency_key=current_user["user_id"]).connect() as connection:
             # Add user permission check ??
             # card_owner_check = connection.execute(
             #     text("SELECT created_by FROM knowledge_cards WHERE id = :card_id"),
@@ -1305,14 +1325,9 @@ def _update_progress(
             progress_data["section_name"] = section_name
             progress_data["section_content"] = section_content
 
-        redis_client.set(
-            f"knowledge_card_generation:{card_id}", json.dumps(progress_data)
-        )
-        if not isinstance(redis_client, DictStorage):
-            redis_client.publish(
-                f"knowledge_card_generation_channel:{card_id}",
-                json.dumps(progress_data),
-            )
+        encoded = redis_codec.dumps(progress_data)
+        redis_client.set(f"knowledge_card_generation:{card_id}", encoded)
+        redis_client.publish(f"knowledge_card_generation_channel:{card_id}", encoded)
     except Exception as e:
         logger.error(f"[PROGRESS UPDATE ERROR] Failed to update progress: {e}")
 
@@ -1322,22 +1337,42 @@ def _update_ingest_progress(
 ):
     """Update ingest progress with error handling"""
     try:
-        progress_data = json.dumps(
+        progress_data = redis_codec.dumps(
             {"reference_id": str(reference_id), "status": status, "message": message}
         )
         redis_client.set(f"knowledge_card_ingest:{card_id}", progress_data)
-        if not isinstance(redis_client, DictStorage):
-            redis_client.publish(
-                f"knowledge_card_ingest_channel:{card_id}", progress_data
-            )
+        redis_client.publish(f"knowledge_card_ingest_channel:{card_id}", progress_data)
     except Exception as e:
         logger.error(
             f"[INGEST PROGRESS UPDATE ERROR] Failed to update ingest progress: {e}"
         )
 
 
-async def generate_content_background(card_id: uuid.UUID):
-    """Background task for content generation with comprehensive error handling"""
+def report_content_generation_failure(card_id: uuid.UUID, error: str):
+    """
+    Marks a knowledge card as failed and reports the error to its progress stream.
+
+    Used on the last generation attempt, including by the job worker when a job's
+    lease expired on that attempt.
+    """
+    _update_progress(card_id, f"An unexpected error occurred: {error}", -1)
+    with get_engine().begin() as connection:
+        connection.execute(
+            text("UPDATE knowledge_cards SET status = 'failed' WHERE id = :id"),
+            {"id": card_id},
+        )
+
+
+async def generate_content_background(
+    card_id: uuid.UUID, raise_errors: bool = False, final_attempt: bool = True
+):
+    """
+    Background task for content generation with comprehensive error handling.
+
+    The job worker sets `raise_errors` so a failed run (including failed sections)
+    raises and is retried by the job queue; unless `final_attempt`, the card is then
+    left for the retry rather than marked as failed.
+    """
 
     def progress_callback_for_reference_ingestion(message, progress):
         _update_progress(card_id, message, progress)
@@ -1394,6 +1429,7 @@ async def generate_content_background(card_id: uuid.UUID):
             knowledge_card_id=str(card_id), pre_prompt=pre_prompt
         )
 
+        failed_sections = []
         num_sections = len(template.get("sections", []))
         for i, section in enumerate(template.get("sections", [])):
             progress = 50 + int(((i + 1) / num_sections) * 50)
@@ -1412,7 +1448,11 @@ async def generate_content_background(card_id: uuid.UUID):
 
             # Add timeout and error handling for each section
             try:
-                result = crew.create_crew().kickoff(inputs=inputs)
+                result = await run_in_llm_executor(
+                    crew.create_crew().kickoff, inputs=inputs
+                )
+                if not str(result).strip():
+                    raise ValueError("No content was generated")
                 generated_sections[section_name] = str(result)
 
                 # --- PARTIAL SAVE: Update DB after each section ---
@@ -1444,10 +1484,14 @@ async def generate_content_background(card_id: uuid.UUID):
                 generated_sections[section_name] = (
                     f"Error generating content: {str(section_error)}"
                 )
+                failed_sections.append(section_name)
                 _update_progress(
                     card_id, f"Error generating section {section_name}", progress
                 )
 
+        if failed_sections and raise_errors and not final_attempt:
+            raise RuntimeError(f"Generation failed for sections: {', '.join(failed_sections)}")
+
         with get_engine().begin() as connection:
             _update_progress(card_id, "Content generation complete.", 100)
             connection.execute(
@@ -1475,12 +1519,12 @@ async def generate_content_background(card_id: uuid.UUID):
 
     except Exception as e:
         logger.error(f"[BACKGROUND KC GENERATION ERROR] {e}", exc_info=True)
-        _update_progress(card_id, f"An unexpected error occurred: {e}", -1)
-        with get_engine().begin() as connection:
-            connection.execute(
-                text("UPDATE knowledge_cards SET status = 'failed' WHERE id = :id"),
-                {"id": card_id},
-            )
+        if final_attempt:
+            report_content_generation_failure(card_id, str(e))
+        else:
+            _update_progress(card_id, f"Generation failed, retrying: {e}", 0)
+        if raise_errors:
+            raise
 
 
 @router.post(
@@ -1536,7 +1580,9 @@ async def ingest_knowledge_card_references(
                         f"Failed to ingest reference {ref.id}: {e}", exc_info=True
                     )
 
-    background_tasks.add_task(ingest_references_background, card_id, data.reference_ids)
+    background_tasks.add_task(
+        with_db_workload(WORKLOAD_BACKGROUND, ingest_references_background), card_id, data.reference_ids
+    )
     return {"message": "Reference ingestion started in the background."}
 
 
@@ -1593,7 +1639,9 @@ async def reingest_knowledge_card_reference(
                     f"Failed to re-ingest reference {reference_id}: {e}", exc_info=True
                 )
 
-    background_tasks.add_task(ingest_single_reference_background, card_id, reference_id)
+    background_tasks.add_task(
+        with_db_workload(WORKLOAD_BACKGROUND, ingest_single_reference_background), card_id, reference_id
+    )
     return {"message": "Single reference ingestion started in the background."}
 
 
@@ -1630,8 +1678,17 @@ async def generate_knowledge_card_content(
             owner_id=card_check.created_by,
         )
 
-    background_tasks.add_task(generate_content_background, card_id)
-    return {"message": "Knowledge card content generation started in the background."}
+    job_id = dispatch_generation_job(
+        background_tasks,
+        JOB_KNOWLEDGE_CARD_GENERATION,
+        generate_content_background,
+        {"card_id": card_id},
+        created_by=current_user["user_id"],
+    )
+    response = {"message": "Knowledge card content generation started in the background."}
+    if job_id:
+        response["job_id"] = job_id
+    return response
 
 
 @router.get("/knowledge-cards/{card_id}/status")
@@ -1652,56 +1709,19 @@ async def get_knowledge_card_status(
             raise HTTPException(status_code=404, detail="Knowledge card not found.")
 
     async def event_generator():
-        # Check if we are using the fallback in-memory storage or actual Redis
-        if isinstance(redis_client, DictStorage):
-            # Fallback for in-memory storage: polling
-            logger.info(f"Using polling for knowledge card {card_id} status.")
-            last_message = None
+        # Subscribe before reading the current state, so that no update is missed in between.
+        async with event_hub.subscribe(
+            f"knowledge_card_generation_channel:{card_id}"
+        ) as subscription:
             try:
+                progress_data = redis_client.get(f"knowledge_card_generation:{card_id}")
                 while True:
-                    # Add timeout to prevent infinite loops
-                    progress_data = redis_client.get(
-                        f"knowledge_card_generation:{card_id}"
-                    )
-                    if progress_data and progress_data != last_message:
-                        last_message = progress_data
+                    if progress_data:
                         yield f"data: {progress_data}\n\n"
 
-                    # Check if task is complete or failed
-                    try:
-                        progress_obj = (
-                            json.loads(progress_data) if progress_data else {}
-                        )
-                        if (
-                            progress_obj.get("progress", 0) >= 100
-                            or progress_obj.get("progress", 0) == -1
-                        ):
-                            break
-                    except:
-                        pass
-
-                    await asyncio.sleep(1)  # Poll every second
-            except asyncio.CancelledError:
-                logger.info(
-                    f"Client disconnected from {card_id} status stream (polling)."
-                )
-        else:
-            # Original implementation for Redis
-            logger.info(f"Using Redis Pub/Sub for knowledge card {card_id} status.")
-            pubsub = redis_client.pubsub()
-            channel = f"knowledge_card_generation_channel:{card_id}"
-            await pubsub.subscribe(channel)
-            try:
-                while True:
-                    message = await pubsub.get_message(
-                        ignore_subscribe_messages=True, timeout=10
-                    )
-                    if message:
-                        yield f"data: {message['data']}\n\n"
-
-                        # Check if task is complete
+                        # Check if task is complete or failed
                         try:
-                            progress_obj = json.loads(message["data"])
+                            progress_obj = json.loads(progress_data)
                             if (
                                 progress_obj.get("progress", 0) >= 100
                                 or progress_obj.get("progress", 0) == -1
@@ -1710,17 +1730,9 @@ async def get_knowledge_card_status(
                         except:
                             pass
 
-                    # Add small sleep to prevent busy waiting
-                    await asyncio.sleep(0.1)
+                    progress_data = await subscription.get(timeout=10)
             except asyncio.CancelledError:
                 logger.info(f"Client disconnected from {card_id} status stream.")
-            finally:
-                #  Proper cleanup
-                try:
-                    await pubsub.unsubscribe(channel)
-                    await pubsub.close()
-                except:
-                    pass
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -1743,54 +1755,19 @@ async def get_knowledge_card_ingest_status(
             raise HTTPException(status_code=404, detail="Knowledge card not found.")
 
     async def event_generator():
-        if isinstance(redis_client, DictStorage):
-            logger.info(f"Using polling for knowledge card {card_id} ingest status.")
-            last_message = None
+        # Subscribe before reading the current state, so that no update is missed in between.
+        async with event_hub.subscribe(
+            f"knowledge_card_ingest_channel:{card_id}"
+        ) as subscription:
             try:
+                progress_data = redis_client.get(f"knowledge_card_ingest:{card_id}")
                 while True:
-                    progress_data = redis_client.get(f"knowledge_card_ingest:{card_id}")
-                    if progress_data and progress_data != last_message:
-                        last_message = progress_data
+                    if progress_data:
                         yield f"data: {progress_data}\n\n"
 
-                    # Add completion check
-                    try:
-                        progress_obj = (
-                            json.loads(progress_data) if progress_data else {}
-                        )
                         # Check if all references are processed (simplified check)
-                        if progress_obj.get("status") in [
-                            "ingested",
-                            "error",
-                            "skipped",
-                        ]:
-                            break
-                    except:
-                        pass
-
-                    await asyncio.sleep(1)
-            except asyncio.CancelledError:
-                logger.info(
-                    f"Client disconnected from {card_id} ingest status stream (polling)."
-                )
-        else:
-            logger.info(
-                f"Using Redis Pub/Sub for knowledge card {card_id} ingest status."
-            )
-            pubsub = redis_client.pubsub()
-            channel = f"knowledge_card_ingest_channel:{card_id}"
-            await pubsub.subscribe(channel)
-            try:
-                while True:
-                    message = await pubsub.get_message(
-                        ignore_subscribe_messages=True, timeout=10
-                    )
-                    if message:
-                        yield f"data: {message['data']}\\n\\n"
-
-                        # Check for completion
                         try:
-                            progress_obj = json.loads(message["data"])
+                            progress_obj = json.loads(progress_data)
                             if progress_obj.get("status") in [
                                 "ingested",
                                 "error",
@@ -1800,16 +1777,9 @@ async def get_knowledge_card_ingest_status(
                         except:
                             pass
 
-                    await asyncio.sleep(0.1)
+                    progress_data = await subscription.get(timeout=10)
             except asyncio.CancelledError:
                 logger.info(f"Client disconnected from {card_id} ingest status stream.")
-            finally:
-                #  Proper cleanup
-                try:
-                    await pubsub.unsubscribe(channel)
-                    await pubsub.close()
-                except:
-                    pass
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -1855,7 +1825,9 @@ async def identify_references(
         #  Use only the essential information
         topic = data.title or f"References for {data.linked_element}"
 
-        result = crew.kickoff(link_type=data.linked_element, topic=topic)
+        result = await run_in_llm_executor(
+            crew.kickoff, link_type=data.linked_element, topic=topic
+        )
 
         try:
             # Clean the raw output from the crew
@@ -1952,6 +1924,8 @@ async def identify_references(
             )
 
         return {"references": references}
+    except LLMQueueFullError:
+        raise
     except Exception as e:
         logger.error(f"[IDENTIFY REFERENCES ERROR] {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to identify references.")
@@ -2051,10 +2025,8 @@ async def generate_and_download_document(
         else:
             template_name = card_dict.get("template_name")
 
-        proposal_template = load_proposal_template(template_name)
-        template_sections = [
-            s.get("section_name") for s in proposal_template.get("sections", [])
-        ]
+        compiled_template = load_compiled_template(template_name)
+        template_sections = compiled_template.output_order
 
         # # Ensure all required sections are present before generating.
         # if len(generated_sections) < len(template_sections):
@@ -2388,7 +2360,7 @@ async def get_all_knowledge_card_reviews(
     """
     user_id = current_user["user_id"]
     try:
-        with get_engine().connect() as connection:
+        with get_engine(readonly=True, consistency_key=user_id).connect() as connection:
             query = text("""
                 SELECT
                     kcr.id,
@@ -2475,7 +2447,7 @@ async def add_knowledge_card_comment(
         # Trigger analysis in background
         if review_id:
             background_tasks.add_task(
-                _run_auto_analysis, ArtifactType.knowledge_card, review_id
+                with_db_workload(WORKLOAD_BACKGROUND, _run_auto_analysis), ArtifactType.knowledge_card, review_id
             )
 
         return {"message": "Comment saved successfully.", "comment_id": review_id}
@@ -1,16 +1,26 @@
 import logging
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy import text
 from typing import Optional
-from backend.core.db import get_engine
+from backend.core.db import get_async_engine, get_engine
+from backend.core.db_pool import WORKLOAD_METRICS
 from backend.core.security import get_current_user, is_system_admin
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def _get_filter_clauses(
+def _parse_date(value: str) -> datetime:
+    """Parses an ISO date filter; the asyncpg driver does not convert strings to timestamps."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date: '{value}'.")
+
+
+async def _get_filter_clauses(
     current_user,
     filter_by=None,
     status=None,
@@ -31,10 +41,12 @@ def _get_filter_clauses(
         params["current_user_id"] = current_user["user_id"]
     elif filter_by == "team":
         user_team_id = None
-        with get_engine().connect() as connection:
-            user_team_id = connection.execute(
-                text("SELECT team_id FROM users WHERE id = :uid"),
-                {"uid": current_user["user_id"]},
+        async with get_async_engine(WORKLOAD_METRICS, readonly=True).connect() as connection:
+            user_team_id = (
+                await connection.execute(
+                    text("SELECT team_id FROM users WHERE id = :uid"),
+                    {"uid": current_user["user_id"]},
+                )
             ).scalar()
         if user_team_id:
             where_clauses.append(
@@ -48,10 +60,10 @@ def _get_filter_clauses(
         params["status"] = status
     if date_start:
         where_clauses.append("p.created_at >= :date_start")
-        params["date_start"] = date_start
+        params["date_start"] = _parse_date(date_start)
     if date_end:
         where_clauses.append("p.created_at <= :date_end")
-        params["date_end"] = date_end
+        params["date_end"] = _parse_date(date_end)
     if author_id:
         where_clauses.append("p.user_id = :author_id")
         params["author_id"] = author_id
@@ -79,10 +91,10 @@ def _get_filter_clauses(
     return "", params
 
 
-def robust_query(query, params, empty_result, rows_to_contract):
+async def robust_query(query, params, empty_result, rows_to_contract):
     try:
-        with get_engine().connect() as connection:
-            rows = connection.execute(text(query), params).mappings().fetchall()
+        async with get_async_engine(WORKLOAD_METRICS, readonly=True).connect() as connection:
+            rows = (await connection.execute(text(query), params)).mappings().fetchall()
         rows = [dict(row) for row in rows] if rows else []
         return rows_to_contract(rows) if rows else empty_result
     except Exception as e:
@@ -90,10 +102,10 @@ def robust_query(query, params, empty_result, rows_to_contract):
         return empty_result
 
 
-def robust_singleval(query, params, key):
+async def robust_singleval(query, params, key):
     try:
-        with get_engine().connect() as connection:
-            val = connection.execute(text(query), params).scalar()
+        async with get_async_engine(WORKLOAD_METRICS, readonly=True).connect() as connection:
+            val = (await connection.execute(text(query), params)).scalar()
         return {key: float(val) if val else 0}
     except Exception as e:
         logger.error(f"[METRIC ERROR] {e}", exc_info=True)
@@ -117,7 +129,7 @@ async def get_pipeline_kpis(
     donor_group: Optional[str] = Query(None),
     template_name: Optional[str] = Query(None),
 ):
-    where_clause, params = _get_filter_clauses(
+    where_clause, params = await _get_filter_clauses(
         current_user,
         filter_by=filter_by,
         status=status,
@@ -184,7 +196,7 @@ async def get_pipeline_kpis(
     FROM counts
     """
 
-    return robust_query(
+    return await robust_query(
         q,
         params,
         {
@@ -220,7 +232,7 @@ async def get_proposals_by_donor(
     donor_group: Optional[str] = Query(None),
     template_name: Optional[str] = Query(None),
 ):
-    where_clause, params = _get_filter_clauses(
+    where_clause, params = await _get_filter_clauses(
         current_user,
         filter_by,
         status,
@@ -261,7 +273,7 @@ async def get_proposals_by_donor(
     GROUP BY d.name
     ORDER BY total_value DESC
     """
-    return robust_query(q, params, [], lambda rows: rows)
+    return await robust_query(q, params, [], lambda rows: rows)
 
 
 @router.get(
@@ -281,7 +293,7 @@ async def get_proposals_by_outcome(
     donor_group: Optional[str] = Query(None),
     template_name: Optional[str] = Query(None),
 ):
-    where_clause, params = _get_filter_clauses(
+    where_clause, params = await _get_filter_clauses(
         current_user,
         filter_by,
         status,
@@ -315,7 +327,7 @@ async def get_proposals_by_outcome(
     GROUP BY d.name, o.name
     ORDER BY count DESC
     """
-    return robust_query(q, params, [], lambda rows: rows)
+    return await robust_query(q, params, [], lambda rows: rows)
 
 
 @router.get(
@@ -335,7 +347,7 @@ async def get_proposals_by_context(
     donor_group: Optional[str] = Query(None),
     template_name: Optional[str] = Query(None),
 ):
-    where_clause, params = _get_filter_clauses(
+    where_clause, params = await _get_filter_clauses(
         current_user,
         filter_by,
         status,
@@ -376,7 +388,7 @@ async def get_proposals_by_context(
     GROUP BY COALESCE(fc.unhcr_region, 'Other'), fc.name
     ORDER BY total_value DESC
     """
-    return robust_query(q, params, [], lambda rows: rows)
+    return await robust_query(q, params, [], lambda rows: rows)
 
 
 @router.get(
@@ -396,7 +408,7 @@ async def get_proposals_by_team(
     donor_group: Optional[str] = Query(None),
     template_name: Optional[str] = Query(None),
 ):
-    where_clause, params = _get_filter_clauses(
+    where_clause, params = await _get_filter_clauses(
         current_user,
         filter_by,
         status,
@@ -454,7 +466,7 @@ async def get_proposals_by_team(
     GROUP BY bd.team_name, tt.total_proposals, tt.total_team_value, bd.status
     ORDER BY tt.total_team_value DESC, bd.team_name, value DESC
     """
-    return robust_query(q, params, [], lambda rows: rows)
+    return await robust_query(q, params, [], lambda rows: rows)
 
 
 @router.get(
@@ -482,7 +494,7 @@ async def get_proposals_by_time(
     }
     period_expr = periods.get(period, periods["month"])
 
-    where_clause, params = _get_filter_clauses(
+    where_clause, params = await _get_filter_clauses(
         current_user,
         filter_by,
         status,
@@ -519,7 +531,7 @@ async def get_proposals_by_time(
     GROUP BY period, p.status
     ORDER BY period ASC
     """
-    return robust_query(q, params, [], lambda rows: rows)
+    return await robust_query(q, params, [], lambda rows: rows)
 
 
 #######################################
@@ -549,11 +561,11 @@ async def get_average_funding(
         END
     ) as avg_funding FROM proposals p {where_clause}
     """
-    where_clause, params = _get_filter_clauses(
+    where_clause, params = await _get_filter_clauses(
         current_user, filter_by, status_filter=status
     )
     query = q.format(where_clause=where_clause)
-    return robust_singleval(query, params, "amount")
+    return await robust_singleval(query, params, "amount")
 
 
 @router.get(
@@ -568,9 +580,9 @@ async def get_proposal_volume(
     date_end: Optional[str] = Query(None),
 ):
     q = "SELECT COALESCE(p.form_data->>'Category', p.template_name) as category, COUNT(p.id) as proposal_count FROM proposals p {where_clause} GROUP BY category ORDER BY proposal_count DESC"
-    where_clause, params = _get_filter_clauses(current_user, filter_by)
+    where_clause, params = await _get_filter_clauses(current_user, filter_by)
     query = q.format(where_clause=where_clause)
-    return robust_query(
+    return await robust_query(
         query,
         params,
         {"categories": [], "counts": []},
@@ -604,9 +616,9 @@ async def get_funding_by_category(
                END, 0)) as total_amount 
     FROM proposals p {where_clause} GROUP BY category
     """
-    where_clause, params = _get_filter_clauses(current_user, filter_by)
+    where_clause, params = await _get_filter_clauses(current_user, filter_by)
     query = q.format(where_clause=where_clause)
-    return robust_query(
+    return await robust_query(
         query,
         params,
         {"categories": [], "amounts": []},
@@ -631,9 +643,9 @@ async def get_donor_interest(
     date_end: Optional[str] = Query(None),
 ):
     q = "SELECT d.name as donor, COUNT(p.id) as interest FROM proposals p JOIN proposal_donors pd ON p.id = pd.proposal_id JOIN donors d ON pd.donor_id = d.id {where_clause} GROUP BY d.name ORDER BY interest DESC"
-    where_clause, params = _get_filter_clauses(current_user, filter_by)
+    where_clause, params = await _get_filter_clauses(current_user, filter_by)
     query = q.format(where_clause=where_clause)
-    return robust_query(
+    return await robust_query(
         query,
         params,
         {"donors": [], "interest": []},
@@ -657,9 +669,9 @@ async def get_development_time(
 ):
     q = """WITH status_durations AS (
         SELECT psh.proposal_id, psh.status, LEAD(psh.created_at, 1, CURRENT_TIMESTAMP) OVER (PARTITION BY psh.proposal_id ORDER BY psh.created_at) - psh.created_at AS duration FROM proposal_status_history psh JOIN proposals p ON psh.proposal_id = p.id {where_clause}) SELECT status, EXTRACT(EPOCH FROM AVG(duration)) as average_duration_seconds FROM status_durations GROUP BY status"""
-    where_clause, params = _get_filter_clauses(current_user, filter_by)
+    where_clause, params = await _get_filter_clauses(current_user, filter_by)
     query = q.format(where_clause=where_clause)
-    return robust_query(query, params, [], lambda rows: rows)
+    return await robust_query(query, params, [], lambda rows: rows)
 
 
 @router.get(
@@ -680,9 +692,9 @@ async def get_proposal_trends(
         "year": "TO_CHAR(p.created_at, 'YYYY')",
     }
     period_expr = periods.get(period, periods["month"])
-    where_clause, params = _get_filter_clauses(current_user, filter_by)
+    where_clause, params = await _get_filter_clauses(current_user, filter_by)
     q = f"SELECT {period_expr} as period, p.status, COUNT(p.id) as proposal_count FROM proposals p {where_clause} GROUP BY period, p.status ORDER BY period DESC"
-    return robust_query(
+    return await robust_query(
         q,
         params,
         {"timeline": [], "statuses": [], "counts": []},
@@ -708,12 +720,12 @@ async def get_conversion_rate(
     date_end: Optional[str] = Query(None),
 ):
     try:
-        where_clause, params = _get_filter_clauses(current_user, filter_by)
+        where_clause, params = await _get_filter_clauses(current_user, filter_by)
         total_query = f"SELECT COUNT(id) FROM proposals p {where_clause}"
         approved_query = f"SELECT COUNT(id) FROM proposals p {where_clause} AND p.status = 'approved'"
-        with get_engine().connect() as connection:
-            total = connection.execute(text(total_query), params).scalar()
-            approved = connection.execute(text(approved_query), params).scalar()
+        async with get_async_engine(WORKLOAD_METRICS, readonly=True).connect() as connection:
+            total = (await connection.execute(text(total_query), params)).scalar()
+            approved = (await connection.execute(text(approved_query), params)).scalar()
         rate = round(approved / total, 4) if total else 0.0
         return {"rate": rate}
     except Exception as e:
@@ -739,14 +751,14 @@ async def get_abandonment_rate(
     date_end: Optional[str] = Query(None),
 ):
     try:
-        where_clause, params = _get_filter_clauses(current_user, filter_by)
+        where_clause, params = await _get_filter_clauses(current_user, filter_by)
         total_query = f"SELECT COUNT(id) FROM proposals p {where_clause}"
         abandoned_query = (
             f"SELECT COUNT(id) FROM proposals p {where_clause} AND p.status = 'draft'"
         )
-        with get_engine().connect() as connection:
-            total = connection.execute(text(total_query), params).scalar()
-            abandoned = connection.execute(text(abandoned_query), params).scalar()
+        async with get_async_engine(WORKLOAD_METRICS, readonly=True).connect() as connection:
+            total = (await connection.execute(text(total_query), params)).scalar()
+            abandoned = (await connection.execute(text(abandoned_query), params)).scalar()
         rate = round(abandoned / total, 4) if total else 0.0
         return {"rate": rate, "total_abandoned": abandoned or 0}
     except Exception as e:
@@ -782,9 +794,9 @@ async def get_edit_activity(
     GROUP BY edit_count
     ORDER BY edit_count
     """
-    where_clause, params = _get_filter_clauses(current_user, filter_by)
+    where_clause, params = await _get_filter_clauses(current_user, filter_by)
     query = q.format(where_clause=where_clause)
-    return robust_query(
+    return await robust_query(
         query,
         params,
         {"labels": [], "data": []},
@@ -824,14 +836,14 @@ async def get_reviewer_activity(
     GROUP BY review_count
     ORDER BY review_count
     """
-    where_clause, params = _get_filter_clauses(current_user, filter_by)
+    where_clause, params = await _get_filter_clauses(current_user, filter_by)
     if where_clause:
         where_clause += " AND psh.status = 'in_review'"
     else:
         where_clause = "WHERE psh.status = 'in_review'"
 
     query = q.format(where_clause=where_clause)
-    return robust_query(
+    return await robust_query(
         query,
         params,
         {"labels": [], "data": []},
@@ -874,7 +886,7 @@ async def get_knowledge_cards(
     FROM knowledge_cards 
     GROUP BY type
     """
-    return robust_query(
+    return await robust_query(
         q,
         {},
         {"types": [], "counts": []},
@@ -897,7 +909,7 @@ async def get_knowledge_cards_history(
     date_end: Optional[str] = Query(None),
 ):
     q = "SELECT kc.id as card_id, COUNT(kr.id) as revisions FROM knowledge_card_history kr JOIN knowledge_cards kc ON kr.knowledge_card_id = kc.id GROUP BY kc.id"
-    return robust_query(
+    return await robust_query(
         q,
         {},
         {"card_ids": [], "revisions": []},
@@ -933,7 +945,7 @@ async def get_reference_metrics(
     JOIN knowledge_cards kc ON kctr.knowledge_card_id = kc.id 
     GROUP BY type
     """
-    return robust_query(
+    return await robust_query(
         q,
         {},
         {"types": [], "references": []},
@@ -956,7 +968,7 @@ async def get_reference_usage_metrics(
     date_end: Optional[str] = Query(None),
 ):
     q = "SELECT kcr.url, COUNT(DISTINCT kctr.knowledge_card_id) as usage_count FROM knowledge_card_references kcr JOIN knowledge_card_to_references kctr ON kcr.id = kctr.reference_id GROUP BY kcr.url HAVING COUNT(DISTINCT kctr.knowledge_card_id) > 1"
-    return robust_query(
+    return await robust_query(
         q,
         {},
         {"urls": [], "usage_counts": []},
@@ -1002,7 +1014,7 @@ async def get_card_edit_frequency(
     JOIN knowledge_cards kc ON kr.knowledge_card_id = kc.id 
     GROUP BY kc.id, kc.created_at
     """
-    return robust_query(
+    return await robust_query(
         q,
         {},
         {"card_ids": [], "edit_frequency": []},
@@ -1053,7 +1065,7 @@ async def get_knowledge_silos(
         HAVING COUNT(DISTINCT kctr.reference_id) = 1
     )
     """
-    return robust_query(
+    return await robust_query(
         q,
         {},
         {"isolated_card_ids": [], "silo_teams": []},
@@ -1156,7 +1168,7 @@ async def get_quality_incidents(
     ORDER BY created_at DESC
     """
 
-    return robust_query(q, {}, [], lambda rows: rows)
+    return await robust_query(q, {}, [], lambda rows: rows)
 
 
 @router.post(
@@ -1221,4 +1233,4 @@ async def get_quality_kpis(
     FROM all_incidents
     GROUP BY type_of_comment, severity
     """
-    return robust_query(q, {}, [], lambda rows: rows)
+    return await robust_query(q, {}, [], lambda rows: rows)
@@ -1,8 +1,10 @@
 #  Standard Library
+import asyncio
 import json
 import re
 import uuid
 import time
+import threading
 from datetime import datetime, timedelta
 import logging
 import tempfile
@@ -20,22 +22,33 @@ from fastapi import (
     File,
     BackgroundTasks,
 )
+from fastapi.responses import StreamingResponse
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
 from slugify import slugify
 
 #  Internal Modules
-from backend.core.db import get_engine
+from backend.core.db import get_engine, replica_router
+from backend.core.db_pool import WORKLOAD_BACKGROUND, with_db_workload
 from backend.core.redis import redis_client
-from backend.core.security import get_current_user
+from backend.core.event_hub import event_hub
+
+from backend.core.llm_executor import run_in_llm_executor
+from backend.core.llm_usage import track_llm_usage
+from backend.core.security import get_async_read_connection, get_current_user
+from backend.core.compiled_template import compile_section
 from backend.core.config import (
     get_available_templates,
+    load_compiled_template,
     load_proposal_template,
     TEMPLATES_DIR,
     _find_template_path,
+    SECTION_GENERATION_CONCURRENCY,
 )
 from backend.utils.crew_actions import (
     handle_text_format,
+    handle_text_format_with_context,
     handle_fixed_text_format,
     handle_number_format,
     handle_table_format,
@@ -61,6 +74,22 @@ from backend.models.schemas import (
     ArtifactType,
 )
 from backend.utils.incident_service import IncidentService
+from backend.utils.llm_cache import make_cache_scope
+from backend.utils.session_store import session_store
+from backend.utils.reference_data import reference_resolver
+from backend.utils.section_store import save_section, save_sections
+from backend.utils.generation_events import (
+    publish_generation_event,
+    stream_section_tokens,
+    generation_channel,
+    generation_snapshot_key,
+    TERMINAL_EVENTS,
+)
+from backend.utils.job_queue import (
+    dispatch_generation_job,
+    JOB_PROPOSAL_GENERATION,
+    JOB_PROPOSAL_REGENERATION,
+)
 from backend.utils.persistence_repository import PersistenceRepository
 
 
@@ -69,10 +98,16 @@ from backend.utils.proposal_logic import (
     resolve_form_data_labels,
 )
 from backend.utils.crew_proposal import ProposalCrew
+from backend.utils.section_scheduler import (
+    build_section_graph,
+    run_section_graph,
+    with_dependency_context,
+)
 from backend.api.knowledge import _save_knowledge_card_content_to_file
 
 # Import proposal run logger for telemetry
 from backend.utils.proposal_run_logger import artifact_run_logger as proposal_run_logger
+from backend.utils.pagination import ListPage, list_page
 
 # This router handles all endpoints related to the lifecycle of a proposal,
 
@@ -84,6 +119,9 @@ router = APIRouter()
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Idle time after which the generation stream sends an SSE comment to keep the connection open.
+GENERATION_STREAM_KEEPALIVE_SECONDS = 15
+
 FALLBACK_GENERATION_MESSAGE = "Generation issue: No content was generated for this section. You can try regenerating it or edit it manually."
 
 
@@ -346,8 +384,8 @@ async def create_session(
             "is_accepted": False,
         }
 
-        # Store the payload in Redis.
-        redis_client.setex(session_id, 3600, json.dumps(redis_payload, default=str))
+        # Store the payload in Redis; the template is stored once and referenced.
+        session_store.create(session_id, redis_payload)
 
         # Return the new IDs.
         return {
@@ -366,9 +404,39 @@ async def create_session(
         )
 
 
-def generate_all_sections_background(session_id: str, proposal_id: str, user_id: str):
+def report_generation_failure(proposal_id: str, error: str):
+    """
+    Marks a proposal as failed and publishes `generation_failed` to its progress stream.
+
+    Used on the last attempt of a generation or regeneration, including by the job
+    worker when a job's lease expired on that attempt.
+    """
+    try:
+        with get_engine().begin() as connection:
+            connection.execute(
+                text(
+                    "UPDATE proposals SET status = 'failed', updated_at = CURRENT_TIMESTAMP WHERE id = :id"
+                ),
+                {"id": proposal_id},
+            )
+    except Exception as db_error:
+        logger.error(
+            f"Failed to update proposal status to 'failed' for {proposal_id}: {db_error}",
+            exc_info=True,
+        )
+    publish_generation_event(proposal_id, "generation_failed", error=error)
+
+
+def generate_all_sections_background(
+    session_id: str, proposal_id: str, user_id: str, raise_errors: bool = False, final_attempt: bool = True
+):
     """
     Runs the proposal generation process for all sections in the background.
+
+    The job worker sets `raise_errors` so a failed run (including sections that could
+    only be filled with the fallback message) raises and is retried by the job queue;
+    unless `final_attempt`, the proposal is then left for the retry rather than marked
+    as failed.
     """
     logger.info(f"Starting background generation for proposal {proposal_id}")
     knowledge_file_paths = []
@@ -415,11 +483,12 @@ def generate_all_sections_background(session_id: str, proposal_id: str, user_id:
                 {"id": proposal_id},
             )
 
-        session_data_str = redis_client.get(session_id)
-        if not session_data_str:
+        publish_generation_event(proposal_id, "generation_started")
+
+        session_data = session_store.load(session_id)
+        if not session_data:
             raise Exception("Session data not found in Redis.")
 
-        session_data = json.loads(session_data_str)
         proposal_template = session_data.get("proposal_template")
         if not proposal_template or "sections" not in proposal_template:
             raise Exception("Proposal template or sections not found in session.")
@@ -427,8 +496,7 @@ def generate_all_sections_background(session_id: str, proposal_id: str, user_id:
         form_data = session_data["form_data"]
 
         # Resolve labels for form_data before sending to CrewAI
-        with get_engine().connect() as connection:
-            form_data = resolve_form_data_labels(form_data, connection)
+        form_data = resolve_form_data_labels(form_data)
 
         project_description = session_data["project_description"]
         associated_knowledge_cards = session_data.get("associated_knowledge_cards")
@@ -548,151 +616,211 @@ def generate_all_sections_background(session_id: str, proposal_id: str, user_id:
                     else:
                         knowledge_file_paths.append(filename)
 
+        # CrewAI crews keep per-kickoff state, so each worker thread builds its own crew.
         # The JSONKnowledgeSource expects relative paths from the `knowledge` directory
-        crew_instance = ProposalCrew(
-            knowledge_file_paths=knowledge_file_paths
-        ).generate_proposal_crew()
-
-        # Extract special_requirements from the template
-        special_requirements_obj = proposal_template.get("special_requirements", {})
-        special_requirements_list = special_requirements_obj.get("instructions", [])
-        # Format as a string (bulleted list)
-        special_requirements_str = (
-            "\n".join([f"- {req}" for req in special_requirements_list])
-            if special_requirements_list
-            else "None"
+        thread_state = threading.local()
+
+        def get_crew_instance():
+            if not hasattr(thread_state, "crew_instance"):
+                thread_state.crew_instance = ProposalCrew(
+                    knowledge_file_paths=knowledge_file_paths
+                ).generate_proposal_crew()
+            return thread_state.crew_instance
+
+        cache_scope = make_cache_scope(
+            session_data.get("template_name", template_name), knowledge_file_paths
         )
 
-        # Use section_sequence for generation order if available, otherwise fall back to sections array order
-        # This allows optimal generation order (memory/dependency) while sections array maintains output order
-        section_sequence = proposal_template.get("section_sequence", [])
-        if not section_sequence:
-            # Fallback: use sections array order if section_sequence is missing
-            section_sequence = [
-                s["section_name"] for s in proposal_template["sections"]
-            ]
+        # Sections by name, generation order and prompt fragments, compiled once per template version
+        compiled_template = load_compiled_template(
+            session_data.get("template_name", template_name),
+            proposal_template,
+            session_data.get("template_version"),
+        )
+        special_requirements_str = compiled_template.special_requirements
+        if not compiled_template.has_section_sequence:
             logger.warning(
                 f"No section_sequence found in template, using sections array order for generation"
             )
+        section_sequence = compiled_template.generation_order
 
-        # Create a lookup dictionary for section configs by name
-        sections_by_name = {s["section_name"]: s for s in proposal_template["sections"]}
-
-        for section_name in section_sequence:
-            # Find the section config by name
-            section_config = sections_by_name.get(section_name)
-            if not section_config:
-                logger.warning(
-                    f"Section '{section_name}' in section_sequence not found in sections array, skipping"
-                )
-                continue
-
-            format_type = section_config.get("format_type", "text")
+        # Sections declaring `depends_on` wait for their dependencies; all others run concurrently.
+        max_workers = SECTION_GENERATION_CONCURRENCY
+        try:
+            section_graph = build_section_graph(proposal_template, section_sequence)
+        except ValueError as graph_error:
+            logger.warning(
+                f"{graph_error}. Falling back to sequential generation for proposal {proposal_id}"
+            )
+            section_graph = {name: [] for name in section_sequence}
+            max_workers = 1
+
+        def generate_section(section_name, upstream):
+            upstream_texts = {
+                name: outcome["text"]
+                for name, outcome in upstream.items()
+                if outcome["text"] != FALLBACK_GENERATION_MESSAGE
+            }
+            section = compiled_template.sections[section_name]
+            config_with_context = with_dependency_context(section.config, upstream_texts)
+            if config_with_context is not section.config:
+                section = compile_section(config_with_context)
+            format_type = section.format_type
             logger.info(
                 f"Generating section: {section_name} with format_type: {format_type} for proposal {proposal_id}"
             )
-            
+
             # Track section generation timing
             section_start_time = time.time()
+            publish_generation_event(proposal_id, "section_started", section=section_name)
 
             generated_text = ""
             agent_name = "unknown"
-            tokens_used = 0
-            
+            error_message = None
+            usage = None
+
             try:
-                if format_type == "text":
-                    agent_name = "content_generator"
-                    generated_text = handle_text_format(
-                        section_config,
-                        crew_instance,
-                        form_data,
-                        project_description,
-                        session_id,
-                        proposal_id,
-                        special_requirements=special_requirements_str,
-                    )
-                elif format_type == "fixed_text":
-                    agent_name = "fixed_text_generator"
-                    generated_text = handle_fixed_text_format(section_config)
-                elif format_type == "number":
-                    agent_name = "number_generator"
-                    generated_text = handle_number_format(
-                        section_config,
-                        crew_instance,
-                        form_data,
-                        project_description,
-                        special_requirements=special_requirements_str,
-                    )
-                elif format_type == "table":
-                    agent_name = "table_generator"
-                    generated_text = handle_table_format(
-                        section_config,
-                        crew_instance,
-                        form_data,
-                        project_description,
-                        special_requirements=special_requirements_str,
-                    )
+                with stream_section_tokens(proposal_id, section_name), track_llm_usage() as usage:
+                    if format_type == "text":
+                        agent_name = "content_generator"
+                        generated_text = handle_text_format(
+                            section,
+                            get_crew_instance(),
+                            form_data,
+                            project_description,
+                            session_id,
+                            proposal_id,
+                            special_requirements=special_requirements_str,
+                            cache_scope=cache_scope,
+                        )
+                    elif format_type == "fixed_text":
+                        agent_name = "fixed_text_generator"
+                        generated_text = handle_fixed_text_format(section)
+                    elif format_type == "number":
+                        agent_name = "number_generator"
+                        generated_text = handle_number_format(
+                            section,
+                            get_crew_instance(),
+                            form_data,
+                            project_description,
+                            special_requirements=special_requirements_str,
+                            cache_scope=cache_scope,
+                        )
+                    elif format_type == "table":
+                        agent_name = "table_generator"
+                        generated_text = handle_table_format(
+                            section,
+                            get_crew_instance(),
+                            form_data,
+                            project_description,
+                            special_requirements=special_requirements_str,
+                            cache_scope=cache_scope,
+                        )
 
                 if not generated_text:
                     logger.warning(
                         f"Generation failed for section '{section_name}' in proposal {proposal_id}. Using fallback message."
                     )
                     generated_text = FALLBACK_GENERATION_MESSAGE
+                    error_message = "No content was generated"
 
             except Exception as e:
                 logger.error(f"Error generating section {section_name}: {e}", exc_info=True)
                 generated_text = FALLBACK_GENERATION_MESSAGE
-                if run_id:
+                error_message = str(e)
+
+            # Calculate section generation time
+            section_latency_ms = int((time.time() - section_start_time) * 1000)
+
+            return {
+                "text": generated_text,
+                "agent_name": agent_name,
+                "latency_ms": section_latency_ms,
+                "usage": usage.as_dict() if usage else {},
+                "error": error_message,
+            }
+
+        def on_section_complete(section_name, outcome):
+            # Runs on this thread, one section at a time, as sections finish (possibly out of order).
+            if run_id:
+                if outcome["error"]:
                     try:
                         proposal_run_logger.log_failure(
                             run_id=run_id,
-                            agent_name=agent_name,
-                            error_message=str(e)
+                            agent_name=outcome["agent_name"],
+                            error_message=outcome["error"]
                         )
                     except Exception as telemetry_error:
                         logger.error(f"Failed to log failure telemetry: {telemetry_error}")
-            
-            # Calculate section generation time
-            section_end_time = time.time()
-            section_latency_ms = int((section_end_time - section_start_time) * 1000)
-            
-            # Log agent execution telemetry
-            if run_id:
+
+                # Log agent execution telemetry
                 try:
                     proposal_run_logger.log_agent_execution(
                         run_id=run_id,
-                        agent_name=agent_name,
-                        stage_latency_ms=section_latency_ms,
-                        tokens_used=tokens_used,
+                        agent_name=outcome["agent_name"],
+                        stage_latency_ms=outcome["latency_ms"],
                         step_count=1
                     )
                 except Exception as telemetry_error:
                     logger.error(f"Failed to log agent execution telemetry: {telemetry_error}")
-            
-            all_sections[section_name] = generated_text
 
-            # --- PARTIAL SAVE: Update DB after each section ---
+                # Tokens and cost of the section, also added to the run totals
+                try:
+                    proposal_run_logger.log_section_usage(
+                        run_id=run_id,
+                        section_name=section_name,
+                        agent_name=outcome["agent_name"],
+                        usage=outcome["usage"],
+                    )
+                except Exception as telemetry_error:
+                    logger.error(f"Failed to log section usage telemetry: {telemetry_error}")
+
+            all_sections[section_name] = outcome["text"]
+
+            # --- PARTIAL SAVE: Store this section as soon as it is ready ---
             try:
                 with get_engine().begin() as connection:
-                    connection.execute(
-                        text(
-                            "UPDATE proposals SET generated_sections = :sections, updated_at = CURRENT_TIMESTAMP WHERE id = :id"
-                        ),
-                        {"sections": json.dumps(all_sections), "id": proposal_id},
-                    )
+                    save_section(connection, proposal_id, section_name, outcome["text"])
             except Exception as db_save_error:
+                unsaved_sections.add(section_name)
                 logger.error(
                     f"Failed to save partial progress for section {section_name}: {db_save_error}"
                 )
             # ----------------------------------------------------
 
+            publish_generation_event(
+                proposal_id,
+                "section_completed",
+                section=section_name,
+                content=outcome["text"],
+                error=outcome["error"],
+            )
+
+        unsaved_sections = set()
+        outcomes = run_section_graph(
+            section_sequence,
+            section_graph,
+            generate_section,
+            on_complete=on_section_complete,
+            max_workers=max_workers,
+        )
+        # Restore the template output order now that every section has finished.
+        all_sections = {name: outcome["text"] for name, outcome in outcomes.items()}
+
+        failed_sections = [name for name, outcome in outcomes.items() if outcome["error"]]
+        if failed_sections and raise_errors and not final_attempt:
+            raise RuntimeError(f"Generation failed for sections: {', '.join(failed_sections)}")
+
+        # Every section is already stored; only retry those whose partial save failed.
         with get_engine().begin() as connection:
-            connection.execute(
-                text(
-                    "UPDATE proposals SET generated_sections = :sections, status = 'draft', updated_at = CURRENT_TIMESTAMP WHERE id = :id"
-                ),
-                {"sections": json.dumps(all_sections), "id": proposal_id},
+            save_sections(
+                connection,
+                proposal_id,
+                {name: all_sections[name] for name in unsaved_sections},
+                status="draft",
             )
+        # The user's next reads go to the primary until the replica has the sections.
+        replica_router.record_write(user_id)
         
         # Calculate total run duration
         end_time = datetime.utcnow()
@@ -724,6 +852,7 @@ def generate_all_sections_background(session_id: str, proposal_id: str, user_id:
             except Exception as telemetry_error:
                 logger.error(f"Failed to complete telemetry run: {telemetry_error}")
         
+        publish_generation_event(proposal_id, "generation_completed")
         logger.info(f"Successfully generated all sections for proposal {proposal_id}")
 
     except Exception as e:
@@ -748,19 +877,13 @@ def generate_all_sections_background(session_id: str, proposal_id: str, user_id:
             except Exception as telemetry_error:
                 logger.error(f"Failed to mark telemetry run as failed: {telemetry_error}")
         
-        try:
-            with get_engine().begin() as connection:
-                connection.execute(
-                    text(
-                        "UPDATE proposals SET status = 'failed', updated_at = CURRENT_TIMESTAMP WHERE id = :id"
-                    ),
-                    {"id": proposal_id},
-                )
-        except Exception as db_error:
-            logger.error(
-                f"Failed to update proposal status to 'failed' for {proposal_id}: {db_error}",
-                exc_info=True,
-            )
+        if final_attempt:
+            report_generation_failure(proposal_id, str(e))
+        else:
+            # The job queue retries the run; clients keep waiting for it.
+            publish_generation_event(proposal_id, "generation_queued", retry=True, error=str(e))
+        if raise_errors:
+            raise
     finally:
         pass
 
@@ -774,22 +897,78 @@ async def generate_proposal_sections(
     """
     Triggers the asynchronous generation of all proposal sections in the background.
     """
-    session_data_str = redis_client.get(session_id)
-    if not session_data_str:
+    session_data = session_store.load(session_id, with_template=False)
+    if not session_data:
         raise HTTPException(status_code=404, detail="Session not found.")
 
-    session_data = json.loads(session_data_str)
     proposal_id = session_data.get("proposal_id")
     user_id = current_user["user_id"]
 
     if not proposal_id:
         raise HTTPException(status_code=400, detail="Proposal ID not found in session.")
 
-    background_tasks.add_task(
-        generate_all_sections_background, session_id, proposal_id, user_id
+    publish_generation_event(proposal_id, "generation_queued")
+    job_id = dispatch_generation_job(
+        background_tasks,
+        JOB_PROPOSAL_GENERATION,
+        generate_all_sections_background,
+        {"session_id": session_id, "proposal_id": proposal_id, "user_id": user_id},
+        created_by=user_id,
     )
 
-    return {"message": "Proposal generation started."}
+    response = {"message": "Proposal generation started."}
+    if job_id:
+        response["job_id"] = job_id
+    return response
+
+
+@router.get("/proposals/{proposal_id}/generation-stream")
+async def stream_proposal_generation(
+    proposal_id: str, current_user: dict = Depends(get_current_user)
+):
+    """
+    Streams the generation of a proposal using SSE: section start/finish events and,
+    when LLM streaming is enabled, the tokens of each section as they are written.
+    """
+    with get_engine().connect() as connection:
+        proposal = connection.execute(
+            text("SELECT id FROM proposals WHERE id = :id AND user_id = :uid"),
+            {"id": proposal_id, "uid": current_user["user_id"]},
+        ).fetchone()
+
+    if not proposal:
+        raise HTTPException(status_code=404, detail="Proposal not found.")
+
+    def _is_terminal(data) -> bool:
+        try:
+            event = json.loads(data)
+        except (TypeError, ValueError):
+            return False
+        return event.get("type") in TERMINAL_EVENTS or event.get("status") in TERMINAL_EVENTS
+
+    async def event_generator():
+        # Subscribe before reading the snapshot, so that no event is missed in between.
+        async with event_hub.subscribe(generation_channel(proposal_id)) as subscription:
+            try:
+                # Send the current state first, so a client connecting mid-generation can catch up.
+                snapshot = redis_client.get(generation_snapshot_key(proposal_id))
+                if snapshot:
+                    yield f"data: {snapshot}\n\n"
+                    if _is_terminal(snapshot):
+                        return
+                while True:
+                    data = await subscription.get(timeout=GENERATION_STREAM_KEEPALIVE_SECONDS)
+                    if data is None:
+                        # SSE comment line, keeps proxies from closing an idle stream.
+                        yield ": keep-alive\n\n"
+                        continue
+                    yield f"data: {data}\n\n"
+                    if _is_terminal(data):
+                        break
+            except asyncio.CancelledError:
+                logger.info(f"Client disconnected from proposal {proposal_id} generation stream.")
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 
 @router.post("/process_section/{session_id}")
@@ -807,18 +986,20 @@ async def process_section(
     )
     logger.info(f"Type of proposal_id: {type(request.proposal_id)}")
 
-    session_data_str = redis_client.get(session_id)
-    if not session_data_str:
+    session_data = session_store.load(session_id)
+    if not session_data:
         raise HTTPException(status_code=400, detail="Session data not found.")
 
-    session_data = json.loads(session_data_str)
-
     # Update session with the latest data from the request to prevent stale data issues.
     session_data["form_data"] = request.form_data
     session_data["project_description"] = request.project_description
 
-    # Persist the updated session back to Redis.
-    redis_client.setex(session_id, 3600, json.dumps(session_data, default=str))
+    # Persist only the updated fields back to Redis.
+    session_store.update(
+        session_id,
+        form_data=request.form_data,
+        project_description=request.project_description,
+    )
 
     # Prevent editing of finalized proposals and check RBAC.
     with get_engine().connect() as connection:
@@ -838,8 +1019,7 @@ async def process_section(
     form_data = session_data["form_data"]
 
     # Resolve labels for form_data before sending to CrewAI
-    with get_engine().connect() as connection:
-        form_data = resolve_form_data_labels(form_data, connection)
+    form_data = resolve_form_data_labels(form_data)
 
     project_description = session_data["project_description"]
 
@@ -850,65 +1030,77 @@ async def process_section(
             status_code=400, detail="Proposal template not found in session."
         )
 
-    section_config = next(
-        (
-            s
-            for s in proposal_template["sections"]
-            if s["section_name"] == request.section
-        ),
-        None,
+    compiled_template = load_compiled_template(
+        session_data.get("template_name"), proposal_template, session_data.get("template_version")
     )
+    section_config = compiled_template.section(request.section)
     if not section_config:
         raise HTTPException(
             status_code=400, detail=f"Invalid section name: {request.section}"
         )
 
-    # Initialize and run the generation crew.
-    crew_instance = ProposalCrew().generate_proposal_crew()
-
-    # Extract special_requirements from the template
-    special_requirements_obj = proposal_template.get("special_requirements", {})
-    special_requirements_list = special_requirements_obj.get("instructions", [])
-    special_requirements_str = (
-        "\n".join([f"- {req}" for req in special_requirements_list])
-        if special_requirements_list
-        else "None"
-    )
+    special_requirements_str = compiled_template.special_requirements
 
-    format_type = section_config.get("format_type", "text")
+    format_type = section_config.format_type
     logger.info(
         f"Generating section: {request.section} with format_type: {format_type} for proposal {request.proposal_id}"
     )
 
-    generated_text = ""
-    if format_type == "text":
-        generated_text = handle_text_format(
-            section_config,
-            crew_instance,
-            form_data,
-            project_description,
-            session_id,
-            request.proposal_id,
-            special_requirements=special_requirements_str,
-        )
-    elif format_type == "fixed_text":
-        generated_text = handle_fixed_text_format(section_config)
-    elif format_type == "number":
-        generated_text = handle_number_format(
-            section_config,
-            crew_instance,
-            form_data,
-            project_description,
-            special_requirements=special_requirements_str,
-        )
-    elif format_type == "table":
-        generated_text = handle_table_format(
-            section_config,
-            crew_instance,
-            form_data,
-            project_description,
-            special_requirements=special_requirements_str,
+    cache_scope = make_cache_scope(session_data.get("template_name"))
+
+    def _run_section_crew() -> str:
+        # Initialize and run the generation crew.
+        crew_instance = ProposalCrew().generate_proposal_crew()
+
+        if format_type == "text":
+            return handle_text_format(
+                section_config,
+                crew_instance,
+                form_data,
+                project_description,
+                session_id,
+                request.proposal_id,
+                special_requirements=special_requirements_str,
+                cache_scope=cache_scope,
+            )
+        elif format_type == "fixed_text":
+            return handle_fixed_text_format(section_config)
+        elif format_type == "number":
+            return handle_number_format(
+                section_config,
+                crew_instance,
+                form_data,
+                project_description,
+                special_requirements=special_requirements_str,
+                cache_scope=cache_scope,
+            )
+        elif format_type == "table":
+            return handle_table_format(
+                section_config,
+                crew_instance,
+                form_data,
+                project_description,
+                special_requirements=special_requirements_str,
+                cache_scope=cache_scope,
+            )
+        return ""
+
+    def _generate_section() -> str:
+        # Stream the section's tokens to /generation-stream subscribers while it is written.
+        with stream_section_tokens(request.proposal_id, request.section):
+            return _run_section_crew()
+
+    publish_generation_event(request.proposal_id, "section_started", section=request.section)
+
+    # The crew kickoff is blocking, so it runs on the LLM executor to keep the event loop free.
+    try:
+        generated_text = await run_in_llm_executor(_generate_section)
+    except Exception as e:
+        # Close the section for stream clients before the error reaches the caller.
+        publish_generation_event(
+            request.proposal_id, "section_completed", section=request.section, content="", error=str(e)
         )
+        raise
 
     if not generated_text:
         logger.warning(
@@ -916,41 +1108,16 @@ async def process_section(
         )
         generated_text = FALLBACK_GENERATION_MESSAGE
 
+    publish_generation_event(
+        request.proposal_id, "section_completed", section=request.section, content=generated_text
+    )
+
     message = f"Content generated for {request.section}"
 
     # Persist the generated text to the database.
     try:
         with get_engine().begin() as conn:
-            db_res = conn.execute(
-                text("SELECT generated_sections FROM proposals WHERE id = :id"),
-                {"id": request.proposal_id},
-            ).scalar()
-
-            # The database driver is already converting JSON to a dict,
-            # so we can use db_res directly if it exists.
-            sections = db_res if db_res else {}
-            if not isinstance(sections, dict):
-                logger.warning(
-                    f"[DB TYPE MISMATCH] Expected dict for generated_sections but got {type(sections)} "
-                    f"for Proposal {request.proposal_id}. Converting..."
-                )
-                try:
-                    sections = json.loads(sections)
-                except Exception:
-                    logger.error(
-                        f"[DB CONVERSION ERROR] Failed to load generated_sections JSON for Proposal {request.proposal_id}"
-                    )
-                    sections = {}
-
-            # sections = json.loads(db_res) if db_res else {}
-
-            sections[request.section] = generated_text
-            conn.execute(
-                text(
-                    "UPDATE proposals SET generated_sections = :sections, updated_at = CURRENT_TIMESTAMP WHERE id = :id"
-                ),
-                {"sections": json.dumps(sections), "id": request.proposal_id},
-            )
+            save_section(conn, request.proposal_id, request.section, generated_text)
     except Exception as e:
         logger.exception(
             f"[DB UPDATE ERROR - process_section] Proposal {request.proposal_id}, "
@@ -1061,12 +1228,14 @@ async def regenerate_section(
             "proposal_id": proposal_id,
             "form_data": resolve_form_data_labels(request.form_data, connection),
             "project_description": request.project_description,
+            "template_name": template_name,
             "proposal_template": proposal_template,
         }
-    redis_client.setex(session_id, 3600, json.dumps(session_data, default=str))
+    session_store.create(session_id, session_data)
 
     try:
-        generated_text = regenerate_section_logic(
+        generated_text = await run_in_llm_executor(
+            regenerate_section_logic,
             session_id, request.section, request.concise_input, proposal_id, previous_content
         )
         
@@ -1160,34 +1329,38 @@ async def regenerate_full_proposal(
     
     # Store the follow-up instruction and previous content in Redis for the background task
     try:
-        session_data_str = redis_client.get(session_id)
-        if session_data_str:
-            session_data = json.loads(session_data_str)
-        else:
-            session_data = {}
-        
         # Update session with follow-up instruction and previous content
-        session_data["follow_up_instruction"] = request.follow_up_instruction
-        session_data["previous_sections"] = request.current_sections
-        session_data["is_regeneration"] = True
-        
-        redis_client.setex(session_id, 3600, json.dumps(session_data, default=str))
+        session_store.update(
+            session_id,
+            follow_up_instruction=request.follow_up_instruction,
+            previous_sections=request.current_sections,
+            is_regeneration=True,
+        )
         
-        # Add background task to regenerate all sections
-        background_tasks.add_task(
+        # Schedule the regeneration of all sections
+        publish_generation_event(request.proposal_id, "generation_queued")
+        job_id = dispatch_generation_job(
+            background_tasks,
+            JOB_PROPOSAL_REGENERATION,
             regenerate_all_sections_with_context,
-            session_id,
-            request.proposal_id,
-            user_id,
-            request.follow_up_instruction,
-            run_id
+            {
+                "session_id": session_id,
+                "proposal_id": request.proposal_id,
+                "user_id": user_id,
+                "follow_up_instruction": request.follow_up_instruction,
+                "run_id": run_id,
+            },
+            created_by=user_id,
         )
         
-        return {
+        response = {
             "message": "Full proposal regeneration started with follow-up instructions.",
             "session_id": session_id,
             "run_id": run_id
         }
+        if job_id:
+            response["job_id"] = job_id
+        return response
     except Exception as e:
         logger.error(f"[REGENERATE FULL PROPOSAL ERROR] {e}", exc_info=True)
         # Mark run as failed if it exists
@@ -1205,21 +1378,31 @@ async def regenerate_full_proposal(
         raise HTTPException(status_code=500, detail="Failed to start full proposal regeneration.")
 
 
-def regenerate_all_sections_with_context(session_id: str, proposal_id: str, user_id: str, follow_up_instruction: str, run_id: str = None):
+def regenerate_all_sections_with_context(
+    session_id: str,
+    proposal_id: str,
+    user_id: str,
+    follow_up_instruction: str,
+    run_id: str = None,
+    raise_errors: bool = False,
+    final_attempt: bool = True,
+):
     """
     Background task to regenerate all sections with follow-up instructions and previous content context.
+
+    `raise_errors` and `final_attempt` work as in `generate_all_sections_background`.
     """
-    from backend.utils.crew_actions import ProposalCrew
     logger.info(f"Starting full proposal regeneration with context for proposal {proposal_id}")
     
     start_time = datetime.utcnow()
     
     try:
-        session_data_str = redis_client.get(session_id)
-        if not session_data_str:
+        publish_generation_event(proposal_id, "generation_started")
+
+        session_data = session_store.load(session_id)
+        if not session_data:
             raise Exception("Session data not found in Redis.")
         
-        session_data = json.loads(session_data_str)
         proposal_template = session_data.get("proposal_template")
         if not proposal_template or "sections" not in proposal_template:
             raise Exception("Proposal template or sections not found in session.")
@@ -1229,8 +1412,7 @@ def regenerate_all_sections_with_context(session_id: str, proposal_id: str, user
         previous_sections = session_data.get("previous_sections", {})
         
         # Resolve labels for form_data before sending to CrewAI
-        with get_engine().connect() as connection:
-            form_data = resolve_form_data_labels(form_data, connection)
+        form_data = resolve_form_data_labels(form_data)
         
         # Update proposal status to regenerating
         with get_engine().begin() as connection:
@@ -1257,99 +1439,114 @@ def regenerate_all_sections_with_context(session_id: str, proposal_id: str, user
                     pass
         
         crew_instance = ProposalCrew(knowledge_file_paths=knowledge_file_paths).generate_proposal_crew()
+        cache_scope = make_cache_scope(session_data.get("template_name"), knowledge_file_paths)
         
-        # Extract special_requirements from the template
-        special_requirements_obj = proposal_template.get("special_requirements", {})
-        special_requirements_list = special_requirements_obj.get("instructions", [])
-        special_requirements_str = (
-            "\n".join([f"- {req}" for req in special_requirements_list])
-            if special_requirements_list
-            else "None"
+        # Sections by name, generation order and prompt fragments, compiled once per template version
+        compiled_template = load_compiled_template(
+            session_data.get("template_name"), proposal_template, session_data.get("template_version")
         )
-        
-        # Use section_sequence for generation order if available
-        section_sequence = proposal_template.get("section_sequence", [])
-        if not section_sequence:
-            section_sequence = [s["section_name"] for s in proposal_template["sections"]]
-        
-        sections_by_name = {s["section_name"]: s for s in proposal_template["sections"]}
+        special_requirements_str = compiled_template.special_requirements
         all_sections = {}
+        unsaved_sections = set()
+        failed_sections = []
         
         # Regenerate each section with context from previous content
-        for section_name in section_sequence:
-            section_config = sections_by_name.get(section_name)
-            if not section_config:
-                continue
-            
-            format_type = section_config.get("format_type", "text")
+        for section_name in compiled_template.generation_order:
+            section_config = compiled_template.sections[section_name]
+            format_type = section_config.format_type
             logger.info(f"Regenerating section: {section_name} with follow-up context")
             
+            publish_generation_event(proposal_id, "section_started", section=section_name)
+
             generated_text = ""
+            usage = None
             try:
-                # Pass follow-up instruction and previous content to the generation
-                if format_type == "text":
-                    generated_text = handle_text_format_with_context(
-                        section_config,
-                        crew_instance,
-                        form_data,
-                        project_description,
-                        session_id,
-                        proposal_id,
-                        special_requirements=special_requirements_str,
-                        follow_up_instruction=follow_up_instruction,
-                        previous_content=previous_sections.get(section_name)
-                    )
-                elif format_type == "fixed_text":
-                    # Fixed text doesn't need regeneration
-                    previous = previous_sections.get(section_name, "")
-                    generated_text = previous
-                elif format_type == "number":
-                    generated_text = handle_number_format(
-                        section_config,
-                        crew_instance,
-                        form_data,
-                        project_description,
-                        special_requirements=special_requirements_str,
-                    )
-                elif format_type == "table":
-                    generated_text = handle_table_format(
-                        section_config,
-                        crew_instance,
-                        form_data,
-                        project_description,
-                        special_requirements=special_requirements_str,
-                    )
+                with stream_section_tokens(proposal_id, section_name), track_llm_usage() as usage:
+                    # Pass follow-up instruction and previous content to the generation
+                    if format_type == "text":
+                        generated_text = handle_text_format_with_context(
+                            section_config,
+                            crew_instance,
+                            form_data,
+                            project_description,
+                            session_id,
+                            proposal_id,
+                            special_requirements=special_requirements_str,
+                            follow_up_instruction=follow_up_instruction,
+                            previous_content=previous_sections.get(section_name),
+                            cache_scope=cache_scope,
+                        )
+                    elif format_type == "fixed_text":
+                        # Fixed text doesn't need regeneration
+                        previous = previous_sections.get(section_name, "")
+                        generated_text = previous
+                    elif format_type == "number":
+                        generated_text = handle_number_format(
+                            section_config,
+                            crew_instance,
+                            form_data,
+                            project_description,
+                            special_requirements=special_requirements_str,
+                            cache_scope=cache_scope,
+                        )
+                    elif format_type == "table":
+                        generated_text = handle_table_format(
+                            section_config,
+                            crew_instance,
+                            form_data,
+                            project_description,
+                            special_requirements=special_requirements_str,
+                            cache_scope=cache_scope,
+                        )
                 
                 if not generated_text:
                     logger.warning(f"Regeneration failed for section '{section_name}'. Using previous content.")
                     generated_text = previous_sections.get(section_name, "")
+                    failed_sections.append(section_name)
                     
             except Exception as e:
                 logger.error(f"Error regenerating section {section_name}: {e}", exc_info=True)
                 generated_text = previous_sections.get(section_name, "")
+                failed_sections.append(section_name)
             
             all_sections[section_name] = generated_text
             
             # Save partial progress
             try:
                 with get_engine().begin() as connection:
-                    connection.execute(
-                        text(
-                            "UPDATE proposals SET generated_sections = :sections, updated_at = CURRENT_TIMESTAMP WHERE id = :id"
-                        ),
-                        {"sections": json.dumps(all_sections), "id": proposal_id},
-                    )
+                    save_section(connection, proposal_id, section_name, generated_text)
             except Exception as db_save_error:
+                unsaved_sections.add(section_name)
                 logger.error(f"Failed to save partial progress for section {section_name}: {db_save_error}")
+
+            if run_id and usage is not None:
+                try:
+                    proposal_run_logger.log_section_usage(
+                        run_id=run_id,
+                        section_name=section_name,
+                        agent_name="content_generator" if format_type == "text" else f"{format_type}_generator",
+                        usage=usage.as_dict(),
+                    )
+                except Exception as telemetry_error:
+                    logger.error(f"Failed to log section usage telemetry: {telemetry_error}")
+
+            publish_generation_event(
+                proposal_id, "section_completed", section=section_name, content=generated_text
+            )
         
-        # Update final status
+        if failed_sections and raise_errors and not final_attempt:
+            raise RuntimeError(f"Regeneration failed for sections: {', '.join(failed_sections)}")
+
+        # Update final status, retrying the sections whose partial save failed
         with get_engine().begin() as connection:
-            connection.execute(
-                text(
-                    "UPDATE proposals SET generated_sections = :sections, status = 'draft', updated_at = CURRENT_TIMESTAMP WHERE id = :id"
-                ),
-                {"sections": json.dumps(all_sections), "id": proposal_id},
+            save_sections(
+                connection,
+                proposal_id,
+                {name: all_sections[name] for name in unsaved_sections},
+                status="draft",
             )
+        # The user's next reads go to the primary until the replica has the sections.
+        replica_router.record_write(user_id)
         
         # Complete the telemetry run
         end_time = datetime.utcnow()
@@ -1375,6 +1572,7 @@ def regenerate_all_sections_with_context(session_id: str, proposal_id: str, user
             except Exception as telemetry_error:
                 logger.error(f"Failed to complete full regeneration telemetry run: {telemetry_error}")
         
+        publish_generation_event(proposal_id, "generation_completed")
         logger.info(f"Successfully regenerated all sections for proposal {proposal_id}")
         
     except Exception as e:
@@ -1393,6 +1591,13 @@ def regenerate_all_sections_with_context(session_id: str, proposal_id: str, user
             except Exception as telemetry_error:
                 logger.error(f"Failed to mark full regeneration telemetry run as failed: {telemetry_error}")
 
+        if final_attempt:
+            report_generation_failure(proposal_id, str(e))
+        else:
+            publish_generation_event(proposal_id, "generation_queued", retry=True, error=str(e))
+        if raise_errors:
+            raise
+
 
 @router.post("/update-section-content")
 async def update_section_content(
@@ -1420,26 +1625,8 @@ async def update_section_content(
                     status_code=403, detail="Cannot modify a finalized proposal."
                 )
 
-            # Use jsonb_set to update the specific key in the generated_sections JSON object.
-            # The path '{request.section}' targets the key to be updated.
-            # The third parameter is the new value, wrapped in to_jsonb to ensure it's a valid JSON value.
-            conn.execute(
-                text("""
-                    UPDATE proposals
-                    SET generated_sections = jsonb_set(
-                        generated_sections::jsonb,
-                        ARRAY[:section],
-                        to_jsonb(CAST(:content AS TEXT))
-                    ),
-                    updated_at = CURRENT_TIMESTAMP
-                    WHERE id = :id
-                """),
-                {
-                    "section": request.section,
-                    "content": request.content,
-                    "id": request.proposal_id,
-                },
-            )
+            # Merge the new content into generated_sections without rewriting other sections.
+            save_section(conn, request.proposal_id, request.section, request.content)
         return {"message": f"Section '{request.section}' updated successfully."}
     except SQLAlchemyError as db_error:
         logger.error(f"[UPDATE SECTION DB ERROR] {db_error}", exc_info=True)
@@ -1534,29 +1721,109 @@ async def save_draft(
         )
 
 
+# Columns and relational names shared by the proposal list endpoints.
+PROPOSAL_LIST_RELATIONS = """
+                string_agg(DISTINCT d.name, ', ') AS donor_name,
+                string_agg(DISTINCT fc.name, ', ') AS country_name,
+                string_agg(DISTINCT o.name, ', ') AS outcome_names"""
+
+PROPOSAL_LIST_JOINS = """
+            LEFT JOIN
+                proposal_donors pd ON p.id = pd.proposal_id
+            LEFT JOIN
+                donors d ON pd.donor_id = d.id
+            LEFT JOIN
+                proposal_field_contexts pfc ON p.id = pfc.proposal_id
+            LEFT JOIN
+                field_contexts fc ON pfc.field_context_id = fc.id
+            LEFT JOIN
+                proposal_outcomes po ON p.id = po.proposal_id
+            LEFT JOIN
+                outcomes o ON po.outcome_id = o.id"""
+
+
+def _proposal_list_columns(page: ListPage) -> str:
+    """
+    Proposal columns of the list endpoints. The summary projection leaves out the
+    description and reads only the form fields shown in lists instead of the whole form.
+    """
+    if page.summary:
+        columns = """
+                p.form_data->>'Project Draft Short name' AS short_name,
+                p.form_data->>'Project title' AS title,
+                p.form_data->>'Budget Range' AS budget,"""
+    else:
+        columns = """
+                p.form_data,
+                p.project_description,"""
+    return columns + """
+                p.status,
+                p.created_at,
+                p.updated_at,
+                p.is_accepted,""" + PROPOSAL_LIST_RELATIONS
+
+
+def _proposal_list_item(row, page: ListPage) -> dict:
+    """Returns the fields common to the items of the proposal list endpoints."""
+    if page.summary:
+        form_data = {
+            key: value
+            for key, value in (
+                ("Project Draft Short name", row["short_name"]),
+                ("Project title", row["title"]),
+                ("Budget Range", row["budget"]),
+            )
+            if value is not None
+        }
+    else:
+        form_data = (
+            json.loads(row["form_data"])
+            if isinstance(row["form_data"], str)
+            else row["form_data"]
+        )
+
+    item = {
+        "proposal_id": row["id"],
+        "project_title": form_data.get("Project Draft Short name")
+        or form_data.get("Project title", "Untitled Proposal"),
+    }
+    if not page.summary:
+        item["summary"] = row["project_description"] or ""
+    item.update(
+        {
+            "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+            "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
+            "is_accepted": row["is_accepted"],
+            "status": row["status"],
+            "donor": row["donor_name"],
+            "country": row["country_name"],
+            "outcomes": row["outcome_names"].split(", ") if row["outcome_names"] else [],
+            "budget": form_data.get("Budget Range", "N/A"),
+        }
+    )
+    return item
+
+
 @router.get("/proposals/reviews")
-async def get_proposals_for_review(current_user: dict = Depends(get_current_user)):
+async def get_proposals_for_review(
+    current_user: dict = Depends(get_current_user), page: ListPage = Depends(list_page)
+):
     """
-    Lists all proposals assigned to the current user for review, both pending and completed.
+    Lists the proposals assigned to the current user for review, both pending and
+    completed, most recently reviewed first. Paginated as described in
+    `backend.utils.pagination`.
     """
     user_id = current_user["user_id"]
     if "project reviewer" not in current_user.get("roles", []):
         return {"message": "User is not a project reviewer.", "reviews": []}
 
     try:
-        with get_engine().connect() as connection:
-            query = text("""
+        with get_engine(readonly=True, consistency_key=user_id).connect() as connection:
+            # Reviews are paged on the date of their latest review activity.
+            keyset = page.keyset("MAX(pp.updated_at)", "p.id")
+            query = text(f"""
                 SELECT
-                    p.id,
-                    p.form_data,
-                    p.project_description,
-                    p.status,
-                    p.created_at,
-                    p.updated_at,
-                    p.is_accepted,
-                    string_agg(DISTINCT d.name, ', ') AS donor_name,
-                    string_agg(DISTINCT fc.name, ', ') AS country_name,
-                    string_agg(DISTINCT o.name, ', ') AS outcome_names,
+                    p.id,{_proposal_list_columns(page)},
                     u.name AS requester_name,
                     -- Determine the review status by checking for any 'completed' status for this reviewer and proposal
                     MAX(CASE WHEN pp.status = 'completed' THEN 1 ELSE 0 END) as is_completed,
@@ -1565,84 +1832,62 @@ async def get_proposals_for_review(current_user: dict = Depends(get_current_user
                     -- Get the deadline from the 'pending' review row
                     MAX(CASE WHEN pp.status = 'pending' THEN pp.deadline ELSE NULL END) as deadline,
                     -- Get the completion date from the latest 'completed' review row
-                    MAX(CASE WHEN pp.status = 'completed' THEN pp.updated_at ELSE NULL END) as review_completed_at
+                    MAX(CASE WHEN pp.status = 'completed' THEN pp.updated_at ELSE NULL END) as review_completed_at,
+                    MAX(pp.updated_at) AS review_updated_at
                 FROM
                     proposals p
                 JOIN
                     proposal_peer_reviews pp ON p.id = pp.proposal_id
                 LEFT JOIN
-                    users u ON p.user_id = u.id
-                LEFT JOIN
-                    proposal_donors pd ON p.id = pd.proposal_id
-                LEFT JOIN
-                    donors d ON pd.donor_id = d.id
-                LEFT JOIN
-                    proposal_field_contexts pfc ON p.id = pfc.proposal_id
-                LEFT JOIN
-                    field_contexts fc ON pfc.field_context_id = fc.id
-                LEFT JOIN
-                    proposal_outcomes po ON p.id = po.proposal_id
-                LEFT JOIN
-                    outcomes o ON po.outcome_id = o.id
+                    users u ON p.user_id = u.id{PROPOSAL_LIST_JOINS}
                 WHERE
                     pp.reviewer_id = :uid
                 GROUP BY
                     p.id, u.name
-                ORDER BY
-                    MAX(pp.updated_at) DESC
-            """)
+                {"HAVING " + keyset if keyset else ""}
+            """ + page.order_by("MAX(pp.updated_at)", "p.id") + page.limit_clause())
+
+            result = connection.execute(query, {"uid": user_id, **page.params()})
+            rows, next_cursor = page.split(result.mappings().fetchall(), "review_updated_at")
+            total = None
+            if page.include_total:
+                total = connection.execute(
+                    text("""
+                        SELECT COUNT(DISTINCT p.id)
+                        FROM proposals p
+                        JOIN proposal_peer_reviews pp ON p.id = pp.proposal_id
+                        WHERE pp.reviewer_id = :uid
+                    """),
+                    {"uid": user_id},
+                ).scalar()
 
-            result = connection.execute(query, {"uid": user_id})
-            rows = result.mappings().fetchall()
             review_list = []
-
             for row in rows:
-                form_data = (
-                    json.loads(row["form_data"])
-                    if isinstance(row["form_data"], str)
-                    else row["form_data"]
-                )
-
                 review_status = "pending"
                 if row["is_completed"]:
                     review_status = "completed"
                 elif row["is_draft"]:
                     review_status = "draft"
 
-                review_list.append(
+                item = _proposal_list_item(row, page)
+                item.update(
                     {
-                        "proposal_id": row["id"],
-                        "project_title": form_data.get("Project Draft Short name")
-                        or form_data.get("Project title", "Untitled Proposal"),
-                        "summary": row["project_description"] or "",
-                        "created_at": row["created_at"].isoformat()
-                        if row["created_at"]
-                        else None,
-                        "updated_at": row["updated_at"].isoformat()
-                        if row["updated_at"]
-                        else None,
-                        "is_accepted": row["is_accepted"],
-                        "status": row["status"],
                         "requester_name": row["requester_name"],
                         "deadline": row["deadline"].isoformat()
                         if row["deadline"]
                         else None,
                         "is_sample": False,
-                        "donor": row["donor_name"],
-                        "country": row["country_name"],
-                        "outcomes": row["outcome_names"].split(", ")
-                        if row["outcome_names"]
-                        else [],
-                        "budget": form_data.get("Budget Range", "N/A"),
                         "review_status": review_status,
                         "review_completed_at": row["review_completed_at"].isoformat()
                         if row["review_completed_at"]
                         else None,
                     }
                 )
+                review_list.append(item)
         return {
             "message": "Proposals for review fetched successfully.",
             "reviews": review_list,
+            **page.metadata(next_cursor, total),
         }
     except Exception as e:
         logger.error(f"[GET PROPOSALS FOR REVIEW ERROR] {e}", exc_info=True)
@@ -1653,12 +1898,16 @@ async def get_proposals_for_review(current_user: dict = Depends(get_current_user
 
 @router.get("/list-drafts")
 async def list_drafts(
-    status: Optional[str] = None, current_user: dict = Depends(get_current_user)
+    status: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    page: ListPage = Depends(list_page),
+    connection: AsyncConnection = Depends(get_async_read_connection),
 ):
     """
-    Lists all drafts for the current user, including sample templates.
+    Lists the drafts of the current user, most recently updated first.
     If status is 'deleted', lists only deleted proposals.
     Otherwise, lists non-deleted proposals.
+    Paginated as described in `backend.utils.pagination`.
     """
     if "proposal writer" not in current_user.get("roles", []):
         return {"message": "User is not a proposal writer.", "drafts": []}
@@ -1668,96 +1917,52 @@ async def list_drafts(
     draft_list = []
 
     # Fetch user's drafts from the database.
-    try:  # Fixed: This was indented incorrectly (had extra spaces)
-        logger.info("Attempting database connection...")
-        engine = get_engine()
-        logger.info(f"Engine type: {type(engine)}")
-
-        with engine.connect() as connection:
-            logger.info("Database connection established")
-
-            # Base query
-            query_str = """
-                SELECT
-                    p.id,
-                    p.form_data,
-                    p.project_description,
-                    p.status,
-                    p.created_at,
-                    p.updated_at,
-                    p.is_accepted,
-                    string_agg(DISTINCT d.name, ', ') AS donor_name,
-                    string_agg(DISTINCT fc.name, ', ') AS country_name,
-                    string_agg(DISTINCT o.name, ', ') AS outcome_names
-                FROM
-                    proposals p
-                LEFT JOIN
-                    proposal_donors pd ON p.id = pd.proposal_id
-                LEFT JOIN
-                    donors d ON pd.donor_id = d.id
-                LEFT JOIN
-                    proposal_field_contexts pfc ON p.id = pfc.proposal_id
-                LEFT JOIN
-                    field_contexts fc ON pfc.field_context_id = fc.id
-                LEFT JOIN
-                    proposal_outcomes po ON p.id = po.proposal_id
-                LEFT JOIN
-                    outcomes o ON po.outcome_id = o.id
-                WHERE
-                    p.user_id = :uid
-            """
-
-            if status == "deleted":
-                query_str += " AND p.status = 'deleted'"
-            else:
-                query_str += " AND p.status != 'deleted'"
-
-            query_str += """
-                GROUP BY
-                    p.id
-                ORDER BY
-                    p.updated_at DESC
-            """
+    try:
+        filters = ["p.user_id = :uid"]
+        if status == "deleted":
+            filters.append("p.status = 'deleted'")
+        else:
+            filters.append("p.status != 'deleted'")
 
-            query = text(query_str)
-            result = connection.execute(query, {"uid": user_id})
-            rows = result.mappings().fetchall()  # Use .mappings() to get dict-like rows
-            logger.info(f"Found {len(rows)} drafts in database")
+        conditions = list(filters)
+        keyset = page.keyset("p.updated_at", "p.id")
+        if keyset:
+            conditions.append(keyset)
 
-            for row in rows:
-                form_data = (
-                    json.loads(row["form_data"])
-                    if isinstance(row["form_data"], str)
-                    else row["form_data"]
+        query = text(f"""
+            SELECT
+                p.id,{_proposal_list_columns(page)}
+            FROM
+                proposals p{PROPOSAL_LIST_JOINS}
+            WHERE
+                {" AND ".join(conditions)}
+            GROUP BY
+                p.id
+        """ + page.order_by("p.updated_at", "p.id") + page.limit_clause())
+        result = await connection.execute(query, {"uid": user_id, **page.params()})
+        rows, next_cursor = page.split(result.mappings().fetchall(), "updated_at")
+        logger.info(f"Found {len(rows)} drafts in database")
+
+        total = None
+        if page.include_total:
+            total = (
+                await connection.execute(
+                    text(f"SELECT COUNT(*) FROM proposals p WHERE {' AND '.join(filters)}"),
+                    {"uid": user_id},
                 )
+            ).scalar()
 
-                draft_list.append(
-                    {
-                        "proposal_id": row["id"],
-                        "project_title": form_data.get("Project Draft Short name")
-                        or form_data.get("Project title", "Untitled Proposal"),
-                        "summary": row["project_description"] or "",
-                        "created_at": row["created_at"].isoformat()
-                        if row["created_at"]
-                        else None,
-                        "updated_at": row["updated_at"].isoformat()
-                        if row["updated_at"]
-                        else None,
-                        "is_accepted": row["is_accepted"],
-                        "status": row["status"],
-                        "is_sample": False,
-                        # New relational fields
-                        "donor": row["donor_name"],
-                        "country": row["country_name"],
-                        "outcomes": row["outcome_names"].split(", ")
-                        if row["outcome_names"]
-                        else [],
-                        "budget": form_data.get("Budget Range", "N/A"),
-                    }
-                )
+        for row in rows:
+            item = _proposal_list_item(row, page)
+            item["is_sample"] = False
+            draft_list.append(item)
 
         logger.info(f"Total drafts (samples + user): {len(draft_list)}")
-        return {"message": "Drafts fetched successfully.", "drafts": draft_list}
+        return {
+            "message": "Drafts fetched successfully.",
+            "drafts": draft_list,
+            **page.metadata(next_cursor, total),
+        }
 
     except SQLAlchemyError as db_error:
         logger.error(f"[DATABASE ERROR - list_drafts] {db_error}", exc_info=True)
@@ -1769,29 +1974,29 @@ async def list_drafts(
 
 
 @router.get("/list-all-proposals")
-async def list_all_proposals(current_user: dict = Depends(get_current_user)):
+async def list_all_proposals(
+    current_user: dict = Depends(get_current_user), page: ListPage = Depends(list_page)
+):
     """
-    Lists all proposals in the system for the 'Other Proposals' view,
-    excluding those owned by the current user.
+    Lists the proposals in the system for the 'Other Proposals' view, excluding those
+    owned by the current user, most recently updated first.
+    Paginated as described in `backend.utils.pagination`.
     """
     user_id = current_user["user_id"]
     proposal_list = []
 
     try:
-        engine = get_engine()
+        engine = get_engine(readonly=True, consistency_key=user_id)
         with engine.connect() as connection:
-            query = text("""
+            filters = ["p.user_id != :uid", "p.status != 'deleted'"]
+            conditions = list(filters)
+            keyset = page.keyset("p.updated_at", "p.id")
+            if keyset:
+                conditions.append(keyset)
+
+            query = text(f"""
                 SELECT
-                    p.id,
-                    p.form_data,
-                    p.project_description,
-                    p.status,
-                    p.created_at,
-                    p.updated_at,
-                    p.is_accepted,
-                    string_agg(DISTINCT d.name, ', ') AS donor_name,
-                    string_agg(DISTINCT fc.name, ', ') AS country_name,
-                    string_agg(DISTINCT o.name, ', ') AS outcome_names,
+                    p.id,{_proposal_list_columns(page)},
                     t.name AS team_name,
                     t.id AS team_id,
                     u.name AS author_name
@@ -1800,66 +2005,43 @@ async def list_all_proposals(current_user: dict = Depends(get_current_user)):
                 JOIN
                     users u ON p.user_id = u.id
                 JOIN
-                    teams t ON u.team_id = t.id
-                LEFT JOIN
-                    proposal_donors pd ON p.id = pd.proposal_id
-                LEFT JOIN
-                    donors d ON pd.donor_id = d.id
-                LEFT JOIN
-                    proposal_field_contexts pfc ON p.id = pfc.proposal_id
-                LEFT JOIN
-                    field_contexts fc ON pfc.field_context_id = fc.id
-                LEFT JOIN
-                    proposal_outcomes po ON p.id = po.proposal_id
-                LEFT JOIN
-                    outcomes o ON po.outcome_id = o.id
+                    teams t ON u.team_id = t.id{PROPOSAL_LIST_JOINS}
                 WHERE
-                    p.user_id != :uid AND p.status != 'deleted'
+                    {" AND ".join(conditions)}
                 GROUP BY
                     p.id, t.name, t.id, u.name
-                ORDER BY
-                    p.updated_at DESC
-            """)
-
-            result = connection.execute(query, {"uid": user_id})
-            rows = result.mappings().fetchall()
+            """ + page.order_by("p.updated_at", "p.id") + page.limit_clause())
+
+            result = connection.execute(query, {"uid": user_id, **page.params()})
+            rows, next_cursor = page.split(result.mappings().fetchall(), "updated_at")
+            total = None
+            if page.include_total:
+                total = connection.execute(
+                    text(f"""
+                        SELECT COUNT(*)
+                        FROM proposals p
+                        JOIN users u ON p.user_id = u.id
+                        JOIN teams t ON u.team_id = t.id
+                        WHERE {" AND ".join(filters)}
+                    """),
+                    {"uid": user_id},
+                ).scalar()
 
             for row in rows:
-                form_data = (
-                    json.loads(row["form_data"])
-                    if isinstance(row["form_data"], str)
-                    else row["form_data"]
-                )
-
-                proposal_list.append(
+                item = _proposal_list_item(row, page)
+                item.update(
                     {
-                        "proposal_id": row["id"],
-                        "project_title": form_data.get("Project Draft Short name")
-                        or form_data.get("Project title", "Untitled Proposal"),
-                        "summary": row["project_description"] or "",
-                        "created_at": row["created_at"].isoformat()
-                        if row["created_at"]
-                        else None,
-                        "updated_at": row["updated_at"].isoformat()
-                        if row["updated_at"]
-                        else None,
-                        "is_accepted": row["is_accepted"],
-                        "status": row["status"],
-                        "donor": row["donor_name"],
-                        "country": row["country_name"],
-                        "outcomes": row["outcome_names"].split(", ")
-                        if row["outcome_names"]
-                        else [],
-                        "budget": form_data.get("Budget Range", "N/A"),
                         "team_name": row["team_name"],
                         "team_id": str(row["team_id"]),
                         "author_name": row["author_name"],
                     }
                 )
+                proposal_list.append(item)
 
         return {
             "message": "All proposals fetched successfully.",
             "proposals": proposal_list,
+            **page.metadata(next_cursor, total),
         }
 
     except Exception as e:
@@ -1887,7 +2069,11 @@ async def get_sections():
 
 
 @router.get("/load-draft/{proposal_id}")
-async def load_draft(proposal_id: str, current_user: dict = Depends(get_current_user)):
+async def load_draft(
+    proposal_id: str,
+    current_user: dict = Depends(get_current_user),
+    conn: AsyncConnection = Depends(get_async_read_connection),
+):
     """
     Loads a specific draft, whether it's a user-created one or a sample.
     It creates a new Redis session for the loaded draft.
@@ -1906,95 +2092,96 @@ async def load_draft(proposal_id: str, current_user: dict = Depends(get_current_
                     detail=f"Invalid proposal ID format: '{proposal_id}'.",
                 )
 
-            with get_engine().connect() as conn:
-                is_admin = any(
-                    role
-                    in [
-                        "admin",
-                        "knowledge manager donors",
-                        "knowledge manager outcome",
-                        "knowledge manager field context",
-                    ]
-                    for role in current_user.get("roles", [])
-                )
+            is_admin = any(
+                role
+                in [
+                    "admin",
+                    "knowledge manager donors",
+                    "knowledge manager outcome",
+                    "knowledge manager field context",
+                ]
+                for role in current_user.get("roles", [])
+            )
 
-                draft_query = text("""
-                    SELECT DISTINCT
-                        p.template_name, p.form_data, p.generated_sections, p.project_description,
-                        p.is_accepted, p.created_at, p.updated_at, p.status, p.contribution_id
-                    FROM proposals p
-                    LEFT JOIN proposal_peer_reviews pr ON p.id = pr.proposal_id AND pr.reviewer_id = :uid
-                    WHERE p.id = :id AND (p.user_id = :uid OR :is_admin OR pr.reviewer_id = :uid)
-                """)
-
-                draft = conn.execute(
+            draft_query = text("""
+                SELECT DISTINCT
+                    p.template_name, p.form_data, p.generated_sections, p.project_description,
+                    p.is_accepted, p.created_at, p.updated_at, p.status, p.contribution_id
+                FROM proposals p
+                LEFT JOIN proposal_peer_reviews pr ON p.id = pr.proposal_id AND pr.reviewer_id = :uid
+                WHERE p.id = :id AND (p.user_id = :uid OR :is_admin OR pr.reviewer_id = :uid)
+            """)
+
+            draft = (
+                await conn.execute(
                     draft_query,
                     {"id": proposal_id, "uid": user_id, "is_admin": is_admin},
-                ).fetchone()
-                if not draft:
-                    raise HTTPException(status_code=404, detail="Draft not found.")
-
-                # This query finds all knowledge cards linked to the same donor, outcomes, or field context as the proposal.
-                associated_cards_result = (
-                    conn.execute(
-                        text("""
-                        SELECT DISTINCT
-                            kc.id, kc.summary as title, kc.summary, kc.donor_id, kc.outcome_id, kc.field_context_id,
-                            d.name as donor_name,
-                            o.name as outcome_name,
-                            fc.name as field_context_name
-                        FROM knowledge_cards kc
-                        LEFT JOIN donors d ON kc.donor_id = d.id
-                        LEFT JOIN outcomes o ON kc.outcome_id = o.id
-                        LEFT JOIN field_contexts fc ON kc.field_context_id = fc.id
-                        WHERE
-                            kc.donor_id IN (SELECT donor_id FROM proposal_donors WHERE proposal_id = :pid) OR
-                            kc.outcome_id IN (SELECT outcome_id FROM proposal_outcomes WHERE proposal_id = :pid) OR
-                            kc.field_context_id IN (SELECT field_context_id FROM proposal_field_contexts WHERE proposal_id = :pid)
-                    """),
-                        {"pid": proposal_id},
-                    )
-                    .mappings()
-                    .fetchall()
                 )
+            ).fetchone()
+            if not draft:
+                raise HTTPException(status_code=404, detail="Draft not found.")
 
-                associated_knowledge_cards = [
-                    dict(card) for card in associated_cards_result
-                ]
+            # This query finds all knowledge cards linked to the same donor, outcomes, or field context as the proposal.
+            associated_cards_result = (
+                (await conn.execute(
+                    text("""
+                    SELECT DISTINCT
+                        kc.id, kc.summary as title, kc.summary, kc.donor_id, kc.outcome_id, kc.field_context_id,
+                        d.name as donor_name,
+                        o.name as outcome_name,
+                        fc.name as field_context_name
+                    FROM knowledge_cards kc
+                    LEFT JOIN donors d ON kc.donor_id = d.id
+                    LEFT JOIN outcomes o ON kc.outcome_id = o.id
+                    LEFT JOIN field_contexts fc ON kc.field_context_id = fc.id
+                    WHERE
+                        kc.donor_id IN (SELECT donor_id FROM proposal_donors WHERE proposal_id = :pid) OR
+                        kc.outcome_id IN (SELECT outcome_id FROM proposal_outcomes WHERE proposal_id = :pid) OR
+                        kc.field_context_id IN (SELECT field_context_id FROM proposal_field_contexts WHERE proposal_id = :pid)
+                """),
+                    {"pid": proposal_id},
+                ))
+                .mappings()
+                .fetchall()
+            )
 
-                template_name = (
-                    draft.template_name or "proposal_template_unhcr.json"
-                )  # Default if null
-                proposal_template = load_proposal_template(template_name)
-                section_names = [
-                    s.get("section_name") for s in proposal_template.get("sections", [])
-                ]
+            associated_knowledge_cards = [
+                dict(card) for card in associated_cards_result
+            ]
 
-                form_data = draft.form_data if draft.form_data else {}
-                sections = draft.generated_sections if draft.generated_sections else {}
-                project_description = draft.project_description
+            template_name = (
+                draft.template_name or "proposal_template_unhcr.json"
+            )  # Default if null
+            proposal_template = load_proposal_template(template_name)
+            section_names = [
+                s.get("section_name") for s in proposal_template.get("sections", [])
+            ]
 
-                data_to_load = {
-                    "form_data": form_data,
-                    "project_description": project_description,
-                    "generated_sections": {
-                        sec: sections.get(sec) for sec in section_names
-                    },
-                    "is_accepted": draft.is_accepted,
-                    "status": draft.status,
-                    "created_at": draft.created_at.isoformat()
-                    if draft.created_at
-                    else None,
-                    "updated_at": draft.updated_at.isoformat()
-                    if draft.updated_at
-                    else None,
-                    "is_sample": False,
-                    "template_name": template_name,
-                    "proposal_template": proposal_template,
-                    "proposal_id": str(proposal_id),
-                    "associated_knowledge_cards": associated_knowledge_cards,
-                    "contribution_id": draft.contribution_id,
-                }
+            form_data = draft.form_data if draft.form_data else {}
+            sections = draft.generated_sections if draft.generated_sections else {}
+            project_description = draft.project_description
+
+            data_to_load = {
+                "form_data": form_data,
+                "project_description": project_description,
+                "generated_sections": {
+                    sec: sections.get(sec) for sec in section_names
+                },
+                "is_accepted": draft.is_accepted,
+                "status": draft.status,
+                "created_at": draft.created_at.isoformat()
+                if draft.created_at
+                else None,
+                "updated_at": draft.updated_at.isoformat()
+                if draft.updated_at
+                else None,
+                "is_sample": False,
+                "template_name": template_name,
+                "proposal_template": proposal_template,
+                "proposal_id": str(proposal_id),
+                "associated_knowledge_cards": associated_knowledge_cards,
+                "contribution_id": draft.contribution_id,
+            }
         else:
             # Handle sample drafts, which are loaded from a JSON file.
             with open("templates/sample_templates.json", "r") as f:
@@ -2032,8 +2219,8 @@ async def load_draft(proposal_id: str, current_user: dict = Depends(get_current_
         **data_to_load,
     }
 
-    # The proposal_template is already a dict, which is JSON serializable.
-    redis_client.setex(session_id, 3600, json.dumps(redis_payload, default=str))
+    # The template is stored once and referenced by the session.
+    session_store.create(session_id, redis_payload)
 
     return {"session_id": session_id, **data_to_load}
 
@@ -2378,7 +2565,9 @@ async def submit_review(
 
         # Trigger analysis in background for each comment
         for rid in new_review_ids:
-            background_tasks.add_task(_run_auto_analysis, ArtifactType.proposal, rid)
+            background_tasks.add_task(
+                with_db_workload(WORKLOAD_BACKGROUND, _run_auto_analysis), ArtifactType.proposal, rid
+            )
 
             # Check if all reviews are completed
             pending_reviews = connection.execute(
@@ -2819,6 +3008,7 @@ async def create_donor(
                     "user_id": current_user["user_id"],
                 },
             )
+        reference_resolver.invalidate()
         return {"id": str(new_id), "name": request.name}
     except Exception as e:
         logger.error(f"[CREATE DONOR ERROR] {e}", exc_info=True)
@@ -2845,6 +3035,7 @@ async def create_outcome(
                     "user_id": current_user["user_id"],
                 },
             )
+        reference_resolver.invalidate()
         return {"id": str(new_id), "name": request.name}
     except Exception as e:
         logger.error(f"[CREATE OUTCOME ERROR] {e}", exc_info=True)
@@ -2874,6 +3065,7 @@ async def create_field_context(
                     "user_id": current_user["user_id"],
                 },
             )
+        reference_resolver.invalidate()
         return {
             "id": str(new_id),
             "name": request.name,
@@ -3089,7 +3281,7 @@ async def get_status_history(
     """
     user_id = current_user["user_id"]
     try:
-        with get_engine().connect() as connection:
+        with get_engine(readonly=True, consistency_key=user_id).connect() as connection:
             # Verify the user has access to the proposal (owner or reviewer)
             proposal_owner = connection.execute(
                 text("SELECT user_id FROM proposals WHERE id = :id"),
@@ -3140,7 +3332,7 @@ async def get_peer_reviews(
     user_id = current_user["user_id"]
     user_roles = current_user.get("roles", [])
     try:
-        with get_engine().connect() as connection:
+        with get_engine(readonly=True, consistency_key=user_id).connect() as connection:
             # Verify the user has access to the proposal (owner, reviewer, admin, or project reviewer)
             proposal_owner = connection.execute(
                 text("SELECT user_id FROM proposals WHERE id = :id"),
@@ -3270,7 +3462,7 @@ async def add_proposal_comment(
         # Trigger analysis in background
         if review_id:
             background_tasks.add_task(
-                _run_auto_analysis, ArtifactType.proposal, review_id
+                with_db_workload(WORKLOAD_BACKGROUND, _run_auto_analysis), ArtifactType.proposal, review_id
             )
 
         return {"message": "Comment saved successfully.", "comment_id": review_id}
@@ -3448,6 +3640,29 @@ async def get_proposal_runs(
         raise HTTPException(status_code=500, detail="Failed to fetch proposal runs.")
 
 
+@router.get("/proposal-runs/aggregates")
+async def get_proposal_run_aggregates(
+    days: int = 30,
+    artifact_type: str = "proposal",
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get p50/p95 latency and token totals per template and per section over the last `days`.
+    """
+    try:
+        aggregates = proposal_run_logger.get_usage_aggregates(
+            start_date=datetime.utcnow() - timedelta(days=days),
+            artifact_type=artifact_type
+        )
+        return {
+            "message": "Proposal run aggregates fetched successfully",
+            **aggregates
+        }
+    except Exception as e:
+        logger.error(f"[GET PROPOSAL RUN AGGREGATES ERROR] {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to fetch proposal run aggregates.")
+
+
 @router.get("/proposal-runs/{run_id}")
 async def get_proposal_run_details(
     run_id: str,
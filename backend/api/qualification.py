@@ -4,6 +4,7 @@ from sqlalchemy.exc import SQLAlchemyError
 import logging
 
 from backend.core.db import get_engine
+from backend.core.db_pool import WORKLOAD_BACKGROUND, with_db_workload
 from backend.core.security import get_current_user
 from backend.utils.qualification_service import QualificationService
 
@@ -20,7 +21,9 @@ async def run_qualification(
     """
     Schedule qualification rule evaluation for a given artifact.
     """
-    background_tasks.add_task(_run_qualification_task, artifact_type, artifact_id)
+    background_tasks.add_task(
+        with_db_workload(WORKLOAD_BACKGROUND, _run_qualification_task), artifact_type, artifact_id
+    )
     return {"message": "Qualification scheduled"}
 
 
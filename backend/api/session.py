@@ -1,14 +1,13 @@
 #  Standard Library
-import json
 import uuid
 
 #  Third-Party Libraries
 from fastapi import APIRouter, Depends, HTTPException
 
 #  Internal Modules
-from backend.core.redis import redis_client
 from backend.core.security import get_current_user
 from backend.models.schemas import BaseDataRequest
+from backend.utils.session_store import session_store
 
 # This router handles endpoints related to managing temporary user session data,
 # which is stored in Redis.
@@ -32,8 +31,8 @@ async def store_base_data(request: BaseDataRequest, current_user: dict = Depends
         "user_id": current_user["user_id"],
         "template_name": request.template_name
     }
-    # Store in Redis with a 1-hour expiration (3600 seconds).
-    redis_client.setex(session_id, 3600, json.dumps(data))
+    # Store in Redis with a 1-hour expiration (SESSION_TTL_SECONDS).
+    session_store.create(session_id, data)
 
     return {"message": "Base data stored successfully", "session_id": session_id}
 
@@ -42,8 +41,13 @@ async def get_base_data(session_id: str):
     """
     Retrieves the base proposal data from the specified Redis session.
     """
-    data = redis_client.get(session_id)
+    data = session_store.load(session_id)
     if data is None:
         raise HTTPException(status_code=404, detail="Session data not found or expired.")
 
-    return json.loads(data)
+    # Return the session as it was stored, without the fields the store adds.
+    data.pop("template_ref", None)
+    data.pop("template_version", None)
+    if not data["generated_sections"]:
+        del data["generated_sections"]
+    return data
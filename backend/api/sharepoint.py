@@ -485,7 +485,7 @@ async def upload_proposal_to_sharepoint(
         JSONResponse: Contains the SharePoint URL for the uploaded file
     """
     from backend.utils.doc_export import create_word_from_sections, create_pdf_from_sections
-    from backend.core.config import load_proposal_template
+    from backend.core.config import load_compiled_template
     from slugify import slugify
     
     user_id = current_user["user_id"]
@@ -606,8 +606,8 @@ async def upload_proposal_to_sharepoint(
             template_name = "proposal_template_unhcr.json"
             logger.warning(f"Proposal {proposal_id} has no template_name, falling back to default.")
         
-        proposal_template = load_proposal_template(template_name)
-        template_sections = [s.get("section_name") for s in proposal_template.get("sections", [])]
+        compiled_template = load_compiled_template(template_name)
+        template_sections = compiled_template.output_order
         ordered_sections = {section: generated_sections.get(section, "") for section in template_sections}
         
         # Generate filename
@@ -619,7 +619,7 @@ async def upload_proposal_to_sharepoint(
             buffer = io.BytesIO(create_pdf_from_sections(form_data, ordered_sections))
             filename = f"{sanitized_filename}.pdf"
         else:
-            doc = create_word_from_sections(form_data, proposal_template, ordered_sections)
+            doc = create_word_from_sections(form_data, compiled_template.source, ordered_sections)
             buffer = io.BytesIO()
             doc.save(buffer)
             buffer.seek(0)
@@ -790,7 +790,7 @@ async def upload_knowledge_card_to_sharepoint(
     """
     import uuid
     from backend.utils.doc_export import create_word_from_sections, create_pdf_from_sections
-    from backend.core.config import load_proposal_template
+    from backend.core.config import load_compiled_template
     from slugify import slugify
     
     user_id = current_user["user_id"]
@@ -905,8 +905,8 @@ async def upload_knowledge_card_to_sharepoint(
         
         # Load the template
         template_name = card_dict.get("template_name") or "proposal_template_unhcr.json"
-        proposal_template = load_proposal_template(template_name)
-        template_sections = [s.get("section_name") for s in proposal_template.get("sections", [])]
+        compiled_template = load_compiled_template(template_name)
+        template_sections = compiled_template.output_order
         ordered_sections = {section: generated_sections.get(section, "") for section in template_sections}
         
         # Generate filename
@@ -918,7 +918,7 @@ async def upload_knowledge_card_to_sharepoint(
             buffer = io.BytesIO(create_pdf_from_sections(form_data, ordered_sections))
             filename = f"{sanitized_filename}.pdf"
         else:
-            doc = create_word_from_sections(form_data, proposal_template, ordered_sections)
+            doc = create_word_from_sections(form_data, compiled_template.source, ordered_sections)
             buffer = io.BytesIO()
             doc.save(buffer)
             buffer.seek(0)
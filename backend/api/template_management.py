@@ -14,7 +14,9 @@ from backend.models.template_models import (
     TemplateFullResponse
 )
 from backend.services.template_service import TemplateService
-from backend.core.db import get_engine
+from backend.core.db import async_pool
+from backend.core.template_registry import template_registry
+from backend.utils.llm_cache import llm_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -22,8 +24,7 @@ logger = logging.getLogger(__name__)
 
 def get_template_service():
     """Dependency to get template service"""
-    engine = get_engine()
-    return TemplateService(engine)
+    return TemplateService(async_pool)
 
 
 @router.get("/templates", response_model=List[TemplateResponse])
@@ -102,6 +103,7 @@ async def create_template(
     """Create a new template"""
     try:
         result = await service.create_template(template_data, current_user)
+        template_registry.invalidate()
         return {
             "message": "Template created successfully",
             "template": result["template"],
@@ -126,6 +128,7 @@ async def update_template_metadata(
         template = await service.update_template_metadata(template_id, update_data, current_user)
         if not template:
             raise HTTPException(status_code=404, detail="Template not found")
+        template_registry.invalidate()
         return template
     except HTTPException:
         raise
@@ -144,6 +147,11 @@ async def create_template_version(
     """Create a new version of a template"""
     try:
         version = await service.create_template_version(template_id, version_data, current_user)
+        if version.get("status") == "active":
+            template = await service.get_template_by_id(template_id)
+            if template:
+                llm_cache.invalidate_template(template["filename"])
+            template_registry.invalidate()
         return version
     except HTTPException:
         raise
@@ -9,12 +9,14 @@ import logging
 import os
 
 from backend.core.db import get_engine
+from backend.core.db_pool import WORKLOAD_BACKGROUND, with_db_workload
 from backend.core.security import get_current_user
 from backend.core.config import (
     get_available_templates,
     load_proposal_template,
     TEMPLATES_DIR,
 )
+from backend.core.template_registry import template_registry
 from backend.utils.incident_service import IncidentService
 from backend.models.schemas import (
     DonorTemplateRequestCreate,
@@ -159,44 +161,38 @@ async def list_templates(
     try:
         # File-based templates
         published = []
-        seen_files = set()
 
-        # Scan both directories for all JSON files
+        # All JSON files of both directories, as indexed by the template registry
         dirs_to_scan = [
             os.path.join(TEMPLATES_DIR, "proposal_template"),
             os.path.join(TEMPLATES_DIR, "concept_note_template"),
         ]
 
-        for scan_dir in dirs_to_scan:
-            if not os.path.exists(scan_dir):
-                continue
-            for filename in os.listdir(scan_dir):
-                if filename.endswith(".json") and filename not in seen_files:
-                    seen_files.add(filename)
-                    try:
-                        t_data = load_proposal_template(filename)
-                        t_type = t_data.get("template_type", "Proposal")
-                        # Normalize type for frontend: 'proposal' or 'concept_note'
-                        t_type_norm = t_type.lower().replace(" ", "_")
-
-                        # Try to get a nice display name from the template itself
-                        donor_display = (
-                            " / ".join(t_data.get("donors", []))
-                            if t_data.get("donors")
-                            else filename
-                        )
-
-                        published.append(
-                            {
-                                "id": filename,
-                                "name": f"Published: {donor_display}",
-                                "status": "published",
-                                "type": "file",
-                                "template_type": t_type_norm,
-                            }
-                        )
-                    except Exception as e:
-                        logger.warning(f"Error indexing template file {filename}: {e}")
+        for filename in template_registry.filenames(dirs_to_scan):
+            try:
+                t_data = load_proposal_template(filename)
+                t_type = t_data.get("template_type", "Proposal")
+                # Normalize type for frontend: 'proposal' or 'concept_note'
+                t_type_norm = t_type.lower().replace(" ", "_")
+
+                # Try to get a nice display name from the template itself
+                donor_display = (
+                    " / ".join(t_data.get("donors", []))
+                    if t_data.get("donors")
+                    else filename
+                )
+
+                published.append(
+                    {
+                        "id": filename,
+                        "name": f"Published: {donor_display}",
+                        "status": "published",
+                        "type": "file",
+                        "template_type": t_type_norm,
+                    }
+                )
+            except Exception as e:
+                logger.warning(f"Error indexing template file {filename}: {e}")
 
         # DB-based requests (update query to include donor_ids and template_type)
         with engine.connect() as connection:
@@ -483,7 +479,7 @@ async def add_comment(
         # Trigger analysis in background
         if review_id:
             background_tasks.add_task(
-                _run_auto_analysis, ArtifactType.template, review_id
+                with_db_workload(WORKLOAD_BACKGROUND, _run_auto_analysis), ArtifactType.template, review_id
             )
 
         return {"message": "Comment added successfully.", "comment_id": review_id}
@@ -9,7 +9,7 @@ from sqlalchemy import text
 
 #  Internal Modules
 from backend.core.db import get_engine
-from backend.core.security import get_current_user
+from backend.core.security import get_current_user, invalidate_principal
 from backend.models.schemas import UserSettings, Role, User
 
 # This router handles all endpoints related to users.
@@ -269,6 +269,7 @@ async def update_user_settings(settings: UserSettings, current_user: dict = Depe
                 if settings.field_contexts:
                     fc_insert_query = text("INSERT INTO user_field_contexts (user_id, field_context_id) VALUES (:user_id, :fc_id)")
                     connection.execute(fc_insert_query, [{"user_id": user_id, "fc_id": fc_id} for fc_id in settings.field_contexts])
+        invalidate_principal(current_user["email"])
     except Exception as e:
         logger.error(f"[UPDATE USER SETTINGS ERROR] {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Could not update user settings.")
@@ -0,0 +1,131 @@
+#  Standard Library
+import base64
+import json
+import logging
+import os
+from typing import Any
+
+#  Third-Party Libraries
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module encodes the values the application stores in Redis.
+#
+# Values are serialized by a pluggable serializer (`REDIS_CODEC`): "orjson" (default, when
+# the package is installed) or the standard library "json". Both write JSON (orjson
+# without the spaces after separators), so either reads what the other wrote, and keys
+# written before this module existed are read unchanged.
+#
+# When `REDIS_CODEC_COMPRESS_THRESHOLD` is set (0, the default, disables it), `encode`
+# additionally compresses values larger than that many bytes with zstd, for values only the application reads (sessions and their templates).
+# The Redis client decodes responses as UTF-8 text, so compressed values are stored as
+# base64 text after a `zstd:` prefix, which no JSON document starts with. `decode`
+# accepts both forms. Values sent as-is to clients (progress keys and pub/sub messages,
+# relayed by the SSE endpoints) use `dumps`, which never compresses.
+#
+# Compression is opt-in: older processes cannot read compressed values, so only set the
+# threshold (e.g. 4096) once every process runs this code.
+
+REDIS_CODEC = os.getenv("REDIS_CODEC", "orjson")
+REDIS_CODEC_COMPRESS_THRESHOLD = int(os.getenv("REDIS_CODEC_COMPRESS_THRESHOLD", "0"))
+REDIS_CODEC_COMPRESS_LEVEL = int(os.getenv("REDIS_CODEC_COMPRESS_LEVEL", "3"))
+
+COMPRESSED_PREFIX = "zstd:"
+
+
+class JsonSerializer:
+    """Standard library JSON, with non-serializable values converted with `str`."""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, default=str)
+
+    def loads(self, raw: str) -> Any:
+        return json.loads(raw)
+
+
+class OrjsonSerializer:
+    """orjson, converting values the way `JsonSerializer` does (datetimes included)."""
+
+    name = "orjson"
+
+    def __init__(self):
+        self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, value: Any) -> str:
+        try:
+            return orjson.dumps(value, default=str, option=self._options).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the standard library handles
+            return json.dumps(value, default=str)
+
+    def loads(self, raw: str) -> Any:
+        return orjson.loads(raw)
+
+
+SERIALIZERS = {"json": JsonSerializer}
+if orjson is not None:
+    SERIALIZERS["orjson"] = OrjsonSerializer
+
+
+class RedisCodec:
+    """
+    Serializes values for Redis, compressing large ones.
+    """
+
+    def __init__(
+        self,
+        serializer: str = REDIS_CODEC,
+        compress_threshold: int = REDIS_CODEC_COMPRESS_THRESHOLD,
+        compress_level: int = REDIS_CODEC_COMPRESS_LEVEL,
+    ):
+        if serializer not in SERIALIZERS:
+            logger.warning(f"Redis codec {serializer!r} is not available, using json")
+            serializer = "json"
+        self.serializer = SERIALIZERS[serializer]()
+        if compress_threshold and zstandard is None:
+            logger.warning("zstandard is not installed, Redis values are stored uncompressed")
+            compress_threshold = 0
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+    def dumps(self, value: Any) -> str:
+        """Returns `value` as JSON text."""
+        return self.serializer.dumps(value)
+
+    def encode(self, value: Any) -> str:
+        """Returns `value` as JSON text, compressed if it exceeds the threshold."""
+        text = self.serializer.dumps(value)
+        if self.compress_threshold and len(text) > self.compress_threshold:
+            # zstd contexts are not thread-safe: one per call (they are cheap to create).
+            compressed = zstandard.ZstdCompressor(level=self.compress_level).compress(text.encode("utf-8"))
+            return COMPRESSED_PREFIX + base64.b64encode(compressed).decode("ascii")
+        return text
+
+    def decode(self, raw: Any) -> Any:
+        """Reads a value written by `encode` or `dumps` (or plain JSON). None stays None."""
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        if raw.startswith(COMPRESSED_PREFIX):
+            if zstandard is None:
+                raise ValueError("Compressed Redis value found but zstandard is not installed")
+            raw = zstandard.ZstdDecompressor().decompress(base64.b64decode(raw[len(COMPRESSED_PREFIX):]))
+        return self.serializer.loads(raw)
+
+    loads = decode
+
+
+redis_codec = RedisCodec()
@@ -0,0 +1,172 @@
+#  Standard Library
+import copy
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module turns a proposal template into the structures the generation code works with.
+#
+# A `CompiledTemplate` is built once per template version (see
+# `TemplateRegistry.compiled`) and holds:
+#   - the sections by name, for O(1) lookup, in output order (the `sections` array),
+#   - the generation order (`section_sequence`, restricted to known sections),
+#   - the `special_requirements` bullet list, rendered for the prompts,
+#   - for each section, its resolved length limit and the instructions sent to the crew
+#     (section instructions + limit instruction, or the full table prompt).
+#
+# The rendered strings are exactly those the format handlers used to build on each call,
+# so prompts and LLM cache keys are unchanged.
+
+DEFAULT_TEXT_LIMIT = 350
+DEFAULT_TABLE_LIMIT = 2000
+NUMBER_WORD_LIMIT = 10
+
+
+def template_version(proposal_template: Dict[str, Any]) -> str:
+    """Returns the content hash identifying a template version."""
+    return hashlib.sha256(
+        json.dumps(proposal_template, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+
+
+def resolve_limit(section_config: Dict[str, Any], default: int) -> Tuple[str, int]:
+    """Returns the (limit_type, limit_value) of a section: its char limit, else its word limit, else `default` words."""
+    char_limit = section_config.get("char_limit")
+    word_limit = section_config.get("word_limit")
+    if char_limit is not None:
+        return "char", char_limit
+    if word_limit is not None:
+        return "word", word_limit
+    return "word", default
+
+
+def render_special_requirements(proposal_template: Dict[str, Any]) -> str:
+    """Formats the template's special requirements as a bulleted list ("None" if there are none)."""
+    special_requirements_list = proposal_template.get("special_requirements", {}).get("instructions", [])
+    return (
+        "\n".join([f"- {req}" for req in special_requirements_list])
+        if special_requirements_list
+        else "None"
+    )
+
+
+def _render_table_prompt(section_config: Dict[str, Any]) -> str:
+    section_name = section_config["section_name"]
+    instructions = section_config.get("instructions", "")
+    columns = section_config.get("columns", [])
+    rows = section_config.get("rows", [])
+
+    prompt = (
+        f"{instructions}\n\n"
+        f"Generate a JSON object for the section '{section_name}'. "
+        "The JSON object must have a single top-level key which is the section name. "
+        "The value for this key should be an object containing two keys: 'table' and 'notes'.\n"
+        "- The 'table' key should contain a list of JSON objects, where each object represents a row.\n"
+        "- The 'notes' key should contain a string for any footnotes or additional information.\n\n"
+        "The columns for the table are:\n"
+    )
+    column_names = [col["name"] for col in columns]
+    prompt += f"`{', '.join(column_names)}`\n\n"
+
+    prompt += "Use the following column definitions for guidance:\n"
+    for col in columns:
+        prompt += f"- Column '{col['name']}': {col.get('instructions', '')}\n"
+
+    prompt += "\nUse the following row definitions for guidance:\n"
+    for row in rows:
+        prompt += f"- Row '{row['row_title']}': {row.get('instructions', '')}\n"
+    return prompt
+
+
+class CompiledSection:
+    """
+    A template section with its limit and crew instructions rendered.
+    """
+
+    __slots__ = (
+        "name", "config", "format_type", "limit_type", "limit_value", "limit_term",
+        "instructions", "regeneration_limit", "regeneration_instructions", "column_names",
+    )
+
+    def __init__(self, section_config: Dict[str, Any]):
+        self.config = section_config
+        self.name = section_config["section_name"]
+        self.format_type = section_config.get("format_type", "text")
+        self.column_names = [col["name"] for col in section_config.get("columns", [])]
+
+        if self.format_type == "number":
+            self.limit_type, self.limit_value = "word", NUMBER_WORD_LIMIT
+        else:
+            default = DEFAULT_TABLE_LIMIT if self.format_type == "table" else DEFAULT_TEXT_LIMIT
+            self.limit_type, self.limit_value = resolve_limit(section_config, default)
+        self.limit_term = "character" if self.limit_type == "char" else "word"
+
+        section_instructions = section_config.get("instructions", "")
+        if self.format_type == "table":
+            self.instructions = _render_table_prompt(section_config)
+        elif self.format_type == "number":
+            self.instructions = section_instructions
+        else:
+            limit_instruction = (
+                f"IMPORTANT: Do not exceed {self.limit_value} {self.limit_term}s for this section. "
+                "If your response is longer, you MUST summarize or truncate to fit the limit."
+            )
+            self.instructions = (
+                f"{section_instructions} {limit_instruction}" if section_instructions else limit_instruction
+            )
+
+        # Regeneration uses the text limit whatever the format, with a shorter reminder.
+        self.regeneration_limit = resolve_limit(section_config, DEFAULT_TEXT_LIMIT)
+        regeneration_type, regeneration_value = self.regeneration_limit
+        self.regeneration_instructions = (
+            f"{section_instructions} Do not exceed {regeneration_value} "
+            f"{'character' if regeneration_type == 'char' else 'word'}s."
+        )
+
+    def limit_inputs(self) -> Dict[str, Any]:
+        """Returns the limit variables of the crew inputs."""
+        inputs = {"limit_value": self.limit_value, "limit_term": self.limit_term}
+        inputs["char_limit" if self.limit_type == "char" else "word_limit"] = self.limit_value
+        return inputs
+
+
+def compile_section(section: Any) -> CompiledSection:
+    """Returns `section` compiled; a section that already is is returned as is."""
+    return section if isinstance(section, CompiledSection) else CompiledSection(section)
+
+
+class CompiledTemplate:
+    """
+    A proposal template with its sections indexed and its prompt fragments rendered.
+    """
+
+    def __init__(self, proposal_template: Dict[str, Any], version: Optional[str] = None):
+        # The template this was compiled from. Shared by all callers: read it, never modify it.
+        self.source = copy.deepcopy(proposal_template)
+        # Content hash of the template (see `template_version`).
+        self.version = version
+        self.special_requirements = render_special_requirements(proposal_template)
+        self.sections: Dict[str, CompiledSection] = {}
+        for section_config in self.source.get("sections", []):
+            self.sections[section_config["section_name"]] = CompiledSection(section_config)
+        self.output_order: List[str] = list(self.sections)
+
+        # `section_sequence` gives the generation order (memory/dependency), while the
+        # sections array gives the output order.
+        section_sequence = self.source.get("section_sequence", [])
+        if not section_sequence:
+            section_sequence = self.output_order
+        for section_name in section_sequence:
+            if section_name not in self.sections:
+                logger.warning(
+                    f"Section '{section_name}' in section_sequence not found in sections array, skipping"
+                )
+        self.generation_order: List[str] = [s for s in section_sequence if s in self.sections]
+        self.has_section_sequence = bool(self.source.get("section_sequence"))
+
+    def section(self, section_name: str) -> Optional[CompiledSection]:
+        return self.sections.get(section_name)
@@ -163,6 +163,10 @@ TEMPLATE_SUB_DIRS = [
     TEMPLATES_DIR,  # fallback: root templates dir for any legacy files
 ]
 
+# Maximum number of independent sections generated concurrently for one proposal.
+# Set to 1 to restore strictly sequential generation.
+SECTION_GENERATION_CONCURRENCY = max(1, int(os.getenv("SECTION_GENERATION_CONCURRENCY", "4")))
+
 
 class Settings:
     """Configuration settings for the application"""
@@ -175,6 +179,7 @@ class Settings:
     BACKEND_DIR = BACKEND_DIR
     TEMPLATES_DIR = TEMPLATES_DIR
     TEMPLATE_SUB_DIRS = TEMPLATE_SUB_DIRS
+    SECTION_GENERATION_CONCURRENCY = SECTION_GENERATION_CONCURRENCY
     llm_model = crew_llm
     debug: bool = os.getenv("DEBUG", "false").lower() in ("1", "true")
     # Persist incident analysis results to database/storage
@@ -201,75 +206,37 @@ def _find_template_path(filename: str) -> str | None:
 
 def get_available_templates():
     """
-    Scans both template sub-directories, reads each template file, and returns a
-    dictionary mapping donor names to their corresponding template filename.
-    This supports a one-to-many relationship between templates and donors.
-    """
-    templates_map = {}
-
-    dirs_to_scan = [
-        os.path.join(TEMPLATES_DIR, "proposal_template"),
-        os.path.join(TEMPLATES_DIR, "concept_note_template"),
-        TEMPLATES_DIR,  # Include knowledge card templates in root templates dir
-    ]
-
-    for scan_dir in dirs_to_scan:
-        if not os.path.isdir(scan_dir):
-            logger.warning(f"Template sub-directory not found: {scan_dir}")
-            continue
-
-        is_concept_note_dir = scan_dir.endswith("concept_note_template")
-
-        for filename in os.listdir(scan_dir):
-            if not filename.endswith(".json"):
-                continue
-            template_path = os.path.join(scan_dir, filename)
-            if not os.path.isfile(template_path):
-                continue
-
-            try:
-                with open(template_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                if not isinstance(data, dict):
-                    logger.info(f"Skipping non-dictionary template file: {filename}")
-                    continue
-
-                donors = data.get("donors", [])
-                # Map proposal templates by donor name (not concept notes)
-                if isinstance(donors, list) and not is_concept_note_dir:
-                    for donor_name in donors:
-                        templates_map[donor_name] = filename
-
-                # Always map by filename for direct access
-                templates_map[filename] = filename
+    Returns a dictionary mapping donor names (and filenames) to their template filename,
+    from both template sub-directories. This supports a one-to-many relationship between
+    templates and donors.
 
-            except (json.JSONDecodeError, IOError) as e:
-                logger.error(
-                    f"Failed to read or parse template file: {filename}. Error: {e}"
-                )
-                continue
-
-    # Ensure "Not Yet Specified" option points to the default UNHCR template.
-    unhcr_template_file = "proposal_template_unhcr.json"
-    if _find_template_path(unhcr_template_file):
-        templates_map["Not Yet Specified"] = unhcr_template_file
+    The map is kept by the in-memory template registry, which re-reads a template file
+    only when it changed on disk.
+    """
+    from backend.core.template_registry import template_registry
 
-    return templates_map
+    return template_registry.templates_map()
 
 
 def load_proposal_template(template_name: str, use_db_first: bool = True):
     """
     Loads a specific proposal template by its filename.
     First tries database (if use_db_first=True), then falls back to file system.
+    Loaded templates are kept by the in-memory template registry.
     """
+    from backend.core.template_registry import template_registry
+
+    cached = template_registry.get(template_name, use_db_first)
+    if cached is not None:
+        return cached
+
     # First try database if enabled
     if use_db_first:
         try:
             template_data = _load_template_from_db(template_name)
             if template_data:
                 logger.info(f"Proposal template loaded successfully from database: {template_name}")
-                return template_data
+                return template_registry.store(template_name, use_db_first, template_data)
         except Exception as e:
             logger.warning(f"Database template loading failed, falling back to file system: {e}")
 
@@ -290,7 +257,7 @@ def load_proposal_template(template_name: str, use_db_first: bool = True):
         with open(template_path, "r", encoding="utf-8") as file:
             proposal_data = json.load(file)
             logger.info(f"Proposal template loaded successfully from {template_path}")
-            return proposal_data
+            return template_registry.store(template_name, use_db_first, proposal_data)
     except json.JSONDecodeError:
         logger.error(
             f"Error decoding JSON from proposal template file: {template_path}"
@@ -300,6 +267,27 @@ def load_proposal_template(template_name: str, use_db_first: bool = True):
         )
 
 
+def load_compiled_template(
+    template_name: str,
+    proposal_template: Optional[Dict[str, Any]] = None,
+    version: Optional[str] = None,
+):
+    """
+    Returns the compiled form (see compiled_template.py) of a proposal template: its
+    sections by name, generation and output order, and rendered prompt fragments.
+    `proposal_template` is the content to compile (e.g. a session's template, with its
+    `version` hash); it is loaded when not given.
+    """
+    from backend.core.template_registry import template_registry
+
+    if proposal_template is None:
+        compiled = template_registry.get_compiled(template_name)
+        if compiled is not None:
+            return compiled
+        proposal_template = load_proposal_template(template_name)
+    return template_registry.compiled(template_name, proposal_template, version)
+
+
 def _load_template_from_db(template_name: str) -> Optional[Dict[str, Any]]:
     """
     Attempt to load template from database.
@@ -3,15 +3,32 @@
 import logging
 import urllib.parse
 import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
 
 #  Third-Party Libraries
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 import pg8000.dbapi
 import psycopg2
 
 #  Internal Modules
 from backend.core.config import db_host, db_name, db_username, db_password
+from backend.core.db_pool import (
+    WORKLOAD_API,
+    WORKLOAD_BACKGROUND,
+    WORKLOADS,
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    PoolConfig,
+    current_workload,
+    install_statement_timeout,
+)
+from backend.core.redis import redis_client
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -19,102 +36,419 @@ logger = logging.getLogger(__name__)
 # --- Additional Config ---
 cloud_provider = os.getenv("CLOUD_PROVIDER", "local").lower()  # gcp | azure | local
 
-# <--- Start with None, lazy-load later
+# Optional read replica (host, or instance connection name on GCP) for read-only queries
+# that tolerate a little replication lag; see `ReplicaRouter`. Same credentials as the primary.
+DB_READ_REPLICA_HOST = os.getenv("DB_READ_REPLICA_HOST", "").strip()
+# Reads go to the primary while the replica lags behind by more than this.
+DB_READ_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_READ_REPLICA_MAX_LAG_SECONDS", "10"))
+DB_READ_REPLICA_LAG_CHECK_SECONDS = float(os.getenv("DB_READ_REPLICA_LAG_CHECK_SECONDS", "15"))
+# After a failure, the replica is left alone for this long.
+DB_READ_REPLICA_RETRY_SECONDS = float(os.getenv("DB_READ_REPLICA_RETRY_SECONDS", "30"))
+# Reads of a user who wrote within this window go to the primary (read-your-writes).
+DB_READ_YOUR_WRITES_SECONDS = int(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "30"))
+
+RECENT_WRITE_KEY_PREFIX = "db_recent_write:"
+
+# Engines are created lazily, one per workload class (see `backend.core.db_pool`), each
+# with its own connection pool. `engine` and `async_engine` hold those of the "api"
+# workload; the others are kept in `_engines` / `_async_engines`, and those of the read
+# replica in `_replica_engines` / `_async_replica_engines`.
 engine = None
-
-
-def get_engine():
+_engines: Dict[str, Engine] = {}
+_replica_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+_connector = None
+
+
+def _get_connector():
+    """Initializes and returns the Cloud SQL Connector instance."""
+    global _connector
+    if _connector is None:
+        from google.cloud.sql.connector import Connector
+        _connector = Connector()
+    return _connector
+
+
+def _create_engine(workload: str, host: str = db_host) -> Engine:
+    """Creates the sync engine of `workload` on `host` for the configured cloud provider."""
+    config = PoolConfig.from_env(workload)
+    logger.info(f"Creating {cloud_provider} SQLAlchemy engine for {host} ({workload} pool: {config.as_dict()})")
+
+    if cloud_provider == "gcp":
+        url = "postgresql+pg8000://"
+        connect_kwargs = {
+            "creator": lambda: _get_connector().connect(
+                host, "pg8000", user=db_username, password=db_password, db=db_name
+            )
+        }
+    else:  # azure, local or default
+        encoded_password = urllib.parse.quote_plus(db_password) if db_password else ""
+        url = f"postgresql+psycopg2://{db_username}:{encoded_password}@{host}:5432/{db_name}"
+        if cloud_provider == "azure":
+            url += "?sslmode=require"
+        connect_kwargs = {}
+
+    new_engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        **config.engine_kwargs(),
+        **connect_kwargs,
+    )
+    install_statement_timeout(new_engine, config.statement_timeout_ms)
+
+    # Test the connection immediately
+    with new_engine.connect() as test_conn:
+        result = test_conn.execute(text("SELECT CURRENT_TIMESTAMP"))
+        logger.info(f"✅ {cloud_provider} database connection test passed ({host}, {workload}): {result.scalar()}")
+    return new_engine
+
+
+def get_engine(workload: Optional[str] = None, readonly: bool = False, consistency_key: Optional[str] = None):
     """
-    Lazily initializes and returns a SQLAlchemy engine.
+    Lazily initializes and returns the SQLAlchemy engine of `workload`
+    (by default, the workload of the current context, see `db_workload`).
+
+    With `readonly=True`, returns the engine of the read replica when one is configured
+    and up to date, and the primary's otherwise. Pass the ID of the user the data is
+    read for as `consistency_key` when they must see their own recent writes.
     """
     global engine
-    if engine is not None:
+    workload = workload or current_workload()
+    if readonly and replica_router.use_replica(consistency_key):
+        try:
+            with _engines_lock:
+                if workload not in _replica_engines:
+                    _replica_engines[workload] = _create_engine(workload, DB_READ_REPLICA_HOST)
+                return _replica_engines[workload]
+        except Exception as e:
+            replica_router.mark_down(e)
+
+    if workload == WORKLOAD_API and engine is not None:
         return engine
 
-    logger.info(f"Initializing SQLAlchemy engine... cloud_provider={cloud_provider}")
-
     if os.getenv("TESTING"):
-        from unittest.mock import MagicMock
-        logger.info("TESTING mode: using MagicMock engine")
-        engine = MagicMock()
+        # Every workload shares the engine the tests replace.
+        if engine is None:
+            from unittest.mock import MagicMock
+            logger.info("TESTING mode: using MagicMock engine")
+            engine = MagicMock()
         return engine
 
-    try:
-        if cloud_provider == "gcp":
-            # --- Cloud SQL Connector Initialization ---
-            connector = None
-
-            def get_connector() -> "Connector":
-                """Initializes and returns a Cloud SQL Connector instance."""
-                global connector
-                if connector is None:
-                    from google.cloud.sql.connector import Connector
-                    connector = Connector()
-                return connector
-
-            logger.info(f"Creating GCP SQLAlchemy engine for {db_host}, db: {db_name}, user: {db_username}")
-            engine = create_engine(
-                "postgresql+pg8000://",
-                creator=lambda: get_connector().connect(
-                    db_host,
-                    "pg8000",
-                    user=db_username,
-                    password=db_password,
-                    db=db_name,
-                ),
-                pool_pre_ping=True,
-                pool_recycle=300,
+    with _engines_lock:
+        try:
+            if workload == WORKLOAD_API:
+                if engine is None:
+                    engine = _create_engine(workload)
+                return engine
+            if workload not in _engines:
+                _engines[workload] = _create_engine(workload)
+            return _engines[workload]
+        except Exception as e:
+            logger.error(f"Failed to create {workload} engine for {cloud_provider}: {e}", exc_info=True)
+            raise
+
+
+# --- Async Engine ---
+
+# Endpoints running in the event loop use the asyncio engine (asyncpg driver), so that
+# their queries do not block the other requests served by the worker. It has its own
+# connection pools, next to the sync engines used by background tasks, the worker and
+# the scripts. Like those, there is one per workload, created lazily.
+async_engine = None
+_async_engines: Dict[str, AsyncEngine] = {}
+_async_replica_engines: Dict[str, AsyncEngine] = {}
+_async_connector = None
+
+
+def _create_async_engine(workload: str, host: str = db_host) -> AsyncEngine:
+    """Creates the asyncio engine of `workload` on `host` for the configured cloud provider."""
+    config = PoolConfig.from_env(workload)
+    logger.info(f"Creating {cloud_provider} async SQLAlchemy engine ({workload} pool: {config.as_dict()})")
+
+    if cloud_provider == "gcp":
+        async def get_gcp_connection():
+            """Opens an asyncpg connection through the Cloud SQL Connector."""
+            global _async_connector
+            if _async_connector is None:
+                from google.cloud.sql.connector import create_async_connector
+                _async_connector = await create_async_connector()
+            return await _async_connector.connect_async(
+                host, "asyncpg", user=db_username, password=db_password, db=db_name
             )
-            logger.info("GCP engine created successfully")
 
-            # Test the connection immediately
-            with engine.connect() as test_conn:
-                result = test_conn.execute(text("SELECT CURRENT_TIMESTAMP"))
-                logger.info(f"✅ GCP Database connection test passed: {result.scalar()}")
+        url = "postgresql+asyncpg://"
+        connect_kwargs = {"async_creator": get_gcp_connection}
+    else:
+        encoded_password = urllib.parse.quote_plus(db_password) if db_password else ""
+        url = f"postgresql+asyncpg://{db_username}:{encoded_password}@{host}:5432/{db_name}"
+        connect_kwargs = {"connect_args": {"ssl": "require"} if cloud_provider == "azure" else {}}
+
+    new_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        **config.engine_kwargs(),
+        **connect_kwargs,
+    )
+    install_statement_timeout(new_engine, config.statement_timeout_ms)
+    return new_engine
+
+
+def get_async_engine(
+    workload: Optional[str] = None, readonly: bool = False, consistency_key: Optional[str] = None
+) -> AsyncEngine:
+    """
+    Lazily initializes and returns the asyncio SQLAlchemy engine of `workload`
+    (by default, the workload of the current context, see `db_workload`).
+    `readonly` and `consistency_key` route to the read replica as in `get_engine`.
+    """
+    global async_engine
+    workload = workload or current_workload()
+    if readonly and replica_router.use_replica(consistency_key):
+        try:
+            if workload not in _async_replica_engines:
+                _async_replica_engines[workload] = _create_async_engine(workload, DB_READ_REPLICA_HOST)
+            return _async_replica_engines[workload]
+        except Exception as e:
+            replica_router.mark_down(e)
+
+    if workload == WORKLOAD_API and async_engine is not None:
+        return async_engine
+
+    if os.getenv("TESTING"):
+        if async_engine is None:
+            from unittest.mock import MagicMock
+            logger.info("TESTING mode: using MagicMock async engine")
+            async_engine = MagicMock()
+        return async_engine
+
+    # Engine creation does not connect, and the event loop runs it in a single thread.
+    if workload == WORKLOAD_API:
+        async_engine = _create_async_engine(workload)
+        return async_engine
+    if workload not in _async_engines:
+        _async_engines[workload] = _create_async_engine(workload)
+    return _async_engines[workload]
+
+
+async def get_async_connection() -> AsyncIterator[AsyncConnection]:
+    """
+    FastAPI dependency yielding a connection of the async engine, returned to the
+    pool at the end of the request. Changes must be committed explicitly.
+    """
+    async with get_async_engine().connect() as connection:
+        yield connection
+
 
-        elif cloud_provider == "azure":
-            encoded_password = urllib.parse.quote_plus(db_password) if db_password else ""
-            connection_string = (
-                f"postgresql+psycopg2://{db_username}:{encoded_password}@{db_host}:5432/{db_name}?sslmode=require"
-            )
-            logger.info(f"Creating Azure engine for {db_host}")
-            engine = create_engine(
-                connection_string,
-                pool_pre_ping=True,
-                pool_recycle=300,
-            )
-            logger.info("Azure engine created successfully")
-
-            # Test the connection immediately
-            with engine.connect() as test_conn:
-                result = test_conn.execute(text("SELECT CURRENT_TIMESTAMP"))
-                logger.info(f"✅ Azure Database connection test passed: {result.scalar()}")
-
-        else:  # local or default
-            logger.info(f"Creating local engine for {db_host}")
-            encoded_password = urllib.parse.quote_plus(db_password) if db_password else ""
-            connection_string = (
-                f"postgresql+psycopg2://{db_username}:{encoded_password}@{db_host}:5432/{db_name}"
-            )
-            engine = create_engine(
-                connection_string,
-                pool_pre_ping=True,
-                pool_recycle=300,
+# --- Read Replica ---
+
+# Read-only queries that tolerate slightly stale data (metrics, lists, histories) can be
+# served by a read replica, to keep them off the primary that takes the writes. Routing
+# falls back to the primary:
+#   - when no replica is configured (DB_READ_REPLICA_HOST), or it cannot be reached;
+#   - while its replication lag, checked in the background every
+#     DB_READ_REPLICA_LAG_CHECK_SECONDS, exceeds DB_READ_REPLICA_MAX_LAG_SECONDS
+#     (and until the first check succeeds);
+#   - for a user who sent a write request within DB_READ_YOUR_WRITES_SECONDS, when the
+#     caller passes their ID as `consistency_key`, so that e.g. `load-draft` right after a
+#     save returns what was saved. Writes are recorded in Redis, so that every API
+#     worker sees them.
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaRouter:
+    """
+    Decides whether read-only queries may use the read replica.
+    """
+
+    def __init__(
+        self,
+        host: str = DB_READ_REPLICA_HOST,
+        max_lag_seconds: float = DB_READ_REPLICA_MAX_LAG_SECONDS,
+        lag_check_seconds: float = DB_READ_REPLICA_LAG_CHECK_SECONDS,
+        retry_seconds: float = DB_READ_REPLICA_RETRY_SECONDS,
+        read_your_writes_seconds: int = DB_READ_YOUR_WRITES_SECONDS,
+    ):
+        self.host = host
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        self.retry_seconds = retry_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.lag_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+        self._checking = False
+        self._checked_at: Optional[float] = None
+        self._down_until = 0.0
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.host)
+
+    def record_write(self, consistency_key: Optional[str]):
+        """Sends the reads made for `consistency_key` to the primary for a while."""
+        if not self.enabled or not consistency_key:
+            return
+        try:
+            redis_client.setex(
+                f"{RECENT_WRITE_KEY_PREFIX}{consistency_key}", self.read_your_writes_seconds, "1"
             )
+        except Exception as e:
+            logger.warning(f"Could not record a recent write for {consistency_key}: {e}")
+
+    def _wrote_recently(self, consistency_key: str) -> bool:
+        try:
+            return bool(redis_client.exists(f"{RECENT_WRITE_KEY_PREFIX}{consistency_key}"))
+        except Exception:
+            # Without the marker, the primary is the safe choice.
+            return True
 
-            # Test the connection immediately
-            with engine.connect() as test_conn:
-                result = test_conn.execute(text("SELECT CURRENT_TIMESTAMP"))
-                logger.info(f"✅ Local Database connection test passed: {result.scalar()}")
+    def use_replica(self, consistency_key: Optional[str] = None) -> bool:
+        """Returns True if a read-only query (for `consistency_key`) may use the replica."""
+        if not self.enabled:
+            return False
+        self._schedule_lag_check()
+        use = (
+            time.monotonic() >= self._down_until
+            and self.lag_seconds is not None
+            and self.lag_seconds <= self.max_lag_seconds
+            and not (consistency_key and self._wrote_recently(consistency_key))
+        )
+        with self._lock:
+            if use:
+                self.replica_reads += 1
+            else:
+                self.primary_reads += 1
+        return use
+
+    def mark_down(self, error: Exception):
+        """Sends every read to the primary for `retry_seconds` after a replica failure."""
+        with self._lock:
+            self.failures += 1
+            self._down_until = time.monotonic() + self.retry_seconds
+        logger.warning(f"Read replica unavailable, using the primary for {self.retry_seconds}s: {error}")
+
+    def _schedule_lag_check(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._checking or now < self._down_until or (
+                self._checked_at is not None and now - self._checked_at < self.lag_check_seconds
+            ):
+                return
+            self._checking = True
+            self._checked_at = now
+        # Requests never wait for the check, which may have to open a connection.
+        threading.Thread(target=self.check_lag, daemon=True, name="replica-lag-check").start()
+
+    def check_lag(self) -> Optional[float]:
+        """Measures the replication lag of the replica, in seconds."""
+        try:
+            with _engines_lock:
+                if WORKLOAD_BACKGROUND not in _replica_engines:
+                    _replica_engines[WORKLOAD_BACKGROUND] = _create_engine(WORKLOAD_BACKGROUND, self.host)
+                replica = _replica_engines[WORKLOAD_BACKGROUND]
+            with replica.connect() as connection:
+                self.lag_seconds = float(connection.execute(REPLICA_LAG_QUERY).scalar() or 0)
+            if self.lag_seconds > self.max_lag_seconds:
+                logger.warning(f"Read replica is {self.lag_seconds:.1f}s behind, using the primary")
+        except Exception as e:
+            self.lag_seconds = None
+            self.mark_down(e)
+        finally:
+            with self._lock:
+                self._checking = False
+        return self.lag_seconds
+
+    def stats(self) -> dict:
+        """Returns the routing counters, used by the /health/db-pools endpoint."""
+        return {
+            "enabled": self.enabled,
+            "available": self.enabled and time.monotonic() >= self._down_until,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "failures": self.failures,
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+class AsyncpgPool:
+    """
+    asyncpg-style pool (`acquire()` yielding an `asyncpg.Connection`) backed by the async
+    engine's pool, for code written against the asyncpg API (`TemplateService`).
+    """
 
-    except Exception as e:
-        logger.error(f"Failed to create engine for {cloud_provider}: {e}", exc_info=True)
-        raise
+    def __init__(self, engine_getter=get_async_engine):
+        self._engine_getter = engine_getter
+
+    @asynccontextmanager
+    async def acquire(self):
+        async with self._engine_getter().connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            yield raw_connection.driver_connection
 
-    return engine
 
+async_pool = AsyncpgPool()
 
 
+async def dispose_async_engine():
+    """Closes the connections of the async engines (on shutdown)."""
+    global async_engine
+    for created in [async_engine, *_async_engines.values(), *_async_replica_engines.values()]:
+        if isinstance(created, AsyncEngine):
+            await created.dispose()
+    async_engine = None
+    _async_engines.clear()
+    _async_replica_engines.clear()
+
+
+def pool_stats() -> dict:
+    """
+    Returns the configuration of every workload pool and the gauges and checkout
+    metrics of those created in this process, used by the /health/db-pools endpoint.
+    """
+    configs = {workload: PoolConfig.from_env(workload) for workload in WORKLOADS}
+    created = {}
+    for kind, engines in (
+        ("sync", {WORKLOAD_API: engine, **_engines}),
+        ("async", {WORKLOAD_API: async_engine, **_async_engines}),
+        ("sync-replica", _replica_engines),
+        ("async-replica", _async_replica_engines),
+    ):
+        for workload, created_engine in engines.items():
+            if isinstance(created_engine, AsyncEngine):
+                created_engine = created_engine.sync_engine
+            if isinstance(created_engine, Engine) and hasattr(created_engine.pool, "stats"):
+                created[f"{kind}:{workload}"] = created_engine.pool.stats()
+
+    def max_connections(replica: bool) -> int:
+        return sum(
+            configs[name.split(":", 1)[1]].max_connections
+            for name in created
+            if name.split(":", 1)[0].endswith("-replica") == replica
+        )
+
+    return {
+        "workloads": {workload: config.as_dict() for workload, config in configs.items()},
+        "pools": created,
+        # Connections this process can hold open with the pools it has created; sum it
+        # over the processes (web workers, job workers) to size `max_connections`.
+        "max_connections": max_connections(replica=False),
+        "replica_max_connections": max_connections(replica=True),
+        "replica": replica_router.stats(),
+    }
 
 
 def test_connection():
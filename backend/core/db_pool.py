@@ -0,0 +1,247 @@
+#  Standard Library
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+#  Third-Party Libraries
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module configures and instruments the database connection pools.
+#
+# Each process keeps one pool per workload class, so that long background work cannot
+# exhaust the connections the API needs (and the other way round):
+#
+#   - "api": requests served by the web workers (the default);
+#   - "background": generation tasks, the job worker, SharePoint sync and other
+#     background tasks;
+#   - "metrics": the dashboard aggregation queries.
+#
+# The workload of the code running in the current context is held in a context variable
+# (`db_workload` / `with_db_workload`), so that `get_engine()` and `get_async_engine()`
+# pick the right pool without threading an argument through every helper.
+#
+# Every pool is sized by DB_POOL_<WORKLOAD>_SIZE, DB_POOL_<WORKLOAD>_MAX_OVERFLOW,
+# DB_POOL_<WORKLOAD>_TIMEOUT (seconds to wait for a free connection) and
+# DB_POOL_<WORKLOAD>_STATEMENT_TIMEOUT_MS (0 = no limit), and records its checkout
+# latency, waits and timeouts, reported by the /health/db-pools endpoint.
+
+WORKLOAD_API = "api"
+WORKLOAD_BACKGROUND = "background"
+WORKLOAD_METRICS = "metrics"
+
+WORKLOAD_DEFAULTS = {
+    WORKLOAD_API: {"size": 5, "max_overflow": 10, "timeout": 30, "statement_timeout_ms": 30000},
+    WORKLOAD_BACKGROUND: {"size": 2, "max_overflow": 3, "timeout": 60, "statement_timeout_ms": 0},
+    WORKLOAD_METRICS: {"size": 2, "max_overflow": 3, "timeout": 10, "statement_timeout_ms": 60000},
+}
+WORKLOADS = tuple(WORKLOAD_DEFAULTS)
+
+# Checkout latencies kept per pool for the percentiles.
+POOL_LATENCY_SAMPLES = 1000
+
+
+class PoolConfig:
+    """
+    Sizing of the connection pool of one workload.
+    """
+
+    def __init__(self, workload: str, size: int, max_overflow: int, timeout: float, statement_timeout_ms: int):
+        self.workload = workload
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.statement_timeout_ms = statement_timeout_ms
+
+    @classmethod
+    def from_env(cls, workload: str) -> "PoolConfig":
+        """Reads the DB_POOL_<WORKLOAD>_* variables, falling back to the workload defaults."""
+        if workload not in WORKLOAD_DEFAULTS:
+            raise ValueError(f"Unknown database workload: {workload!r}")
+        defaults = WORKLOAD_DEFAULTS[workload]
+        prefix = f"DB_POOL_{workload.upper()}_"
+        return cls(
+            workload,
+            size=max(1, int(os.getenv(prefix + "SIZE", defaults["size"]))),
+            max_overflow=max(0, int(os.getenv(prefix + "MAX_OVERFLOW", defaults["max_overflow"]))),
+            timeout=float(os.getenv(prefix + "TIMEOUT", defaults["timeout"])),
+            statement_timeout_ms=max(0, int(os.getenv(prefix + "STATEMENT_TIMEOUT_MS", defaults["statement_timeout_ms"]))),
+        )
+
+    @property
+    def max_connections(self) -> int:
+        """Connections the pool can hold open at the same time."""
+        return self.size + self.max_overflow
+
+    def engine_kwargs(self) -> dict:
+        """Pool arguments for `create_engine` / `create_async_engine`."""
+        return {"pool_size": self.size, "max_overflow": self.max_overflow, "pool_timeout": self.timeout}
+
+    def as_dict(self) -> dict:
+        return {
+            "size": self.size,
+            "max_overflow": self.max_overflow,
+            "timeout": self.timeout,
+            "statement_timeout_ms": self.statement_timeout_ms,
+            "max_connections": self.max_connections,
+        }
+
+
+class PoolMetrics:
+    """
+    Checkout counters and latencies of one pool. Thread-safe.
+    """
+
+    def __init__(self, samples: int = POOL_LATENCY_SAMPLES):
+        self._lock = threading.Lock()
+        self._latencies_ms = deque(maxlen=samples)
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.max_checkout_ms = 0.0
+
+    def record(self, elapsed_ms: float, waited: bool, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self._latencies_ms.append(elapsed_ms)
+            if waited:
+                self.waits += 1
+            self.max_checkout_ms = max(self.max_checkout_ms, elapsed_ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies_ms)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2)
+
+        return {
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "checkout_p50_ms": percentile(0.50),
+            "checkout_p95_ms": percentile(0.95),
+            "checkout_max_ms": round(self.max_checkout_ms, 2),
+        }
+
+
+class _InstrumentedPoolMixin:
+    """Times the checkouts of a `QueuePool` and counts those that had to wait."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        # No idle connection and no overflow left: the checkout waits for a return.
+        waited = self.checkedin() == 0 and -1 < self._max_overflow <= self._overflow
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record((time.perf_counter() - started) * 1000, waited, timed_out=True)
+            raise
+        self.metrics.record((time.perf_counter() - started) * 1000, waited)
+        return connection
+
+    def recreate(self):
+        # `engine.dispose()` replaces the pool; the counters carry over.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict:
+        """Returns the pool gauges and checkout metrics."""
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            **self.metrics.stats(),
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """`QueuePool` of the sync engines, with checkout metrics."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """`AsyncAdaptedQueuePool` of the asyncio engines, with checkout metrics."""
+
+
+def install_statement_timeout(engine, statement_timeout_ms: int):
+    """Sets `statement_timeout` on every new connection of `engine` (0 = no limit)."""
+    if not statement_timeout_ms:
+        return
+    statement = f"SET statement_timeout = {int(statement_timeout_ms)}"
+
+    if isinstance(engine, AsyncEngine):
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_async_statement_timeout(dbapi_connection, connection_record):
+            dbapi_connection.run_async(lambda connection: connection.execute(statement))
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_statement_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(statement)
+        cursor.close()
+        # pg8000 and psycopg2 open a transaction implicitly; the setting must outlive it.
+        dbapi_connection.commit()
+
+
+# --- Workload of the current context ---
+
+_db_workload: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "db_workload", default=None
+)
+
+
+def current_workload(default: str = WORKLOAD_API) -> str:
+    """Returns the database workload of the current context."""
+    return _db_workload.get() or default
+
+
+@contextmanager
+def db_workload(workload: str):
+    """Makes the database connections opened within the block use the `workload` pool."""
+    if workload not in WORKLOAD_DEFAULTS:
+        raise ValueError(f"Unknown database workload: {workload!r}")
+    token = _db_workload.set(workload)
+    try:
+        yield
+    finally:
+        _db_workload.reset(token)
+
+
+def with_db_workload(workload: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wraps a (sync or async) function so that its connections use the `workload` pool."""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with db_workload(workload):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with db_workload(workload):
+            return func(*args, **kwargs)
+    return wrapper
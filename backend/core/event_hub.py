@@ -0,0 +1,167 @@
+#  Standard Library
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+#  Internal Modules
+from backend.core.redis import DictStorage, create_async_redis_client, redis_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module relays Redis pub/sub messages to the SSE endpoints of this process.
+#
+# Each API worker holds a single `redis.asyncio` connection with one pattern subscription
+# covering every progress channel (`knowledge_card_generation_channel:*`,
+# `knowledge_card_ingest_channel:*`, `proposal_generation_channel:*`). A reader task in
+# the event loop receives the messages and puts them in the queues of the streams
+# subscribed to their channel, so that open streams cost no Redis connection and no
+# polling: they just await their queue.
+#
+# Without Redis, the same subscription is made on the in-memory store
+# (see `backend.core.memory_store`), which delivers the messages published in-process.
+
+# Glob pattern of the channels relayed by the hub.
+EVENT_HUB_PATTERN = os.getenv("EVENT_HUB_PATTERN", "*_channel:*")
+# Messages a stream can have waiting; beyond this, its oldest ones are dropped.
+EVENT_HUB_MAX_PENDING_MESSAGES = int(os.getenv("EVENT_HUB_MAX_PENDING_MESSAGES", "1000"))
+RECONNECT_MAX_DELAY_SECONDS = 30
+
+
+class Subscription:
+    """
+    The messages published on one channel, as received by one stream.
+    """
+
+    def __init__(self, channel: str, max_pending: int):
+        self.channel = channel
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Returns the next message, or None if none arrives within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventHub:
+    """
+    Per-process fan-out of a Redis pattern subscription to in-process subscribers.
+    """
+
+    def __init__(self, pattern: str = EVENT_HUB_PATTERN, max_pending: int = EVENT_HUB_MAX_PENDING_MESSAGES):
+        self.pattern = pattern
+        self.max_pending = max_pending
+        self._subscriptions: Dict[str, set] = {}
+        self._client = None
+        self._reader: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribed: Optional[asyncio.Event] = None
+        self.received = 0
+        self.dropped = 0
+        self.reconnects = 0
+
+    def _open_pubsub(self):
+        if isinstance(redis_client, DictStorage):
+            return redis_client.pubsub()
+        if self._client is None:
+            # The async client is bound to the event loop running the reader.
+            self._client = create_async_redis_client()
+        return self._client.pubsub(ignore_subscribe_messages=True)
+
+    async def start(self):
+        """Starts the reader task in the running event loop, if it is not running yet."""
+        loop = asyncio.get_running_loop()
+        if self._reader is None or self._reader.done() or self._loop is not loop:
+            if self._loop is not loop:
+                self._client = None
+            self._loop = loop
+            self._subscribed = asyncio.Event()
+            self._reader = loop.create_task(self._read())
+        await self._subscribed.wait()
+
+    async def _read(self):
+        delay = 1
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._open_pubsub()
+                await pubsub.psubscribe(self.pattern)
+                self._subscribed.set()
+                delay = 1
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+                    if message and message.get("type") in ("message", "pmessage"):
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.reconnects += 1
+                logger.warning(f"Event hub lost its subscription, reconnecting in {delay}s: {e}")
+                # Streams keep waiting instead of failing while Redis is unreachable.
+                self._subscribed.set()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, channel: str, data: str):
+        self.received += 1
+        for subscription in list(self._subscriptions.get(channel, ())):
+            if subscription.queue.full():
+                # A slow client loses its oldest messages rather than holding up the others.
+                subscription.queue.get_nowait()
+                self.dropped += 1
+            subscription.queue.put_nowait(data)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        """
+        Receives the messages published on `channel` while the context is open.
+        Messages published before entering it are not received.
+        """
+        await self.start()
+        subscription = Subscription(channel, self.max_pending)
+        self._subscriptions.setdefault(channel, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self._subscriptions.get(channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[channel]
+
+    async def close(self):
+        """Stops the reader task and closes its connection."""
+        if self._reader is not None and not self._reader.done():
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        self._reader = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        """Returns the hub counters, used by the health endpoint."""
+        return {
+            "running": self._reader is not None and not self._reader.done(),
+            "channels": len(self._subscriptions),
+            "subscribers": sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+            "received": self.received,
+            "dropped": self.dropped,
+            "reconnects": self.reconnects,
+        }
+
+
+event_hub = EventHub()
@@ -28,14 +28,24 @@ if missing_vars:
 # This object will be used by the CrewAI agents to interact with the Azure OpenAI service.
 from crewai import LLM
 
+# When enabled, completions are streamed and each chunk is forwarded to the proposal
+# generation SSE stream (see backend/utils/generation_events.py).
+LLM_STREAMING_ENABLED = os.getenv("LLM_STREAMING_ENABLED", "false").lower() in ("1", "true")
+
 llm = LLM(
     model=f"azure/{os.getenv('AZURE_DEPLOYMENT_NAME')}",
     api_base=os.getenv("AZURE_OPENAI_ENDPOINT"),
     api_key=os.getenv("AZURE_OPENAI_API_KEY"),
     api_version=os.getenv("OPENAI_API_VERSION"),
-    timeout=30
+    timeout=30,
+    stream=LLM_STREAMING_ENABLED,
 )
 
+# Registers the quota-aware scheduler in front of every agent LLM call, and the
+# per-kickoff usage accounting.
+import backend.core.llm_rate_limiter  # noqa: E402,F401
+import backend.core.llm_usage  # noqa: E402,F401
+
 def get_embedder_config():
     """
     Returns the configuration for the Azure OpenAI embedder.
@@ -0,0 +1,133 @@
+#  Standard Library
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+#  Internal Modules
+from backend.core.db_pool import current_workload, with_db_workload
+from backend.core.llm_rate_limiter import (
+    PRIORITY_INTERACTIVE,
+    current_priority,
+    with_llm_priority,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module runs blocking CrewAI kickoffs off the event loop.
+# `crew.kickoff()` is synchronous and can take minutes; calling it directly from an
+# `async def` endpoint freezes every other request served by the same worker.
+# Calls are instead dispatched to a bounded, per-process thread pool, and the
+# endpoints simply await the result.
+
+# Maximum number of crew kickoffs running at the same time in this worker process.
+LLM_EXECUTOR_MAX_WORKERS = max(1, int(os.getenv("LLM_EXECUTOR_MAX_WORKERS", "4")))
+# Maximum number of kickoffs waiting for a free slot before new ones are rejected (0 = unbounded).
+LLM_EXECUTOR_MAX_QUEUE = max(0, int(os.getenv("LLM_EXECUTOR_MAX_QUEUE", "20")))
+
+
+class LLMQueueFullError(Exception):
+    """
+    Raised when too many LLM calls are already waiting for a free slot.
+    The API answers it with a 503 (see `core/middleware.py`).
+    """
+
+
+class LLMExecutor:
+    """
+    A bounded thread pool for blocking LLM calls, with basic load metrics.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int = 0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="llm-exec"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait_ms = 0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Runs `func(*args, **kwargs)` on the executor and awaits its result.
+
+        Raises:
+            LLMQueueFullError: If the queue of waiting calls is full.
+        """
+        with self._lock:
+            if self.max_queue and self._queued >= self.max_queue:
+                self._rejected += 1
+                logger.warning(
+                    f"LLM executor queue full ({self._queued} waiting), rejecting call"
+                )
+                raise LLMQueueFullError(
+                    f"LLM executor queue full ({self._queued} calls waiting)"
+                )
+            self._queued += 1
+
+        enqueued_at = time.monotonic()
+
+        def _tracked():
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait_ms += int((time.monotonic() - enqueued_at) * 1000)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self._failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+            return result
+
+        def _release_if_cancelled(future):
+            # A call cancelled while waiting for a slot never reaches `_tracked`.
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        future = self._executor.submit(_tracked)
+        future.add_done_callback(_release_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        """Returns a snapshot of the executor load, used by the health endpoint."""
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_queue_wait_ms": int(self._total_wait_ms / started) if started else 0,
+            }
+
+
+llm_executor = LLMExecutor(LLM_EXECUTOR_MAX_WORKERS, LLM_EXECUTOR_MAX_QUEUE)
+
+
+async def run_in_llm_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Awaits a blocking LLM call on the shared per-worker executor. Calls made from a
+    request are interactive; background jobs keep their own priority and database pool.
+    """
+    priority = current_priority(default=PRIORITY_INTERACTIVE)
+    func = with_db_workload(current_workload(), with_llm_priority(priority, func))
+    return await llm_executor.run(functools.partial(func, *args, **kwargs))
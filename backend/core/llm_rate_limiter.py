@@ -0,0 +1,303 @@
+#  Standard Library
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Optional, Tuple
+
+#  Third-Party Libraries
+from crewai.events import LLMCallFailedEvent, crewai_event_bus
+from crewai.hooks.llm_hooks import register_before_llm_call_hook
+
+#  Internal Modules
+from backend.core.redis import redis_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module keeps LLM calls within the Azure OpenAI quota of the deployment.
+#
+# Every agent LLM call goes through a token bucket for tokens-per-minute and one for
+# requests-per-minute, shared by all API and worker processes through Redis. The cost
+# of a call is estimated before it is sent (prompt characters / 4, plus the expected
+# completion size). A call that does not fit waits until the buckets have refilled,
+# instead of being sent, rejected with a 429 and retried by the client library.
+#
+# Calls are admitted by priority. Interactive calls (a user waiting on a section) may
+# drain the buckets; background generations must leave a share of the quota untouched,
+# and scripts (seeding, card population) a larger one, so that a running full-proposal
+# generation or batch script does not starve the users in front of the UI.
+#
+# Limits default to 0, which disables the limiter.
+
+LLM_RATE_LIMIT_TPM = max(0, int(os.getenv("LLM_RATE_LIMIT_TPM", "0")))
+LLM_RATE_LIMIT_RPM = max(0, int(os.getenv("LLM_RATE_LIMIT_RPM", "0")))
+# Tokens expected in a completion, added to the prompt estimate.
+LLM_RATE_LIMIT_COMPLETION_TOKENS = int(os.getenv("LLM_RATE_LIMIT_COMPLETION_TOKENS", "1000"))
+# Longest a call waits for quota; after that it is sent anyway.
+LLM_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT_SECONDS", "120"))
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+PRIORITY_SCRIPT = "script"
+
+# Share of each bucket a priority class must leave for higher priorities.
+PRIORITY_RESERVES = {
+    PRIORITY_INTERACTIVE: 0.0,
+    PRIORITY_BACKGROUND: 0.2,
+    PRIORITY_SCRIPT: 0.4,
+}
+
+KEY_PREFIX = "llm_rate"
+
+# Refills both buckets to the current time, then takes the cost of the call if both
+# have enough left above the caller's reserve. Returns {admitted, retry_after_ms}.
+_TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local reserve = tonumber(ARGV[5])
+local limits = {tonumber(ARGV[1]), tonumber(ARGV[2])}
+local costs = {tonumber(ARGV[3]), tonumber(ARGV[4])}
+local levels = {}
+local wait = 0
+for i = 1, 2 do
+    local limit = limits[i]
+    if limit > 0 then
+        local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+        local level = tonumber(state[1]) or limit
+        local ts = tonumber(state[2]) or now
+        level = math.min(limit, level + (now - ts) * limit / 60)
+        levels[i] = level
+        local need = math.min(limit, costs[i] + reserve * limit)
+        if level < need then
+            wait = math.max(wait, (need - level) * 60 / limit)
+        end
+    end
+end
+for i = 1, 2 do
+    local limit = limits[i]
+    if limit > 0 then
+        local level = levels[i]
+        if wait == 0 then
+            level = level - math.min(limit, costs[i])
+        end
+        redis.call('HSET', KEYS[i], 'level', level, 'ts', now)
+        redis.call('EXPIRE', KEYS[i], 120)
+    end
+end
+if wait == 0 then
+    return {1, 0}
+end
+return {0, math.ceil(wait * 1000)}
+"""
+
+_llm_priority: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "llm_priority", default=None
+)
+
+
+def current_priority(default: str = PRIORITY_SCRIPT) -> str:
+    """Returns the priority of LLM calls made from the current context."""
+    return _llm_priority.get() or default
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """Sets the priority of the LLM calls made within the block."""
+    token = _llm_priority.set(priority)
+    try:
+        yield
+    finally:
+        _llm_priority.reset(token)
+
+
+def with_llm_priority(priority: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wraps a (sync or async) function so that its LLM calls run at `priority`."""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with llm_priority(priority):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with llm_priority(priority):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def estimate_tokens(messages, completion_tokens: int = LLM_RATE_LIMIT_COMPLETION_TOKENS) -> int:
+    """Roughly estimates the tokens of a chat call (about 4 characters per token)."""
+    characters = 0
+    for message in messages or []:
+        content = message.get("content") if isinstance(message, dict) else message
+        if isinstance(content, list):
+            content = " ".join(
+                part.get("text", "") if isinstance(part, dict) else str(part) for part in content
+            )
+        characters += len(str(content or ""))
+    return characters // 4 + completion_tokens
+
+
+class LLMRateLimiter:
+    """
+    Priority-aware token buckets for the TPM and RPM quotas of the LLM deployment,
+    kept in Redis when available and in-process otherwise.
+    """
+
+    def __init__(
+        self,
+        tpm: int,
+        rpm: int,
+        max_wait_seconds: float = LLM_RATE_LIMIT_MAX_WAIT_SECONDS,
+        client=None,
+        deployment: Optional[str] = None,
+    ):
+        self.tpm = tpm
+        self.rpm = rpm
+        self.max_wait_seconds = max_wait_seconds
+        self._client = client if client is not None else redis_client
+        deployment = deployment or os.getenv("AZURE_DEPLOYMENT_NAME", "default")
+        self._keys = [f"{KEY_PREFIX}:{deployment}:tokens", f"{KEY_PREFIX}:{deployment}:requests"]
+        self._script = None
+        self._lock = threading.Lock()
+        self._local_levels = [float(tpm), float(rpm)]
+        self._local_ts = time.monotonic()
+        self._admitted_tokens: "deque[Tuple[float, int]]" = deque()
+        self._counters = {
+            "admitted": {priority: 0 for priority in PRIORITY_RESERVES},
+            "throttled": 0,
+            "wait_timeouts": 0,
+            "rate_limit_errors": 0,
+            "total_wait_ms": 0,
+            "max_wait_ms": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.tpm > 0 or self.rpm > 0
+
+    def _try_acquire_redis(self, tokens: int, reserve: float) -> Tuple[bool, float]:
+        if self._script is None:
+            self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+        admitted, retry_after_ms = self._script(
+            keys=self._keys, args=[self.tpm, self.rpm, tokens, 1, reserve]
+        )
+        return bool(int(admitted)), int(retry_after_ms) / 1000
+
+    def _try_acquire_local(self, tokens: int, reserve: float) -> Tuple[bool, float]:
+        with self._lock:
+            now = time.monotonic()
+            elapsed, self._local_ts = now - self._local_ts, now
+            wait = 0.0
+            for i, (limit, cost) in enumerate(((self.tpm, tokens), (self.rpm, 1))):
+                if limit <= 0:
+                    continue
+                self._local_levels[i] = min(limit, self._local_levels[i] + elapsed * limit / 60)
+                need = min(limit, cost + reserve * limit)
+                if self._local_levels[i] < need:
+                    wait = max(wait, (need - self._local_levels[i]) * 60 / limit)
+            if wait:
+                return False, wait
+            for i, (limit, cost) in enumerate(((self.tpm, tokens), (self.rpm, 1))):
+                if limit > 0:
+                    self._local_levels[i] -= min(limit, cost)
+            return True, 0.0
+
+    def try_acquire(self, tokens: int, priority: str = PRIORITY_SCRIPT) -> Tuple[bool, float]:
+        """
+        Takes `tokens` (and one request) from the buckets if the quota allows it.
+
+        Returns:
+            (admitted, retry_after_seconds)
+        """
+        reserve = PRIORITY_RESERVES.get(priority, PRIORITY_RESERVES[PRIORITY_SCRIPT])
+        if hasattr(self._client, "register_script"):
+            try:
+                return self._try_acquire_redis(tokens, reserve)
+            except Exception as e:
+                logger.warning(f"LLM rate limiter could not use Redis, limiting in-process: {e}")
+        return self._try_acquire_local(tokens, reserve)
+
+    def acquire(self, tokens: int, priority: str = PRIORITY_SCRIPT) -> float:
+        """
+        Blocks until the call fits in the quota, or until `max_wait_seconds` have passed.
+
+        Returns:
+            The time waited, in seconds.
+        """
+        if not self.enabled:
+            return 0.0
+
+        started = time.monotonic()
+        throttled = False
+        while True:
+            admitted, retry_after = self.try_acquire(tokens, priority)
+            waited = time.monotonic() - started
+            if admitted:
+                break
+            if waited + retry_after > self.max_wait_seconds:
+                logger.warning(
+                    f"LLM call ({priority}, ~{tokens} tokens) waited {waited:.1f}s for quota, sending it anyway"
+                )
+                with self._lock:
+                    self._counters["wait_timeouts"] += 1
+                break
+            throttled = True
+            time.sleep(min(max(retry_after, 0.05), 1.0))
+
+        waited_ms = int(waited * 1000)
+        with self._lock:
+            self._counters["admitted"][priority] = self._counters["admitted"].get(priority, 0) + 1
+            self._counters["throttled"] += int(throttled)
+            self._counters["total_wait_ms"] += waited_ms
+            self._counters["max_wait_ms"] = max(self._counters["max_wait_ms"], waited_ms)
+            now = time.monotonic()
+            self._admitted_tokens.append((now, tokens))
+            while self._admitted_tokens and self._admitted_tokens[0][0] < now - 60:
+                self._admitted_tokens.popleft()
+        return waited
+
+    def record_rate_limit_error(self):
+        with self._lock:
+            self._counters["rate_limit_errors"] += 1
+
+    def stats(self) -> dict:
+        """Returns the limiter counters, used by the health endpoint."""
+        with self._lock:
+            now = time.monotonic()
+            admitted = sum(self._counters["admitted"].values())
+            return {
+                "enabled": self.enabled,
+                "tpm_limit": self.tpm,
+                "rpm_limit": self.rpm,
+                **self._counters,
+                "admitted": dict(self._counters["admitted"]),
+                "avg_wait_ms": int(self._counters["total_wait_ms"] / admitted) if admitted else 0,
+                # Estimated tokens admitted by this process over the last minute.
+                "effective_tpm": sum(t for ts, t in self._admitted_tokens if ts >= now - 60),
+            }
+
+
+llm_rate_limiter = LLMRateLimiter(LLM_RATE_LIMIT_TPM, LLM_RATE_LIMIT_RPM)
+
+
+def _before_llm_call(context) -> None:
+    if llm_rate_limiter.enabled:
+        llm_rate_limiter.acquire(estimate_tokens(context.messages), current_priority())
+
+
+def _count_rate_limit_errors(source, event: LLMCallFailedEvent):
+    error = str(event.error).lower()
+    if "429" in error or "rate limit" in error or "ratelimit" in error:
+        llm_rate_limiter.record_rate_limit_error()
+
+
+register_before_llm_call_hook(_before_llm_call)
+crewai_event_bus.on(LLMCallFailedEvent)(_count_rate_limit_errors)
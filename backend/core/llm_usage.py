@@ -0,0 +1,219 @@
+#  Standard Library
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+#  Third-Party Libraries
+from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+from crewai.hooks.llm_hooks import register_after_llm_call_hook
+from crewai.llms.base_llm import BaseLLM
+
+try:
+    from crewai.llms.providers.azure.completion import AzureCompletion
+except ImportError:
+    AzureCompletion = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module measures the LLM usage of a crew kickoff: tokens, number of calls, model,
+# latency to the first token and total latency.
+#
+# All crews share one LLM object, so its cumulative counters (and `CrewOutput.token_usage`,
+# which is derived from them) mix up concurrent kickoffs. Instead, each provider response
+# is added to the collector opened with `track_llm_usage()` in the calling context; LLM
+# calls, usage tracking and stream chunks all happen on the thread running the kickoff.
+#
+# Costs are estimated from the per-1K-token prices of the deployment (0 = unknown).
+#
+# The native Azure provider reports no usage for streamed completions and drops the cached
+# prompt tokens of the usage it does report. Streamed requests ask for the usage in a final
+# chunk (`stream_options.include_usage`), which is reported like a complete response, and
+# the cached tokens are read from `prompt_tokens_details` when the API version returns it.
+
+LLM_PRICE_INPUT_PER_1K = float(os.getenv("LLM_PRICE_INPUT_PER_1K", "0"))
+LLM_PRICE_CACHED_INPUT_PER_1K = float(os.getenv("LLM_PRICE_CACHED_INPUT_PER_1K", "0"))
+LLM_PRICE_OUTPUT_PER_1K = float(os.getenv("LLM_PRICE_OUTPUT_PER_1K", "0"))
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """Estimates the cost of a call from the configured prices. Cached tokens are part of the prompt."""
+    uncached = max(0, prompt_tokens - cached_tokens)
+    return (
+        uncached * LLM_PRICE_INPUT_PER_1K
+        + cached_tokens * LLM_PRICE_CACHED_INPUT_PER_1K
+        + completion_tokens * LLM_PRICE_OUTPUT_PER_1K
+    ) / 1000
+
+
+class LLMUsage:
+    """
+    Usage of the LLM calls made within a `track_llm_usage()` block.
+    """
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.llm_calls = 0
+        self.model: Optional[str] = None
+        self.first_token_ms: Optional[int] = None
+        self.latency_ms: Optional[int] = None
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _elapsed_ms(self) -> int:
+        return int((time.monotonic() - self._started) * 1000)
+
+    def add(self, usage_data: dict, model: Optional[str] = None):
+        with self._lock:
+            self.prompt_tokens += int(
+                usage_data.get("prompt_tokens") or usage_data.get("input_tokens") or 0
+            )
+            self.completion_tokens += int(
+                usage_data.get("completion_tokens") or usage_data.get("output_tokens") or 0
+            )
+            self.cached_tokens += int(
+                usage_data.get("cached_tokens") or usage_data.get("cached_prompt_tokens") or 0
+            )
+            self.llm_calls += 1
+            self.model = model or self.model
+
+    def mark_first_token(self):
+        with self._lock:
+            if self.first_token_ms is None:
+                self.first_token_ms = self._elapsed_ms()
+
+    def finish(self):
+        self.latency_ms = self._elapsed_ms()
+
+    @property
+    def estimated_cost(self) -> float:
+        return estimate_cost(self.prompt_tokens, self.completion_tokens, self.cached_tokens)
+
+    def as_dict(self) -> dict:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "llm_calls": self.llm_calls,
+            "model": self.model,
+            "first_token_ms": self.first_token_ms,
+            "latency_ms": self.latency_ms if self.latency_ms is not None else self._elapsed_ms(),
+            "estimated_cost": self.estimated_cost,
+        }
+
+
+_current_usage: contextvars.ContextVar[Optional[LLMUsage]] = contextvars.ContextVar(
+    "llm_usage", default=None
+)
+
+
+@contextmanager
+def track_llm_usage():
+    """Collects the usage of the LLM calls made within the block."""
+    usage = LLMUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        usage.finish()
+        _current_usage.reset(token)
+
+
+_track_token_usage = BaseLLM._track_token_usage_internal
+
+
+def _track_token_usage_with_collector(self, usage_data):
+    _track_token_usage(self, usage_data)
+    usage = _current_usage.get()
+    if usage is not None:
+        try:
+            usage.add(usage_data or {}, getattr(self, "model", None))
+        except Exception as e:
+            logger.warning(f"Could not record LLM usage: {e}")
+
+
+# Providers report the usage of every response through this method; there is no public
+# per-call hook carrying it.
+BaseLLM._track_token_usage_internal = _track_token_usage_with_collector
+
+
+def _mark_first_token(*args):
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.mark_first_token()
+
+
+# Streaming: the first chunk. Otherwise: the first complete response.
+crewai_event_bus.on(LLMStreamChunkEvent)(_mark_first_token)
+register_after_llm_call_hook(_mark_first_token)
+
+
+def _azure_token_usage(usage) -> dict:
+    """Returns the usage of an Azure response (a `CompletionsUsage` mapping), with its cached prompt tokens."""
+    details = usage.get("prompt_tokens_details") or {}
+    return {
+        "prompt_tokens": usage.get("prompt_tokens") or 0,
+        "completion_tokens": usage.get("completion_tokens") or 0,
+        "total_tokens": usage.get("total_tokens") or 0,
+        "cached_tokens": details.get("cached_tokens") or 0,
+    }
+
+
+class _StreamUsageClient:
+    """
+    Wraps the client of an Azure LLM to report the usage of its streamed completions,
+    once the stream has been read.
+    """
+
+    def __init__(self, client, llm):
+        self._client = client
+        self._llm = llm
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def complete(self, **params):
+        response = self._client.complete(**params)
+        return self._report_usage(response) if params.get("stream") else response
+
+    def _report_usage(self, updates):
+        usage = None
+        for update in updates:
+            usage = getattr(update, "usage", None) or usage
+            yield update
+        if usage is None:
+            logger.warning("Streamed completion reported no token usage, recorded as 0 tokens")
+        self._llm._track_token_usage_internal(_azure_token_usage(usage) if usage else {})
+
+
+if AzureCompletion is not None:
+    _prepare_azure_params = AzureCompletion._prepare_completion_params
+    _handle_azure_streaming = AzureCompletion._handle_streaming_completion
+
+    def _prepare_azure_params_with_usage(self, *args, **kwargs):
+        params = _prepare_azure_params(self, *args, **kwargs)
+        if params.get("stream"):
+            extras = dict(params.get("model_extras") or {})
+            extras.setdefault("stream_options", {"include_usage": True})
+            params["model_extras"] = extras
+        return params
+
+    def _handle_azure_streaming_with_usage(self, *args, **kwargs):
+        client = self.client
+        if not isinstance(client, _StreamUsageClient):
+            self.client = _StreamUsageClient(client, self)
+        return _handle_azure_streaming(self, *args, **kwargs)
+
+    def _extract_azure_token_usage(self, response):
+        usage = getattr(response, "usage", None)
+        return _azure_token_usage(usage) if usage else {"total_tokens": 0}
+
+    AzureCompletion._prepare_completion_params = _prepare_azure_params_with_usage
+    AzureCompletion._handle_streaming_completion = _handle_azure_streaming_with_usage
+    AzureCompletion._extract_azure_token_usage = _extract_azure_token_usage
@@ -0,0 +1,462 @@
+#  Standard Library
+import asyncio
+import fnmatch
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+#  Third-Party Libraries
+from redis.exceptions import ResponseError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module provides the in-memory store used in place of Redis when Redis is not
+# reachable (see `backend.core.redis`).
+#
+# It implements the subset of the Redis client API the application uses (strings with
+# expiry, hashes, pub/sub) and behaves like a bounded cache:
+#   - every key can have an expiry (`setex`, `set(ex=...)`, `expire`). Expired keys are
+#     dropped when accessed, and a background thread sweeps the ones nobody reads;
+#   - when the store holds more than `MEMORY_STORE_MAX_ENTRIES` keys, or more than
+#     `MEMORY_STORE_MAX_BYTES` (estimated from the length of keys and values), the least
+#     recently used keys are evicted, like Redis with `maxmemory-policy allkeys-lru`;
+#   - messages published on a channel are delivered to the `pubsub()` subscribers of this
+#     process. Publishing is thread-safe (generation runs in worker threads); subscribers
+#     are coroutines, and use the `redis.asyncio` PubSub API.
+#   - `pipeline()` queues commands and runs them together under the store lock, so like
+#     a Redis MULTI/EXEC no other thread sees the store between them.
+#
+# The store lives in one process: with several API workers, each has its own store, so
+# the fallback is only suitable for single-process deployments.
+
+MEMORY_STORE_MAX_ENTRIES = int(os.getenv("MEMORY_STORE_MAX_ENTRIES", "100000"))
+MEMORY_STORE_MAX_BYTES = int(os.getenv("MEMORY_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+MEMORY_STORE_SWEEP_SECONDS = float(os.getenv("MEMORY_STORE_SWEEP_SECONDS", "30"))
+# Messages a subscriber can have waiting before new ones are dropped.
+PUBSUB_MAX_PENDING_MESSAGES = 1000
+
+# Rough per-key bookkeeping cost, added to the length of the key and value.
+ENTRY_OVERHEAD_BYTES = 64
+
+_WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+
+def _to_str(value: Any) -> Any:
+    """Converts a value the way the Redis client (with `decode_responses=True`) returns it."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+def _size(key: str, value: Any) -> int:
+    if isinstance(value, dict):
+        size = sum(len(str(field)) + len(str(field_value)) for field, field_value in value.items())
+    else:
+        size = len(str(value))
+    return len(str(key)) + size + ENTRY_OVERHEAD_BYTES
+
+
+class MemoryPubSub:
+    """
+    Subscription to channels of a `DictStorage`, with the `redis.asyncio` PubSub API.
+    Subscription confirmations are not delivered as messages.
+    """
+
+    def __init__(self, store: "DictStorage"):
+        self._store = store
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self.channels = set()
+        self.patterns = set()
+
+    def _bind(self):
+        if self._queue is None:
+            self._loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue()
+
+    async def subscribe(self, *channels):
+        self._bind()
+        for channel in channels:
+            self.channels.add(channel)
+            self._store._add_subscriber(channel, self)
+
+    async def unsubscribe(self, *channels):
+        for channel in channels or list(self.channels):
+            self.channels.discard(channel)
+            self._store._remove_subscriber(channel, self)
+
+    async def psubscribe(self, *patterns):
+        """Subscribes to the channels matching glob-style patterns."""
+        self._bind()
+        for pattern in patterns:
+            self.patterns.add(pattern)
+            self._store._add_subscriber(pattern, self, is_pattern=True)
+
+    async def punsubscribe(self, *patterns):
+        for pattern in patterns or list(self.patterns):
+            self.patterns.discard(pattern)
+            self._store._remove_subscriber(pattern, self, is_pattern=True)
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: Optional[float] = 0.0):
+        """
+        Returns the next message, or None if none arrives within `timeout` seconds
+        (0 returns immediately, None waits indefinitely).
+        """
+        if self._queue is None:
+            return None
+        if timeout == 0:
+            try:
+                return self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return None
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        await self.unsubscribe()
+        await self.punsubscribe()
+
+    aclose = close
+
+    def _deliver(self, channel: str, message: Any, pattern: Optional[str] = None) -> bool:
+        """Queues a message from any thread. Returns False if this subscriber is gone."""
+        if self._queue.qsize() >= PUBSUB_MAX_PENDING_MESSAGES:
+            self._store._count("dropped_messages")
+            return True
+        payload = {
+            "type": "pmessage" if pattern else "message",
+            "pattern": pattern,
+            "channel": channel,
+            "data": message,
+        }
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, payload)
+        except RuntimeError:
+            # The subscriber's event loop is closed.
+            return False
+        return True
+
+
+class MemoryPipeline:
+    """
+    Commands queued for a `DictStorage`, with the Redis client Pipeline API: each call
+    returns the pipeline, and `execute()` runs them at once and returns their results.
+    """
+
+    def __init__(self, store: "DictStorage"):
+        self._store = store
+        self._commands = []
+
+    def __getattr__(self, name):
+        command = getattr(self._store, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        commands, self._commands = self._commands, []
+        with self._store._lock:
+            return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+    def reset(self):
+        self._commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.reset()
+
+
+class DictStorage:
+    """
+    An in-memory, bounded substitute for the Redis client: per-key expiry, LRU eviction
+    by entry count and size, and in-process pub/sub.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MEMORY_STORE_MAX_ENTRIES,
+        max_bytes: int = MEMORY_STORE_MAX_BYTES,
+        sweep_seconds: float = MEMORY_STORE_SWEEP_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        # Key -> value (str, or dict for hashes), least recently used first
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._expires: Dict[str, float] = {}
+        self._bytes = 0
+        self._subscribers: Dict[str, set] = {}
+        self._pattern_subscribers: Dict[str, set] = {}
+        self._counters = {
+            "hits": 0, "misses": 0, "evictions": 0, "expirations": 0,
+            "published": 0, "dropped_messages": 0,
+        }
+
+        self._stop = threading.Event()
+        self._sweeper = None
+        if sweep_seconds > 0:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, args=(sweep_seconds,), name="memory-store-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    # --- Internals (called with the lock held) ---
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _expired(self, key: str, now: Optional[float] = None) -> bool:
+        deadline = self._expires.get(key)
+        return deadline is not None and deadline <= (now if now is not None else time.monotonic())
+
+    def _lookup(self, key: str) -> Any:
+        """Returns the live value of a key (None if missing or expired), marking it as recently used."""
+        if key not in self._data:
+            return None
+        if self._expired(key):
+            self._remove(key)
+            self._counters["expirations"] += 1
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def _remove(self, key: str):
+        self._data.pop(key, None)
+        self._bytes -= self._sizes.pop(key, 0)
+        self._expires.pop(key, None)
+
+    def _store(self, key: str, value: Any, ttl: Optional[float] = None, keep_ttl: bool = False):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._resize(key)
+        if ttl is not None:
+            self._expires[key] = time.monotonic() + ttl
+        elif not keep_ttl:
+            self._expires.pop(key, None)
+        self._evict(keep=key)
+
+    def _resize(self, key: str):
+        size = _size(key, self._data[key])
+        self._bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+
+    def _evict(self, keep: str):
+        """Evicts least recently used keys until the store is within its bounds, sparing `keep`."""
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            if oldest == keep:
+                if len(self._data) == 1:
+                    break
+                self._data.move_to_end(keep)
+                continue
+            self._remove(oldest)
+            self._counters["evictions"] += 1
+
+    def _hash(self, name: str, create: bool = False) -> Optional[dict]:
+        value = self._lookup(name)
+        if value is None:
+            if not create:
+                return None
+            value = {}
+            self._store(name, value)
+        if not isinstance(value, dict):
+            raise ResponseError(_WRONGTYPE)
+        return value
+
+    # --- Expiry ---
+
+    def sweep(self) -> int:
+        """Removes the expired keys. Returns how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, deadline in self._expires.items() if deadline <= now]
+            for key in expired:
+                self._remove(key)
+            self._counters["expirations"] += len(expired)
+        return len(expired)
+
+    def _sweep_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"In-memory store sweep failed: {e}")
+
+    def close(self):
+        """Stops the background sweeper."""
+        self._stop.set()
+
+    # --- Strings ---
+
+    def ping(self):
+        return True
+
+    def get(self, key):
+        with self._lock:
+            value = self._lookup(key)
+            if isinstance(value, dict):
+                raise ResponseError(_WRONGTYPE)
+            self._counters["hits" if value is not None else "misses"] += 1
+            return value
+
+    def set(self, key, value, ex=None, px=None, nx=False, xx=False, keepttl=False):
+        """Sets a key-value pair. Returns True, or None when `nx`/`xx` prevented it."""
+        with self._lock:
+            exists = self._lookup(key) is not None
+            if (nx and exists) or (xx and not exists):
+                return None
+            ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+            self._store(key, _to_str(value), ttl, keep_ttl=keepttl)
+            return True
+
+    def setex(self, key, ttl, value):
+        """Sets a key that expires after `ttl` seconds."""
+        return self.set(key, value, ex=ttl)
+
+    def delete(self, *keys):
+        """Deletes keys. Returns how many existed."""
+        with self._lock:
+            deleted = 0
+            for key in keys:
+                if self._lookup(key) is not None:
+                    self._remove(key)
+                    deleted += 1
+            return deleted
+
+    def exists(self, *keys):
+        """Returns how many of the keys exist."""
+        with self._lock:
+            return sum(1 for key in keys if self._lookup(key) is not None)
+
+    def expire(self, key, ttl):
+        """Sets a key's time to live in seconds. Returns False if the key does not exist."""
+        with self._lock:
+            if self._lookup(key) is None:
+                return False
+            self._expires[key] = time.monotonic() + ttl
+            return True
+
+    def ttl(self, key):
+        """Returns a key's remaining time to live: -2 if it does not exist, -1 if it has no expiry."""
+        with self._lock:
+            if self._lookup(key) is None:
+                return -2
+            deadline = self._expires.get(key)
+            return -1 if deadline is None else max(0, int(round(deadline - time.monotonic())))
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._expires.clear()
+            self._bytes = 0
+        return True
+
+    # --- Hashes ---
+
+    def hset(self, name, key=None, value=None, mapping=None):
+        """Sets fields of a hash. Returns how many fields were added."""
+        fields = dict(mapping or {})
+        if key is not None:
+            fields[key] = value
+        with self._lock:
+            stored = self._hash(name, create=True)
+            added = sum(1 for field in fields if field not in stored)
+            stored.update({field: _to_str(field_value) for field, field_value in fields.items()})
+            self._resize(name)
+            self._evict(keep=name)
+            return added
+
+    def hget(self, name, key):
+        with self._lock:
+            return (self._hash(name) or {}).get(key)
+
+    def hmget(self, name, keys, *args):
+        with self._lock:
+            stored = self._hash(name) or {}
+            keys = (list(keys) if isinstance(keys, (list, tuple)) else [keys]) + list(args)
+            return [stored.get(key) for key in keys]
+
+    def hgetall(self, name):
+        with self._lock:
+            return dict(self._hash(name) or {})
+
+    def hdel(self, name, *keys):
+        """Deletes fields of a hash. Returns how many existed; an emptied hash is removed, as in Redis."""
+        with self._lock:
+            stored = self._hash(name)
+            if stored is None:
+                return 0
+            deleted = sum(1 for key in keys if stored.pop(key, None) is not None)
+            if stored:
+                self._resize(name)
+            else:
+                self._remove(name)
+            return deleted
+
+    # --- Pub/Sub ---
+
+    # --- Pipelines ---
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> MemoryPipeline:
+        return MemoryPipeline(self)
+
+    def pubsub(self, **kwargs) -> MemoryPubSub:
+        return MemoryPubSub(self)
+
+    def publish(self, channel, message):
+        """Delivers a message to the subscribers of `channel` in this process. Returns how many received it."""
+        with self._lock:
+            targets = [(subscriber, None, channel) for subscriber in self._subscribers.get(channel, ())]
+            for pattern, subscribers in self._pattern_subscribers.items():
+                if fnmatch.fnmatchcase(channel, pattern):
+                    targets.extend((subscriber, pattern, pattern) for subscriber in subscribers)
+            self._counters["published"] += 1
+        received = 0
+        for subscriber, pattern, subscription in targets:
+            if subscriber._deliver(channel, _to_str(message), pattern):
+                received += 1
+            else:
+                self._remove_subscriber(subscription, subscriber, is_pattern=pattern is not None)
+        return received
+
+    def _add_subscriber(self, channel: str, subscriber: MemoryPubSub, is_pattern: bool = False):
+        registry = self._pattern_subscribers if is_pattern else self._subscribers
+        with self._lock:
+            registry.setdefault(channel, set()).add(subscriber)
+
+    def _remove_subscriber(self, channel: str, subscriber: MemoryPubSub, is_pattern: bool = False):
+        registry = self._pattern_subscribers if is_pattern else self._subscribers
+        with self._lock:
+            subscribers = registry.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del registry[channel]
+
+    def stats(self) -> dict:
+        """Returns the store counters, used by the health endpoint."""
+        with self._lock:
+            return {
+                "keys": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "channels": len(self._subscribers) + len(self._pattern_subscribers),
+                **self._counters,
+            }
@@ -12,6 +12,7 @@ from sqlalchemy import text
 #  Internal Modules
 from backend.core.config import origins
 from backend.core.db import engine
+from backend.core.llm_executor import LLMQueueFullError
 
 # This module contains all custom middleware, exception handlers, and background tasks.
 
@@ -66,6 +67,19 @@ async def custom_http_exception_handler(request: Request, exc: HTTPException):
         response.headers["Access-Control-Allow-Credentials"] = "true"
     return response
 
+async def llm_queue_full_exception_handler(request: Request, exc: LLMQueueFullError):
+    """
+    Answers 503 when a request's LLM call is rejected because the LLM executor
+    of this worker already has too many calls waiting.
+    """
+    return await custom_http_exception_handler(
+        request,
+        HTTPException(
+            status_code=503,
+            detail="The generation service is busy. Please try again in a moment.",
+        ),
+    )
+
 def delete_old_proposals():
     """
     A background task that periodically deletes old, non-finalized proposals
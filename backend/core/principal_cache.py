@@ -0,0 +1,117 @@
+#  Standard Library
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+#  Internal Modules
+from backend.core.redis import redis_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module caches the authenticated principal (user row + roles) built by
+# `get_current_user`, so that most authenticated requests - including the frontend's
+# status polling - do not query the database.
+#
+# The JWT is still decoded and verified on every request; only the database lookup
+# behind it is cached. Principals are kept for a few seconds in-process and for a
+# minute in Redis, keyed by the email carried in the token. Endpoints that change a
+# user's roles call `invalidate()`, which drops the Redis entry and the local copy of the
+# current worker; other workers pick up the change when their short local TTL runs out.
+
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_LOCAL_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_LOCAL_TTL_SECONDS", "10"))
+PRINCIPAL_CACHE_LOCAL_MAX_ENTRIES = 1024
+
+
+def _redis_key(email: str) -> str:
+    return f"principal:{email.lower()}"
+
+
+class PrincipalCache:
+    """
+    Two-tier (in-process + Redis) cache of authenticated principals, with hit/miss counters.
+    """
+
+    def __init__(self, ttl_seconds: int, local_ttl_seconds: int, client=None):
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = min(local_ttl_seconds, ttl_seconds)
+        self._client = client if client is not None else redis_client
+        self._local = {}
+        self._lock = threading.Lock()
+        self._counters = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, email: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+
+        key = email.lower()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._counters["local_hits"] += 1
+                return dict(entry[1])
+            self._local.pop(key, None)
+
+        try:
+            cached = self._client.get(_redis_key(email))
+        except Exception as e:
+            logger.warning(f"Principal cache read failed: {e}")
+            cached = None
+
+        with self._lock:
+            if cached is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["redis_hits"] += 1
+
+        principal = json.loads(cached)
+        self._store_local(key, principal)
+        return dict(principal)
+
+    def set(self, email: str, principal: dict):
+        if not self.enabled:
+            return
+        self._store_local(email.lower(), principal)
+        try:
+            self._client.setex(_redis_key(email), self.ttl_seconds, json.dumps(principal, default=str))
+        except Exception as e:
+            logger.warning(f"Principal cache write failed: {e}")
+
+    def _store_local(self, key: str, principal: dict):
+        with self._lock:
+            if len(self._local) >= PRINCIPAL_CACHE_LOCAL_MAX_ENTRIES:
+                self._local.clear()
+            self._local[key] = (time.monotonic() + self.local_ttl_seconds, dict(principal))
+
+    def invalidate(self, email: Optional[str]):
+        """Forgets a user's principal, e.g. after their roles changed."""
+        if not email:
+            return
+        with self._lock:
+            self._local.pop(email.lower(), None)
+        try:
+            self._client.delete(_redis_key(email))
+        except Exception as e:
+            logger.warning(f"Principal cache invalidation failed for {email}: {e}")
+
+    def stats(self) -> dict:
+        """Returns the hit/miss counters, used by the health endpoint."""
+        with self._lock:
+            hits = self._counters["local_hits"] + self._counters["redis_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+                "local_entries": len(self._local),
+            }
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_LOCAL_TTL_SECONDS)
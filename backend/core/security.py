@@ -1,13 +1,14 @@
 import logging
 #  Standard Library
 from datetime import datetime, timedelta
-from typing import Optional, List, Any
+from typing import AsyncIterator, Optional, List, Any
 import uuid
 
 #  Third-Party Libraries
 import jwt
 from fastapi import Request, HTTPException, Depends
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
 from werkzeug.security import generate_password_hash, check_password_hash
 
 #  Internal Modules
@@ -18,7 +19,8 @@ from backend.core.config import (
     ENTRA_CLIENT_SECRET,
     ENTRA_REDIRECT_URI,
 )
-from backend.core.db import get_engine
+from backend.core.db import get_async_engine, get_engine, replica_router
+from backend.core.principal_cache import principal_cache
 
 # Configure logging for this module.
 logger = logging.getLogger(__name__)
@@ -26,6 +28,9 @@ logger = logging.getLogger(__name__)
 # This module centralizes security-related functions, such as authentication,
 # token handling, and password management.
 
+# Methods that do not modify data; other requests count as writes for replica routing.
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
 
 def get_current_user(request: Request) -> dict:
     """
@@ -35,8 +40,43 @@ def get_current_user(request: Request) -> dict:
     It performs the following steps:
     1. Extracts the 'auth_token' from the request cookies.
     2. Decodes the JWT to get the user's email.
-    3. Queries the database to find the corresponding user.
-    4. Returns the user's information or raises an HTTPException on failure.
+    3. Returns the cached principal for that email, or queries the database
+       to find the corresponding user and caches it.
+    4. For write requests (any method but GET, HEAD and OPTIONS), sends the user's
+       read-replica reads to the primary for a while (see `ReplicaRouter`).
+    5. Returns the user's information or raises an HTTPException on failure.
+
+    Args:
+        request: The incoming FastAPI request object.
+
+    Returns:
+        A dictionary containing the user's ID, name, and email.
+
+    Raises:
+        HTTPException: If the token is missing, invalid, expired, or the user is not found.
+    """
+    principal = _authenticate(request)
+    if request.method not in READ_METHODS:
+        replica_router.record_write(principal.get("user_id"))
+    return principal
+
+
+async def get_async_read_connection(
+    current_user: dict = Depends(get_current_user),
+) -> AsyncIterator[AsyncConnection]:
+    """
+    FastAPI dependency yielding a read-only connection of the async engine: on the read
+    replica when it is up to date and the user has not written recently, on the
+    primary otherwise.
+    """
+    engine = get_async_engine(readonly=True, consistency_key=current_user.get("user_id"))
+    async with engine.connect() as connection:
+        yield connection
+
+
+def _authenticate(request: Request) -> dict:
+    """
+    Returns the principal of the user authenticated by the request's JWT token.
 
     Args:
         request: The incoming FastAPI request object.
@@ -58,6 +98,10 @@ def get_current_user(request: Request) -> dict:
         if not email:
             raise HTTPException(status_code=401, detail="Invalid token payload.")
 
+        principal = principal_cache.get(email)
+        if principal is not None:
+            return principal
+
         # Fetch the user from the database.
         with get_engine().connect() as connection:
             result = connection.execute(
@@ -76,23 +120,29 @@ def get_current_user(request: Request) -> dict:
             # We use nested transactions (savepoints) to ensure that if one query fails, 
             # it doesn't poison the entire connection/transaction.
             roles = []
+            roles_loaded = False
             try:
                 with connection.begin_nested():
                     roles_query = text("SELECT r.name FROM roles r JOIN user_roles ur ON r.id = ur.role_id WHERE ur.user_id = :user_id")
                     roles_result = connection.execute(roles_query, {"user_id": user_id}).fetchall()
                     roles = [row[0] for row in roles_result] if roles_result else []
+                roles_loaded = True
             except Exception as e:
                 logger.warning(f"Failed to fetch roles for user {user_id}: {e}")
 
-            return {
+            principal = {
                 "user_id": user_id,
                 "name": user[1],
                 "email": user[2],
                 "roles": roles,
                 "is_admin": "system admin" in roles,
                 "is_sso": is_sso,
-                "requested_role_id": user[4]
+                "requested_role_id": str(user[4]) if user[4] is not None else None
             }
+            # Do not cache a principal whose roles could not be loaded.
+            if roles_loaded:
+                principal_cache.set(email, principal)
+            return principal
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired.")
@@ -106,6 +156,14 @@ def get_current_user(request: Request) -> dict:
         raise HTTPException(status_code=500, detail="Authentication error")
 
 
+def invalidate_principal(email: Optional[str]):
+    """
+    Drops the cached principal of a user. Call it after changing the user's roles,
+    role requests or account, so the change applies to their next request.
+    """
+    principal_cache.invalidate(email)
+
+
 def is_system_admin(current_user: dict = Depends(get_current_user)):
     """
     Dependency to check if the current user is a system admin.
@@ -154,6 +212,7 @@ __all__ = [
     "get_current_user",
     "is_system_admin",
     "check_user_group_access",
+    "invalidate_principal",
     "generate_password_hash",
     "check_password_hash",
     "ENTRA_TENANT_ID",
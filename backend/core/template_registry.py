@@ -0,0 +1,288 @@
+#  Standard Library
+import copy
+import io
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+#  Internal Modules
+from backend.core.compiled_template import CompiledTemplate, template_version
+from backend.core.config import TEMPLATE_SUB_DIRS
+from backend.core.redis import redis_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module keeps the proposal templates of this process in memory.
+#
+# The template directories are indexed once (filename -> path, donor -> filename) and
+# re-checked at most every TEMPLATE_REGISTRY_RESCAN_SECONDS: only files whose mtime
+# changed are parsed again. Resolved templates (the active version from
+# `template_versions`, or the file) are kept until:
+#   - their file changes on disk,
+#   - `invalidate()` is called after a template version change; it rotates a version
+#     token in Redis, so every worker drops its copies on its next lookup,
+#   - TEMPLATE_REGISTRY_TTL_SECONDS pass, which picks up versions written outside the
+#     API (e.g. by scripts/5-seed_templates.py).
+#
+# Lookups return deep copies, so callers may modify the template they receive.
+#
+# The compiled form of each template (see compiled_template.py) is kept per filename and
+# version (content hash) in a small LRU, so the versions in use (e.g. by older sessions)
+# do not evict each other. The version of a resolved template is computed once, when it is
+# stored, so `get_compiled` serves it without copying or hashing the template again; for
+# other templates it is computed when the caller does not know it.
+
+TEMPLATE_REGISTRY_RESCAN_SECONDS = float(os.getenv("TEMPLATE_REGISTRY_RESCAN_SECONDS", "2"))
+TEMPLATE_REGISTRY_TTL_SECONDS = int(os.getenv("TEMPLATE_REGISTRY_TTL_SECONDS", "300"))
+VERSION_KEY = "template_registry:version"
+
+# Templates of these directories are not mapped by donor name.
+CONCEPT_NOTE_DIR_SUFFIX = "concept_note_template"
+DEFAULT_TEMPLATE = "proposal_template_unhcr.json"
+TEMPLATE_COMPILED_MAX_ENTRIES = 32
+
+
+class TemplateRegistry:
+    """
+    Process-wide index and cache of proposal templates.
+    """
+
+    def __init__(
+        self,
+        scan_dirs: List[str],
+        client=None,
+        rescan_seconds: float = TEMPLATE_REGISTRY_RESCAN_SECONDS,
+        ttl_seconds: int = TEMPLATE_REGISTRY_TTL_SECONDS,
+    ):
+        self.scan_dirs = scan_dirs
+        self.rescan_seconds = rescan_seconds
+        self.ttl_seconds = ttl_seconds
+        self._client = client if client is not None else redis_client
+        self._lock = threading.RLock()
+        # path -> (mtime, parsed content or None if unreadable)
+        self._files: Dict[str, Tuple[float, Optional[dict]]] = {}
+        self._paths: Dict[str, str] = {}
+        self._templates_map: Dict[str, str] = {}
+        # (filename, use_db_first) -> (loaded_at, template, version)
+        self._resolved: Dict[Tuple[str, bool], Tuple[float, dict, str]] = {}
+        # (filename, version) -> compiled template, least recently used first
+        self._compiled: "OrderedDict[Tuple[str, str], CompiledTemplate]" = OrderedDict()
+        self._scanned_at: Optional[float] = None
+        self._version: Optional[str] = None
+        self._counters = {
+            "hits": 0, "misses": 0, "rescans": 0, "file_reloads": 0,
+            "compiled_hits": 0, "compilations": 0,
+        }
+
+    # --- File index ---
+
+    def _list_files(self) -> Dict[str, float]:
+        files = {}
+        for scan_dir in self.scan_dirs:
+            if not os.path.isdir(scan_dir):
+                continue
+            with os.scandir(scan_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        files[entry.path] = entry.stat().st_mtime
+        return files
+
+    def _read(self, path: str) -> Optional[dict]:
+        try:
+            with io.open(path, "r", encoding="utf-8") as f:
+                data = json.loads(f.read())
+        except (json.JSONDecodeError, IOError) as e:
+            logger.error(f"Failed to read or parse template file: {os.path.basename(path)}. Error: {e}")
+            return None
+        if not isinstance(data, dict):
+            logger.info(f"Skipping non-dictionary template file: {os.path.basename(path)}")
+            return None
+        return data
+
+    def _rebuild_index(self):
+        paths, templates_map = {}, {}
+        for scan_dir in self.scan_dirs:
+            is_concept_note_dir = scan_dir.endswith(CONCEPT_NOTE_DIR_SUFFIX)
+            for path in sorted(p for p in self._files if os.path.dirname(p) == scan_dir):
+                filename = os.path.basename(path)
+                paths.setdefault(filename, path)
+                data = self._files[path][1]
+                if data is None:
+                    continue
+                donors = data.get("donors", [])
+                # Map proposal templates by donor name (not concept notes)
+                if isinstance(donors, list) and not is_concept_note_dir:
+                    for donor_name in donors:
+                        templates_map[donor_name] = filename
+                # Always map by filename for direct access
+                templates_map[filename] = filename
+
+        # Ensure "Not Yet Specified" option points to the default UNHCR template.
+        if DEFAULT_TEMPLATE in paths:
+            templates_map["Not Yet Specified"] = DEFAULT_TEMPLATE
+
+        self._paths = paths
+        self._templates_map = templates_map
+
+    def _rescan(self):
+        """Re-parses the template files that changed since the last scan."""
+        current = self._list_files()
+        changed = [
+            path for path, mtime in current.items()
+            if path not in self._files or self._files[path][0] != mtime
+        ]
+        removed = [path for path in self._files if path not in current]
+        self._counters["rescans"] += 1
+        if not changed and not removed:
+            return
+
+        for path in removed:
+            del self._files[path]
+        for path in changed:
+            self._files[path] = (current[path], self._read(path))
+        self._counters["file_reloads"] += len(changed)
+        self._rebuild_index()
+
+        stale = {os.path.basename(path) for path in changed + removed}
+        for key in [key for key in self._resolved if key[0] in stale]:
+            del self._resolved[key]
+        if self._scanned_at is not None:
+            logger.info(f"Template files changed, reloaded: {sorted(stale)}")
+
+    def _current_version(self) -> Optional[str]:
+        try:
+            version = self._client.get(VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Could not read template registry version: {e}")
+            return self._version
+        return version.decode() if isinstance(version, bytes) else version
+
+    def refresh(self, force: bool = False):
+        """Rescans the template files if due, and drops resolved templates made stale by a version change."""
+        version = self._current_version()
+        with self._lock:
+            now = time.monotonic()
+            if force or self._scanned_at is None or now - self._scanned_at >= self.rescan_seconds:
+                self._rescan()
+                self._scanned_at = now
+            if version != self._version:
+                self._resolved.clear()
+                self._version = version
+
+    def templates_map(self) -> Dict[str, str]:
+        """Returns the donor name / filename -> template filename map."""
+        self.refresh()
+        with self._lock:
+            return dict(self._templates_map)
+
+    def filenames(self, scan_dirs: Optional[List[str]] = None) -> List[str]:
+        """Returns the template filenames found in `scan_dirs` (default: all), without duplicates."""
+        self.refresh()
+        dirs = scan_dirs or self.scan_dirs
+        with self._lock:
+            names = []
+            for scan_dir in dirs:
+                for path in sorted(p for p in self._files if os.path.dirname(p) == scan_dir):
+                    if os.path.basename(path) not in names:
+                        names.append(os.path.basename(path))
+            return names
+
+    def find_path(self, filename: str) -> Optional[str]:
+        self.refresh()
+        with self._lock:
+            return self._paths.get(filename)
+
+    # --- Resolved templates ---
+
+    def _lookup(self, filename: str, use_db_first: bool) -> Optional[Tuple[float, dict, str]]:
+        self.refresh()
+        with self._lock:
+            entry = self._resolved.get((filename, use_db_first))
+            if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._counters["hits"] += 1
+                return entry
+            self._counters["misses"] += 1
+            return None
+
+    def get(self, filename: str, use_db_first: bool = True) -> Optional[dict]:
+        """Returns a copy of the cached template, or None if it must be loaded."""
+        entry = self._lookup(filename, use_db_first)
+        return copy.deepcopy(entry[1]) if entry else None
+
+    def get_compiled(self, filename: str, use_db_first: bool = True) -> Optional[CompiledTemplate]:
+        """Returns the compiled form of the cached template, or None if it must be loaded."""
+        entry = self._lookup(filename, use_db_first)
+        return self.compiled(filename, entry[1], entry[2]) if entry else None
+
+    def store(self, filename: str, use_db_first: bool, template: Dict[str, Any]) -> dict:
+        """Caches a loaded template and returns it."""
+        self.refresh()
+        resolved = copy.deepcopy(template)
+        version = template_version(resolved)
+        with self._lock:
+            self._resolved[(filename, use_db_first)] = (time.monotonic(), resolved, version)
+        return template
+
+    def compiled(
+        self, filename: str, template: Dict[str, Any], version: Optional[str] = None
+    ) -> CompiledTemplate:
+        """
+        Returns the compiled form of `template`, the content of `filename` (e.g. the copy
+        kept in a proposal session). It is compiled once per template version; the
+        `version` (content hash) is computed when the caller does not give it.
+        """
+        if version is None:
+            version = template_version(template)
+        key = (filename, version)
+        with self._lock:
+            compiled = self._compiled.get(key)
+            if compiled is not None:
+                self._compiled.move_to_end(key)
+                self._counters["compiled_hits"] += 1
+                return compiled
+        compiled = CompiledTemplate(template, version)
+        with self._lock:
+            self._compiled[key] = compiled
+            self._compiled.move_to_end(key)
+            while len(self._compiled) > TEMPLATE_COMPILED_MAX_ENTRIES:
+                self._compiled.popitem(last=False)
+            self._counters["compilations"] += 1
+        return compiled
+
+    def invalidate(self):
+        """Drops the resolved templates of every worker, e.g. after a template version change."""
+        with self._lock:
+            self._resolved.clear()
+        try:
+            self._client.set(VERSION_KEY, uuid.uuid4().hex)
+        except Exception as e:
+            logger.warning(f"Could not publish template registry version: {e}")
+
+    def clear(self):
+        """Forgets everything this process has indexed or cached."""
+        with self._lock:
+            self._files.clear()
+            self._paths.clear()
+            self._templates_map.clear()
+            self._resolved.clear()
+            self._compiled.clear()
+            self._scanned_at = None
+
+    def stats(self) -> dict:
+        """Returns the registry counters, used by the health endpoint."""
+        with self._lock:
+            return {
+                **self._counters,
+                "files": len(self._files),
+                "resolved": len(self._resolved),
+                "compiled": len(self._compiled),
+            }
+
+
+template_registry = TemplateRegistry(TEMPLATE_SUB_DIRS)
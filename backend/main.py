@@ -34,15 +34,18 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 #  Internal Modules
-from backend.api import auth, proposals, session, documents, health, users, knowledge, metrics, admin, templates, incident, qualification, template_management, sharepoint
+from backend.api import auth, proposals, session, documents, health, users, knowledge, metrics, admin, templates, incident, qualification, template_management, sharepoint, jobs
 from backend.core.middleware import (
     setup_cors_middleware,
     custom_http_exception_handler,
+    llm_queue_full_exception_handler,
     setup_scheduler
 )
+from backend.core.llm_executor import LLMQueueFullError
 from backend.utils.sharepoint_sync import setup_sharepoint_sync_scheduler, initialize_database
 
-from backend.core.db import test_connection
+from backend.core.db import dispose_async_engine, test_connection
+from backend.core.event_hub import event_hub
 
 
 # This is the main application file. It brings together all the different
@@ -74,6 +77,8 @@ async def lifespan(app: FastAPI):
     yield
     # Cleanup tasks can be added here if needed
     logging.info("Application is shutting down...")
+    await event_hub.close()
+    await dispose_async_engine()
 
 # --- FastAPI Application Initialization ---
 app = FastAPI(
@@ -101,6 +106,7 @@ app = FastAPI(
 # They are used here for handling CORS and custom exceptions.
 setup_cors_middleware(app)
 app.add_exception_handler(HTTPException, custom_http_exception_handler)
+app.add_exception_handler(LLMQueueFullError, llm_queue_full_exception_handler)
 
 
 # --- API Router Inclusion ---
@@ -121,6 +127,7 @@ app.include_router(incident.router, prefix="/api", tags=["Incidents"])
 app.include_router(qualification.router, prefix="/api", tags=["Qualification"])
 app.include_router(health.router, tags=["Health & Debugging"])
 app.include_router(sharepoint.router, prefix="/api", tags=["SharePoint"])
+app.include_router(jobs.router, prefix="/api", tags=["Generation Jobs"])
 
 # --- Root Endpoint: Health Check + SPA ---
 # This MUST be defined before the SPA fallback to take priority
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Reference Chunk Content Hash Backfill
+
+Fills `knowledge_card_reference_vectors.content_hash` for the chunks stored before
+db/migrations/20261017_add_chunk_content_hash.sql, which adds the column. New chunks
+get their hash when they are written.
+
+Rows are updated in batches of --batch-size, each in its own transaction, so the table
+is never locked for long and the script can be stopped and run again: it only updates
+rows whose hash is still missing. Chunks without a hash are re-embedded on the next
+ingestion of their reference, so run it before re-ingesting references.
+
+Requires the database settings of the application (DB_HOST, DB_NAME, ...).
+
+Usage:
+    python3 backend/scripts/backfill_chunk_content_hash.py
+    python3 backend/scripts/backfill_chunk_content_hash.py --batch-size 2000 --pause 0.5
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import text
+
+from backend.core.db import get_engine
+from backend.core.db_pool import WORKLOAD_BACKGROUND
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Same hash as chunk_hash() in backend/utils/chunk_store.py
+BACKFILL_BATCH_QUERY = """
+    UPDATE knowledge_card_reference_vectors
+    SET content_hash = encode(sha256(convert_to(text_chunk, 'UTF8')), 'hex')
+    WHERE id IN (
+        SELECT id FROM knowledge_card_reference_vectors
+        WHERE content_hash IS NULL
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+"""
+
+
+def backfill(engine, batch_size: int, pause: float = 0.0) -> int:
+    """Fills the missing hashes batch by batch, and returns the number of rows updated."""
+    total = 0
+    while True:
+        with engine.begin() as connection:
+            updated = connection.execute(text(BACKFILL_BATCH_QUERY), {"batch_size": batch_size}).rowcount
+        total += updated
+        if updated:
+            logging.info(f"Backfilled {total} chunks")
+        if updated < batch_size:
+            return total
+        if pause:
+            time.sleep(pause)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill content_hash for the existing reference chunks.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows updated per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to wait between batches")
+    args = parser.parse_args()
+
+    engine = get_engine(WORKLOAD_BACKGROUND)
+    total = backfill(engine, args.batch_size, args.pause)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE knowledge_card_reference_vectors"))
+        missing = connection.execute(
+            text("SELECT count(*) FROM knowledge_card_reference_vectors WHERE content_hash IS NULL")
+        ).scalar()
+    logging.info(f"Backfill complete: {total} chunks updated, {missing} still missing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Redis Codec Benchmark
+
+Compares the encodings available for Redis values (see backend/core/codec.py) on
+proposal session payloads: the form data, a proposal template and its generated
+sections (each section filled up to its word/character limit).
+
+For each template and encoding, reports the size stored in Redis, the encode and
+decode times, and the peak memory allocated while decoding.
+
+Usage:
+    python3 backend/scripts/benchmark_codec.py
+    python3 backend/scripts/benchmark_codec.py --template proposal_template_unhcr.json --repeat 500
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.core.codec import SERIALIZERS, RedisCodec, zstandard
+from backend.core.compiled_template import CompiledTemplate
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "proposal_template"
+
+WORDS = (
+    "refugees protection assistance community shelter water sanitation education health "
+    "livelihoods partners durable solutions resilience host government coordination "
+    "monitoring outcome indicator budget beneficiaries displacement access services"
+).split()
+
+FORM_DATA = {
+    "Project title": "Improving access to clean water for refugees and host communities",
+    "Geographical Coverage": "Kakuma and Kalobeyei settlements, Turkana County",
+    "Targeted Donor": "UNHCR",
+    "Budget Range": "1M$",
+    "Duration": "24 months",
+    "Main Outcome": ["Well-being and Basic Needs", "Sustainable Housing and Settlements"],
+    "Beneficiaries Profile": "Refugees, asylum-seekers and host community members",
+}
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def build_session(template_path: Path) -> dict:
+    """Returns a session as stored by the proposal endpoints, with every section generated."""
+    with open(template_path, "r", encoding="utf-8") as f:
+        proposal_template = json.load(f)
+    rng = random.Random(0)
+    generated_sections = {}
+    for name, section in CompiledTemplate(proposal_template).sections.items():
+        # A word is about 6 characters with its space.
+        words = section.limit_value // 6 if section.limit_type == "char" else section.limit_value
+        generated_sections[name] = _text(rng, words)
+    return {
+        "proposal_id": "6b1f5a9e-0c5e-4b8e-9d8f-3f1f4f0d2a11",
+        "template_name": template_path.name,
+        "form_data": FORM_DATA,
+        "project_description": _text(rng, 300),
+        "proposal_template": proposal_template,
+        "generated_sections": generated_sections,
+    }
+
+
+def benchmark(codec: RedisCodec, payload: dict, repeat: int) -> dict:
+    encoded = codec.encode(payload)
+    encode_seconds = timeit.timeit(lambda: codec.encode(payload), number=repeat) / repeat
+    decode_seconds = timeit.timeit(lambda: codec.decode(encoded), number=repeat) / repeat
+
+    tracemalloc.start()
+    codec.decode(encoded)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert codec.decode(encoded) == json.loads(json.dumps(payload, default=str))
+    return {
+        "size": len(encoded.encode("utf-8")),
+        "encode_us": encode_seconds * 1e6,
+        "decode_us": decode_seconds * 1e6,
+        "decode_peak_kb": peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Redis codecs on proposal sessions.")
+    parser.add_argument("--template", help="Template file name (default: all proposal templates)")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per measurement")
+    parser.add_argument("--threshold", type=int, default=4096, help="Compression threshold, in bytes")
+    args = parser.parse_args()
+
+    codecs = {name: RedisCodec(name, compress_threshold=0) for name in SERIALIZERS}
+    if zstandard is not None:
+        codecs.update({
+            f"{name}+zstd": RedisCodec(name, compress_threshold=args.threshold) for name in SERIALIZERS
+        })
+
+    paths = [TEMPLATE_DIR / args.template] if args.template else sorted(TEMPLATE_DIR.glob("*.json"))
+    totals = {name: {"size": 0, "encode_us": 0.0, "decode_us": 0.0, "decode_peak_kb": 0.0} for name in codecs}
+
+    header = f"{'template':<36} {'codec':<12} {'bytes':>9} {'encode µs':>10} {'decode µs':>10} {'decode KiB':>11}"
+    print(header)
+    print("-" * len(header))
+    for path in paths:
+        payload = build_session(path)
+        for name, codec in codecs.items():
+            result = benchmark(codec, payload, args.repeat)
+            for key, value in result.items():
+                totals[name][key] += value
+            print(
+                f"{path.name:<36} {name:<12} {result['size']:>9} {result['encode_us']:>10.1f} "
+                f"{result['decode_us']:>10.1f} {result['decode_peak_kb']:>11.1f}"
+            )
+
+    print("-" * len(header))
+    for name, total in totals.items():
+        print(
+            f"{'average':<36} {name:<12} {total['size'] // len(paths):>9} "
+            f"{total['encode_us'] / len(paths):>10.1f} {total['decode_us'] / len(paths):>10.1f} "
+            f"{total['decode_peak_kb'] / len(paths):>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
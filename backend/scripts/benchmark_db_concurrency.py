@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Database Concurrency Benchmark
+
+Measures how many concurrent requests one API worker can serve with each database
+layer (see backend/core/db.py):
+
+- sync: the SQLAlchemy engine called from `async def` code, as the endpoints did
+  before the async engine; every query blocks the event loop.
+- async: the asyncio engine (asyncpg), as used by list-drafts, load-draft,
+  knowledge-cards and the metrics endpoints.
+
+Each simulated request runs the query given with --query (by default a 20 ms
+`pg_sleep`, standing for a typical read) while a heartbeat task measures how late the
+event loop wakes it up, i.e. the latency any other request would see.
+
+Requires the database settings of the application (DB_HOST, DB_NAME, ...).
+
+Usage:
+    python3 backend/scripts/benchmark_db_concurrency.py
+    python3 backend/scripts/benchmark_db_concurrency.py --concurrency 50 --requests 500
+    python3 backend/scripts/benchmark_db_concurrency.py --query "SELECT id FROM proposals LIMIT 50"
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import text
+
+from backend.core.db import dispose_async_engine, get_async_engine, get_engine
+
+HEARTBEAT_SECONDS = 0.01
+
+
+async def _heartbeat(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        lags.append(time.perf_counter() - started - HEARTBEAT_SECONDS)
+
+
+async def _sync_request(query: str):
+    with get_engine().connect() as connection:
+        connection.execute(text(query)).fetchall()
+
+
+async def _async_request(query: str):
+    async with get_async_engine().connect() as connection:
+        (await connection.execute(text(query))).fetchall()
+
+
+async def run(mode: str, query: str, concurrency: int, requests: int) -> dict:
+    request = _sync_request if mode == "sync" else _async_request
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, lags = [], []
+    stop = asyncio.Event()
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await request(query)
+            latencies.append(time.perf_counter() - started)
+
+    # Warm up the pool, so connection setup is not measured.
+    await asyncio.gather(*(request(query) for _ in range(min(concurrency, 5))))
+
+    heartbeat = asyncio.create_task(_heartbeat(lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await heartbeat
+
+    latencies.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_loop_lag_ms": max(lags, default=0) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare the sync and async database layers under concurrency.")
+    parser.add_argument("--query", default="SELECT pg_sleep(0.02)", help="Query run by each request")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per mode")
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max loop lag ms':>16}")
+    for mode in ("sync", "async"):
+        result = await run(mode, args.query, args.concurrency, args.requests)
+        print(
+            f"{mode:<6} {result['throughput']:>8.1f} {result['p50_ms']:>8.1f} "
+            f"{result['p95_ms']:>8.1f} {result['max_loop_lag_ms']:>16.1f}"
+        )
+    await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Vector Insert Benchmark
+
+Compares the ways of writing the chunks of a reference into
+`knowledge_card_reference_vectors` (see backend/utils/vector_writer.py):
+
+- per-row: one INSERT per chunk with `str(embedding)`, as ingestion used to do;
+- multi-row: INSERT statements of VECTOR_INSERT_BATCH_ROWS rows;
+- copy: `COPY ... FROM STDIN`, used by ingestion with the Postgres drivers.
+
+Each run writes random 1536-dimension embeddings for a temporary reference, inside a
+transaction that is rolled back, so the database is left unchanged. The indexes and
+triggers of the table are maintained as in production, and included in the timings.
+
+Requires the database settings of the application (DB_HOST, DB_NAME, ...) and at least
+one user (the temporary reference needs an author).
+
+Usage:
+    python3 backend/scripts/benchmark_vector_insert.py
+    python3 backend/scripts/benchmark_vector_insert.py --chunks 1000 10000 --repeat 3
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import text
+
+from backend.core.db import get_engine
+from backend.core.db_pool import WORKLOAD_BACKGROUND
+from backend.utils.vector_writer import copy_reference_vectors, insert_reference_vectors
+
+DIMENSIONS = 1536
+
+
+def _per_row(connection, reference_id, rows):
+    for chunk, embedding in rows:
+        connection.execute(
+            text("""
+                INSERT INTO knowledge_card_reference_vectors (reference_id, text_chunk, embedding)
+                VALUES (:ref_id, :chunk, :embedding)
+            """),
+            {"ref_id": reference_id, "chunk": chunk, "embedding": str(embedding)},
+        )
+    return len(rows)
+
+
+MODES = {
+    "per-row": _per_row,
+    "multi-row": insert_reference_vectors,
+    "copy": copy_reference_vectors,
+}
+
+
+def _rows(count: int) -> list:
+    words = ["water", "refugee", "health", "education", "shelter", "protection", "livelihood", "camp"]
+    return [
+        (" ".join(random.choices(words, k=150)), [random.uniform(-1, 1) for _ in range(DIMENSIONS)])
+        for _ in range(count)
+    ]
+
+
+def run(engine, mode: str, rows: list) -> float:
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            reference_id = str(uuid.uuid4())
+            connection.execute(
+                text("""
+                    INSERT INTO knowledge_card_references (id, url, reference_type, summary, created_by, updated_by)
+                    SELECT :id, :url, 'benchmark', 'Vector insert benchmark', id, id FROM users LIMIT 1
+                """),
+                {"id": reference_id, "url": f"https://benchmark.invalid/{reference_id}"},
+            )
+            started = time.perf_counter()
+            MODES[mode](connection, reference_id, rows)
+            return time.perf_counter() - started
+        finally:
+            transaction.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-row, multi-row and COPY inserts of reference vectors.")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[1000, 10000], help="Chunks per reference")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode and size")
+    args = parser.parse_args()
+
+    engine = get_engine(WORKLOAD_BACKGROUND)
+    with engine.connect() as connection:
+        if not connection.execute(text("SELECT 1 FROM users LIMIT 1")).first():
+            print("The benchmark needs at least one user in the database.")
+            return
+
+    print(f"{'chunks':>7} {'mode':<10} {'median s':>9} {'rows/s':>9}")
+    for count in args.chunks:
+        rows = _rows(count)
+        for mode in MODES:
+            seconds = statistics.median(run(engine, mode, rows) for _ in range(args.repeat))
+            print(f"{count:>7} {mode:<10} {seconds:>9.2f} {count / seconds:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
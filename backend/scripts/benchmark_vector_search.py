@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Vector Search Benchmark
+
+Measures the recall and latency of the ANN index on the reference chunk embeddings
+(see backend/utils/vector_search.py) against exact search, for a range of
+`hnsw.ef_search` (or `ivfflat.probes`) values.
+
+Queries are the embeddings of chunks sampled from the database, so no embedding
+model is called. For each setting it reports:
+
+- knn recall@k: share of the k nearest chunks of the whole corpus returned by the index;
+- card recall@k: share of the chunks returned by the research search of the chunk's
+  knowledge card (`search_reference_chunks`) that match the exact search, and how often
+  that search had to fall back to an exact scan of the card. It reads --candidates
+  chunks from the index, so ef_search values below that do not change it;
+- p50/p95 latency of both.
+
+Requires the database settings of the application (DB_HOST, DB_NAME, ...).
+
+Usage:
+    python3 backend/scripts/benchmark_vector_search.py
+    python3 backend/scripts/benchmark_vector_search.py --queries 200 --ef-search 20 40 100 200
+    python3 backend/scripts/benchmark_vector_search.py --rebuild-index ivfflat --probes 1 5 10 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import text
+
+from backend.core.db import get_engine
+from backend.core.db_pool import WORKLOAD_BACKGROUND
+from backend.utils.vector_search import (
+    INDEX_TYPES,
+    VECTOR_SEARCH_LIMIT,
+    apply_search_params,
+    build_fts_query,
+    rebuild_vector_index,
+    search_reference_chunks,
+)
+
+SAMPLE_QUERY = """
+    SELECT kcrv.embedding::text AS embedding, kcrv.text_chunk, kctr.knowledge_card_id
+    FROM knowledge_card_reference_vectors kcrv
+    JOIN knowledge_card_to_references kctr ON kctr.reference_id = kcrv.reference_id
+    WHERE kcrv.embedding IS NOT NULL
+    ORDER BY random()
+    LIMIT :queries
+"""
+
+KNN_QUERY = """
+    SELECT id FROM knowledge_card_reference_vectors
+    ORDER BY embedding <=> :query_embedding
+    LIMIT :k
+"""
+
+
+def _sample(connection, queries: int) -> list:
+    samples = []
+    for row in connection.execute(text(SAMPLE_QUERY), {"queries": queries}).mappings():
+        # The first words of the chunk stand for the keywords of a research query.
+        words = row["text_chunk"].split()[:3]
+        samples.append((json.loads(row["embedding"]), build_fts_query(" ".join(words)), row["knowledge_card_id"]))
+    return samples
+
+
+def _timed(connection, run, exact: bool):
+    """Runs `run` in its own transaction, with index scans disabled for the exact baseline."""
+    with connection.begin():
+        if exact:
+            connection.execute(text("SELECT set_config('enable_indexscan', 'off', true)"))
+        started = time.perf_counter()
+        result = run()
+        return result, time.perf_counter() - started
+
+
+def _percentiles(latencies: list) -> tuple:
+    latencies = sorted(latencies)
+    return statistics.median(latencies) * 1000, latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000
+
+
+def measure(connection, samples: list, k: int, candidates=None, ef_search=None, probes=None) -> dict:
+    knn_recall, card_recall, knn_latency, card_latency, fallbacks = [], [], [], [], 0
+
+    for embedding, fts_query, card_id in samples:
+        vector = str(embedding)
+
+        def knn():
+            apply_search_params(connection, ef_search, probes)
+            return [row[0] for row in connection.execute(text(KNN_QUERY), {"query_embedding": vector, "k": k})]
+
+        def card(exact=False, fallback=True):
+            rows = search_reference_chunks(
+                connection, embedding, fts_query, card_id, limit=k, candidates=candidates,
+                ef_search=ef_search, probes=probes, exact=exact, fallback=fallback,
+            )
+            return [row[0] for row in rows]
+
+        expected, _ = _timed(connection, knn, exact=True)
+        found, elapsed = _timed(connection, knn, exact=False)
+        knn_recall.append(len(set(found) & set(expected)) / max(len(expected), 1))
+        knn_latency.append(elapsed)
+
+        expected, _ = _timed(connection, lambda: card(exact=True), exact=True)
+        found, elapsed = _timed(connection, card, exact=False)
+        card_recall.append(len(set(found) & set(expected)) / max(len(expected), 1))
+        card_latency.append(elapsed)
+        if len(_timed(connection, lambda: card(fallback=False), exact=False)[0]) < k:
+            fallbacks += 1
+
+    return {
+        "knn_recall": statistics.mean(knn_recall),
+        "knn_latency": _percentiles(knn_latency),
+        "card_recall": statistics.mean(card_recall),
+        "card_latency": _percentiles(card_latency),
+        "fallback_rate": fallbacks / len(samples),
+    }
+
+
+def measure_exact(connection, samples: list, k: int) -> dict:
+    knn_latency, card_latency = [], []
+    for embedding, fts_query, card_id in samples:
+        vector = str(embedding)
+        knn_latency.append(_timed(
+            connection,
+            lambda: connection.execute(text(KNN_QUERY), {"query_embedding": vector, "k": k}).fetchall(),
+            exact=True,
+        )[1])
+        card_latency.append(_timed(
+            connection,
+            lambda: search_reference_chunks(connection, embedding, fts_query, card_id, limit=k, exact=True),
+            exact=True,
+        )[1])
+    return {"knn_latency": _percentiles(knn_latency), "card_latency": _percentiles(card_latency)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the recall and latency of the vector index with exact search.")
+    parser.add_argument("--queries", type=int, default=100, help="Number of sampled query chunks")
+    parser.add_argument("--k", type=int, default=VECTOR_SEARCH_LIMIT, help="Number of results per query")
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[10, 20, 40, 100, 200], help="hnsw.ef_search values")
+    parser.add_argument("--probes", type=int, nargs="+", default=None, help="ivfflat.probes values (IVFFlat index)")
+    parser.add_argument("--candidates", type=int, default=None, help="ANN candidates of the card search (VECTOR_SEARCH_CANDIDATES)")
+    parser.add_argument("--rebuild-index", choices=INDEX_TYPES, help="Replace the index with one of this type first")
+    args = parser.parse_args()
+
+    engine = get_engine(WORKLOAD_BACKGROUND)
+    with engine.connect() as connection:
+        if args.rebuild_index:
+            with connection.begin():
+                print(rebuild_vector_index(connection, args.rebuild_index))
+
+        samples = _sample(connection, args.queries)
+        connection.commit()
+        if not samples:
+            print("No reference chunks linked to a knowledge card; nothing to benchmark.")
+            return
+
+        exact = measure_exact(connection, samples, args.k)
+        print(f"{len(samples)} queries, k={args.k}")
+        print(f"{'setting':<16} {'knn recall':>10} {'knn p50/p95 ms':>16} {'card recall':>11} {'card p50/p95 ms':>16} {'fallback':>9}")
+        print(
+            f"{'exact':<16} {1.0:>10.3f} {'%.1f/%.1f' % exact['knn_latency']:>16} "
+            f"{1.0:>11.3f} {'%.1f/%.1f' % exact['card_latency']:>16} {'-':>9}"
+        )
+
+        settings = [("probes", value) for value in args.probes] if args.probes else [("ef_search", value) for value in args.ef_search]
+        for name, value in settings:
+            result = measure(connection, samples, args.k, candidates=args.candidates, **{name: value})
+            print(
+                f"{f'{name}={value}':<16} {result['knn_recall']:>10.3f} {'%.1f/%.1f' % result['knn_latency']:>16} "
+                f"{result['card_recall']:>11.3f} {'%.1f/%.1f' % result['card_latency']:>16} {result['fallback_rate']:>9.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ Validation Checks:
 4. Section Configuration - Valid format_type, proper field definitions
 5. Special Requirements - Valid structure
 6. Cross-References - Internal consistency checks
+7. Section Dependencies - Valid depends_on references without cycles
 
 Usage:
     python3 backend/scripts/validate_templates.py
@@ -276,6 +277,59 @@ class TemplateValidator:
         
         return valid
     
+    def validate_section_dependencies(self, data: Dict) -> bool:
+        """Validate depends_on references and check for dependency cycles."""
+        sections = data.get("sections", [])
+        section_names = {s.get("section_name") for s in sections if s.get("section_name")}
+        graph = {}
+        valid = True
+        
+        for section in sections:
+            section_name = section.get("section_name")
+            depends_on = section.get("depends_on")
+            if depends_on is None:
+                continue
+            if isinstance(depends_on, str):
+                depends_on = [depends_on]
+            if not isinstance(depends_on, list):
+                self.add_result(ValidationLevel.ERROR, "Section Dependencies",
+                              f"Section '{section_name}' has invalid 'depends_on' (must be an array)")
+                valid = False
+                continue
+            
+            unknown = [d for d in depends_on if d not in section_names or d == section_name]
+            if unknown:
+                self.add_result(ValidationLevel.ERROR, "Section Dependencies",
+                              f"Section '{section_name}' depends on unknown sections: {unknown}")
+                valid = False
+            graph[section_name] = [d for d in depends_on if d in section_names and d != section_name]
+        
+        # Detect cycles with a depth-first search
+        visiting, visited = set(), set()
+        
+        def has_cycle(node):
+            if node in visited:
+                return False
+            if node in visiting:
+                return True
+            visiting.add(node)
+            if any(has_cycle(dep) for dep in graph.get(node, [])):
+                return True
+            visiting.discard(node)
+            visited.add(node)
+            return False
+        
+        if any(has_cycle(node) for node in list(graph)):
+            self.add_result(ValidationLevel.ERROR, "Section Dependencies",
+                          "Circular dependency detected in 'depends_on' - generation will fall back to sequential")
+            valid = False
+        
+        if valid and graph and self.verbose:
+            self.add_result(ValidationLevel.INFO, "Section Dependencies",
+                          f"{len(graph)} section(s) declare dependencies")
+        
+        return valid
+    
     def validate_special_requirements(self, data: Dict) -> bool:
         """Validate special_requirements field."""
         special_requirements = data.get("special_requirements")
@@ -335,7 +389,10 @@ class TemplateValidator:
         # 6. Validate section_sequence
         self.validate_section_sequence(data)
         
-        # 7. Validate special_requirements
+        # 7. Validate section dependencies
+        self.validate_section_dependencies(data)
+        
+        # 8. Validate special_requirements
         self.validate_special_requirements(data)
         
         # Print results
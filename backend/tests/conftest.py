@@ -4,6 +4,7 @@ import uuid
 import jwt
 from datetime import datetime, timedelta
 from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
 # --- Environment Variable Setup ---
@@ -24,14 +25,17 @@ os.environ["SERPER_API_KEY"] = "test_serper_key"
 from backend.main import app
 from backend.core.db import get_engine
 from backend.core.security import get_current_user
+from backend.core.template_registry import template_registry
+from backend.core.memory_store import DictStorage
 
 
 @pytest.fixture(scope="function")
 def test_engine():
     """Creates a fresh, in-memory SQLite engine for each test function."""
     engine = create_engine(
-        "sqlite:///file::memory:?cache=shared",
+        "sqlite://",
         connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
     )
     with engine.connect() as connection:
         # Use transaction to ensure DDL is committed
@@ -44,6 +48,7 @@ def test_engine():
             connection.execute(text("DROP TABLE IF EXISTS proposals"))
             connection.execute(text("DROP TABLE IF EXISTS donor_template_comments"))
             connection.execute(text("DROP TABLE IF EXISTS donor_template_requests"))
+            connection.execute(text("DROP TABLE IF EXISTS generation_jobs"))
             connection.execute(
                 text("""
                 CREATE TABLE IF NOT EXISTS teams (
@@ -241,6 +246,28 @@ def test_engine():
                 )
             """)
             )
+            connection.execute(
+                text("""
+                CREATE TABLE IF NOT EXISTS generation_jobs (
+                    id TEXT PRIMARY KEY,
+                    job_type TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL DEFAULT 3,
+                    run_after DATETIME,
+                    last_error TEXT,
+                    worker_id TEXT,
+                    lease_expires_at DATETIME,
+                    heartbeat_at DATETIME,
+                    created_by TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    started_at DATETIME,
+                    finished_at DATETIME,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            )
     return engine
 
 
@@ -252,6 +279,22 @@ def override_get_engine(test_engine):
     app.dependency_overrides.pop(get_engine, None)
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_template_registry():
+    """Keeps templates cached by one test from being served to the next."""
+    template_registry.clear()
+    yield
+    template_registry.clear()
+
+
+@pytest.fixture
+def memory_redis():
+    """A fresh in-memory Redis substitute, with real expiry, hash and nx semantics."""
+    store = DictStorage(sweep_seconds=0)
+    yield store
+    store.close()
+
+
 @pytest.fixture(scope="function")
 def db_session(test_engine):
     """Provides a transactional scope for each test function."""
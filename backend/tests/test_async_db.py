@@ -0,0 +1,47 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.api.metrics import _get_filter_clauses, _parse_date
+from backend.core import db
+from backend.core.db import AsyncpgPool
+from fastapi import HTTPException
+
+
+@pytest.mark.asyncio
+async def test_asyncpg_pool_yields_the_driver_connection_of_the_engine():
+    driver_connection = object()
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=MagicMock(driver_connection=driver_connection))
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__.return_value = connection
+
+    async with AsyncpgPool(lambda: engine).acquire() as conn:
+        assert conn is driver_connection
+    engine.connect.return_value.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_connection_dependency_releases_the_connection(monkeypatch):
+    engine = MagicMock()
+    monkeypatch.setattr(db, "async_engine", engine)
+
+    dependency = db.get_async_connection()
+    connection = await dependency.__anext__()
+    assert connection is engine.connect.return_value.__aenter__.return_value
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+    engine.connect.return_value.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_metric_date_filters_are_sent_as_datetimes():
+    where_clause, params = await _get_filter_clauses(
+        {"user_id": "u1"}, filter_by="user", date_start="2024-01-01", date_end="2024-06-30T12:00:00"
+    )
+
+    assert "p.created_at >= :date_start" in where_clause
+    assert params["date_start"].year == 2024 and params["date_end"].hour == 12
+    with pytest.raises(HTTPException) as exc_info:
+        _parse_date("last week")
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,82 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from backend.utils.chunk_store import chunk_hash, load_chunk_embeddings, save_chunk_embeddings
+from backend.utils.embedding_utils import process_and_store_text
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE knowledge_card_reference_vectors "
+            "(id INTEGER PRIMARY KEY, reference_id TEXT, text_chunk TEXT, embedding TEXT, content_hash TEXT)"
+        ))
+        connection.execute(text(
+            "CREATE TABLE chunk_embeddings (content_hash TEXT, embedding_model TEXT, embedding TEXT, "
+            "PRIMARY KEY (content_hash, embedding_model))"
+        ))
+        connection.execute(text(
+            "CREATE TABLE knowledge_card_references (id TEXT PRIMARY KEY, scraped_at TEXT, "
+            "scraping_error BOOLEAN, updated_at TEXT)"
+        ))
+        connection.execute(text("INSERT INTO knowledge_card_references (id) VALUES ('ref-1'), ('ref-2')"))
+    return engine
+
+
+def test_store_is_keyed_by_hash_and_model(engine):
+    with engine.begin() as connection:
+        save_chunk_embeddings(connection, "ada", {chunk_hash("a"): [0.5, 1.0]})
+        save_chunk_embeddings(connection, "ada", {chunk_hash("a"): [9.0, 9.0]})
+
+        assert load_chunk_embeddings(connection, "ada", [chunk_hash("a"), chunk_hash("b")]) == {
+            chunk_hash("a"): [0.5, 1.0]
+        }
+        assert load_chunk_embeddings(connection, "large", [chunk_hash("a")]) == {}
+
+
+def _ingest(engine, reference_id, sentences, calls):
+    def embedding(model, input, max_retries, **config):
+        calls.extend(input)
+        return SimpleNamespace(data=[{"index": i, "embedding": [float(len(chunk))]} for i, chunk in enumerate(input)])
+
+    config = {"config": {"deployment_id": "embed", "model": "text-embedding-ada-002"}}
+    with patch("backend.utils.embedding_utils.get_embedder_config", return_value=config), \
+            patch("backend.utils.embedding_utils.sent_tokenize", lambda content: content.split("|")), \
+            patch("backend.utils.embedding_utils.litellm.embedding", side_effect=embedding):
+        with engine.begin() as connection:
+            return asyncio.run(process_and_store_text(reference_id, "|".join(sentences), connection))
+
+
+def test_reingestion_embeds_only_new_chunks(engine):
+    # Sentences of 600 characters make one chunk each.
+    intro, methods, results, update = ("i" * 600, "m" * 600, "r" * 600, "u" * 600)
+    calls = []
+
+    stats = _ingest(engine, "ref-1", [intro, methods, results], calls)
+    assert stats.embedded == 3 and stats.reused == 0 and len(calls) == 3
+
+    calls.clear()
+    stats = _ingest(engine, "ref-1", [intro, methods, update], calls)
+    assert calls == [update]
+    assert (stats.kept, stats.reused, stats.embedded, stats.deleted) == (2, 0, 1, 1)
+
+    # A chunk shared with another reference comes from the store.
+    calls.clear()
+    stats = _ingest(engine, "ref-2", [intro, results], calls)
+    assert calls == []
+    assert (stats.kept, stats.reused, stats.embedded) == (0, 2, 0)
+
+    with engine.connect() as connection:
+        chunks = connection.execute(text(
+            "SELECT reference_id, content_hash FROM knowledge_card_reference_vectors ORDER BY reference_id, id"
+        )).fetchall()
+    assert chunks == [
+        ("ref-1", chunk_hash(intro)), ("ref-1", chunk_hash(methods)), ("ref-1", chunk_hash(update)),
+        ("ref-2", chunk_hash(intro)), ("ref-2", chunk_hash(results)),
+    ]
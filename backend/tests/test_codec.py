@@ -0,0 +1,37 @@
+import json
+from datetime import datetime
+
+from backend.core.codec import COMPRESSED_PREFIX, RedisCodec
+
+
+VALUE = {"form_data": {"Project title": "Water"}, "created_at": datetime(2024, 1, 2, 3, 4, 5), "count": 3}
+
+
+def test_serializers_read_each_other_and_legacy_json():
+    legacy = json.dumps(VALUE, default=str)
+    orjson_codec, json_codec = RedisCodec("orjson", compress_threshold=0), RedisCodec("json", compress_threshold=0)
+
+    assert orjson_codec.decode(legacy) == json_codec.decode(legacy) == json.loads(legacy)
+    assert json_codec.decode(orjson_codec.encode(VALUE)) == json.loads(legacy)
+    assert orjson_codec.decode(json_codec.encode(VALUE)) == json.loads(legacy)
+    assert orjson_codec.decode(None) is None
+
+
+def test_large_values_are_compressed():
+    codec = RedisCodec("orjson", compress_threshold=100)
+    section = "Refugees need access to water. " * 50
+
+    encoded = codec.encode({"section": section})
+
+    assert encoded.startswith(COMPRESSED_PREFIX)
+    assert len(encoded) < len(section)
+    assert codec.decode(encoded) == {"section": section}
+    # Small values, and `dumps`, stay plain JSON.
+    assert json.loads(codec.encode({"a": 1})) == {"a": 1}
+    assert json.loads(codec.dumps({"section": section})) == {"section": section}
+    # A process that does not compress still reads compressed values.
+    assert RedisCodec("json", compress_threshold=0).decode(encoded) == {"section": section}
+
+
+def test_unknown_serializer_falls_back_to_json():
+    assert RedisCodec("msgpack").serializer.name == "json"
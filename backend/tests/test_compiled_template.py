@@ -0,0 +1,96 @@
+from backend.core.compiled_template import CompiledTemplate, compile_section
+from backend.core.template_registry import template_registry
+
+
+TEMPLATE = {
+    "special_requirements": {"instructions": ["Use UNHCR terminology", "Be concise"]},
+    "section_sequence": ["Budget", "Summary", "Unknown"],
+    "sections": [
+        {"section_name": "Summary", "instructions": "Summarize.", "char_limit": 1000},
+        {"section_name": "Overview", "format_type": "text"},
+        {
+            "section_name": "Budget",
+            "format_type": "table",
+            "instructions": "Budget table.",
+            "columns": [{"name": "Item", "instructions": "The item"}, {"name": "Cost"}],
+            "rows": [{"row_title": "Staff"}],
+        },
+        {"section_name": "Beneficiaries", "format_type": "number", "instructions": "How many?"},
+    ],
+}
+
+
+def test_sections_and_orders():
+    compiled = CompiledTemplate(TEMPLATE)
+
+    assert compiled.output_order == ["Summary", "Overview", "Budget", "Beneficiaries"]
+    assert compiled.generation_order == ["Budget", "Summary"]
+    assert compiled.section("Budget").format_type == "table"
+    assert compiled.section("Unknown") is None
+    assert compiled.special_requirements == "- Use UNHCR terminology\n- Be concise"
+    assert CompiledTemplate({"sections": []}).special_requirements == "None"
+
+
+def test_generation_order_defaults_to_output_order():
+    compiled = CompiledTemplate({"sections": TEMPLATE["sections"]})
+
+    assert not compiled.has_section_sequence
+    assert compiled.generation_order == compiled.output_order
+
+
+def test_rendered_limits_and_instructions():
+    compiled = CompiledTemplate(TEMPLATE)
+
+    summary = compiled.section("Summary")
+    assert summary.instructions == (
+        "Summarize. IMPORTANT: Do not exceed 1000 characters for this section. "
+        "If your response is longer, you MUST summarize or truncate to fit the limit."
+    )
+    assert summary.limit_inputs() == {"limit_value": 1000, "limit_term": "character", "char_limit": 1000}
+    assert summary.regeneration_instructions == "Summarize. Do not exceed 1000 characters."
+
+    overview = compiled.section("Overview")
+    assert overview.instructions.startswith("IMPORTANT: Do not exceed 350 words")
+    assert overview.regeneration_instructions == " Do not exceed 350 words."
+
+    budget = compiled.section("Budget")
+    assert budget.limit_inputs() == {"limit_value": 2000, "limit_term": "word", "word_limit": 2000}
+    assert "`Item, Cost`" in budget.instructions
+    assert "- Column 'Item': The item\n" in budget.instructions
+    assert "- Row 'Staff': \n" in budget.instructions
+    assert budget.column_names == ["Item", "Cost"]
+
+    number = compiled.section("Beneficiaries")
+    assert number.instructions == "How many?"
+    assert number.limit_inputs() == {"limit_value": 10, "limit_term": "word", "word_limit": 10}
+
+
+def test_compile_section_accepts_compiled_sections():
+    section = compile_section({"section_name": "Summary"})
+
+    assert compile_section(section) is section
+
+
+def test_registry_compiles_once_per_version():
+    compilations = template_registry.stats()["compilations"]
+    first = template_registry.compiled("test.json", TEMPLATE)
+    assert template_registry.compiled("test.json", dict(TEMPLATE)) is first
+
+    changed = dict(TEMPLATE, special_requirements={"instructions": ["New rule"]})
+    second = template_registry.compiled("test.json", changed)
+
+    assert second is not first
+    assert second.special_requirements == "- New rule"
+    assert template_registry.stats()["compilations"] == compilations + 2
+
+
+def test_registry_keeps_several_versions_of_a_template():
+    first = template_registry.compiled("versions.json", TEMPLATE)
+    changed = dict(TEMPLATE, special_requirements={"instructions": ["New rule"]})
+    second = template_registry.compiled("versions.json", changed)
+
+    # Alternating between versions does not recompile either of them.
+    compilations = template_registry.stats()["compilations"]
+    assert template_registry.compiled("versions.json", TEMPLATE) is first
+    assert template_registry.compiled("versions.json", changed, second.version) is second
+    assert template_registry.stats()["compilations"] == compilations
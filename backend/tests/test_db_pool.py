@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from backend.core import db
+from backend.core.db_pool import (
+    WORKLOAD_API,
+    WORKLOAD_BACKGROUND,
+    WORKLOAD_METRICS,
+    InstrumentedQueuePool,
+    PoolConfig,
+    current_workload,
+    db_workload,
+    with_db_workload,
+)
+from backend.core.llm_executor import run_in_llm_executor
+
+
+def test_pool_config_reads_the_workload_variables(monkeypatch):
+    monkeypatch.setenv("DB_POOL_BACKGROUND_SIZE", "4")
+    monkeypatch.setenv("DB_POOL_BACKGROUND_MAX_OVERFLOW", "1")
+    monkeypatch.setenv("DB_POOL_BACKGROUND_STATEMENT_TIMEOUT_MS", "5000")
+
+    config = PoolConfig.from_env(WORKLOAD_BACKGROUND)
+    assert config.engine_kwargs() == {"pool_size": 4, "max_overflow": 1, "pool_timeout": 60.0}
+    assert config.statement_timeout_ms == 5000
+    assert config.max_connections == 5
+    assert PoolConfig.from_env(WORKLOAD_API).max_connections == 15
+    with pytest.raises(ValueError):
+        PoolConfig.from_env("reports")
+
+
+def test_pool_records_checkouts_waits_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert engine.pool.stats()["checked_out"] == 1
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    with engine.connect():
+        pass
+    stats = engine.pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["waits"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["checked_out"] == 0 and stats["checked_in"] == 1
+    assert stats["checkout_max_ms"] >= 50
+
+    # Disposing the engine recreates its pool without losing the counters.
+    engine.dispose()
+    assert engine.pool.stats()["checkouts"] == 2
+
+
+def test_workload_follows_the_context():
+    assert current_workload() == WORKLOAD_API
+    with db_workload(WORKLOAD_METRICS):
+        assert current_workload() == WORKLOAD_METRICS
+    assert with_db_workload(WORKLOAD_BACKGROUND, current_workload)() == WORKLOAD_BACKGROUND
+
+    async def workload():
+        return current_workload()
+
+    assert asyncio.run(with_db_workload(WORKLOAD_BACKGROUND, workload)()) == WORKLOAD_BACKGROUND
+    with pytest.raises(ValueError):
+        with db_workload("reports"):
+            pass
+
+
+def test_llm_executor_threads_keep_the_workload():
+    async def run():
+        with db_workload(WORKLOAD_BACKGROUND):
+            return await run_in_llm_executor(current_workload)
+
+    assert asyncio.run(run()) == WORKLOAD_BACKGROUND
+    assert asyncio.run(run_in_llm_executor(current_workload)) == WORKLOAD_API
+
+
+def test_pool_stats_report_the_created_pools(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool)
+    monkeypatch.setitem(db._engines, WORKLOAD_BACKGROUND, engine)
+    with engine.connect():
+        pass
+
+    stats = db.pool_stats()
+    assert set(stats["workloads"]) == {WORKLOAD_API, WORKLOAD_BACKGROUND, WORKLOAD_METRICS}
+    assert stats["pools"]["sync:background"]["checkouts"] == 1
+    assert stats["max_connections"] == stats["workloads"][WORKLOAD_BACKGROUND]["max_connections"]
+
+
+def test_run_logger_uses_the_pool_of_the_calling_workload(monkeypatch):
+    from backend.utils import proposal_run_logger
+
+    monkeypatch.setattr(proposal_run_logger, "get_engine", lambda: current_workload())
+    run_logger = proposal_run_logger.ArtifactRunLogger()
+
+    assert run_logger.engine == WORKLOAD_API
+    with db_workload(WORKLOAD_BACKGROUND):
+        assert run_logger.engine == WORKLOAD_BACKGROUND
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from backend.utils.embedding_utils import batch_chunks, embed_chunks
+
+
+def _fake_embedding(calls, fail_on=None):
+    def embedding(model, input, max_retries, **config):
+        calls.append(list(input))
+        if fail_on and fail_on in input:
+            raise RuntimeError("content filter")
+        # Items are returned out of order, as the API does not guarantee it.
+        data = [{"index": i, "embedding": [float(len(chunk))]} for i, chunk in enumerate(input)]
+        return SimpleNamespace(data=data[::-1], usage=SimpleNamespace(prompt_tokens=10 * len(input)))
+
+    return embedding
+
+
+def test_batches_are_bounded_by_items_and_tokens():
+    chunks = ["a" * 40] * 5 + ["b" * 400, "c" * 40]
+
+    assert batch_chunks(chunks, max_items=2, max_tokens=1000) == [[0, 1], [2, 3], [4, 5], [6]]
+    # 40 characters are 11 estimated tokens; the large chunk gets a batch of its own.
+    assert batch_chunks(chunks, max_items=10, max_tokens=30) == [[0, 1], [2, 3], [4], [5], [6]]
+
+
+def test_chunks_are_embedded_in_batches_in_order():
+    calls = []
+    chunks = [f"chunk {i}" + "x" * i for i in range(10)]
+
+    with patch("backend.utils.embedding_utils.litellm.embedding", side_effect=_fake_embedding(calls)):
+        embeddings, stats = embed_chunks(chunks, "azure/embed", {}, max_items=4, max_tokens=1000, concurrency=2)
+
+    assert embeddings == [[float(len(chunk))] for chunk in chunks]
+    assert sorted(len(call) for call in calls) == [2, 4, 4]
+    assert stats.requests == 3 and stats.embedded == 10 and stats.failed == 0
+    assert stats.tokens == 100
+    assert stats.as_dict()["chunks_per_second"] > 0
+
+
+def test_failed_batches_are_split_down_to_the_bad_chunk():
+    calls = []
+    chunks = [f"chunk {i}" for i in range(8)]
+
+    with patch("backend.utils.embedding_utils.litellm.embedding", side_effect=_fake_embedding(calls, "chunk 5")):
+        embeddings, stats = embed_chunks(chunks, "azure/embed", {}, max_items=8, concurrency=1)
+
+    assert embeddings[5] is None
+    assert all(embedding is not None for i, embedding in enumerate(embeddings) if i != 5)
+    # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1
+    assert stats.splits == 3 and stats.failed == 1 and stats.embedded == 7
+    assert stats.requests == len(calls) == 7
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from backend.core import event_hub as event_hub_module
+from backend.core.event_hub import EventHub
+from backend.core.memory_store import DictStorage
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    store = DictStorage(sweep_seconds=0)
+    monkeypatch.setattr(event_hub_module, "redis_client", store)
+    return EventHub(pattern="*_channel:*", max_pending=2), store
+
+
+@pytest.mark.asyncio
+async def test_messages_are_fanned_out_from_a_single_subscription(hub):
+    hub, store = hub
+    async with hub.subscribe("progress_channel:a") as first, hub.subscribe("progress_channel:a") as second:
+        async with hub.subscribe("progress_channel:b") as other:
+            # One pattern subscription, whatever the number of streams.
+            assert store.publish("progress_channel:a", "50") == 1
+            assert store.publish("unrelated", "ignored") == 0
+
+            assert await first.get(timeout=1) == "50"
+            assert await second.get(timeout=1) == "50"
+            assert await other.get(timeout=0.01) is None
+
+        assert hub.stats()["subscribers"] == 2
+    assert hub.stats()["subscribers"] == 0
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscribers_lose_their_oldest_messages(hub):
+    hub, store = hub
+    async with hub.subscribe("progress_channel:a") as subscription:
+        for progress in ("10", "20", "30"):
+            store.publish("progress_channel:a", progress)
+        await asyncio.sleep(0.01)
+
+        assert [await subscription.get(timeout=1), await subscription.get(timeout=1)] == ["20", "30"]
+        assert hub.stats()["dropped"] == 1
+    await hub.close()
@@ -25,7 +25,7 @@ async def test_generate_document(authenticated_client, db_session, mocker):
             {"section_name": "Annex 1. Risk Assessment Plan"}
         ]
     }
-    mocker.patch('backend.api.documents.load_proposal_template', return_value=dummy_template)
+    mocker.patch('backend.core.config.load_proposal_template', return_value=dummy_template)
 
     # Mock the database engine for this specific test
     mock_engine = MagicMock()
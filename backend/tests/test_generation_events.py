@@ -0,0 +1,102 @@
+import json
+import threading
+
+from crewai.events import LLMStreamChunkEvent
+
+from backend.utils import generation_events
+from backend.utils.generation_events import (
+    generation_channel,
+    generation_snapshot_key,
+    publish_generation_event,
+    stream_section_tokens,
+)
+
+
+def _record_events(monkeypatch, memory_redis):
+    """Routes the events to `memory_redis` and returns the list of messages published."""
+    published = []
+    publish = memory_redis.publish
+
+    def record(channel, message):
+        published.append((channel, json.loads(message)))
+        return publish(channel, message)
+
+    monkeypatch.setattr(memory_redis, "publish", record)
+    monkeypatch.setattr(generation_events, "redis_client", memory_redis)
+    return published
+
+
+def test_status_events_are_published_and_folded_into_snapshot(monkeypatch, memory_redis):
+    published = _record_events(monkeypatch, memory_redis)
+
+    publish_generation_event("p1", "generation_started")
+    publish_generation_event("p1", "section_started", section="Summary")
+    publish_generation_event("p1", "section_started", section="Budget")
+    publish_generation_event("p1", "section_completed", section="Summary", content="Text", error=None)
+
+    assert [event["type"] for _, event in published] == [
+        "generation_started", "section_started", "section_started", "section_completed",
+    ]
+    assert {channel for channel, _ in published} == {generation_channel("p1")}
+
+    snapshot = json.loads(memory_redis.get(generation_snapshot_key("p1")))
+    assert snapshot["status"] == "generation_started"
+    assert snapshot["sections"] == {"Summary": "completed", "Budget": "generating"}
+
+
+def test_new_run_resets_snapshot(monkeypatch, memory_redis):
+    _record_events(monkeypatch, memory_redis)
+
+    publish_generation_event("p1", "section_completed", section="Summary", content="Text")
+    publish_generation_event("p1", "generation_completed")
+    publish_generation_event("p1", "generation_queued")
+
+    snapshot = json.loads(memory_redis.get(generation_snapshot_key("p1")))
+    assert snapshot["status"] == "generation_queued"
+    assert snapshot["sections"] == {}
+
+
+def test_stream_chunks_are_routed_to_the_section_of_the_current_thread(monkeypatch, memory_redis):
+    published = _record_events(monkeypatch, memory_redis)
+    monkeypatch.setattr(generation_events, "TOKEN_FLUSH_SECONDS", 60)
+
+    def write_section(proposal_id, section, chunks):
+        with stream_section_tokens(proposal_id, section):
+            for chunk in chunks:
+                generation_events._forward_stream_chunk(None, LLMStreamChunkEvent(chunk=chunk))
+
+    threads = [
+        threading.Thread(target=write_section, args=("p1", "Summary", ["Hello", " world"])),
+        threading.Thread(target=write_section, args=("p2", "Budget", ["42"])),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    tokens = {
+        (event["proposal_id"], event["section"]): event["text"]
+        for _, event in published
+        if event["type"] == "token"
+    }
+    assert tokens == {("p1", "Summary"): "Hello world", ("p2", "Budget"): "42"}
+    # Token events do not touch the snapshot.
+    assert memory_redis.stats()["keys"] == 0
+
+
+def test_chunks_outside_a_section_are_ignored(monkeypatch, memory_redis):
+    published = _record_events(monkeypatch, memory_redis)
+
+    generation_events._forward_stream_chunk(None, LLMStreamChunkEvent(chunk="stray"))
+
+    assert published == []
+
+
+def test_publish_failure_does_not_raise(monkeypatch, memory_redis):
+    def publish(channel, message):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(memory_redis, "publish", publish)
+    monkeypatch.setattr(generation_events, "redis_client", memory_redis)
+
+    publish_generation_event("p1", "section_started", section="Summary")
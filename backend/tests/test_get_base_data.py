@@ -22,4 +22,6 @@ def test_get_base_data(authenticated_client):
 
     assert get_response.status_code == 200
     assert data["form_data"] == payload["form_data"]
-    assert data["project_description"] == payload["project_description"]
\ No newline at end of file
+    assert data["project_description"] == payload["project_description"]
+    # Fields added by the session store are not part of the response.
+    assert "template_ref" not in data and "generated_sections" not in data
\ No newline at end of file
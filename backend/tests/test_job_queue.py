@@ -0,0 +1,153 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import text
+
+from backend import worker
+from backend.api import proposals
+from backend.utils import job_queue as job_queue_module
+from backend.utils.job_queue import JobQueue, JOB_PROPOSAL_GENERATION, _utcnow
+
+
+def test_enqueue_claim_and_complete(test_engine):
+    queue = JobQueue(engine=test_engine)
+    job_id = queue.enqueue(JOB_PROPOSAL_GENERATION, {"proposal_id": "p1"}, created_by="u1")
+
+    job = queue.claim("worker-a")
+    assert job["id"] == job_id
+    assert job["status"] == "running"
+    assert job["attempts"] == 1
+    assert job["payload"] == {"proposal_id": "p1"}
+
+    # Nothing else is runnable while the lease is held.
+    assert queue.claim("worker-b") is None
+
+    assert queue.complete(job_id, "worker-a")
+    assert queue.get(job_id)["status"] == "succeeded"
+
+
+def test_failed_job_is_retried_then_marked_failed(test_engine, monkeypatch):
+    monkeypatch.setattr(job_queue_module, "JOB_RETRY_BASE_SECONDS", 0)
+    queue = JobQueue(engine=test_engine)
+    job_id = queue.enqueue(JOB_PROPOSAL_GENERATION, {}, max_attempts=2)
+
+    queue.claim("worker-a")
+    assert queue.fail(job_id, "worker-a", "boom") == "queued"
+    assert queue.get(job_id)["last_error"] == "boom"
+
+    queue.claim("worker-a")
+    assert queue.fail(job_id, "worker-a", "boom again") == "failed"
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+
+
+def test_expired_lease_is_reclaimed(test_engine):
+    queue = JobQueue(engine=test_engine)
+    job_id = queue.enqueue(JOB_PROPOSAL_GENERATION, {})
+    queue.claim("worker-a")
+
+    with test_engine.begin() as connection:
+        connection.execute(
+            text("UPDATE generation_jobs SET lease_expires_at = :past WHERE id = :id"),
+            {"past": _utcnow() - timedelta(seconds=1), "id": job_id},
+        )
+
+    job = queue.claim("worker-b")
+    assert job["id"] == job_id
+    assert job["worker_id"] == "worker-b"
+    assert job["attempts"] == 2
+    # The worker that lost its lease can no longer finish the job.
+    assert not queue.complete(job_id, "worker-a")
+    assert not queue.heartbeat(job_id, "worker-a")
+
+
+def test_lease_expired_on_final_attempt_reports_the_failure(test_engine, monkeypatch):
+    reported = []
+    monkeypatch.setattr(proposals, "report_generation_failure", lambda proposal_id, error: reported.append(proposal_id))
+    queue = JobQueue(engine=test_engine)
+    job_id = queue.enqueue(JOB_PROPOSAL_GENERATION, {"proposal_id": "p1"}, max_attempts=1)
+    queue.claim("worker-a")
+
+    with test_engine.begin() as connection:
+        connection.execute(
+            text("UPDATE generation_jobs SET lease_expires_at = :past WHERE id = :id"),
+            {"past": _utcnow() - timedelta(seconds=1), "id": job_id},
+        )
+
+    assert queue.claim("worker-b", on_exhausted=worker.report_exhausted_job) is None
+    assert queue.get(job_id)["status"] == "failed"
+    assert reported == ["p1"]
+
+
+def test_cancelled_job_is_not_claimed(test_engine):
+    queue = JobQueue(engine=test_engine)
+    job_id = queue.enqueue(JOB_PROPOSAL_GENERATION, {})
+
+    assert queue.cancel(job_id)
+    assert not queue.cancel(job_id)
+    assert queue.claim("worker-a") is None
+    assert queue.get(job_id)["status"] == "cancelled"
+
+
+def test_worker_retries_a_failing_handler(test_engine, monkeypatch):
+    monkeypatch.setattr(job_queue_module, "JOB_RETRY_BASE_SECONDS", 0)
+    queue = JobQueue(engine=test_engine)
+    monkeypatch.setattr(worker, "job_queue", queue)
+    calls = []
+
+    def handler(proposal_id, final_attempt):
+        calls.append(final_attempt)
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(worker.JOB_HANDLERS, JOB_PROPOSAL_GENERATION, handler)
+    job_id = queue.enqueue(JOB_PROPOSAL_GENERATION, {"proposal_id": "p1"}, max_attempts=2)
+
+    assert worker.run_job(queue.claim("worker-a"), "worker-a") == "queued"
+    assert worker.run_job(queue.claim("worker-a"), "worker-a") == "failed"
+    assert calls == [False, True]
+    assert queue.get(job_id)["last_error"] == "boom"
+
+
+def test_generation_failure_is_reported_on_the_last_attempt_only(monkeypatch):
+    events = []
+    monkeypatch.setattr(proposals.session_store, "load", lambda session_id: None)
+    monkeypatch.setattr(
+        proposals, "publish_generation_event", lambda proposal_id, event_type, **data: events.append(event_type)
+    )
+
+    with pytest.raises(Exception, match="Session data not found"):
+        proposals.generate_all_sections_background("s1", "p1", "u1", raise_errors=True, final_attempt=False)
+    assert "generation_failed" not in events
+    assert events[-1] == "generation_queued"
+
+    events.clear()
+    proposals.generate_all_sections_background("s1", "p1", "u1")
+    assert events[-1] == "generation_failed"
+
+
+def test_generation_with_only_fallback_sections_raises_for_retry(monkeypatch):
+    events = []
+    monkeypatch.setattr(
+        proposals.session_store,
+        "load",
+        lambda session_id: {
+            "template_name": "fallback_test.json",
+            "proposal_template": {"sections": [{"section_name": "Summary", "format_type": "text"}]},
+            "form_data": {},
+            "project_description": "Test",
+        },
+    )
+    monkeypatch.setattr(proposals, "resolve_form_data_labels", lambda form_data: form_data)
+    monkeypatch.setattr(proposals, "ProposalCrew", lambda **kwargs: MagicMock())
+    # An empty result (e.g. an unparseable crew output) is replaced by the fallback message.
+    monkeypatch.setattr(proposals, "handle_text_format", lambda *args, **kwargs: "")
+    monkeypatch.setattr(
+        proposals, "publish_generation_event", lambda proposal_id, event_type, **data: events.append(event_type)
+    )
+
+    with pytest.raises(RuntimeError, match="Generation failed for sections: Summary"):
+        proposals.generate_all_sections_background("s1", "p1", "u1", raise_errors=True, final_attempt=False)
+    assert "generation_completed" not in events
+    assert events[-1] == "generation_queued"
@@ -0,0 +1,99 @@
+import json
+
+from backend.utils.llm_cache import LLMResponseCache, cached_kickoff, make_cache_scope
+
+
+class FakeOutput:
+    def __init__(self, raw):
+        self.raw = raw
+
+
+class FakeCrew:
+    def __init__(self, raw='{"generated_content": "Hello"}'):
+        self.raw = raw
+        self.kickoffs = 0
+
+    def kickoff(self, inputs):
+        self.kickoffs += 1
+        return FakeOutput(self.raw)
+
+
+def make_cache(redis, local_max_entries=16):
+    return LLMResponseCache(True, 60, local_max_entries, client=redis)
+
+
+def test_identical_inputs_hit_the_cache(memory_redis):
+    cache = make_cache(memory_redis)
+    crew = FakeCrew()
+    scope = make_cache_scope("template.json")
+    inputs = {"section": "Summary", "form_data": {"Project title": "Water"}}
+
+    first = cached_kickoff(crew, inputs, scope, {"section_name": "Summary"}, cache=cache)
+    second = cached_kickoff(crew, dict(inputs), scope, {"section_name": "Summary"}, cache=cache)
+
+    assert crew.kickoffs == 1
+    assert second.raw == first.raw
+    assert cache.stats()["local_hits"] == 1 and cache.stats()["misses"] == 1
+
+    cached_kickoff(crew, {**inputs, "form_data": {"Project title": "Food"}}, scope, cache=cache)
+    assert crew.kickoffs == 2
+
+
+def test_redis_tier_is_shared_between_processes(memory_redis):
+    redis = memory_redis
+    crew = FakeCrew()
+    scope = make_cache_scope("template.json")
+
+    cached_kickoff(crew, {"section": "A"}, scope, cache=make_cache(redis))
+    other_process = make_cache(redis)
+    result = cached_kickoff(crew, {"section": "A"}, scope, cache=other_process)
+
+    assert crew.kickoffs == 1
+    assert json.loads(result.raw)["generated_content"] == "Hello"
+    assert other_process.stats()["redis_hits"] == 1
+
+
+def test_invalidate_template_and_unparseable_outputs(memory_redis):
+    cache = make_cache(memory_redis)
+    crew = FakeCrew()
+    scope = make_cache_scope("template.json")
+
+    cached_kickoff(crew, {"section": "A"}, scope, cache=cache)
+    cache.invalidate_template("template.json")
+    cached_kickoff(crew, {"section": "A"}, scope, cache=cache)
+    assert crew.kickoffs == 2
+
+    # Outputs without JSON are not stored, so failures are retried.
+    broken = FakeCrew(raw="Sorry, I cannot help with that.")
+    cached_kickoff(broken, {"section": "B"}, scope, cache=cache)
+    cached_kickoff(broken, {"section": "B"}, scope, cache=cache)
+    assert broken.kickoffs == 2
+
+
+def test_cache_is_bypassed_without_scope_or_when_disabled(memory_redis):
+    crew = FakeCrew()
+    cache = make_cache(memory_redis)
+    cached_kickoff(crew, {"section": "A"}, None, cache=cache)
+    cached_kickoff(crew, {"section": "A"}, None, cache=cache)
+
+    disabled = LLMResponseCache(False, 60, 16, client=memory_redis)
+    cached_kickoff(crew, {"section": "A"}, make_cache_scope("t"), cache=disabled)
+    cached_kickoff(crew, {"section": "A"}, make_cache_scope("t"), cache=disabled)
+
+    assert crew.kickoffs == 4
+
+
+def test_workers_creating_a_generation_token_agree_on_it(memory_redis):
+    client = memory_redis
+    cache = LLMResponseCache(enabled=True, ttl_seconds=60, local_max_entries=10, client=client)
+    get = client.get
+
+    def get_racing(key):
+        # Another worker creates the token right after this one found it missing.
+        value = get(key)
+        if value is None:
+            client.set(key, "other-worker-token")
+        return value
+
+    client.get = get_racing
+    assert ":other-worker-token:" in cache.make_key("t.json", {"a": 1})
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from backend.core.llm_executor import LLMExecutor, LLMQueueFullError
+
+
+@pytest.mark.asyncio
+async def test_executor_keeps_event_loop_responsive():
+    executor = LLMExecutor(max_workers=2)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    result, _ = await asyncio.gather(
+        executor.run(lambda: time.sleep(0.2) or "done"), ticker()
+    )
+
+    assert result == "done"
+    # The ticker kept running while the blocking call was in flight.
+    assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.2
+    stats = executor.stats()
+    assert stats["completed"] == 1 and stats["running"] == 0 and stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_when_queue_is_full():
+    executor = LLMExecutor(max_workers=1, max_queue=1)
+
+    first = asyncio.ensure_future(executor.run(lambda: time.sleep(0.1)))
+    await asyncio.sleep(0.02)
+    second = asyncio.ensure_future(executor.run(lambda: None))
+    await asyncio.sleep(0)
+
+    with pytest.raises(LLMQueueFullError):
+        await executor.run(lambda: None)
+
+    await asyncio.gather(first, second)
+    assert executor.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiting_call_leaves_the_queue():
+    executor = LLMExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0.02)
+    waiting = asyncio.ensure_future(executor.run(lambda: None))
+    await asyncio.sleep(0)
+    assert executor.stats()["queue_depth"] == 1
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert executor.stats()["queue_depth"] == 0
+
+    release.set()
+    await running
+    # The slot freed by the cancelled call is available again.
+    assert await executor.run(lambda: "ok") == "ok"
+    assert executor.stats()["rejected"] == 0
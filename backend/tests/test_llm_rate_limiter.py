@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from backend.core import llm_rate_limiter as rate_limiter_module
+from backend.core.llm_executor import run_in_llm_executor
+from backend.core.llm_rate_limiter import (
+    LLMRateLimiter,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_SCRIPT,
+    current_priority,
+    estimate_tokens,
+    llm_priority,
+    with_llm_priority,
+)
+
+
+class NoScriptRedis:
+    """A client without scripting support, so the limiter keeps its buckets in-process."""
+
+
+def test_estimate_tokens_counts_prompt_and_completion():
+    messages = [
+        {"role": "system", "content": "a" * 400},
+        {"role": "user", "content": [{"type": "text", "text": "b" * 40}]},
+    ]
+
+    assert estimate_tokens(messages, completion_tokens=100) == 110 + 100
+
+
+def test_lower_priorities_leave_a_reserve():
+    limiter = LLMRateLimiter(tpm=1000, rpm=0, client=NoScriptRedis())
+
+    assert limiter.try_acquire(500, PRIORITY_SCRIPT)[0]
+    # 500 tokens left: a script must keep 400 of them, a background call 200.
+    admitted, retry_after = limiter.try_acquire(200, PRIORITY_SCRIPT)
+    assert not admitted and retry_after > 0
+    assert limiter.try_acquire(300, PRIORITY_BACKGROUND)[0]
+    assert not limiter.try_acquire(100, PRIORITY_BACKGROUND)[0]
+    assert limiter.try_acquire(200, PRIORITY_INTERACTIVE)[0]
+
+
+def test_request_bucket_limits_calls():
+    limiter = LLMRateLimiter(tpm=0, rpm=2, client=NoScriptRedis())
+
+    assert limiter.try_acquire(10, PRIORITY_INTERACTIVE)[0]
+    assert limiter.try_acquire(10, PRIORITY_INTERACTIVE)[0]
+    assert not limiter.try_acquire(10, PRIORITY_INTERACTIVE)[0]
+
+
+def test_acquire_waits_then_gives_up_after_max_wait(monkeypatch):
+    limiter = LLMRateLimiter(tpm=600, rpm=0, max_wait_seconds=0.2, client=NoScriptRedis())
+    limiter.acquire(600, PRIORITY_INTERACTIVE)
+
+    # 600 tokens refill at 10/s: the next call cannot fit within 0.2s and is sent anyway.
+    limiter.acquire(600, PRIORITY_INTERACTIVE)
+
+    stats = limiter.stats()
+    assert stats["admitted"][PRIORITY_INTERACTIVE] == 2
+    assert stats["wait_timeouts"] == 1
+    assert stats["effective_tpm"] == 1200
+
+
+def test_disabled_limiter_does_not_wait():
+    limiter = LLMRateLimiter(tpm=0, rpm=0, client=NoScriptRedis())
+
+    assert limiter.acquire(10**9) == 0.0
+    assert not limiter.stats()["enabled"]
+
+
+def test_redis_script_is_used_when_available():
+    client = MagicMock()
+    client.register_script.return_value = MagicMock(return_value=[0, 1500])
+    limiter = LLMRateLimiter(tpm=1000, rpm=60, client=client, deployment="gpt")
+
+    assert limiter.try_acquire(100, PRIORITY_BACKGROUND) == (False, 1.5)
+    script = client.register_script.return_value
+    script.assert_called_once_with(
+        keys=["llm_rate:gpt:tokens", "llm_rate:gpt:requests"], args=[1000, 60, 100, 1, 0.2]
+    )
+
+
+def test_priority_context():
+    assert current_priority() == PRIORITY_SCRIPT
+    with llm_priority(PRIORITY_BACKGROUND):
+        assert current_priority() == PRIORITY_BACKGROUND
+    assert with_llm_priority(PRIORITY_BACKGROUND, current_priority)() == PRIORITY_BACKGROUND
+
+
+def test_llm_executor_calls_are_interactive_unless_called_from_a_job():
+    assert asyncio.run(run_in_llm_executor(current_priority)) == PRIORITY_INTERACTIVE
+
+    async def from_job():
+        with llm_priority(PRIORITY_BACKGROUND):
+            return await run_in_llm_executor(current_priority)
+
+    assert asyncio.run(from_job()) == PRIORITY_BACKGROUND
+
+
+def test_rate_limit_errors_are_counted(monkeypatch):
+    limiter = LLMRateLimiter(tpm=0, rpm=0, client=NoScriptRedis())
+    monkeypatch.setattr(rate_limiter_module, "llm_rate_limiter", limiter)
+
+    rate_limiter_module._count_rate_limit_errors(None, MagicMock(error="Error code: 429 - RateLimitError"))
+    rate_limiter_module._count_rate_limit_errors(None, MagicMock(error="timeout"))
+
+    assert limiter.stats()["rate_limit_errors"] == 1
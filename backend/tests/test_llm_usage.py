@@ -0,0 +1,175 @@
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from azure.ai.inference.models import StreamingChatCompletionsUpdate
+from crewai.llms.base_llm import BaseLLM
+from crewai.llms.providers.azure.completion import AzureCompletion
+from sqlalchemy import create_engine, text
+
+from backend.core import llm_usage
+from backend.core.llm_usage import _mark_first_token, estimate_cost, track_llm_usage
+from backend.utils.proposal_run_logger import ArtifactRunLogger, aggregate_usage
+
+
+class FakeLLM(BaseLLM):
+    def call(self, *args, **kwargs):
+        return "ok"
+
+
+def test_usage_is_collected_only_inside_the_block():
+    llm = FakeLLM(model="gpt-test")
+
+    llm._track_token_usage_internal({"prompt_tokens": 5, "completion_tokens": 5})
+    with track_llm_usage() as usage:
+        llm._track_token_usage_internal({"prompt_tokens": 100, "completion_tokens": 20, "cached_tokens": 40})
+        llm._track_token_usage_internal({"prompt_tokens": 50, "completion_tokens": 10})
+        _mark_first_token()
+
+    result = usage.as_dict()
+    assert result["prompt_tokens"] == 150
+    assert result["completion_tokens"] == 30
+    assert result["cached_tokens"] == 40
+    assert result["llm_calls"] == 2
+    assert result["model"] == "gpt-test"
+    assert result["first_token_ms"] is not None
+    assert result["latency_ms"] >= result["first_token_ms"]
+    # The LLM's own cumulative counters are still maintained.
+    assert llm._token_usage["prompt_tokens"] == 155
+
+
+def test_concurrent_kickoffs_are_accounted_separately():
+    llm = FakeLLM(model="gpt-test")
+    results = {}
+
+    def kickoff(name, tokens):
+        with track_llm_usage() as usage:
+            for _ in range(50):
+                llm._track_token_usage_internal({"prompt_tokens": tokens, "completion_tokens": 1})
+        results[name] = usage.prompt_tokens
+
+    threads = [threading.Thread(target=kickoff, args=(name, tokens)) for name, tokens in (("a", 1), ("b", 10))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {"a": 50, "b": 500}
+
+
+class FakeStreamingClient:
+    def __init__(self, updates):
+        self.updates = updates
+        self.params = None
+
+    def complete(self, **params):
+        self.params = params
+        return iter(self.updates)
+
+
+def test_streamed_azure_completions_report_their_usage():
+    llm = AzureCompletion(
+        model="gpt-test", api_key="key", stream=True,
+        endpoint="https://example.openai.azure.com/openai/deployments/gpt-test",
+    )
+    llm.client = FakeStreamingClient([
+        StreamingChatCompletionsUpdate({"id": "1", "choices": [{"index": 0, "delta": {"content": "Hello"}}]}),
+        StreamingChatCompletionsUpdate({"id": "1", "choices": [{"index": 0, "delta": {"content": " world"}}]}),
+        # Final chunk requested with `include_usage`: no choices, the usage of the call.
+        StreamingChatCompletionsUpdate({"id": "1", "choices": [], "usage": {
+            "prompt_tokens": 120, "completion_tokens": 2, "total_tokens": 122,
+            "prompt_tokens_details": {"cached_tokens": 64},
+        }}),
+    ])
+
+    with track_llm_usage() as usage:
+        assert llm.call("Say hello") == "Hello world"
+
+    assert llm.client.params["model_extras"] == {"stream_options": {"include_usage": True}}
+    result = usage.as_dict()
+    assert result["prompt_tokens"] == 120
+    assert result["completion_tokens"] == 2
+    assert result["cached_tokens"] == 64
+    assert result["llm_calls"] == 1
+    assert result["first_token_ms"] is not None
+
+
+def test_estimate_cost(monkeypatch):
+    monkeypatch.setattr(llm_usage, "LLM_PRICE_INPUT_PER_1K", 0.01)
+    monkeypatch.setattr(llm_usage, "LLM_PRICE_CACHED_INPUT_PER_1K", 0.005)
+    monkeypatch.setattr(llm_usage, "LLM_PRICE_OUTPUT_PER_1K", 0.03)
+
+    assert estimate_cost(2000, 1000, cached_tokens=1000) == pytest.approx(0.01 + 0.005 + 0.03)
+
+
+def test_aggregate_usage_percentiles_and_totals():
+    rows = [
+        {"template_name": "t", "section_name": "Summary", "latency_ms": latency,
+         "first_token_ms": None, "prompt_tokens": 10, "completion_tokens": 5, "estimated_cost": 0.1}
+        for latency in range(1, 101)
+    ]
+
+    [aggregate] = aggregate_usage(rows, ["template_name", "section_name"])
+
+    assert aggregate["count"] == 100
+    assert aggregate["p50_latency_ms"] == pytest.approx(50.5)
+    assert aggregate["p95_latency_ms"] == pytest.approx(95.05)
+    assert aggregate["p50_first_token_ms"] is None
+    assert aggregate["prompt_tokens"] == 1000
+    assert aggregate["completion_tokens"] == 500
+    assert aggregate["estimated_cost"] == pytest.approx(10.0)
+
+
+@pytest.fixture
+def run_logger():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("""
+            CREATE TABLE artifact_runs (
+                id TEXT PRIMARY KEY, artifact_type TEXT, run_status TEXT, start_time DATETIME,
+                template_name TEXT, total_latency_ms INTEGER, tokens_input INTEGER,
+                tokens_output INTEGER, estimated_cost NUMERIC, updated_at DATETIME
+            )
+        """))
+        connection.execute(text("""
+            CREATE TABLE artifact_run_sections (
+                id TEXT PRIMARY KEY, run_id TEXT, section_name TEXT, agent_name TEXT, model TEXT,
+                prompt_tokens INTEGER, completion_tokens INTEGER, cached_tokens INTEGER,
+                llm_calls INTEGER, estimated_cost NUMERIC, first_token_ms INTEGER,
+                latency_ms INTEGER, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+    return ArtifactRunLogger(engine=engine)
+
+
+def test_section_usage_is_persisted_and_aggregated(run_logger):
+    run_id = str(uuid.uuid4())
+    with run_logger.engine.begin() as connection:
+        connection.execute(
+            text("""
+                INSERT INTO artifact_runs (id, artifact_type, run_status, start_time, template_name, total_latency_ms)
+                VALUES (:id, 'proposal', 'completed', :start_time, 'unhcr.json', 9000)
+            """),
+            {"id": run_id, "start_time": datetime.utcnow()},
+        )
+
+    for section, latency in (("Summary", 3000), ("Budget", 6000)):
+        run_logger.log_section_usage(
+            run_id=run_id,
+            section_name=section,
+            agent_name="content_generator",
+            usage={"prompt_tokens": 1000, "completion_tokens": 200, "cached_tokens": 0,
+                   "llm_calls": 2, "model": "gpt", "first_token_ms": 400,
+                   "latency_ms": latency, "estimated_cost": 0.02},
+        )
+
+    aggregates = run_logger.get_usage_aggregates(datetime.utcnow() - timedelta(days=1))
+
+    [template] = aggregates["templates"]
+    assert template["template_name"] == "unhcr.json"
+    assert template["p50_latency_ms"] == 9000
+    assert template["prompt_tokens"] == 2000
+    assert template["completion_tokens"] == 400
+    assert [s["section_name"] for s in aggregates["sections"]] == ["Budget", "Summary"]
+    assert aggregates["sections"][0]["p95_first_token_ms"] == 400
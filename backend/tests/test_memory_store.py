@@ -0,0 +1,127 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.memory_store import DictStorage
+
+
+def make_store(**kwargs):
+    kwargs.setdefault("sweep_seconds", 0)
+    return DictStorage(**kwargs)
+
+
+def test_keys_expire():
+    store = make_store()
+    with patch("backend.core.memory_store.time.monotonic", return_value=100.0):
+        store.setex("session", 10, "data")
+        store.set("permanent", "data")
+        assert store.ttl("session") == 10
+        assert store.ttl("permanent") == -1
+
+    with patch("backend.core.memory_store.time.monotonic", return_value=111.0):
+        assert store.get("session") is None
+        assert store.get("permanent") == "data"
+        assert store.ttl("session") == -2
+
+    assert store.stats()["expirations"] == 1
+
+
+def test_sweep_removes_expired_keys_nobody_reads():
+    store = make_store()
+    with patch("backend.core.memory_store.time.monotonic", return_value=100.0):
+        store.hset("hash", mapping={"a": "1"})
+        store.expire("hash", 5)
+        store.setex("progress", 5, "50")
+        store.setex("cache", 60, "value")
+
+    with patch("backend.core.memory_store.time.monotonic", return_value=110.0):
+        assert store.sweep() == 2
+
+    assert store.stats()["keys"] == 1
+
+
+def test_least_recently_used_keys_are_evicted_by_count():
+    store = make_store(max_entries=2)
+    store.set("a", "1")
+    store.set("b", "2")
+    store.get("a")
+    store.set("c", "3")
+
+    assert store.exists("a", "b", "c") == 2
+    assert store.get("b") is None
+    assert store.stats()["evictions"] == 1
+
+
+def test_least_recently_used_keys_are_evicted_by_size():
+    store = make_store(max_bytes=500)
+    store.set("a", "x" * 200)
+    store.set("b", "x" * 200)
+
+    assert store.get("a") is None
+    assert store.get("b") == "x" * 200
+    # Growing a hash counts too, but never evicts the hash being written.
+    store.hset("h", mapping={"field": "y" * 600})
+    assert store.hgetall("h") == {"field": "y" * 600}
+    assert store.stats()["keys"] == 1
+
+
+def test_redis_semantics():
+    store = make_store()
+    assert store.set("key", 1) is True
+    assert store.set("key", "2", nx=True) is None
+    assert store.get("key") == "1"
+    assert store.set("missing", "x", xx=True) is None
+    assert store.hset("h", "a", "1") == 1
+    assert store.hmget("h", ["a", "b"]) == ["1", None]
+    assert store.hdel("h", "a") == 1
+    assert store.exists("h") == 0
+    assert store.delete("key", "missing") == 1
+
+
+
+def test_pipeline_runs_queued_commands_on_execute():
+    store = make_store()
+    pipe = store.pipeline(transaction=True)
+    assert pipe.hset("h", mapping={"a": "1"}).expire("h", 10) is pipe
+    assert store.exists("h") == 0
+
+    assert pipe.execute() == [1, True]
+    assert store.hgetall("h") == {"a": "1"}
+    assert store.ttl("h") == 10
+    assert pipe.execute() == []
+
+@pytest.mark.asyncio
+async def test_pubsub_delivers_messages_published_from_other_threads():
+    store = make_store()
+    pubsub = store.pubsub()
+    await pubsub.subscribe("channel")
+
+    received = []
+    publisher = threading.Thread(target=lambda: received.append(store.publish("channel", "hello")))
+    publisher.start()
+    publisher.join()
+
+    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1)
+    assert message["channel"] == "channel"
+    assert message["data"] == "hello"
+    assert received == [1]
+    assert store.publish("other", "ignored") == 0
+    assert await pubsub.get_message(timeout=0.01) is None
+
+    await pubsub.close()
+    assert store.publish("channel", "after close") == 0
+    assert store.stats()["channels"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pubsub_fans_out_to_every_subscriber():
+    store = make_store()
+    subscribers = [store.pubsub() for _ in range(3)]
+    for pubsub in subscribers:
+        await pubsub.subscribe("channel")
+
+    assert store.publish("channel", "event") == 3
+    messages = await asyncio.gather(*(pubsub.get_message(timeout=1) for pubsub in subscribers))
+    assert [message["data"] for message in messages] == ["event"] * 3
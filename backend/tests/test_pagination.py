@@ -0,0 +1,104 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api.proposals import list_drafts
+from backend.utils.pagination import LIST_MAX_PAGE_SIZE, ListPage, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    updated_at = datetime(2026, 10, 17, 8, 30, tzinfo=timezone.utc)
+    row_id = uuid.uuid4()
+
+    assert decode_cursor(encode_cursor(updated_at, row_id)) == (updated_at, str(row_id))
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+def test_lists_are_unpaginated_unless_requested():
+    legacy = ListPage()
+    assert legacy.paginated is False
+    assert legacy.limit_clause() == "" and legacy.params() == {}
+    assert legacy.metadata(None) == {}
+
+    page = ListPage(limit=10_000)
+    assert page.paginated and page.limit == LIST_MAX_PAGE_SIZE
+    assert page.params() == {"page_limit": LIST_MAX_PAGE_SIZE + 1}
+
+    cursor = encode_cursor(datetime(2026, 1, 1), uuid.uuid4())
+    assert ListPage(cursor=cursor).keyset("p.updated_at", "p.id").startswith("(p.updated_at, p.id) <")
+    # paginate=false is the backward-compatible full list, whatever else is passed.
+    assert ListPage(limit=5, cursor=cursor, paginate=False).keyset("p.updated_at", "p.id") is None
+    with pytest.raises(HTTPException):
+        ListPage(fields="everything")
+
+
+def test_split_returns_the_cursor_of_the_last_row():
+    now = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    rows = [{"id": uuid.uuid4(), "updated_at": now - timedelta(minutes=i)} for i in range(3)]
+    page = ListPage(limit=2, include_total=True)
+
+    items, next_cursor = page.split(rows, "updated_at")
+    assert items == rows[:2]
+    assert decode_cursor(next_cursor) == (rows[1]["updated_at"], str(rows[1]["id"]))
+    assert page.metadata(next_cursor, 3) == {"next_cursor": next_cursor, "has_more": True, "total": 3}
+    assert page.split(rows[:2], "updated_at") == (rows[:2], None)
+
+
+def _draft_row(updated_at, **overrides):
+    row = {
+        "id": uuid.uuid4(),
+        "short_name": None,
+        "title": "Water for all",
+        "budget": "1M$",
+        "status": "draft",
+        "created_at": updated_at,
+        "updated_at": updated_at,
+        "is_accepted": False,
+        "donor_name": "UNHCR",
+        "country_name": None,
+        "outcome_names": "Health, Education",
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.mark.asyncio
+async def test_list_drafts_pages_a_summary_projection():
+    now = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    rows = [_draft_row(now - timedelta(hours=i)) for i in range(3)]
+    connection = MagicMock()
+    connection.execute = AsyncMock(
+        side_effect=[
+            MagicMock(**{"mappings.return_value.fetchall.return_value": rows}),
+            MagicMock(**{"scalar.return_value": 7}),
+        ]
+    )
+    cursor = encode_cursor(now + timedelta(days=1), uuid.uuid4())
+    page = ListPage(limit=2, cursor=cursor, fields="summary", include_total=True)
+
+    response = await list_drafts(
+        status=None,
+        current_user={"user_id": "u1", "roles": ["proposal writer"]},
+        page=page,
+        connection=connection,
+    )
+
+    query, params = connection.execute.await_args_list[0].args
+    sql = str(query)
+    assert "p.form_data->>'Project title'" in sql and "project_description" not in sql
+    assert "(p.updated_at, p.id) < (:cursor_sort, CAST(:cursor_id AS uuid))" in sql
+    assert "ORDER BY p.updated_at DESC, p.id DESC LIMIT :page_limit" in sql
+    assert params["page_limit"] == 3 and params["uid"] == "u1"
+    # The count ignores the cursor.
+    assert "cursor" not in str(connection.execute.await_args_list[1].args[0])
+
+    assert [draft["proposal_id"] for draft in response["drafts"]] == [rows[0]["id"], rows[1]["id"]]
+    assert response["drafts"][0]["project_title"] == "Water for all"
+    assert "summary" not in response["drafts"][0]
+    assert response["has_more"] is True and response["total"] == 7
+    assert decode_cursor(response["next_cursor"])[1] == str(rows[1]["id"])
@@ -0,0 +1,58 @@
+import os
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import jwt
+
+from backend.core import security
+from backend.core.principal_cache import PrincipalCache
+
+
+def _request_with_token(email):
+    token = jwt.encode(
+        {"email": email, "exp": datetime.utcnow() + timedelta(minutes=5)},
+        os.environ["SECRET_KEY"],
+        algorithm="HS256",
+    )
+    request = MagicMock()
+    request.cookies = {"auth_token": token}
+    return request
+
+
+def _mock_engine(roles):
+    engine = MagicMock()
+    connection = engine.connect.return_value.__enter__.return_value
+    connection.execute.return_value.fetchone.return_value = (
+        "user-1", "Jane", "jane@example.com", "hash", None
+    )
+    connection.execute.return_value.fetchall.return_value = [(role,) for role in roles]
+    return engine
+
+
+def test_principal_is_served_from_cache_until_invalidated(monkeypatch, memory_redis):
+    cache = PrincipalCache(60, 10, client=memory_redis)
+    engine = _mock_engine(["system admin"])
+    monkeypatch.setattr(security, "principal_cache", cache)
+    monkeypatch.setattr(security, "get_engine", lambda: engine)
+    request = _request_with_token("jane@example.com")
+
+    first = security.get_current_user(request)
+    second = security.get_current_user(request)
+
+    assert first == second
+    assert first["is_admin"] is True
+    assert engine.connect.call_count == 1
+    assert cache.stats()["local_hits"] == 1
+
+    security.invalidate_principal("jane@example.com")
+    security.get_current_user(request)
+    assert engine.connect.call_count == 2
+
+
+def test_redis_tier_is_shared_between_workers(memory_redis):
+    redis = memory_redis
+    PrincipalCache(60, 10, client=redis).set("jane@example.com", {"user_id": "user-1"})
+
+    other_worker = PrincipalCache(60, 10, client=redis)
+    assert other_worker.get("Jane@example.com") == {"user_id": "user-1"}
+    assert other_worker.stats()["redis_hits"] == 1
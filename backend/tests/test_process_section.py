@@ -41,3 +41,36 @@ def test_process_section(authenticated_client, mocker):
     assert response.status_code == 200
     assert "generated_text" in response_data
     assert response_data["generated_text"] == "Test content"
+
+
+def test_process_section_failure_closes_the_section_for_stream_clients(authenticated_client, mocker):
+    from backend.api import proposals
+    from backend.core.llm_executor import LLMQueueFullError
+
+    mocker.patch.object(
+        proposals.session_store,
+        "load",
+        return_value={"proposal_template": {"sections": [{"section_name": "Summary"}]}, "form_data": {}},
+    )
+    mocker.patch.object(proposals.session_store, "update")
+    mocker.patch.object(proposals, "resolve_form_data_labels", side_effect=lambda form_data: form_data)
+    mocker.patch.object(proposals, "run_in_llm_executor", side_effect=LLMQueueFullError("queue full"))
+    publish = mocker.patch.object(proposals, "publish_generation_event")
+    mock_engine = MagicMock()
+    mock_engine.connect.return_value.__enter__.return_value.execute.return_value.fetchone.return_value = (False,)
+    mocker.patch.object(proposals, "get_engine", return_value=mock_engine)
+
+    proposal_id = str(uuid.uuid4())
+    response = authenticated_client.post(
+        f"/api/process_section/{uuid.uuid4()}",
+        json={
+            "section": "Summary",
+            "proposal_id": proposal_id,
+            "form_data": {},
+            "project_description": "A test for a failing section.",
+        },
+    )
+
+    assert response.status_code == 503
+    assert [c.args[1] for c in publish.call_args_list] == ["section_started", "section_completed"]
+    assert publish.call_args.kwargs["error"] == "queue full"
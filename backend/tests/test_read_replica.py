@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.core import db, security
+from backend.core.db import ReplicaRouter
+from backend.core.db_pool import WORKLOAD_API, WORKLOAD_BACKGROUND
+
+
+@pytest.fixture
+def router(monkeypatch):
+    router = ReplicaRouter(host="replica", max_lag_seconds=5, read_your_writes_seconds=30)
+    # Lag is set by the tests instead of being measured in a thread.
+    monkeypatch.setattr(router, "_schedule_lag_check", lambda: None)
+    monkeypatch.setattr(db, "replica_router", router)
+    monkeypatch.setattr(security, "replica_router", router)
+    return router
+
+
+def test_reads_stay_on_the_primary_without_a_replica():
+    router = ReplicaRouter(host="")
+    assert router.use_replica("user") is False
+    router.record_write("user")
+    assert router.stats()["enabled"] is False
+
+
+def test_replica_is_used_only_while_its_lag_is_known_and_small(router):
+    assert router.use_replica() is False
+    router.lag_seconds = 1.0
+    assert router.use_replica() is True
+    router.lag_seconds = 60.0
+    assert router.use_replica() is False
+    assert router.stats()["replica_reads"] == 1
+    assert router.stats()["primary_reads"] == 2
+
+
+def test_users_read_their_own_writes_from_the_primary(router):
+    router.lag_seconds = 0.0
+    router.record_write("writer")
+    assert router.use_replica("writer") is False
+    assert router.use_replica("reader") is True
+    assert router.use_replica() is True
+
+
+def test_lag_is_measured_on_the_replica(router, monkeypatch):
+    replica = MagicMock()
+    replica.connect.return_value.__enter__.return_value.execute.return_value.scalar.return_value = 2.5
+    monkeypatch.setitem(db._replica_engines, WORKLOAD_BACKGROUND, replica)
+
+    assert router.check_lag() == 2.5
+    assert router.use_replica() is True
+
+
+def test_get_engine_routes_readonly_queries(router, monkeypatch):
+    replica = MagicMock(name="replica")
+    monkeypatch.setitem(db._replica_engines, WORKLOAD_API, replica)
+    router.lag_seconds = 0.0
+
+    assert db.get_engine(readonly=True) is replica
+    assert db.get_engine() is not replica
+    router.record_write("writer")
+    assert db.get_engine(readonly=True, consistency_key="writer") is not replica
+
+
+def test_unreachable_replica_falls_back_to_the_primary(router, monkeypatch):
+    def unreachable(workload, host):
+        raise ConnectionError("replica is down")
+
+    monkeypatch.setattr(db, "_create_engine", unreachable)
+    monkeypatch.setattr(db, "_replica_engines", {})
+    router.lag_seconds = 0.0
+
+    assert db.get_engine(WORKLOAD_BACKGROUND, readonly=True) is db.get_engine(WORKLOAD_BACKGROUND)
+    assert router.stats()["failures"] == 1
+    # The replica is left alone until the retry delay expires.
+    assert router.use_replica() is False
+    assert router.check_lag() is None
+
+
+def test_write_requests_send_the_user_to_the_primary(router, monkeypatch):
+    monkeypatch.setattr(security, "_authenticate", lambda request: {"user_id": "author"})
+    router.lag_seconds = 0.0
+
+    security.get_current_user(MagicMock(method="GET"))
+    assert router.use_replica("author") is True
+    security.get_current_user(MagicMock(method="POST"))
+    assert router.use_replica("author") is False
@@ -0,0 +1,83 @@
+import uuid
+
+from sqlalchemy import event, text
+
+from backend.utils.reference_data import ReferenceDataResolver
+
+
+def _insert(engine, table, name):
+    ref_id = str(uuid.uuid4())
+    with engine.begin() as connection:
+        connection.execute(
+            text(f"INSERT INTO {table} (id, name) VALUES (:id, :name)"),
+            {"id": ref_id, "name": name},
+        )
+    return ref_id
+
+
+def _count_queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_form_data_labels_resolved_in_one_query_then_cached(test_engine, memory_redis):
+    donor = _insert(test_engine, "donors", "ECHO")
+    outcome_a = _insert(test_engine, "outcomes", "Protection")
+    outcome_b = _insert(test_engine, "outcomes", "Education")
+    country = _insert(test_engine, "field_contexts", "Kenya")
+    unknown = str(uuid.uuid4())
+
+    resolver = ReferenceDataResolver(engine=test_engine, client=memory_redis)
+    statements = _count_queries(test_engine)
+    form_data = {
+        "Targeted Donor": donor,
+        "Main Outcome": [outcome_a, outcome_b, unknown],
+        "Country / Location(s)": [country, "Somewhere"],
+        "Project title": "Water",
+    }
+
+    resolved = resolver.resolve_form_data(form_data)
+    assert resolved == {
+        "Targeted Donor": "ECHO",
+        "Main Outcome": ["Protection", "Education", unknown],
+        "Country / Location(s)": ["Kenya", "Somewhere"],
+        "Project title": "Water",
+    }
+    assert len(statements) == 1
+
+    # Second resolution, including the unknown ID, is served from memory.
+    assert resolver.resolve_form_data(form_data) == resolved
+    assert len(statements) == 1
+
+
+def test_invalidate_picks_up_new_rows(test_engine, memory_redis):
+    redis = memory_redis
+    resolver = ReferenceDataResolver(engine=test_engine, client=redis)
+    other_worker = ReferenceDataResolver(engine=test_engine, client=redis)
+    donor_id = str(uuid.uuid4())
+
+    assert other_worker.resolve_form_data({"Targeted Donor": donor_id}) == {"Targeted Donor": donor_id}
+
+    with test_engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO donors (id, name) VALUES (:id, 'UNICEF')"), {"id": donor_id}
+        )
+    resolver.invalidate()
+
+    assert other_worker.resolve_form_data({"Targeted Donor": donor_id}) == {"Targeted Donor": "UNICEF"}
+
+
+def test_malformed_ids_do_not_fail_the_batch(test_engine, memory_redis):
+    donor = _insert(test_engine, "donors", "ECHO")
+    malformed = "not-a-uuid-but-exactly-36-chars-long"
+    assert len(malformed) == 36
+
+    resolver = ReferenceDataResolver(engine=test_engine, client=memory_redis)
+    statements = _count_queries(test_engine)
+    resolved = resolver.resolve_form_data({"Targeted Donor": donor, "Main Outcome": malformed})
+
+    assert resolved == {"Targeted Donor": "ECHO", "Main Outcome": malformed}
+    assert len(statements) == 1
+    assert resolver.resolve({"donors": [malformed]}) == {"donors": {}}
+    assert len(statements) == 1
@@ -40,3 +40,71 @@ async def test_regenerate_section(authenticated_client, mocker):
     response_json = response.json()
     assert "Content regenerated for Introduction" in response_json["message"]
     assert "Regenerated Content" in response_json["generated_text"]
+
+
+def test_flagged_section_is_regenerated_with_its_dependency_context(mocker):
+    from backend.utils import crew_actions
+    from backend.utils.section_scheduler import with_dependency_context
+
+    flagged = MagicMock(raw='{"generated_content": "Draft", "evaluation_status": "Flagged", "feedback": "Too vague"}')
+    mocker.patch.object(crew_actions, "cached_kickoff", return_value=flagged)
+    regenerate = mocker.patch.object(crew_actions, "regenerate_section_logic", return_value="Regenerated")
+
+    config = with_dependency_context(
+        {"section_name": "Budget", "instructions": "Build the budget."}, {"Activities": "Activity 1"}
+    )
+    result = crew_actions.handle_text_format(config, MagicMock(), {}, "", "session-1", "proposal-1")
+
+    assert result == "Regenerated"
+    section = regenerate.call_args.kwargs["section_config"]
+    assert "Activity 1" in section.regeneration_instructions
+
+
+def test_regenerate_full_proposal(authenticated_client, mocker):
+    from backend.api import proposals
+
+    mocker.patch("backend.utils.proposal_run_logger.artifact_run_logger.create_run_record", return_value=None)
+    update = mocker.patch.object(proposals.session_store, "update")
+    publish = mocker.patch.object(proposals, "publish_generation_event")
+    dispatch = mocker.patch.object(proposals, "dispatch_generation_job", return_value="job-1")
+
+    proposal_id = str(uuid.uuid4())
+    payload = {
+        "proposal_id": proposal_id,
+        "follow_up_instruction": "Focus on refugee youth.",
+        "current_sections": {"Summary": "Old summary"},
+        "form_data": {"Project title": "Child Protection"},
+        "project_description": "A project for full regeneration test.",
+    }
+    response = authenticated_client.post("/api/regenerate-full-proposal/session-1", json=payload)
+
+    assert response.status_code == 202
+    assert response.json()["job_id"] == "job-1"
+    update.assert_called_once()
+    publish.assert_called_once_with(proposal_id, "generation_queued")
+    job_payload = dispatch.call_args.args[3]
+    assert job_payload["proposal_id"] == proposal_id
+    assert job_payload["follow_up_instruction"] == "Focus on refugee youth."
+
+
+def test_regenerate_section_answers_503_when_llm_queue_is_full(authenticated_client, mocker):
+    from backend.core.llm_executor import LLMQueueFullError
+
+    mocker.patch("backend.api.proposals.run_in_llm_executor", side_effect=LLMQueueFullError("queue full"))
+    mocker.patch("backend.api.proposals.redis_client.setex")
+    mock_engine = MagicMock()
+    mock_engine.connect.return_value.__enter__.return_value.execute.return_value.scalar.return_value = False
+    mocker.patch("backend.api.proposals.get_engine", return_value=mock_engine)
+
+    response = authenticated_client.post(
+        f"/api/regenerate_section/{uuid.uuid4()}",
+        json={
+            "section": "Introduction",
+            "concise_input": "Make it better.",
+            "form_data": {},
+            "project_description": "A project for the busy executor test.",
+        },
+    )
+
+    assert response.status_code == 503
+    assert "busy" in response.json()["detail"]
@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from backend.utils.section_scheduler import (
+    build_section_graph,
+    run_section_graph,
+    with_dependency_context,
+)
+
+
+def _template(*sections):
+    return {"sections": [dict(section_name=name, **extra) for name, extra in sections]}
+
+
+def test_build_section_graph_ignores_unknown_dependencies():
+    template = _template(
+        ("Activities", {}),
+        ("Budget", {"depends_on": ["Activities", "Missing", "Budget"]}),
+    )
+    graph = build_section_graph(template, ["Activities", "Budget"])
+    assert graph == {"Activities": [], "Budget": ["Activities"]}
+
+
+def test_build_section_graph_rejects_cycles():
+    template = _template(
+        ("A", {"depends_on": ["B"]}),
+        ("B", {"depends_on": ["A"]}),
+    )
+    with pytest.raises(ValueError):
+        build_section_graph(template, ["A", "B"])
+
+
+def test_run_section_graph_honours_dependencies_and_output_order():
+    sequence = ["Summary", "Activities", "Budget", "Risks"]
+    graph = {"Summary": [], "Activities": [], "Budget": ["Activities"], "Risks": []}
+    started, completed = [], []
+    lock = threading.Lock()
+    others_completed = threading.Event()
+
+    def generate(name, upstream):
+        with lock:
+            started.append(name)
+        if name == "Budget":
+            assert upstream == {"Activities": "Activities text"}
+        if name == "Summary":
+            # Summary is held until every other section has completed.
+            assert others_completed.wait(timeout=5)
+        return f"{name} text"
+
+    def on_complete(name, result):
+        completed.append(name)
+        if {"Activities", "Budget", "Risks"} <= set(completed):
+            others_completed.set()
+
+    results = run_section_graph(sequence, graph, generate, on_complete=on_complete, max_workers=3)
+
+    assert list(results) == sequence
+    assert started.index("Budget") > started.index("Activities")
+    assert completed.index("Budget") > completed.index("Activities")
+    # Independent sections complete without waiting for the slow one.
+    assert completed[-1] == "Summary"
+
+
+def test_run_section_graph_bounds_concurrency():
+    sequence = [f"S{i}" for i in range(6)]
+    active, peak = [0], [0]
+    lock = threading.Lock()
+    # Sections leave in pairs, so each one overlaps another running section.
+    pair = threading.Barrier(2, timeout=5)
+
+    def generate(name, upstream):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        pair.wait()
+        with lock:
+            active[0] -= 1
+        return name
+
+    run_section_graph(sequence, {name: [] for name in sequence}, generate, max_workers=2)
+    assert peak[0] == 2
+
+
+def test_with_dependency_context_does_not_mutate_config():
+    config = {"section_name": "Budget", "instructions": "Build the budget."}
+    enriched = with_dependency_context(config, {"Activities": "Activity 1"})
+    assert config["instructions"] == "Build the budget."
+    assert "Activity 1" in enriched["instructions"]
+    assert with_dependency_context(config, {"Activities": ""}) is config
@@ -0,0 +1,52 @@
+import json
+import uuid
+
+from sqlalchemy import text
+
+from backend.utils.section_store import save_section, save_sections
+
+
+def _create_proposal(engine, sections):
+    proposal_id = str(uuid.uuid4())
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO proposals (id, generated_sections, status) VALUES (:id, :sections, 'generating_sections')"),
+            {"id": proposal_id, "sections": json.dumps(sections) if sections is not None else None},
+        )
+    return proposal_id
+
+
+def _load(engine, proposal_id):
+    with engine.connect() as connection:
+        row = connection.execute(
+            text("SELECT generated_sections, status FROM proposals WHERE id = :id"),
+            {"id": proposal_id},
+        ).fetchone()
+    return json.loads(row.generated_sections), row.status
+
+
+def test_save_section_merges_into_existing_sections(test_engine):
+    proposal_id = _create_proposal(test_engine, {"Summary": "Old summary", "Budget": "100"})
+
+    with test_engine.begin() as connection:
+        assert save_section(connection, proposal_id, "Summary", 'New "summary"\nwith lines')
+
+    sections, _ = _load(test_engine, proposal_id)
+    assert sections == {"Summary": 'New "summary"\nwith lines', "Budget": "100"}
+
+
+def test_save_sections_handles_empty_document_and_status(test_engine):
+    proposal_id = _create_proposal(test_engine, None)
+
+    with test_engine.begin() as connection:
+        save_section(connection, proposal_id, "Summary", "Text")
+        save_sections(connection, proposal_id, {}, status="draft")
+
+    sections, status = _load(test_engine, proposal_id)
+    assert sections == {"Summary": "Text"}
+    assert status == "draft"
+
+
+def test_save_section_unknown_proposal(test_engine):
+    with test_engine.begin() as connection:
+        assert not save_section(connection, str(uuid.uuid4()), "Summary", "Text")
@@ -0,0 +1,112 @@
+import json
+from unittest.mock import patch
+
+from backend.utils.session_store import TEMPLATE_KEY_PREFIX, SessionStore, session_key, template_version
+
+
+TEMPLATE = {"donors": ["UNHCR"], "sections": [{"section_name": "Summary"}]}
+TEMPLATE_KEY = f"{TEMPLATE_KEY_PREFIX}:unhcr.json:{template_version(TEMPLATE)}"
+
+
+def record_written_fields(monkeypatch, client):
+    """Returns the list of the field names of each hash write to `client`."""
+    written_fields = []
+    hset = client.hset
+
+    def record(name, key=None, value=None, mapping=None):
+        written_fields.append(sorted(mapping or {key: value}))
+        return hset(name, key, value, mapping)
+
+    monkeypatch.setattr(client, "hset", record)
+    return written_fields
+
+
+def make_session(store, session_id="s1"):
+    store.create(session_id, {
+        "proposal_id": "p1",
+        "form_data": {"Project title": "Water"},
+        "template_name": "unhcr.json",
+        "proposal_template": TEMPLATE,
+        "generated_sections": {"Summary": "Old"},
+    })
+
+
+def test_sessions_reference_a_single_copy_of_the_template(memory_redis):
+    client = memory_redis
+    store = SessionStore(client=client)
+    make_session(store, "s1")
+    make_session(store, "s2")
+
+    # Two sessions, one template
+    assert client.stats()["keys"] == 3
+    assert client.exists(TEMPLATE_KEY)
+    fields = client.hgetall(session_key("s1"))
+    assert "proposal_template" not in fields
+    assert json.loads(fields["template_ref"]) == {"filename": "unhcr.json", "version": template_version(TEMPLATE)}
+
+    session = store.load("s1")
+    assert session["proposal_template"] == TEMPLATE
+    assert session["template_version"] == template_version(TEMPLATE)
+    assert session["generated_sections"] == {"Summary": "Old"}
+    assert "proposal_template" not in store.load("s1", with_template=False)
+
+
+def test_updates_write_only_the_given_fields(monkeypatch, memory_redis):
+    store = SessionStore(client=memory_redis)
+    make_session(store)
+    written_fields = record_written_fields(monkeypatch, memory_redis)
+
+    store.update("s1", form_data={"Project title": "Shelter"})
+    store.set_sections("s1", {"Summary": "New"})
+
+    assert written_fields == [["form_data"], ["section:Summary"]]
+    session = store.load("s1")
+    assert session["form_data"] == {"Project title": "Shelter"}
+    assert session["generated_sections"] == {"Summary": "New"}
+    assert session["proposal_id"] == "p1"
+
+
+def test_template_is_reloaded_from_redis_by_other_processes(memory_redis):
+    client = memory_redis
+    make_session(SessionStore(client=client))
+
+    assert SessionStore(client=client).load("s1")["proposal_template"] == TEMPLATE
+
+
+def test_expired_template_version_falls_back_to_the_current_template(memory_redis):
+    client = memory_redis
+    make_session(SessionStore(client=client))
+    client.delete(TEMPLATE_KEY)
+
+    with patch("backend.core.config.load_proposal_template", return_value={"sections": []}) as mock_load:
+        session = SessionStore(client=client).load("s1")
+
+    mock_load.assert_called_once_with("unhcr.json")
+    assert session["proposal_template"] == {"sections": []}
+
+
+def test_legacy_sessions_are_read_and_converted_on_update(memory_redis):
+    client = memory_redis
+    client.set("legacy", json.dumps({"proposal_id": "p1", "proposal_template": TEMPLATE}))
+    store = SessionStore(client=client)
+
+    assert store.load("legacy")["proposal_template"] == TEMPLATE
+
+    store.update("legacy", is_regeneration=True)
+
+    assert not client.exists("legacy")
+    session = store.load("legacy")
+    assert session["is_regeneration"] is True
+    assert session["proposal_template"] == TEMPLATE
+
+
+def test_written_template_keys_are_bounded(memory_redis):
+    store = SessionStore(client=memory_redis)
+    with patch("backend.utils.session_store.SESSION_TEMPLATE_LOCAL_MAX_ENTRIES", 2):
+        for i in range(5):
+            store.intern_template("unhcr.json", dict(TEMPLATE, donors=[f"Donor {i}"]))
+    assert len(store._templates_written) == 2
+
+
+def test_missing_session(memory_redis):
+    assert SessionStore(client=memory_redis).load("unknown") is None
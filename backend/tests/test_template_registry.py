@@ -0,0 +1,115 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.template_registry import TemplateRegistry
+
+
+@pytest.fixture
+def template_dirs(tmp_path):
+    proposal_dir = tmp_path / "proposal_template"
+    concept_note_dir = tmp_path / "concept_note_template"
+    proposal_dir.mkdir()
+    concept_note_dir.mkdir()
+    (proposal_dir / "proposal_template_unhcr.json").write_text(json.dumps({"donors": ["UNHCR"], "sections": []}))
+    (proposal_dir / "proposal_template_echo.json").write_text(json.dumps({"donors": ["ECHO"], "sections": []}))
+    (concept_note_dir / "concept_note_echo.json").write_text(json.dumps({"donors": ["ECHO"], "sections": []}))
+    (tmp_path / "not_a_template.txt").write_text("ignored")
+    return [str(proposal_dir), str(concept_note_dir), str(tmp_path)]
+
+
+def make_registry(template_dirs, client, **kwargs):
+    return TemplateRegistry(template_dirs, client=client, rescan_seconds=0, **kwargs)
+
+
+def test_templates_map_matches_directory_scan(template_dirs, memory_redis):
+    registry = make_registry(template_dirs, memory_redis)
+
+    assert registry.templates_map() == {
+        "UNHCR": "proposal_template_unhcr.json",
+        "ECHO": "proposal_template_echo.json",
+        "proposal_template_unhcr.json": "proposal_template_unhcr.json",
+        "proposal_template_echo.json": "proposal_template_echo.json",
+        "concept_note_echo.json": "concept_note_echo.json",
+        "Not Yet Specified": "proposal_template_unhcr.json",
+    }
+    assert registry.filenames(template_dirs[1:2]) == ["concept_note_echo.json"]
+    assert registry.find_path("concept_note_echo.json") == os.path.join(template_dirs[1], "concept_note_echo.json")
+
+
+def test_unchanged_files_are_not_read_again(template_dirs, memory_redis):
+    registry = make_registry(template_dirs, memory_redis)
+    registry.templates_map()
+
+    with patch("io.open") as mock_open:
+        registry.templates_map()
+    mock_open.assert_not_called()
+
+    path = os.path.join(template_dirs[0], "proposal_template_echo.json")
+    with open(path, "w") as f:
+        json.dump({"donors": ["ECHO", "DG ECHO"], "sections": []}, f)
+    os.utime(path, (0, 1))
+
+    assert registry.templates_map()["DG ECHO"] == "proposal_template_echo.json"
+    assert registry.stats()["file_reloads"] == 4
+
+
+def test_resolved_templates_are_copies_and_dropped_on_file_change(template_dirs, memory_redis):
+    registry = make_registry(template_dirs, memory_redis)
+    registry.store("proposal_template_echo.json", False, {"sections": [{"section_name": "A"}]})
+
+    template = registry.get("proposal_template_echo.json", False)
+    template["sections"].append({"section_name": "B"})
+    assert registry.get("proposal_template_echo.json", False) == {"sections": [{"section_name": "A"}]}
+    assert registry.get("proposal_template_echo.json", True) is None
+
+    os.utime(os.path.join(template_dirs[0], "proposal_template_echo.json"), (0, 1))
+    assert registry.get("proposal_template_echo.json", False) is None
+
+
+def test_invalidate_is_seen_by_other_workers(template_dirs, memory_redis):
+    client = memory_redis
+    worker_a = TemplateRegistry(template_dirs, client=client, rescan_seconds=0)
+    worker_b = TemplateRegistry(template_dirs, client=client, rescan_seconds=0)
+    worker_b.store("proposal_template_echo.json", True, {"version": 1})
+    assert worker_b.get("proposal_template_echo.json") == {"version": 1}
+
+    worker_a.invalidate()
+
+    assert worker_b.get("proposal_template_echo.json") is None
+
+
+def test_resolved_templates_expire(template_dirs, memory_redis):
+    registry = make_registry(template_dirs, memory_redis, ttl_seconds=0)
+    registry.store("proposal_template_echo.json", True, {"version": 1})
+
+    assert registry.get("proposal_template_echo.json") is None
+
+
+def test_compiled_lookups_reuse_the_stored_version(template_dirs, memory_redis):
+    registry = make_registry(template_dirs, memory_redis)
+    registry.store("proposal_template_echo.json", True, {"sections": [{"section_name": "A"}]})
+    first = registry.get_compiled("proposal_template_echo.json")
+
+    with patch("backend.core.template_registry.template_version") as version, \
+            patch("backend.core.template_registry.copy.deepcopy") as deepcopy:
+        assert registry.get_compiled("proposal_template_echo.json") is first
+
+    version.assert_not_called()
+    deepcopy.assert_not_called()
+    assert first.section("A") is not None
+    assert registry.get_compiled("proposal_template_echo.json", False) is None
+
+
+def test_load_proposal_template_is_served_from_the_registry():
+    from backend.core.config import load_proposal_template
+
+    with patch("backend.core.config._load_template_from_db", return_value={"sections": []}) as mock_db:
+        first = load_proposal_template("proposal_template_unhcr.json")
+        first["sections"].append("modified by caller")
+        second = load_proposal_template("proposal_template_unhcr.json")
+
+    assert mock_db.call_count == 1
+    assert second == {"sections": []}
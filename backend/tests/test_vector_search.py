@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.utils.vector_search import (
+    HNSW_INDEX_NAME,
+    IVFFLAT_INDEX_NAME,
+    build_fts_query,
+    ivfflat_lists,
+    rebuild_vector_index,
+    search_reference_chunks,
+)
+
+EMBEDDING = [0.1, 0.2, 0.3]
+
+
+def _connection(*results):
+    connection = MagicMock()
+    connection.execute.side_effect = [MagicMock(**{"fetchall.return_value": rows}) for rows in results]
+    return connection
+
+
+def _statements(connection):
+    return [(str(call.args[0]), call.args[1] if len(call.args) > 1 else None) for call in connection.execute.call_args_list]
+
+
+def test_candidates_come_from_the_index_before_the_card_filter():
+    rows = [("chunk", "https://example.org", 0.9)] * 2
+    connection = _connection([], rows)
+
+    assert search_reference_chunks(connection, EMBEDDING, "water", "card", limit=2, candidates=50, ef_search=20) == rows
+
+    (settings, setting_params), (query, params) = _statements(connection)
+    assert "hnsw.ef_search" in settings and "ivfflat.probes" in settings
+    # HNSW cannot return more rows than ef_search.
+    assert setting_params["ef_search"] == "50"
+    ann_branch, keyword_branch = query.split("WITH candidates AS (")[1].split("UNION")[:2]
+    assert "ORDER BY embedding <=> :query_embedding" in ann_branch and "kc_id" not in ann_branch
+    assert "text_chunk_tsv @@ websearch_to_tsquery('english', :fts_query)" in keyword_branch
+    assert "to_tsquery('english'" not in query.replace("websearch_to_tsquery", "")
+    assert "WHERE kctr.knowledge_card_id = :kc_id" in query
+    assert params["candidates"] == 50 and params["limit"] == 2
+    assert params["query_embedding"] == "[0.1, 0.2, 0.3]"
+
+
+def test_cards_with_too_few_candidates_fall_back_to_exact_search():
+    ann_rows = [("close chunk", "https://example.org", 0.9)]
+    exact_rows = ann_rows + [("other chunk", "https://example.org", 0.5)]
+
+    connection = _connection([], ann_rows, exact_rows)
+    assert search_reference_chunks(connection, EMBEDDING, "water", "card", limit=2, probes=7) == exact_rows
+    statements = _statements(connection)
+    assert statements[0][1]["probes"] == "7"
+    assert "candidates" not in statements[2][0]
+
+    connection = _connection([], ann_rows)
+    assert search_reference_chunks(connection, EMBEDDING, "water", "card", limit=2, fallback=False) == ann_rows
+
+    connection = _connection(exact_rows)
+    assert search_reference_chunks(connection, EMBEDDING, "water", "card", limit=2, exact=True) == exact_rows
+    assert connection.execute.call_count == 1
+
+
+def test_rebuild_replaces_the_index():
+    connection = MagicMock()
+    connection.execute.return_value.scalar.return_value = 250_000
+
+    ddl = rebuild_vector_index(connection, "ivfflat")
+    assert ddl.startswith(f"CREATE INDEX {IVFFLAT_INDEX_NAME}") and "lists = 250" in ddl
+    executed = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert f"DROP INDEX IF EXISTS {HNSW_INDEX_NAME}" in executed
+
+    assert "USING hnsw (embedding vector_cosine_ops)" in rebuild_vector_index(MagicMock(), "hnsw")
+    with pytest.raises(ValueError):
+        rebuild_vector_index(MagicMock(), "flat")
+    assert ivfflat_lists(10) == 1 and ivfflat_lists(4_000_000) == 2000
+
+
+def test_fts_query_keeps_words_and_matches_any_of_a_long_query():
+    assert build_fts_query("refugee's (education)?") == "refugee s education"
+    assert build_fts_query("") == ""
+    long_query = "access to clean water for refugees or displaced people in camps"
+    assert build_fts_query(long_query) == " or ".join(
+        ["access", "to", "clean", "water", "for", "refugees", "displaced", "people", "in", "camps"]
+    )
@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from backend.utils.chunk_store import chunk_hash
+from backend.utils.vector_writer import (
+    COPY_SQL,
+    replace_reference_vectors,
+    sync_reference_vectors,
+    vector_literal,
+    write_reference_vectors,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE knowledge_card_reference_vectors "
+            "(id INTEGER PRIMARY KEY, reference_id TEXT, text_chunk TEXT, embedding TEXT, content_hash TEXT)"
+        ))
+    return engine
+
+
+def _chunks(connection, reference_id="ref"):
+    return connection.execute(
+        text("SELECT text_chunk, embedding FROM knowledge_card_reference_vectors WHERE reference_id = :ref ORDER BY id"),
+        {"ref": reference_id},
+    ).fetchall()
+
+
+def test_vectors_are_replaced_in_bulk(engine, monkeypatch):
+    monkeypatch.setattr("backend.utils.vector_writer.VECTOR_INSERT_BATCH_ROWS", 2)
+    with engine.begin() as connection:
+        replace_reference_vectors(connection, "ref", [("old", [0.0])])
+        replace_reference_vectors(connection, "other", [("kept", [1.0])])
+
+    rows = [(f"chunk {i}", [i, 0.5]) for i in range(5)]
+    with engine.begin() as connection:
+        assert replace_reference_vectors(connection, "ref", rows) == 5
+
+    with engine.connect() as connection:
+        assert _chunks(connection) == [(f"chunk {i}", f"[{float(i)},0.5]") for i in range(5)]
+        assert _chunks(connection, "other") == [("kept", "[1.0]")]
+
+
+def test_a_failed_write_keeps_the_previous_vectors(engine):
+    with engine.begin() as connection:
+        replace_reference_vectors(connection, "ref", [("old", [0.0])])
+
+    with engine.begin() as connection:
+        with pytest.raises(ValueError):
+            replace_reference_vectors(connection, "ref", [("new", [0.1]), ("bad", ["not a number"])])
+        # The savepoint is rolled back; the caller's transaction goes on.
+        assert _chunks(connection) == [("old", "[0.0]")]
+
+
+def test_postgres_drivers_stream_rows_with_copy():
+    copied = {}
+
+    def copy_expert(sql, stream):
+        copied["sql"] = sql
+        copied["data"] = b"".join(iter(lambda: stream.read(7), b""))
+
+    connection = MagicMock()
+    connection.dialect.driver = "psycopg2"
+    connection.connection.dbapi_connection.cursor.return_value.copy_expert.side_effect = copy_expert
+
+    rows = [("tab\there\nand a \\ backslash\x00", [0.25, -1e-05]), ("second", [1, 2])]
+    assert write_reference_vectors(connection, "ref", rows) == 2
+
+    assert copied["sql"] == COPY_SQL
+    assert copied["data"].decode("utf-8") == (
+        f"ref\ttab\\there\\nand a \\\\ backslash\t[0.25,-1e-05]\t{chunk_hash(rows[0][0][:-1])}\n"
+        f"ref\tsecond\t[1.0,2.0]\t{chunk_hash('second')}\n"
+    )
+    assert vector_literal([0.1, 2]) == "[0.1,2.0]"
+
+
+def test_sync_keeps_unchanged_chunks_and_deletes_vanished_ones(engine):
+    with engine.begin() as connection:
+        replace_reference_vectors(connection, "ref", [("kept", [1.0]), ("vanished", [2.0])])
+        connection.execute(text(
+            "INSERT INTO knowledge_card_reference_vectors (reference_id, text_chunk, embedding) "
+            "VALUES ('ref', 'legacy', '[3.0]')"
+        ))
+
+    with engine.begin() as connection:
+        counts = sync_reference_vectors(
+            connection, "ref", {chunk_hash("kept"), chunk_hash("new")}, [("new", [4.0]), ("new", [4.0])]
+        )
+
+    assert counts == {"inserted": 1, "kept": 1, "deleted": 2}
+    with engine.connect() as connection:
+        assert _chunks(connection) == [("kept", "[1.0]"), ("new", "[4.0]")]
@@ -0,0 +1,67 @@
+#  Standard Library
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+#  Third-Party Libraries
+from sqlalchemy import bindparam, text
+
+# This module is the store of chunk embeddings shared by all references: the table
+# `chunk_embeddings` holds one embedding per (content hash, embedding model), so a chunk
+# found in several references (boilerplate, a report quoted by several pages) or ingested
+# again is embedded only once per model.
+#
+# The content hash is the SHA-256 of the chunk text, also stored with each chunk in
+# `knowledge_card_reference_vectors.content_hash` (the migration computes it for existing
+# chunks with the same function in SQL), which lets re-ingestion keep the chunks of a
+# reference that did not change (see `sync_reference_vectors` in vector_writer.py).
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+STORE_LOOKUP_BATCH = 1000
+
+
+def chunk_hash(chunk: str) -> str:
+    """Content hash of a chunk: hex SHA-256 of its UTF-8 text."""
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
+def vector_literal(embedding: Sequence[float]) -> str:
+    """pgvector text representation of an embedding, e.g. '[0.1,0.2]'."""
+    return "[" + ",".join(repr(float(value)) for value in embedding) + "]"
+
+
+def load_chunk_embeddings(connection, embedding_model: str, hashes: Iterable[str]) -> Dict[str, List[float]]:
+    """Returns the stored embeddings of `hashes` for `embedding_model`, by hash."""
+    hashes = sorted(set(hashes))
+    embeddings = {}
+    query = text(
+        "SELECT content_hash, CAST(embedding AS TEXT) FROM chunk_embeddings "
+        "WHERE embedding_model = :model AND content_hash IN :hashes"
+    ).bindparams(bindparam("hashes", expanding=True))
+    for start in range(0, len(hashes), STORE_LOOKUP_BATCH):
+        rows = connection.execute(
+            query, {"model": embedding_model, "hashes": hashes[start:start + STORE_LOOKUP_BATCH]}
+        )
+        for content_hash, embedding in rows:
+            embeddings[content_hash] = json.loads(embedding)
+    return embeddings
+
+
+def save_chunk_embeddings(connection, embedding_model: str, embeddings: Mapping[str, List[float]]):
+    """Adds embeddings, by hash, to the store; hashes already stored for the model are left as they are."""
+    if not embeddings:
+        return
+    connection.execute(
+        text("""
+            INSERT INTO chunk_embeddings (content_hash, embedding_model, embedding)
+            VALUES (:content_hash, :model, :embedding)
+            ON CONFLICT (content_hash, embedding_model) DO NOTHING
+        """),
+        [
+            {"content_hash": content_hash, "model": embedding_model, "embedding": vector_literal(embedding)}
+            for content_hash, embedding in embeddings.items()
+        ],
+    )
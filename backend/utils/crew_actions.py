@@ -4,7 +4,9 @@ import re
 import logging
 
 #  Internal Modules
+from backend.core.compiled_template import compile_section
 from backend.utils.proposal_logic import regenerate_section_logic
+from backend.utils.llm_cache import cached_kickoff
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -82,42 +84,20 @@ def handle_text_format(
     session_id,
     proposal_id,
     special_requirements="None",
+    cache_scope=None,
 ):
-    """Handles 'text' format_type."""
-    section_name = section_config["section_name"]
-    char_limit = section_config.get("char_limit")
-    word_limit = section_config.get("word_limit")
-    if char_limit is not None:
-        limit_type = "char"
-        limit_value = char_limit
-    elif word_limit is not None:
-        limit_type = "word"
-        limit_value = word_limit
-    else:
-        limit_type = "word"
-        limit_value = 350  # fallback
-
-    limit_instruction = f"IMPORTANT: Do not exceed {limit_value} {'characters' if limit_type == 'char' else 'words'} for this section. If your response is longer, you MUST summarize or truncate to fit the limit."
-    instructions = section_config.get("instructions", "")
-    if instructions:
-        instructions += " " + limit_instruction
-    else:
-        instructions = limit_instruction
-
+    """Handles 'text' format_type. `section_config` may be a raw or compiled section."""
+    section = compile_section(section_config)
+    section_name = section.name
     inputs = {
         "section": section_name,
         "form_data": form_data,
         "project_description": project_description,
-        "instructions": instructions,
+        "instructions": section.instructions,
         "special_requirements": special_requirements,
-        "limit_value": limit_value,
-        "limit_term": "character" if limit_type == "char" else "word",
+        **section.limit_inputs(),
     }
-    if limit_type == "char":
-        inputs["char_limit"] = limit_value
-    else:
-        inputs["word_limit"] = limit_value
-    result = crew_instance.kickoff(inputs=inputs)
+    result = cached_kickoff(crew_instance, inputs, cache_scope, section.config)
     parsed = extract_json_from_crew_output(result)
     if not parsed:
         logger.error(f"[CREWAI PARSE ERROR] for section {section_name}")
@@ -136,7 +116,7 @@ def handle_text_format(
 
     if evaluation_status.lower() == "flagged" and feedback:
         generated_text = regenerate_section_logic(
-            session_id, section_name, feedback, proposal_id
+            session_id, section_name, feedback, proposal_id, section_config=section
         )
 
     return generated_text
@@ -151,51 +131,29 @@ def handle_text_format_with_context(
     proposal_id,
     special_requirements="None",
     follow_up_instruction="",
-    previous_content=""
+    previous_content="",
+    cache_scope=None,
 ):
     """Handles 'text' format_type with previous content context and follow-up instructions."""
-    section_name = section_config["section_name"]
-    char_limit = section_config.get("char_limit")
-    word_limit = section_config.get("word_limit")
-    if char_limit is not None:
-        limit_type = "char"
-        limit_value = char_limit
-    elif word_limit is not None:
-        limit_type = "word"
-        limit_value = word_limit
-    else:
-        limit_type = "word"
-        limit_value = 350  # fallback
-
-    limit_instruction = f"IMPORTANT: Do not exceed {limit_value} {'characters' if limit_type == 'char' else 'words'} for this section. If your response is longer, you MUST summarize or truncate to fit the limit."
-    instructions = section_config.get("instructions", "")
-    if instructions:
-        instructions += " " + limit_instruction
-    else:
-        instructions = limit_instruction
-
+    section = compile_section(section_config)
+    section_name = section.name
     inputs = {
         "section": section_name,
         "form_data": form_data,
         "project_description": project_description,
-        "instructions": instructions,
+        "instructions": section.instructions,
         "special_requirements": special_requirements,
-        "limit_value": limit_value,
-        "limit_term": "character" if limit_type == "char" else "word",
+        **section.limit_inputs(),
     }
-    if limit_type == "char":
-        inputs["char_limit"] = limit_value
-    else:
-        inputs["word_limit"] = limit_value
-    
+
     # Add follow-up instruction and previous content to context
     if follow_up_instruction:
         inputs["follow_up_instruction"] = follow_up_instruction
     if previous_content:
         inputs["previous_content"] = previous_content
         inputs["context_instruction"] = "Use the previous content as a starting point and improve it based on the follow-up instructions. Maintain the structure and key points from the previous version."
-    
-    result = crew_instance.kickoff(inputs=inputs)
+
+    result = cached_kickoff(crew_instance, inputs, cache_scope, section.config)
     parsed = extract_json_from_crew_output(result)
     if not parsed:
         logger.error(f"[CREWAI PARSE ERROR] for section {section_name}")
@@ -209,7 +167,7 @@ def handle_text_format_with_context(
     if evaluation_status.lower() == "flagged" and feedback:
         # If flagged, try to regenerate with the feedback
         generated_text = regenerate_section_logic(
-            session_id, section_name, feedback, proposal_id, previous_content
+            session_id, section_name, feedback, proposal_id, previous_content, section_config=section
         )
 
     return generated_text
@@ -217,7 +175,7 @@ def handle_text_format_with_context(
 
 def handle_fixed_text_format(section_config):
     """Handles 'fixed_text' format_type."""
-    return section_config.get("fixed_text", "")
+    return compile_section(section_config).config.get("fixed_text", "")
 
 
 def handle_number_format(
@@ -226,21 +184,21 @@ def handle_number_format(
     form_data,
     project_description,
     special_requirements="None",
+    cache_scope=None,
 ):
     """Handles 'number' format_type."""
-    section_name = section_config["section_name"]
-    # Always provide all three vars for robust prompts
+    section = compile_section(section_config)
+    section_name = section.name
+    # Always provide all three vars for robust prompts; numbers use a small word limit
     inputs = {
         "section": section_name,
         "form_data": form_data,
         "project_description": project_description,
-        "instructions": section_config.get("instructions", ""),
-        "word_limit": 10,  # Numbers use a small word limit
+        "instructions": section.instructions,
         "special_requirements": special_requirements,
-        "limit_value": 10,
-        "limit_term": "word",
+        **section.limit_inputs(),
     }
-    result = crew_instance.kickoff(inputs=inputs)
+    result = cached_kickoff(crew_instance, inputs, cache_scope, section.config)
 
     parsed = extract_json_from_crew_output(result)
     if not parsed:
@@ -259,62 +217,21 @@ def handle_table_format(
     form_data,
     project_description,
     special_requirements="None",
+    cache_scope=None,
 ):
     """Handles 'table' format_type by converting generated JSON to a Markdown table."""
-    section_name = section_config["section_name"]
-    instructions = section_config.get("instructions", "")
-    columns = section_config.get("columns", [])
-    rows = section_config.get("rows", [])
-
-    # Construct a detailed prompt for the table
-    prompt = (
-        f"{instructions}\n\n"
-        f"Generate a JSON object for the section '{section_name}'. "
-        "The JSON object must have a single top-level key which is the section name. "
-        "The value for this key should be an object containing two keys: 'table' and 'notes'.\n"
-        "- The 'table' key should contain a list of JSON objects, where each object represents a row.\n"
-        "- The 'notes' key should contain a string for any footnotes or additional information.\n\n"
-        "The columns for the table are:\n"
-    )
-    column_names = [col["name"] for col in columns]
-    prompt += f"`{', '.join(column_names)}`\n\n"
-
-    prompt += "Use the following column definitions for guidance:\n"
-    for col in columns:
-        prompt += f"- Column '{col['name']}': {col.get('instructions', '')}\n"
-
-    prompt += "\nUse the following row definitions for guidance:\n"
-    for row in rows:
-        prompt += f"- Row '{row['row_title']}': {row.get('instructions', '')}\n"
-
-    # Dynamic limit values for tables
-    char_limit = section_config.get("char_limit")
-    word_limit = section_config.get("word_limit")
-    if char_limit is not None:
-        limit_type = "char"
-        limit_value = char_limit
-    elif word_limit is not None:
-        limit_type = "word"
-        limit_value = word_limit
-    else:
-        limit_type = "word"
-        limit_value = 2000  # fallback for tables
-
+    section = compile_section(section_config)
+    section_name = section.name
     inputs = {
         "section": section_name,
         "form_data": form_data,
         "project_description": project_description,
-        "instructions": prompt,
+        "instructions": section.instructions,
         "special_requirements": special_requirements,
-        "limit_value": limit_value,
-        "limit_term": "character" if limit_type == "char" else "word",
+        **section.limit_inputs(),
     }
-    if limit_type == "char":
-        inputs["char_limit"] = limit_value
-    else:
-        inputs["word_limit"] = limit_value
 
-    result = crew_instance.kickoff(inputs=inputs)
+    result = cached_kickoff(crew_instance, inputs, cache_scope, section.config)
 
     parsed_crew_output = extract_json_from_crew_output(result)
     if not parsed_crew_output:
@@ -390,7 +307,7 @@ def handle_table_format(
         
         # Check for missing columns in the first row (and warn)
         if table_rows and isinstance(table_rows[0], dict):
-             expected_columns = [col["name"] for col in columns]
+             expected_columns = section.column_names
              actual_columns = table_rows[0].keys()
              missing_cols = set(expected_columns) - set(actual_columns)
              if missing_cols:
@@ -1,5 +1,5 @@
 import os
-from typing import Type
+from typing import Optional, Type
 import re
 from pydantic import BaseModel, Field
 from crewai import Agent, Task, Crew, Process
@@ -7,6 +7,7 @@ from crewai.project import CrewBase, agent, crew, task
 from crewai.tools import BaseTool
 from backend.core.llm import llm, get_embedder_config
 from backend.core.db import get_engine
+from backend.utils.vector_search import build_fts_query, search_reference_chunks
 from sqlalchemy import text
 import litellm
 
@@ -63,10 +64,15 @@ class VectorSearchTool(BaseTool):
     name: str = "Vector Search"
     description: str = "Searches for relevant information in the knowledge base using vector similarity."
     knowledge_card_id: str = None
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
 
-    def __init__(self, knowledge_card_id: str):
+    def __init__(self, knowledge_card_id: str, ef_search: Optional[int] = None, probes: Optional[int] = None):
         super().__init__()
         self.knowledge_card_id = knowledge_card_id
+        # Recall of the vector index for this tool's searches (see utils/vector_search.py)
+        self.ef_search = ef_search
+        self.probes = probes
 
     def _run(self, search_query: str) -> str:
         embedder_config = get_embedder_config()["config"]
@@ -80,33 +86,14 @@ class VectorSearchTool(BaseTool):
         )
         query_embedding = response.data[0]['embedding']
         with get_engine().connect() as connection:
-            # The 1 - (embedding <=> :query_embedding) is for cosine similarity
-            # pgvector returns the cosine distance, so we subtract from 1 to get similarity
-            words = re.findall(r'\b\w+\b', search_query)
-            fts_query = " & ".join(words) 
-            query = text("""
-                SELECT
-                    kcrv.text_chunk,
-                    kcr.url,
-                    (1 - (kcrv.embedding <=> :query_embedding)) * 0.5 +
-                    COALESCE(ts_rank(to_tsvector('english', kcrv.text_chunk), to_tsquery('english', :fts_query)), 0) * 0.5 AS hybrid_score
-                FROM
-                    knowledge_card_reference_vectors kcrv
-                JOIN
-                    knowledge_card_references kcr ON kcrv.reference_id = kcr.id
-                JOIN
-                    knowledge_card_to_references kctr ON kcr.id = kctr.reference_id
-                WHERE
-                    kctr.knowledge_card_id = :kc_id
-                ORDER BY
-                    hybrid_score DESC
-                LIMIT 10;
-            """)
-            results = connection.execute(query, {
-                "kc_id": self.knowledge_card_id,
-                "query_embedding": str(query_embedding),
-                "fts_query": fts_query
-            }).fetchall()
+            results = search_reference_chunks(
+                connection,
+                query_embedding,
+                build_fts_query(search_query),
+                self.knowledge_card_id,
+                ef_search=self.ef_search,
+                probes=self.probes,
+            )
 
             retrieved_context = "\n\n".join([f"Source: {row[1]}\nChunk: {row[0]}" for row in results])
 
@@ -1,5 +1,7 @@
 import concurrent.futures
 import logging
+import threading
+import time
 from sqlalchemy import text
 import litellm
 import nltk
@@ -7,9 +9,21 @@ from nltk.tokenize import sent_tokenize
 import os
 
 from backend.core.llm import get_embedder_config
+from backend.utils.chunk_store import chunk_hash, load_chunk_embeddings, save_chunk_embeddings
+from backend.utils.vector_writer import reference_chunk_hashes, sync_reference_vectors
 
 logger = logging.getLogger(__name__)
 
+# Chunks are embedded in batches: one `litellm.embedding` call per batch of at most
+# EMBEDDING_BATCH_SIZE chunks and about EMBEDDING_BATCH_TOKENS tokens (estimated at 4
+# characters per token), with EMBEDDING_CONCURRENCY batches in flight. A batch that
+# fails after litellm's retries is split in two and each half retried, down to single
+# chunks, so one bad chunk only loses itself. Azure accepts 16 inputs per request with
+# the API version 2023-05-15 and 2048 with recent ones.
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "16"))
+EMBEDDING_BATCH_TOKENS = int(os.getenv("EMBEDDING_BATCH_TOKENS", "8000"))
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+
 # --- NLTK setup: use predownloaded path if available, otherwise download ---
 NLTK_DATA_PATH = os.environ.get("NLTK_DATA", "/app/nltk_data")
 if NLTK_DATA_PATH not in nltk.data.path:
@@ -22,36 +36,147 @@ except LookupError:
     logger.info("NLTK punkt tokenizer not found, downloading...")
     nltk.download("punkt", download_dir=NLTK_DATA_PATH)
 
-# --- Embedding helper ---
-def get_embedding(chunk, model, embedder_config):
-    """Get embedding for a text chunk with error handling"""
-    try:
-        response = litellm.embedding(
-            model=model,
-            input=[chunk],
-            max_retries=3,
-            **embedder_config
-        )
-        return chunk, response.data[0]['embedding']
-    except Exception as e:
-        logger.error(f"[EMBEDDING ERROR] Failed to get embedding for chunk: {e}")
-        raise
+# --- Embedding helpers ---
+def estimate_embedding_tokens(chunk):
+    """Roughly estimates the tokens of a chunk (about 4 characters per token)."""
+    return len(chunk) // 4 + 1
+
+
+def batch_chunks(chunks, max_items=None, max_tokens=None):
+    """
+    Groups chunks, in order, into batches of at most `max_items` chunks and `max_tokens`
+    estimated tokens, and returns the batches as lists of chunk indexes. A chunk larger
+    than the token budget gets a batch of its own.
+    """
+    max_items = max_items or EMBEDDING_BATCH_SIZE
+    max_tokens = max_tokens or EMBEDDING_BATCH_TOKENS
+    batches, batch, batch_tokens = [], [], 0
+    for index, chunk in enumerate(chunks):
+        tokens = estimate_embedding_tokens(chunk)
+        if batch and (len(batch) >= max_items or batch_tokens + tokens > max_tokens):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(index)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def get_embeddings(chunks, model, embedder_config):
+    """Embeds a batch of chunks in one request. Returns the embeddings, in order, and the tokens used."""
+    response = litellm.embedding(
+        model=model,
+        input=chunks,
+        max_retries=3,
+        **embedder_config
+    )
+    data = sorted(response.data, key=lambda item: item['index'])
+    usage = getattr(response, "usage", None)
+    tokens = getattr(usage, "prompt_tokens", None) or sum(estimate_embedding_tokens(chunk) for chunk in chunks)
+    return [item['embedding'] for item in data], tokens
+
+
+class EmbeddingStats:
+    """
+    Embedding of one reference: chunks kept from the previous ingestion, reused from the
+    chunk store, newly embedded (and the throughput of that), failed and deleted.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.embedded = 0
+        self.failed = 0
+        self.tokens = 0
+        self.requests = 0
+        self.splits = 0
+        self.reused = 0
+        self.kept = 0
+        self.deleted = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, **counts):
+        """Adds to the counters; called from the embedding threads."""
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def chunks_per_second(self):
+        return self.embedded / self.seconds if self.seconds else 0.0
+
+    @property
+    def tokens_per_second(self):
+        return self.tokens / self.seconds if self.seconds else 0.0
+
+    def as_dict(self):
+        return {
+            "chunks": self.chunks,
+            "embedded": self.embedded,
+            "failed": self.failed,
+            "tokens": self.tokens,
+            "requests": self.requests,
+            "splits": self.splits,
+            "reused": self.reused,
+            "kept": self.kept,
+            "deleted": self.deleted,
+            "seconds": round(self.seconds, 3),
+            "chunks_per_second": round(self.chunks_per_second, 1),
+            "tokens_per_second": round(self.tokens_per_second, 1),
+        }
+
+
+def embed_chunks(chunks, model, embedder_config, max_items=None, max_tokens=None, concurrency=None):
+    """
+    Embeds chunks in concurrent batches.
+
+    Returns:
+        A tuple (embeddings, stats): `embeddings[i]` is the embedding of `chunks[i]`, or
+        None if it could not be embedded, and `stats` the EmbeddingStats of the run.
+    """
+    embeddings = [None] * len(chunks)
+    stats = EmbeddingStats(len(chunks))
+
+    def embed(batch):
+        # Runs in a pool thread; a failed batch is split and each half retried.
+        stats.record(requests=1)
+        try:
+            vectors, tokens = get_embeddings([chunks[i] for i in batch], model, embedder_config)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"[EMBEDDING ERROR] Failed to get embedding for chunk: {e}")
+                stats.record(failed=1)
+                return
+            logger.warning(f"[EMBEDDING ERROR] Batch of {len(batch)} chunks failed, splitting it: {e}")
+            stats.record(splits=1)
+            middle = len(batch) // 2
+            embed(batch[:middle])
+            embed(batch[middle:])
+            return
+        for index, vector in zip(batch, vectors):
+            embeddings[index] = vector
+        stats.record(embedded=len(batch), tokens=tokens)
+
+    started = time.perf_counter()
+    batches = batch_chunks(chunks, max_items, max_tokens)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency or EMBEDDING_CONCURRENCY) as executor:
+        # list() re-raises anything unexpected from the workers.
+        list(executor.map(embed, batches))
+    stats.seconds = time.perf_counter() - started
+    return embeddings, stats
 
 # --- Main processing function ---
 async def process_and_store_text(reference_id, text_content, connection):
     """
     Chunks text, creates embeddings, and stores them for a given reference.
+    Chunks already stored for the reference are kept, and chunks whose embedding is in the
+    chunk store (utils/chunk_store.py) are not embedded again.
+    Returns the EmbeddingStats of the reference (None if it has no text).
     """
     try:
         logger.info(f"Starting to process and store text for reference_id: {reference_id}")
 
-        # Clear old vectors
-        logger.info(f"Deleting existing vectors for reference_id: {reference_id}")
-        connection.execute(
-            text("DELETE FROM knowledge_card_reference_vectors WHERE reference_id = :ref_id"),
-            {"ref_id": reference_id}
-        )
-
         # Chunk the text
         sentences = sent_tokenize(text_content.replace('\x00', ''))
 
@@ -74,36 +199,53 @@ async def process_and_store_text(reference_id, text_content, connection):
         # Embedding configuration
         embedder_config = get_embedder_config()["config"]
         model = f"azure/{embedder_config.pop('deployment_id')}"
-        embedder_config.pop('model', None)
-
-        # Generate embeddings in parallel
-        logger.info(f"Starting parallel embedding generation for {len(chunks)} chunks...")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(get_embedding, chunk, model, embedder_config) for chunk in chunks]
-            completed = 0
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    chunk, embedding = future.result()
-                    completed += 1
-
-                    # Insert chunk and embedding into database
-                    connection.execute(
-                        text("""
-                            INSERT INTO knowledge_card_reference_vectors (reference_id, text_chunk, embedding)
-                            VALUES (:ref_id, :chunk, :embedding)
-                        """),
-                        {"ref_id": reference_id, "chunk": chunk, "embedding": str(embedding)}
-                    )
-
-                except Exception as e:
-                    logger.error(f"[CHUNK PROCESSING ERROR] Failed for reference_id {reference_id}: {e}")
-                    continue
+        embedding_model = embedder_config.pop('model', None) or model
+
+        # Only the chunks new to the reference are embedded, unless the store has them
+        unique_chunks = {}
+        for chunk in chunks:
+            unique_chunks.setdefault(chunk_hash(chunk), chunk)
+        existing = reference_chunk_hashes(connection, reference_id)
+        needed = [content_hash for content_hash in unique_chunks if content_hash not in existing]
+        stored = load_chunk_embeddings(connection, embedding_model, needed)
+        to_embed = [content_hash for content_hash in needed if content_hash not in stored]
+
+        logger.info(
+            f"Reference_id {reference_id}: {len(unique_chunks) - len(needed)} chunks unchanged, "
+            f"{len(stored)} reused from the store, {len(to_embed)} to embed..."
+        )
+        embeddings, stats = embed_chunks([unique_chunks[content_hash] for content_hash in to_embed], model, embedder_config)
+        embedded = {
+            content_hash: embedding for content_hash, embedding in zip(to_embed, embeddings) if embedding is not None
+        }
+        save_chunk_embeddings(connection, embedding_model, embedded)
+
+        rows = [
+            (unique_chunks[content_hash], stored.get(content_hash) or embedded[content_hash])
+            for content_hash in needed
+            if content_hash in stored or content_hash in embedded
+        ]
+        if needed and not rows and not existing.intersection(unique_chunks):
+            # Keep the existing vectors of the reference rather than replace them with nothing.
+            raise RuntimeError(f"None of the {len(chunks)} chunks of reference_id {reference_id} could be embedded")
+
+        # Delete the vanished chunks and write the new ones in one transaction
+        counts = sync_reference_vectors(connection, reference_id, set(unique_chunks), rows)
+        stats.record(reused=len(stored), kept=counts["kept"], deleted=counts["deleted"])
+        stats.chunks = len(unique_chunks)
+        logger.info(
+            f"Ingested reference_id {reference_id}: {stats.kept} chunks kept, {stats.reused} reused, "
+            f"{stats.embedded} newly embedded, {stats.failed} failed, {stats.deleted} deleted; "
+            f"embedding took {stats.seconds:.1f}s ({stats.chunks_per_second:.1f} chunks/s, "
+            f"{stats.tokens_per_second:.0f} tokens/s, {stats.requests} requests)"
+        )
 
         # Update scraped_at timestamp
         connection.execute(
             text("UPDATE knowledge_card_references SET scraped_at = CURRENT_TIMESTAMP, scraping_error = FALSE WHERE id = :id"),
             {"id": reference_id}
         )
+        return stats
 
     except Exception as e:
         logger.error(f"[PROCESS AND STORE TEXT ERROR] {e}", exc_info=True)
@@ -0,0 +1,133 @@
+#  Standard Library
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+#  Third-Party Libraries
+from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+
+#  Internal Modules
+from backend.core.codec import redis_codec
+from backend.core.redis import redis_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module publishes live progress events for proposal generation, consumed by the
+# `/proposals/{proposal_id}/generation-stream` SSE endpoint.
+#
+# Events are JSON objects with a `type`:
+#   - generation_queued / generation_started / generation_completed / generation_failed
+#   - section_started / section_completed
+#   - token: a chunk of text emitted by the LLM while a section is being written
+#            (only when the LLM runs with LLM_STREAMING_ENABLED=true)
+#
+# Every event is published on a Redis channel, so any API worker can serve the stream.
+# Status events are also folded into a snapshot key, which lets a client that connects
+# mid-generation catch up. Without Redis, the in-memory store delivers the events to the
+# streams served by the same process.
+
+SNAPSHOT_TTL_SECONDS = 3600
+# Token chunks are coalesced before publishing to avoid one Redis message per token.
+TOKEN_FLUSH_CHARS = 64
+TOKEN_FLUSH_SECONDS = 0.1
+
+TERMINAL_EVENTS = ("generation_completed", "generation_failed")
+# Events starting a new run, which discard the snapshot of the previous one.
+RESET_EVENTS = ("generation_queued", "generation_started")
+
+
+def generation_channel(proposal_id: str) -> str:
+    return f"proposal_generation_channel:{proposal_id}"
+
+
+def generation_snapshot_key(proposal_id: str) -> str:
+    return f"proposal_generation:{proposal_id}"
+
+
+_snapshot_lock = threading.Lock()
+
+
+def _update_snapshot(proposal_id: str, event: dict):
+    key = generation_snapshot_key(proposal_id)
+    with _snapshot_lock:
+        raw = redis_client.get(key)
+        if raw and event["type"] not in RESET_EVENTS:
+            snapshot = redis_codec.decode(raw)
+        else:
+            snapshot = {"proposal_id": proposal_id, "sections": {}}
+        if event["type"] == "section_started":
+            snapshot["sections"][event["section"]] = "generating"
+        elif event["type"] == "section_completed":
+            snapshot["sections"][event["section"]] = "failed" if event.get("error") else "completed"
+        else:
+            snapshot["status"] = event["type"]
+        snapshot["last_event"] = event
+        redis_client.setex(key, SNAPSHOT_TTL_SECONDS, redis_codec.dumps(snapshot))
+
+
+def publish_generation_event(proposal_id: str, event_type: str, **data):
+    """
+    Publishes a generation event for a proposal. Never raises: progress reporting
+    must not break generation.
+    """
+    event = {"type": event_type, "proposal_id": str(proposal_id), "timestamp": time.time(), **data}
+    try:
+        if event_type != "token":
+            _update_snapshot(str(proposal_id), event)
+        redis_client.publish(generation_channel(proposal_id), redis_codec.dumps(event))
+    except Exception as e:
+        logger.error(f"[GENERATION EVENT ERROR] {event_type} for proposal {proposal_id}: {e}")
+
+
+# --- Token streaming ---
+
+# CrewAI emits LLMStreamChunkEvent synchronously on the thread running the kickoff,
+# so the section being written is tracked per thread.
+_stream_target = threading.local()
+
+
+class _TokenBuffer:
+    def __init__(self, proposal_id: str, section_name: str):
+        self.proposal_id = proposal_id
+        self.section_name = section_name
+        self.chunks = []
+        self.size = 0
+        self.last_flush = time.monotonic()
+
+    def add(self, chunk: str):
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        if self.size >= TOKEN_FLUSH_CHARS or time.monotonic() - self.last_flush >= TOKEN_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        if self.chunks:
+            publish_generation_event(
+                self.proposal_id, "token", section=self.section_name, text="".join(self.chunks)
+            )
+        self.chunks = []
+        self.size = 0
+        self.last_flush = time.monotonic()
+
+
+@contextmanager
+def stream_section_tokens(proposal_id: str, section_name: str):
+    """Forwards LLM stream chunks emitted by this thread to the proposal's event channel."""
+    previous: Optional[_TokenBuffer] = getattr(_stream_target, "buffer", None)
+    buffer = _TokenBuffer(str(proposal_id), section_name)
+    _stream_target.buffer = buffer
+    try:
+        yield
+    finally:
+        buffer.flush()
+        _stream_target.buffer = previous
+
+
+@crewai_event_bus.on(LLMStreamChunkEvent)
+def _forward_stream_chunk(source, event: LLMStreamChunkEvent):
+    buffer = getattr(_stream_target, "buffer", None)
+    if buffer is not None and event.chunk and event.tool_call is None:
+        buffer.add(event.chunk)
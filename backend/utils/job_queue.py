@@ -0,0 +1,359 @@
+#  Standard Library
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+#  Third-Party Libraries
+from fastapi import BackgroundTasks
+from sqlalchemy import text
+
+#  Internal Modules
+from backend.core.db import get_engine
+from backend.core.db_pool import WORKLOAD_BACKGROUND, with_db_workload
+from backend.core.llm_rate_limiter import PRIORITY_BACKGROUND, with_llm_priority
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module implements a durable, Postgres-backed queue for long-running generation work
+# (full proposal generation/regeneration and knowledge card generation).
+#
+# Jobs are rows in `generation_jobs`. Workers started with `python -m backend.worker` claim
+# jobs with a lease, renew it with heartbeats while the job runs, and release it on
+# completion. A job whose worker dies is picked up again once its lease expires, and failed
+# jobs are retried with exponential backoff until `max_attempts` is reached.
+#
+# GENERATION_JOB_BACKEND selects how the API dispatches work:
+#   - "background" (default): run inside the web worker with FastAPI BackgroundTasks.
+#   - "queue": enqueue a job for the separate worker processes.
+
+GENERATION_JOB_BACKEND = os.getenv("GENERATION_JOB_BACKEND", "background").lower()
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BASE_SECONDS = int(os.getenv("JOB_RETRY_BASE_SECONDS", "30"))
+
+# Job types, shared by the API (producer) and the worker (consumer).
+JOB_PROPOSAL_GENERATION = "proposal_generation"
+JOB_PROPOSAL_REGENERATION = "proposal_regeneration"
+JOB_KNOWLEDGE_CARD_GENERATION = "knowledge_card_generation"
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _row_to_job(row) -> Dict[str, Any]:
+    job = dict(row._mapping)
+    if isinstance(job.get("payload"), str):
+        job["payload"] = json.loads(job["payload"])
+    if job.get("id") is not None:
+        job["id"] = str(job["id"])
+    if job.get("created_by") is not None:
+        job["created_by"] = str(job["created_by"])
+    return job
+
+
+class JobQueue:
+    """
+    Repository for the `generation_jobs` table.
+
+    All timestamps are computed in Python so that lease arithmetic does not depend
+    on database-specific interval functions.
+    """
+
+    JOB_COLUMNS = """
+        id, job_type, payload, status, attempts, max_attempts, run_after,
+        worker_id, lease_expires_at, heartbeat_at, last_error, created_by,
+        created_at, started_at, finished_at, updated_at
+    """
+
+    def __init__(self, engine=None):
+        self._engine = engine
+
+    @property
+    def engine(self):
+        return self._engine if self._engine is not None else get_engine()
+
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        created_by: Optional[str] = None,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ) -> str:
+        """
+        Adds a job to the queue.
+
+        Args:
+            job_type: One of the JOB_* constants, used by the worker to pick a handler.
+            payload: JSON-serialisable keyword arguments for the handler.
+            created_by: The ID of the user who requested the job.
+            max_attempts: How many times the job may run before being marked failed.
+
+        Returns:
+            The ID of the new job.
+        """
+        job_id = str(uuid.uuid4())
+        now = _utcnow()
+        with self.engine.begin() as connection:
+            connection.execute(
+                text("""
+                    INSERT INTO generation_jobs (
+                        id, job_type, payload, status, attempts, max_attempts,
+                        run_after, created_by, created_at, updated_at
+                    ) VALUES (
+                        :id, :job_type, :payload, 'queued', 0, :max_attempts,
+                        :now, :created_by, :now, :now
+                    )
+                """),
+                {
+                    "id": job_id,
+                    "job_type": job_type,
+                    "payload": json.dumps(payload, default=str),
+                    "max_attempts": max_attempts,
+                    "now": now,
+                    "created_by": created_by,
+                },
+            )
+        logger.info(f"Enqueued {job_type} job {job_id}")
+        return job_id
+
+    def claim(
+        self,
+        worker_id: str,
+        lease_seconds: int = JOB_LEASE_SECONDS,
+        on_exhausted: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Leases the next runnable job: a queued job whose `run_after` has passed, or a
+        running job whose lease has expired (its worker died).
+
+        A job whose lease expired on its final attempt is marked failed instead, and
+        passed to `on_exhausted` so the caller can report the failure of its work.
+
+        Returns:
+            The claimed job, or None if there is nothing to run.
+        """
+        now = _utcnow()
+        skip_locked = (
+            " FOR UPDATE SKIP LOCKED" if self.engine.dialect.name == "postgresql" else ""
+        )
+        with self.engine.begin() as connection:
+            row = connection.execute(
+                text(f"""
+                    UPDATE generation_jobs
+                    SET status = 'running',
+                        worker_id = :worker_id,
+                        attempts = attempts + 1,
+                        lease_expires_at = :lease_until,
+                        heartbeat_at = :now,
+                        started_at = COALESCE(started_at, :now),
+                        updated_at = :now
+                    WHERE id = (
+                        SELECT id FROM generation_jobs
+                        WHERE (status = 'queued' AND run_after <= :now)
+                           OR (status = 'running' AND lease_expires_at < :now)
+                        ORDER BY run_after
+                        LIMIT 1{skip_locked}
+                    )
+                    RETURNING {self.JOB_COLUMNS}
+                """),
+                {
+                    "worker_id": worker_id,
+                    "now": now,
+                    "lease_until": now + timedelta(seconds=lease_seconds),
+                },
+            ).fetchone()
+
+        if not row:
+            return None
+
+        job = _row_to_job(row)
+        if job["attempts"] > job["max_attempts"]:
+            # A lease expired after the final attempt: the job keeps crashing its worker.
+            error = "Job lease expired on its final attempt."
+            if self._finish(job["id"], worker_id, "failed", error):
+                logger.error(f"Job {job['id']} exhausted its attempts after lease expiry")
+                if on_exhausted is not None:
+                    on_exhausted({**job, "status": "failed", "last_error": error})
+            return None
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> bool:
+        """
+        Extends the lease of a running job.
+
+        Returns:
+            False if the job no longer belongs to this worker (cancelled or re-leased).
+        """
+        now = _utcnow()
+        with self.engine.begin() as connection:
+            row = connection.execute(
+                text("""
+                    UPDATE generation_jobs
+                    SET heartbeat_at = :now, lease_expires_at = :lease_until, updated_at = :now
+                    WHERE id = :id AND worker_id = :worker_id AND status = 'running'
+                    RETURNING id
+                """),
+                {
+                    "id": job_id,
+                    "worker_id": worker_id,
+                    "now": now,
+                    "lease_until": now + timedelta(seconds=lease_seconds),
+                },
+            ).fetchone()
+        return row is not None
+
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        """Marks a running job as succeeded."""
+        return self._finish(job_id, worker_id, "succeeded", None)
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> str:
+        """
+        Records a failed attempt. The job is re-queued with exponential backoff
+        until it reaches `max_attempts`, then marked as failed.
+
+        Returns:
+            The new status of the job ("queued", "failed", or the unchanged status
+            if the job no longer belongs to this worker).
+        """
+        now = _utcnow()
+        with self.engine.begin() as connection:
+            job = connection.execute(
+                text("""
+                    SELECT attempts, max_attempts, status FROM generation_jobs
+                    WHERE id = :id AND worker_id = :worker_id
+                """),
+                {"id": job_id, "worker_id": worker_id},
+            ).fetchone()
+            if not job or job.status != "running":
+                return job.status if job else "missing"
+
+            if job.attempts < job.max_attempts:
+                delay = JOB_RETRY_BASE_SECONDS * (2 ** (job.attempts - 1))
+                connection.execute(
+                    text("""
+                        UPDATE generation_jobs
+                        SET status = 'queued', run_after = :run_after, worker_id = NULL,
+                            lease_expires_at = NULL, last_error = :error, updated_at = :now
+                        WHERE id = :id
+                    """),
+                    {
+                        "id": job_id,
+                        "run_after": now + timedelta(seconds=delay),
+                        "error": error[:2000],
+                        "now": now,
+                    },
+                )
+                logger.warning(
+                    f"Job {job_id} failed (attempt {job.attempts}/{job.max_attempts}), retrying in {delay}s: {error}"
+                )
+                return "queued"
+
+        self._finish(job_id, worker_id, "failed", error)
+        logger.error(f"Job {job_id} failed permanently after {job.attempts} attempts: {error}")
+        return "failed"
+
+    def _finish(self, job_id: str, worker_id: str, status: str, error: Optional[str]) -> bool:
+        now = _utcnow()
+        with self.engine.begin() as connection:
+            row = connection.execute(
+                text("""
+                    UPDATE generation_jobs
+                    SET status = :status, finished_at = :now, lease_expires_at = NULL,
+                        last_error = COALESCE(:error, last_error), updated_at = :now
+                    WHERE id = :id AND worker_id = :worker_id AND status = 'running'
+                    RETURNING id
+                """),
+                {
+                    "id": job_id,
+                    "worker_id": worker_id,
+                    "status": status,
+                    "error": error[:2000] if error else None,
+                    "now": now,
+                },
+            ).fetchone()
+        return row is not None
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancels a queued or running job. A queued job never runs. A running job is not
+        interrupted: its handler runs to the end, but its result no longer changes the
+        job status and it is never retried.
+
+        Returns:
+            True if the job was active and is now cancelled.
+        """
+        now = _utcnow()
+        with self.engine.begin() as connection:
+            row = connection.execute(
+                text("""
+                    UPDATE generation_jobs
+                    SET status = 'cancelled', finished_at = :now, lease_expires_at = NULL, updated_at = :now
+                    WHERE id = :id AND status IN ('queued', 'running')
+                    RETURNING id
+                """),
+                {"id": job_id, "now": now},
+            ).fetchone()
+        return row is not None
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns a job by ID, or None."""
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                text(f"SELECT {self.JOB_COLUMNS} FROM generation_jobs WHERE id = :id"),
+                {"id": job_id},
+            ).fetchone()
+        return _row_to_job(row) if row else None
+
+    def list_jobs(
+        self,
+        created_by: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """Returns the most recent jobs, optionally filtered by owner and status."""
+        clauses, params = [], {"limit": limit}
+        if created_by:
+            clauses.append("created_by = :created_by")
+            params["created_by"] = created_by
+        if status:
+            clauses.append("status = :status")
+            params["status"] = status
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                text(f"SELECT {self.JOB_COLUMNS} FROM generation_jobs {where} ORDER BY created_at DESC LIMIT :limit"),
+                params,
+            ).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+
+job_queue = JobQueue()
+
+
+def dispatch_generation_job(
+    background_tasks: BackgroundTasks,
+    job_type: str,
+    handler: Callable[..., Any],
+    payload: Dict[str, Any],
+    created_by: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Schedules generation work according to GENERATION_JOB_BACKEND.
+
+    In "queue" mode the work is enqueued for `python -m backend.worker` and the job ID
+    is returned; otherwise `handler(**payload)` runs as a FastAPI background task and
+    None is returned.
+    """
+    if GENERATION_JOB_BACKEND == "queue":
+        return job_queue.enqueue(job_type, payload, created_by=created_by)
+    background_tasks.add_task(
+        with_db_workload(WORKLOAD_BACKGROUND, with_llm_priority(PRIORITY_BACKGROUND, handler)), **payload
+    )
+    return None
@@ -0,0 +1,259 @@
+#  Standard Library
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+#  Internal Modules
+from backend.core.redis import redis_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module implements an opt-in, content-addressed cache for crew kickoffs.
+#
+# A kickoff result is keyed by a SHA-256 digest of everything that can change the
+# output: the crew's agent/task configuration, the kickoff inputs (resolved form data,
+# project description, instructions), the template section config, the content of the
+# attached knowledge files and the model deployment. Identical requests - typically
+# "regenerate" on unchanged inputs, or demo/e2e runs on the sample proposals - then
+# return the stored output instead of calling Azure OpenAI again.
+#
+# Two tiers are used: a small per-process LRU, then Redis (shared by all workers).
+# Each template has a generation token in Redis that is part of every key, so bumping
+# it with `invalidate_template()` makes all previous entries for that template unreachable.
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("LLM_CACHE_LOCAL_MAX_ENTRIES", "256"))
+
+KNOWLEDGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "knowledge")
+
+KEY_PREFIX = "llm_cache"
+
+
+class CachedCrewOutput:
+    """
+    Stands in for a `CrewOutput` replayed from the cache. Only `raw` is kept, which is
+    all the format handlers read.
+    """
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.token_usage = None
+        self.from_cache = True
+
+
+def knowledge_digests(knowledge_file_paths: Optional[List[str]]) -> Dict[str, str]:
+    """
+    Hashes the knowledge files attached to a crew (paths relative to the knowledge dir),
+    so that editing a knowledge card changes the cache key.
+    """
+    digests = {}
+    for path in sorted(knowledge_file_paths or []):
+        try:
+            with open(os.path.join(KNOWLEDGE_DIR, path), "rb") as f:
+                digests[path] = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            digests[path] = "missing"
+    return digests
+
+
+def make_cache_scope(template_name: str, knowledge_file_paths: Optional[List[str]] = None) -> dict:
+    """
+    Builds the per-proposal part of the cache key. Computed once per generation run
+    and passed to the format handlers.
+    """
+    return {
+        "template_name": template_name or "unknown",
+        "knowledge": knowledge_digests(knowledge_file_paths),
+    }
+
+
+def _crew_fingerprint(crew_instance) -> list:
+    """Collects the prompt-bearing configuration of a crew's agents and tasks."""
+    fingerprint = []
+    for agent in getattr(crew_instance, "agents", None) or []:
+        fingerprint.append([
+            value for value in (
+                getattr(agent, "role", None),
+                getattr(agent, "goal", None),
+                getattr(agent, "backstory", None),
+            ) if isinstance(value, str)
+        ])
+    for task in getattr(crew_instance, "tasks", None) or []:
+        fingerprint.append([
+            value for value in (
+                getattr(task, "description", None),
+                getattr(task, "expected_output", None),
+            ) if isinstance(value, str)
+        ])
+    return fingerprint
+
+
+def _model_deployment() -> str:
+    return os.getenv("AZURE_DEPLOYMENT_NAME", "")
+
+
+class LLMResponseCache:
+    """
+    Two-tier (local LRU + Redis) store for crew outputs, with hit/miss counters.
+    """
+
+    def __init__(self, enabled: bool, ttl_seconds: int, local_max_entries: int, client=None):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.local_max_entries = local_max_entries
+        self._client = client if client is not None else redis_client
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "errors": 0,
+        }
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _generation(self, template_name: str) -> str:
+        generation_key = f"{KEY_PREFIX}:generation:{template_name}"
+        try:
+            generation = self._client.get(generation_key)
+            if generation is None:
+                # Only the first token is written, so workers racing here all read the same one.
+                self._client.set(generation_key, uuid.uuid4().hex, nx=True)
+                generation = self._client.get(generation_key)
+            return generation.decode() if isinstance(generation, bytes) else generation
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"LLM cache could not read generation for {template_name}: {e}")
+            return "0"
+
+    def make_key(self, template_name: str, material: Dict[str, Any]) -> str:
+        """Returns the cache key of `material` within a template's current generation."""
+        digest = hashlib.sha256(
+            json.dumps(material, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return f"{KEY_PREFIX}:{template_name}:{self._generation(template_name)}:{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry and entry[0] > now:
+                self._local.move_to_end(key)
+                self._counters["local_hits"] += 1
+                return entry[1]
+            if entry:
+                del self._local[key]
+
+        try:
+            value = self._client.get(key)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"LLM cache read failed: {e}")
+            value = None
+
+        if value is None:
+            self._count("misses")
+            return None
+
+        value = value.decode() if isinstance(value, bytes) else value
+        self._store_local(key, value)
+        self._count("redis_hits")
+        return value
+
+    def set(self, key: str, value: str):
+        self._store_local(key, value)
+        try:
+            self._client.setex(key, self.ttl_seconds, value)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"LLM cache write failed: {e}")
+        self._count("stores")
+
+    def _store_local(self, key: str, value: str):
+        if self.local_max_entries <= 0:
+            return
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def invalidate_template(self, template_name: str):
+        """Makes every cached output generated from `template_name` unreachable."""
+        try:
+            self._client.set(f"{KEY_PREFIX}:generation:{template_name}", uuid.uuid4().hex)
+        except Exception as e:
+            self._count("errors")
+            logger.error(f"LLM cache invalidation failed for {template_name}: {e}")
+        prefix = f"{KEY_PREFIX}:{template_name}:"
+        with self._lock:
+            for key in [k for k in self._local if k.startswith(prefix)]:
+                del self._local[key]
+        logger.info(f"Invalidated LLM cache for template {template_name}")
+
+    def stats(self) -> dict:
+        """Returns the hit/miss counters, used by the health endpoint."""
+        with self._lock:
+            hits = self._counters["local_hits"] + self._counters["redis_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                "enabled": self.enabled,
+                **self._counters,
+                "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+                "local_entries": len(self._local),
+            }
+
+
+llm_cache = LLMResponseCache(LLM_CACHE_ENABLED, LLM_CACHE_TTL_SECONDS, LLM_CACHE_LOCAL_MAX_ENTRIES)
+
+
+def cached_kickoff(
+    crew_instance,
+    inputs: Dict[str, Any],
+    cache_scope: Optional[dict] = None,
+    section_config: Optional[dict] = None,
+    cache: LLMResponseCache = None,
+):
+    """
+    Runs `crew_instance.kickoff(inputs=inputs)` through the LLM cache.
+
+    The cache is bypassed when it is disabled or when no `cache_scope` is given (the
+    caller did not describe the knowledge attached to the crew). Only outputs that
+    contain a JSON object are stored, so failed generations are retried next time.
+    """
+    cache = cache or llm_cache
+    if not cache.enabled or cache_scope is None:
+        return crew_instance.kickoff(inputs=inputs)
+
+    key = cache.make_key(
+        cache_scope["template_name"],
+        {
+            "crew": _crew_fingerprint(crew_instance),
+            "inputs": inputs,
+            "section_config": section_config,
+            "knowledge": cache_scope.get("knowledge", {}),
+            "model": _model_deployment(),
+        },
+    )
+    cached_raw = cache.get(key)
+    if cached_raw is not None:
+        logger.info(f"LLM cache hit for section '{inputs.get('section')}'")
+        return CachedCrewOutput(cached_raw)
+
+    result = crew_instance.kickoff(inputs=inputs)
+    raw_output = result.raw if hasattr(result, "raw") and result.raw else ""
+    if isinstance(raw_output, str) and "{" in raw_output:
+        cache.set(key, raw_output)
+    return result
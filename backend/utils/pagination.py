@@ -0,0 +1,137 @@
+#  Standard Library
+import base64
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+#  Third-Party Libraries
+from fastapi import HTTPException, Query
+
+# This module implements the pagination of the list endpoints (`list-drafts`,
+# `list-all-proposals`, `/proposals/reviews`, `/knowledge-cards`).
+#
+# Pages are read newest first with a keyset on `(updated_at, id)`: the opaque cursor
+# returned with a page holds the sort key of its last row, and the next page selects the
+# rows strictly before it. Unlike OFFSET, each page costs the same whatever its depth,
+# and rows updated or inserted meanwhile do not shift the following pages.
+#
+# Query parameters (see `list_page`):
+#   - `limit` (default LIST_PAGE_SIZE, at most LIST_MAX_PAGE_SIZE) and `cursor`;
+#   - `fields`: "full" (default) or "summary", which leaves out the large columns;
+#   - `include_total`: also count the matching rows (an extra query, so only on demand);
+#   - `paginate`: false returns every row in one response, as before pagination existed.
+#
+# Requests without `limit`, `cursor` or `paginate` are paginated only if
+# LIST_PAGINATION_DEFAULT is true, so that existing clients keep receiving full lists
+# until they follow `next_cursor`.
+
+LIST_PAGINATION_DEFAULT = os.getenv("LIST_PAGINATION_DEFAULT", "false").lower() in ("1", "true")
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "50"))
+LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "200"))
+
+FIELDS_FULL = "full"
+FIELDS_SUMMARY = "summary"
+
+
+def encode_cursor(sort_value: datetime, row_id: Any) -> str:
+    """Returns the cursor of the page following the row with this sort key."""
+    payload = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Reads a cursor returned by `encode_cursor`.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(sort_value), str(uuid.UUID(row_id))
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+
+
+class ListPage:
+    """
+    The page of a list request, and the SQL fragments selecting it.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: str = FIELDS_FULL,
+        include_total: bool = False,
+        paginate: Optional[bool] = None,
+    ):
+        if fields not in (FIELDS_FULL, FIELDS_SUMMARY):
+            raise HTTPException(status_code=400, detail=f"Invalid fields: '{fields}'.")
+        if paginate is None:
+            paginate = bool(limit or cursor) or LIST_PAGINATION_DEFAULT
+        self.paginated = paginate
+        self.limit = min(limit or LIST_PAGE_SIZE, LIST_MAX_PAGE_SIZE) if paginate else None
+        self.cursor = decode_cursor(cursor) if cursor and paginate else None
+        self.fields = fields
+        self.include_total = include_total
+
+    @property
+    def summary(self) -> bool:
+        return self.fields == FIELDS_SUMMARY
+
+    def params(self) -> Dict[str, Any]:
+        """Bind parameters of `keyset` and `limit_clause`."""
+        params = {}
+        if self.cursor is not None:
+            params["cursor_sort"], params["cursor_id"] = self.cursor
+        if self.limit is not None:
+            # One more row than the page tells whether another page follows.
+            params["page_limit"] = self.limit + 1
+        return params
+
+    def keyset(self, sort_expr: str, id_expr: str) -> Optional[str]:
+        """Condition selecting the rows after the cursor, or None on the first page."""
+        if self.cursor is None:
+            return None
+        return f"({sort_expr}, {id_expr}) < (:cursor_sort, CAST(:cursor_id AS uuid))"
+
+    @staticmethod
+    def order_by(sort_expr: str, id_expr: str) -> str:
+        return f" ORDER BY {sort_expr} DESC, {id_expr} DESC"
+
+    def limit_clause(self) -> str:
+        return " LIMIT :page_limit" if self.limit is not None else ""
+
+    def split(self, rows: Sequence[Any], sort_key: str, id_key: str = "id") -> Tuple[List[Any], Optional[str]]:
+        """Returns the rows of the page and the cursor of the next page (None on the last one)."""
+        rows = list(rows)
+        if self.limit is None or len(rows) <= self.limit:
+            return rows, None
+        rows = rows[: self.limit]
+        last = rows[-1]
+        return rows, encode_cursor(last[sort_key], last[id_key])
+
+    def metadata(self, next_cursor: Optional[str], total: Optional[int] = None) -> Dict[str, Any]:
+        """Pagination fields added to the response (none for an unpaginated list)."""
+        metadata = {}
+        if self.paginated:
+            metadata["next_cursor"] = next_cursor
+            metadata["has_more"] = next_cursor is not None
+        if self.include_total:
+            metadata["total"] = total
+        return metadata
+
+
+def list_page(
+    limit: Optional[int] = Query(None, ge=1, description=f"Page size (at most {LIST_MAX_PAGE_SIZE})"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+    fields: str = Query(FIELDS_FULL, description="'full' or 'summary'"),
+    include_total: bool = Query(False, description="Also return the number of matching rows"),
+    paginate: Optional[bool] = Query(None, description="false returns every row, unpaginated"),
+) -> ListPage:
+    """FastAPI dependency reading the pagination parameters of a list request."""
+    return ListPage(limit, cursor, fields, include_total, paginate)
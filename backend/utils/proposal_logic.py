@@ -5,12 +5,14 @@ import re
 #  Third-Party Libraries
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
-from sqlalchemy import text
 
 #  Internal Modules
+from backend.core.compiled_template import compile_section
+from backend.core.config import load_compiled_template
 from backend.utils.crew_proposal import ProposalCrew
-from backend.core.redis import redis_client
-from backend.core.db import get_engine
+from backend.utils.session_store import session_store
+from backend.utils.llm_cache import cached_kickoff, make_cache_scope
+from backend.utils.reference_data import reference_resolver
 
 FALLBACK_GENERATION_MESSAGE = "Generation issue: No content was generated for this section. You can try regenerating it or edit it manually."
 
@@ -18,97 +20,24 @@ FALLBACK_GENERATION_MESSAGE = "Generation issue: No content was generated for th
 # using the 'crew' of AI agents.
 
 
-def resolve_form_data_labels(form_data: dict, connection) -> dict:
+def resolve_form_data_labels(form_data: dict, connection=None) -> dict:
     """
     Replaces UUIDs in form_data with their corresponding labels from the database.
     This ensures that the LLM receives human-readable information.
+
+    Labels come from the shared reference data cache; `connection` is only used
+    when some of them are not cached yet.
     """
-    if not form_data:
-        return {}
-
-    resolved_data = form_data.copy()
-
-    # 1. Targeted Donor
-    donor_input = resolved_data.get("Targeted Donor")
-    if donor_input:
-        if isinstance(donor_input, list):
-            resolved_donors = []
-            for did in donor_input:
-                if did and isinstance(did, str) and len(did) == 36:
-                    try:
-                        name = connection.execute(
-                            text("SELECT name FROM donors WHERE id = :id"),
-                            {"id": did}
-                        ).scalar()
-                        resolved_donors.append(name if name else did)
-                    except Exception:
-                        resolved_donors.append(did)
-                else:
-                    resolved_donors.append(did)
-            resolved_data["Targeted Donor"] = resolved_donors
-        elif isinstance(donor_input, str) and len(donor_input) == 36:
-            try:
-                name = connection.execute(
-                    text("SELECT name FROM donors WHERE id = :id"),
-                    {"id": donor_input}
-                ).scalar()
-                if name:
-                    resolved_data["Targeted Donor"] = name
-            except Exception:
-                pass
-
-    # 2. Main Outcome (List)
-    outcome_ids = resolved_data.get("Main Outcome")
-    if outcome_ids and isinstance(outcome_ids, list):
-        resolved_outcomes = []
-        for oid in outcome_ids:
-            if oid and isinstance(oid, str) and len(oid) == 36:
-                try:
-                    name = connection.execute(
-                        text("SELECT name FROM outcomes WHERE id = :id"),
-                        {"id": oid}
-                    ).scalar()
-                    resolved_outcomes.append(name if name else oid)
-                except Exception:
-                    resolved_outcomes.append(oid)
-            else:
-                resolved_outcomes.append(oid)
-        resolved_data["Main Outcome"] = resolved_outcomes
-
-    # 3. Country / Location(s)
-    country_input = resolved_data.get("Country / Location(s)")
-    if country_input:
-        if isinstance(country_input, list):
-            resolved_countries = []
-            for cid in country_input:
-                if cid and isinstance(cid, str) and len(cid) == 36:
-                    try:
-                        name = connection.execute(
-                            text("SELECT name FROM field_contexts WHERE id = :id"),
-                            {"id": cid}
-                        ).scalar()
-                        resolved_countries.append(name if name else cid)
-                    except Exception:
-                        resolved_countries.append(cid)
-                else:
-                    resolved_countries.append(cid)
-            resolved_data["Country / Location(s)"] = resolved_countries
-        elif isinstance(country_input, str) and len(country_input) == 36:
-            try:
-                name = connection.execute(
-                    text("SELECT name FROM field_contexts WHERE id = :id"),
-                    {"id": country_input}
-                ).scalar()
-                if name:
-                    resolved_data["Country / Location(s)"] = name
-            except Exception:
-                pass
-
-    return resolved_data
+    return reference_resolver.resolve_form_data(form_data, connection)
 
 
 def regenerate_section_logic(
-    session_id: str, section: str, concise_input: str, proposal_id: str, previous_content: str = None
+    session_id: str,
+    section: str,
+    concise_input: str,
+    proposal_id: str,
+    previous_content: str = None,
+    section_config=None,
 ) -> str:
     """
     Shared logic for regenerating a proposal section using custom input.
@@ -122,6 +51,8 @@ def regenerate_section_logic(
         concise_input: The user-provided or evaluator-provided feedback for regeneration.
         proposal_id: The unique ID of the proposal being edited.
         previous_content: The previously generated content for this section to use as context.
+        section_config: The raw or compiled section to regenerate, when it differs from the
+            session template (e.g. with the content of the sections it depends on).
 
     Returns:
         The newly generated text for the section.
@@ -129,21 +60,18 @@ def regenerate_section_logic(
     Raises:
         HTTPException: If session data is missing or the section is invalid.
     """
-    session_data_str = redis_client.get(session_id)
-    if not session_data_str:
+    session_data = session_store.load(session_id)
+    if not session_data:
         raise HTTPException(
             status_code=400,
             detail="Base data not found in session. Please store it first.",
         )
 
-    session_data = json.loads(session_data_str)
     form_data = session_data.get("form_data", {})
     project_description = session_data.get("project_description", "")
 
     # Resolve labels for form_data before sending to CrewAI
-    # Resolve labels for form_data before sending to CrewAI
-    with get_engine().connect() as connection:
-        form_data = resolve_form_data_labels(form_data, connection)
+    form_data = resolve_form_data_labels(form_data)
 
     # Get proposal template from session data
     proposal_template = session_data.get("proposal_template")
@@ -153,57 +81,39 @@ def regenerate_section_logic(
         )
 
     # Find the specific instructions and word limit for the section.
-    section_config = next(
-        (
-            s
-            for s in proposal_template.get("sections", [])
-            if s.get("section_name") == section
-        ),
-        None,
+    compiled_template = load_compiled_template(
+        session_data.get("template_name"), proposal_template, session_data.get("template_version")
     )
+    if section_config is not None:
+        section_config = compile_section(section_config)
+    else:
+        section_config = compiled_template.section(section)
     if not section_config:
         raise HTTPException(status_code=400, detail=f"Invalid section name: {section}")
 
-    char_limit = section_config.get("char_limit")
-    word_limit = section_config.get("word_limit")
-    if char_limit is not None:
-        limit_type = "char"
-        limit_value = char_limit
-    elif word_limit is not None:
-        limit_type = "word"
-        limit_value = word_limit
-    else:
-        limit_type = "word"
-        limit_value = 350
-    instructions = section_config.get("instructions", "")
-    limit_instruction = f"Do not exceed {limit_value} {'character' if limit_type == 'char' else 'word'}s."
-    instructions += " " + limit_instruction
+    limit_type, limit_value = section_config.regeneration_limit
 
     proposal_crew = ProposalCrew()
     crew_instance = proposal_crew.regenerate_proposal_crew()
 
-    # Extract special_requirements from the template
-    special_requirements_obj = proposal_template.get("special_requirements", {})
-    special_requirements_list = special_requirements_obj.get("instructions", [])
-    special_requirements_str = (
-        "\n".join([f"- {req}" for req in special_requirements_list])
-        if special_requirements_list
-        else "None"
-    )
-
     section_input = {
         "section": section,
         "form_data": form_data,
         "project_description": project_description,
-        "special_requirements": special_requirements_str,
-        "instructions": instructions,
+        "special_requirements": compiled_template.special_requirements,
+        "instructions": section_config.regeneration_instructions,
         "limit_term": limit_type,
         "limit_value": limit_value,
         "concise_input": concise_input,
         "previous_content": previous_content,
     }
 
-    result = crew_instance.kickoff(inputs=section_input)
+    result = cached_kickoff(
+        crew_instance,
+        section_input,
+        make_cache_scope(session_data.get("template_name")),
+        section_config.config,
+    )
 
     # Clean and parse the raw output from the crew.
     # raw_output = result.raw.replace("`", "")
@@ -238,8 +148,7 @@ def regenerate_section_logic(
     if not generated_text:
         generated_text = FALLBACK_GENERATION_MESSAGE
 
-    # Update the section in the session data.
-    session_data.setdefault("generated_sections", {})[section] = generated_text
-    redis_client.set(session_id, json.dumps(session_data))
+    # Update the section in the session data (only that section's field is written).
+    session_store.set_sections(session_id, {section: generated_text})
 
     return generated_text
@@ -25,9 +25,15 @@ class ArtifactRunLogger:
     metrics, token usage, agent execution details, and output statistics.
     """
     
-    def __init__(self):
-        self.engine = get_engine()
-        
+    def __init__(self, engine=None):
+        self._engine = engine
+
+    @property
+    def engine(self):
+        # Resolved on each use, so the workload of the calling context (API request,
+        # background generation, job worker) picks the connection pool.
+        return self._engine if self._engine is not None else get_engine()
+
     def create_run_record(
         self,
         artifact_type: str,
@@ -490,6 +496,75 @@ class ArtifactRunLogger:
             logger.error(f"Failed to log token usage for run {run_id}: {e}", exc_info=True)
             raise
     
+    def log_section_usage(
+        self,
+        run_id: str,
+        section_name: str,
+        agent_name: str,
+        usage: Dict[str, Any]
+    ) -> None:
+        """
+        Log the LLM usage of one generated section and add it to the run totals.
+        
+        Args:
+            run_id: The ID of the run
+            section_name: The name of the generated section
+            agent_name: The name of the agent that generated it
+            usage: The usage collected by `backend.core.llm_usage.track_llm_usage`
+        """
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(
+                    text("""
+                        INSERT INTO artifact_run_sections (
+                            id, run_id, section_name, agent_name, model,
+                            prompt_tokens, completion_tokens, cached_tokens, llm_calls,
+                            estimated_cost, first_token_ms, latency_ms
+                        ) VALUES (
+                            :id, :run_id, :section_name, :agent_name, :model,
+                            :prompt_tokens, :completion_tokens, :cached_tokens, :llm_calls,
+                            :estimated_cost, :first_token_ms, :latency_ms
+                        )
+                    """
+                ), {
+                    "id": str(uuid.uuid4()),
+                    "run_id": run_id,
+                    "section_name": section_name,
+                    "agent_name": agent_name,
+                    "model": usage.get("model"),
+                    "prompt_tokens": usage.get("prompt_tokens", 0),
+                    "completion_tokens": usage.get("completion_tokens", 0),
+                    "cached_tokens": usage.get("cached_tokens", 0),
+                    "llm_calls": usage.get("llm_calls", 0),
+                    "estimated_cost": usage.get("estimated_cost", 0.0),
+                    "first_token_ms": usage.get("first_token_ms"),
+                    "latency_ms": usage.get("latency_ms"),
+                })
+                
+                # Accumulate in place, sections of a run may be logged concurrently
+                connection.execute(
+                    text("""
+                        UPDATE artifact_runs
+                        SET 
+                            tokens_input = COALESCE(tokens_input, 0) + :prompt_tokens,
+                            tokens_output = COALESCE(tokens_output, 0) + :completion_tokens,
+                            estimated_cost = COALESCE(estimated_cost, 0) + :estimated_cost,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE id = :run_id
+                    """
+                ), {
+                    "run_id": run_id,
+                    "prompt_tokens": usage.get("prompt_tokens", 0),
+                    "completion_tokens": usage.get("completion_tokens", 0),
+                    "estimated_cost": usage.get("estimated_cost", 0.0),
+                })
+                
+            logger.debug(f"Logged usage of section {section_name} in run {run_id}: {usage}")
+            
+        except Exception as e:
+            logger.error(f"Failed to log section usage for run {run_id}: {e}", exc_info=True)
+            raise
+    
     def complete_run(
         self,
         run_id: str,
@@ -805,6 +880,91 @@ class ArtifactRunLogger:
             logger.error(f"Failed to get runs by agent {agent_name}: {e}", exc_info=True)
             raise
 
+    
+    def get_usage_aggregates(self, start_date: datetime, artifact_type: str = "proposal") -> Dict[str, Any]:
+        """
+        Get latency percentiles and token totals per template and per section.
+        
+        Args:
+            start_date: Only runs started after this date are included
+            artifact_type: Type of artifact ('proposal' or 'knowledge_card')
+            
+        Returns:
+            Dictionary with `templates` and `sections` aggregates
+        """
+        try:
+            with self.engine.connect() as connection:
+                runs = connection.execute(
+                    text("""
+                        SELECT template_name, total_latency_ms AS latency_ms,
+                               tokens_input AS prompt_tokens, tokens_output AS completion_tokens,
+                               estimated_cost
+                        FROM artifact_runs
+                        WHERE artifact_type = :artifact_type
+                          AND run_status = 'completed'
+                          AND start_time >= :start_date
+                    """
+                ), {"artifact_type": artifact_type, "start_date": start_date}).mappings().fetchall()
+                
+                sections = connection.execute(
+                    text("""
+                        SELECT r.template_name, s.section_name, s.latency_ms, s.first_token_ms,
+                               s.prompt_tokens, s.completion_tokens, s.cached_tokens,
+                               s.estimated_cost
+                        FROM artifact_run_sections s
+                        JOIN artifact_runs r ON r.id = s.run_id
+                        WHERE r.artifact_type = :artifact_type
+                          AND r.start_time >= :start_date
+                    """
+                ), {"artifact_type": artifact_type, "start_date": start_date}).mappings().fetchall()
+                
+            return {
+                "templates": aggregate_usage(runs, ["template_name"]),
+                "sections": aggregate_usage(sections, ["template_name", "section_name"]),
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get usage aggregates: {e}", exc_info=True)
+            raise
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def aggregate_usage(rows, group_by: List[str]) -> List[Dict[str, Any]]:
+    """
+    Groups usage rows and returns, per group, the count, the p50/p95 of `latency_ms`
+    (and `first_token_ms` when present) and the token and cost totals.
+    """
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        row = dict(row)
+        groups.setdefault(tuple(row.get(field) for field in group_by), []).append(row)
+    
+    aggregates = []
+    for key, group_rows in groups.items():
+        aggregate = dict(zip(group_by, key))
+        aggregate["count"] = len(group_rows)
+        for metric in ("latency_ms", "first_token_ms"):
+            values = sorted(row[metric] for row in group_rows if row.get(metric) is not None)
+            if metric in group_rows[0]:
+                aggregate[f"p50_{metric}"] = _percentile(values, 0.5)
+                aggregate[f"p95_{metric}"] = _percentile(values, 0.95)
+        for total in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+            if total in group_rows[0]:
+                aggregate[total] = sum(row.get(total) or 0 for row in group_rows)
+        aggregate["estimated_cost"] = float(sum(row.get("estimated_cost") or 0 for row in group_rows))
+        aggregates.append(aggregate)
+    
+    aggregates.sort(key=lambda a: a.get("p95_latency_ms") or 0, reverse=True)
+    return aggregates
 
 # Singleton instance for easy access
 artifact_run_logger = ArtifactRunLogger()
\ No newline at end of file
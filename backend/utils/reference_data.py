@@ -0,0 +1,193 @@
+#  Standard Library
+import logging
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Optional
+
+#  Third-Party Libraries
+from sqlalchemy import bindparam, text
+
+#  Internal Modules
+from backend.core.db import get_engine
+from backend.core.redis import redis_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module resolves donor, outcome and field context UUIDs to their names.
+#
+# These lookup tables are small and change rarely, but their labels are needed on every
+# section generation, regeneration and document export. Names are cached in-process;
+# UUIDs that are not cached yet are fetched for all three tables in a single query.
+#
+# The cache carries a version token stored in Redis. `invalidate()` (called when a donor,
+# outcome or field context is created) rotates the token, so every worker drops its copy
+# on its next lookup. Entries also expire after REFERENCE_CACHE_TTL_SECONDS to pick up
+# rows inserted outside the API (e.g. by the seeding scripts).
+
+REFERENCE_TABLES = ("donors", "outcomes", "field_contexts")
+REFERENCE_CACHE_TTL_SECONDS = 600
+VERSION_KEY = "reference_data:version"
+
+# form_data fields holding reference UUIDs, and the table each one points to.
+FORM_DATA_REFERENCE_FIELDS = {
+    "Targeted Donor": "donors",
+    "Main Outcome": "outcomes",
+    "Country / Location(s)": "field_contexts",
+}
+
+
+def _is_uuid(value) -> bool:
+    # A malformed ID would make the uuid[] cast fail the whole batched query.
+    if not isinstance(value, str):
+        return False
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+class ReferenceDataResolver:
+    """
+    In-process cache of reference-table labels with version-based invalidation.
+    """
+
+    def __init__(self, engine=None, client=None, ttl_seconds: int = REFERENCE_CACHE_TTL_SECONDS):
+        self._engine = engine
+        self._client = client if client is not None else redis_client
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._labels: Dict[str, Dict[str, Optional[str]]] = {table: {} for table in REFERENCE_TABLES}
+        self._version = None
+        self._loaded_at = time.monotonic()
+
+    @property
+    def engine(self):
+        return self._engine if self._engine is not None else get_engine()
+
+    def _current_version(self) -> Optional[str]:
+        try:
+            version = self._client.get(VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Could not read reference data version: {e}")
+            return self._version
+        return version.decode() if isinstance(version, bytes) else version
+
+    def _drop_if_stale(self):
+        version = self._current_version()
+        with self._lock:
+            expired = time.monotonic() - self._loaded_at > self.ttl_seconds
+            if version != self._version or expired:
+                self._labels = {table: {} for table in REFERENCE_TABLES}
+                self._version = version
+                self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Drops the cached labels in every worker, e.g. after a new donor is created."""
+        with self._lock:
+            self._labels = {table: {} for table in REFERENCE_TABLES}
+        try:
+            self._client.set(VERSION_KEY, uuid.uuid4().hex)
+        except Exception as e:
+            logger.warning(f"Could not publish reference data version: {e}")
+
+    def _fetch(self, missing: Dict[str, list], connection) -> Dict[str, Dict[str, Optional[str]]]:
+        """Fetches the names of the missing IDs of all tables in one query."""
+        postgres = connection.dialect.name == "postgresql"
+        selects, params = [], {}
+        for table, ids in missing.items():
+            if not ids:
+                continue
+            if postgres:
+                condition = f"id = ANY(CAST(:{table}_ids AS uuid[]))"
+            else:
+                condition = f"id IN :{table}_ids"
+            selects.append(f"SELECT '{table}' AS ref_table, CAST(id AS TEXT) AS id, name FROM {table} WHERE {condition}")
+            params[f"{table}_ids"] = list(ids)
+
+        fetched = {table: {ref_id: None for ref_id in ids} for table, ids in missing.items()}
+        if not selects:
+            return fetched
+
+        query = text(" UNION ALL ".join(selects))
+        if not postgres:
+            query = query.bindparams(*[bindparam(name, expanding=True) for name in params])
+        for row in connection.execute(query, params):
+            fetched[row.ref_table][str(row.id)] = row.name
+        return fetched
+
+    def resolve(self, ids_by_table: Dict[str, Iterable[str]], connection=None) -> Dict[str, Dict[str, str]]:
+        """
+        Returns `{table: {id: name}}` for the requested IDs. Unknown and malformed IDs
+        are omitted. A database connection is only used when some IDs are not cached yet.
+        """
+        self._drop_if_stale()
+
+        resolved: Dict[str, Dict[str, str]] = {table: {} for table in ids_by_table}
+        missing: Dict[str, list] = {}
+        with self._lock:
+            for table, ids in ids_by_table.items():
+                cached = self._labels.setdefault(table, {})
+                for ref_id in ids:
+                    if not _is_uuid(ref_id):
+                        continue
+                    if ref_id in cached:
+                        if cached[ref_id] is not None:
+                            resolved[table][ref_id] = cached[ref_id]
+                    else:
+                        missing.setdefault(table, []).append(ref_id)
+
+        if not missing:
+            return resolved
+
+        try:
+            if connection is not None:
+                fetched = self._fetch(missing, connection)
+            else:
+                with self.engine.connect() as own_connection:
+                    fetched = self._fetch(missing, own_connection)
+        except Exception as e:
+            logger.warning(f"Could not resolve reference labels: {e}")
+            return resolved
+
+        with self._lock:
+            for table, names in fetched.items():
+                # Unknown IDs are cached as None so they are not queried again.
+                self._labels.setdefault(table, {}).update(names)
+                resolved[table].update({ref_id: name for ref_id, name in names.items() if name})
+        return resolved
+
+    def resolve_form_data(self, form_data: dict, connection=None) -> dict:
+        """
+        Returns a copy of `form_data` with the reference UUIDs replaced by their names.
+        Values that are not UUIDs, or not found, are kept as they are.
+        """
+        if not form_data:
+            return {}
+
+        ids_by_table: Dict[str, list] = {}
+        for field, table in FORM_DATA_REFERENCE_FIELDS.items():
+            value = form_data.get(field)
+            values = value if isinstance(value, list) else [value]
+            ids = [v for v in values if _is_uuid(v)]
+            if ids:
+                ids_by_table.setdefault(table, []).extend(ids)
+
+        resolved_data = form_data.copy()
+        if not ids_by_table:
+            return resolved_data
+
+        labels = self.resolve(ids_by_table, connection)
+        for field, table in FORM_DATA_REFERENCE_FIELDS.items():
+            value = resolved_data.get(field)
+            names = labels.get(table, {})
+            if isinstance(value, list):
+                resolved_data[field] = [names.get(v, v) if _is_uuid(v) else v for v in value]
+            elif _is_uuid(value):
+                resolved_data[field] = names.get(value, value)
+        return resolved_data
+
+
+reference_resolver = ReferenceDataResolver()
@@ -0,0 +1,177 @@
+#  Standard Library
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module schedules the generation of proposal sections as a dependency graph.
+# Templates may declare, per section, a `depends_on` list of other section names.
+# Sections whose dependencies are satisfied are generated concurrently on a bounded
+# thread pool, while `section_sequence` is still used as the tie-breaking priority and
+# as the order of the final output.
+
+
+def build_section_graph(
+    proposal_template: Dict[str, Any], section_sequence: List[str]
+) -> Dict[str, List[str]]:
+    """
+    Builds the dependency map for the sections listed in `section_sequence`.
+
+    Dependencies pointing to sections that are not part of the sequence (or to the
+    section itself) are ignored with a warning, so that a typo in a template never
+    blocks generation.
+
+    Args:
+        proposal_template: The proposal template dictionary.
+        section_sequence: The ordered list of section names to generate.
+
+    Returns:
+        A dictionary mapping each section name to the list of section names it depends on.
+
+    Raises:
+        ValueError: If the declared dependencies contain a cycle.
+    """
+    known_sections = set(section_sequence)
+    graph = {}
+    for section in proposal_template.get("sections", []):
+        section_name = section.get("section_name")
+        if section_name not in known_sections:
+            continue
+        depends_on = section.get("depends_on") or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+
+        valid_dependencies = []
+        for dependency in depends_on:
+            if dependency == section_name or dependency not in known_sections:
+                logger.warning(
+                    f"Ignoring invalid dependency '{dependency}' declared by section '{section_name}'"
+                )
+                continue
+            if dependency not in valid_dependencies:
+                valid_dependencies.append(dependency)
+        graph[section_name] = valid_dependencies
+
+    for section_name in section_sequence:
+        graph.setdefault(section_name, [])
+
+    cycle = _find_cycle(graph)
+    if cycle:
+        raise ValueError(f"Circular section dependency: {' -> '.join(cycle)}")
+
+    return graph
+
+
+def _find_cycle(graph: Dict[str, List[str]]) -> Optional[List[str]]:
+    """Returns the first dependency cycle found in the graph, or None."""
+    visiting, visited = set(), set()
+    path = []
+
+    def visit(node):
+        if node in visited:
+            return None
+        if node in visiting:
+            return path[path.index(node):] + [node]
+        visiting.add(node)
+        path.append(node)
+        for dependency in graph.get(node, []):
+            cycle = visit(dependency)
+            if cycle:
+                return cycle
+        path.pop()
+        visiting.discard(node)
+        visited.add(node)
+        return None
+
+    for node in graph:
+        cycle = visit(node)
+        if cycle:
+            return cycle
+    return None
+
+
+def with_dependency_context(
+    section_config: Dict[str, Any], upstream: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Returns a copy of the section config whose instructions include the content of
+    the sections it depends on, so that e.g. a budget is consistent with the activities.
+    The original config is left untouched.
+    """
+    upstream = {name: content for name, content in upstream.items() if content}
+    if not upstream:
+        return section_config
+
+    context = "\n\n".join(
+        f'Content of section "{name}":\n{content}' for name, content in upstream.items()
+    )
+    section_config = dict(section_config)
+    section_config["instructions"] = (
+        f"{section_config.get('instructions', '')}\n\n"
+        f"Ensure consistency with the following previously generated sections:\n{context}"
+    ).strip()
+    return section_config
+
+
+def run_section_graph(
+    section_sequence: List[str],
+    graph: Dict[str, List[str]],
+    generate: Callable[[str, Dict[str, Any]], Any],
+    on_complete: Optional[Callable[[str, Any], None]] = None,
+    max_workers: int = 1,
+) -> Dict[str, Any]:
+    """
+    Executes `generate` for every section, honouring the dependency graph.
+
+    `generate(section_name, upstream_results)` runs on a worker thread and receives the
+    results of the sections it depends on. `on_complete(section_name, result)` runs on
+    the calling thread as soon as each section finishes, one section at a time, which
+    makes it safe to use for partial saves and telemetry.
+
+    Args:
+        section_sequence: The ordered list of section names to generate.
+        graph: The dependency map returned by `build_section_graph`.
+        generate: Callable producing the result for a single section.
+        on_complete: Optional callback invoked for each finished section.
+        max_workers: The maximum number of sections generated concurrently.
+
+    Returns:
+        A dictionary of results keyed by section name, ordered by `section_sequence`.
+    """
+    priority = {name: index for index, name in enumerate(section_sequence)}
+    remaining = {name: set(graph.get(name, [])) for name in section_sequence}
+    results = {}
+    running = {}
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, max_workers), thread_name_prefix="section-gen"
+    ) as executor:
+
+        def submit_ready():
+            ready = sorted(
+                (name for name, deps in remaining.items() if not deps),
+                key=priority.get,
+            )
+            for name in ready:
+                del remaining[name]
+                upstream = {dep: results[dep] for dep in graph.get(name, [])}
+                # Worker threads inherit the caller's context (e.g. the LLM call priority).
+                context = contextvars.copy_context()
+                running[executor.submit(context.run, generate, name, upstream)] = name
+
+        submit_ready()
+        while running:
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: priority[running[f]]):
+                name = running.pop(future)
+                results[name] = future.result()
+                if on_complete:
+                    on_complete(name, results[name])
+                for deps in remaining.values():
+                    deps.discard(name)
+            submit_ready()
+
+    return {name: results[name] for name in section_sequence if name in results}
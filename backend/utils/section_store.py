@@ -0,0 +1,65 @@
+#  Standard Library
+import json
+import logging
+from typing import Dict, Optional
+
+#  Third-Party Libraries
+from sqlalchemy import text
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module writes generated section content into `proposals.generated_sections`.
+#
+# Sections are merged into the stored JSON object in a single UPDATE
+# (`generated_sections || patch` on Postgres, `json_patch` on SQLite) instead of reading
+# the document, changing one key in Python and writing the whole document back. This
+# keeps each write proportional to the section being saved, and sections saved
+# concurrently for the same proposal no longer overwrite each other.
+
+
+def _merge_expression(dialect_name: str) -> str:
+    if dialect_name == "postgresql":
+        return "COALESCE(generated_sections::jsonb, '{}'::jsonb) || CAST(:patch AS JSONB)"
+    return "json_patch(COALESCE(generated_sections, '{}'), :patch)"
+
+
+def save_sections(
+    connection,
+    proposal_id: str,
+    sections: Dict[str, str],
+    status: Optional[str] = None,
+) -> bool:
+    """
+    Merges `sections` into a proposal's generated_sections, leaving other keys untouched.
+
+    Args:
+        connection: An open SQLAlchemy connection (the caller owns the transaction).
+        proposal_id: The ID of the proposal.
+        sections: A mapping of section names to their content.
+        status: Optionally, a new proposal status to set in the same statement.
+
+    Returns:
+        True if the proposal exists and was updated.
+    """
+    assignments = ["updated_at = CURRENT_TIMESTAMP"]
+    params = {"id": proposal_id}
+    if sections:
+        assignments.insert(
+            0, f"generated_sections = {_merge_expression(connection.dialect.name)}"
+        )
+        params["patch"] = json.dumps(sections)
+    if status:
+        assignments.append("status = :status")
+        params["status"] = status
+
+    result = connection.execute(
+        text(f"UPDATE proposals SET {', '.join(assignments)} WHERE id = :id"),
+        params,
+    )
+    return bool(result.rowcount)
+
+
+def save_section(connection, proposal_id: str, section_name: str, content: str) -> bool:
+    """Stores the content of a single section. See `save_sections`."""
+    return save_sections(connection, proposal_id, {section_name: content})
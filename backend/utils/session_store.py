@@ -0,0 +1,204 @@
+#  Standard Library
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+#  Internal Modules
+from backend.core.codec import redis_codec
+from backend.core.compiled_template import template_version
+from backend.core.redis import redis_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# This module stores proposal sessions in Redis.
+#
+# A session is a Redis hash (`proposal_session:{session_id}`) with one JSON-encoded field
+# per top-level value: `form_data`, `project_description`, `proposal_id`, ... Updating the
+# form data or a single generated section writes only that field, instead of re-reading,
+# re-parsing and rewriting the whole session. Generated sections are stored as one field
+# each (`section:{name}`) and reassembled into `generated_sections` on load.
+#
+# The proposal template is not copied into each session. Sessions hold a reference
+# (`template_ref`: filename + content hash), and each template version is stored once in
+# Redis (`session_template:{filename}:{version}`) and kept in-process. Loading a session
+# puts the template back under `proposal_template`; that object is shared, so it must be
+# treated as read-only.
+#
+# Field values are encoded by `redis_codec`: JSON, zstd-compressed above a size threshold
+# when one is configured (large generated sections and the interned templates).
+#
+# Sessions written as a single JSON string under the bare session ID (before this module
+# existed) are still read, and converted to a hash on their first update.
+
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "3600"))
+# Interned templates outlive the sessions referencing them; each new session refreshes them.
+SESSION_TEMPLATE_TTL_SECONDS = int(os.getenv("SESSION_TEMPLATE_TTL_SECONDS", "86400"))
+SESSION_TEMPLATE_LOCAL_MAX_ENTRIES = 64
+
+KEY_PREFIX = "proposal_session"
+TEMPLATE_KEY_PREFIX = "session_template"
+SECTION_FIELD_PREFIX = "section:"
+
+
+def session_key(session_id: str) -> str:
+    return f"{KEY_PREFIX}:{session_id}"
+
+
+def _encode(value: Any) -> str:
+    return redis_codec.encode(value)
+
+
+def _decode(value: Optional[str]) -> Any:
+    return redis_codec.decode(value)
+
+
+class SessionStore:
+    """
+    Field-level proposal session storage with interned templates.
+    """
+
+    def __init__(self, client=None, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self._client = client if client is not None else redis_client
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._templates: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        # Template key -> when this process last wrote it to Redis, least recently used first
+        self._templates_written: "OrderedDict[str, float]" = OrderedDict()
+
+    # --- Templates ---
+
+    def intern_template(self, template_name: str, proposal_template: Dict[str, Any]) -> Dict[str, str]:
+        """Stores a template version once and returns the reference sessions keep instead."""
+        version = template_version(proposal_template)
+        key = f"{TEMPLATE_KEY_PREFIX}:{template_name}:{version}"
+        now = time.monotonic()
+        with self._lock:
+            written_at = self._templates_written.get(key, float("-inf"))
+        # Rewritten when half its lifetime has passed, so that it outlives new sessions.
+        if now - written_at > SESSION_TEMPLATE_TTL_SECONDS / 2:
+            try:
+                self._client.setex(key, SESSION_TEMPLATE_TTL_SECONDS, _encode(proposal_template))
+                with self._lock:
+                    self._templates_written[key] = now
+                    self._templates_written.move_to_end(key)
+                    while len(self._templates_written) > SESSION_TEMPLATE_LOCAL_MAX_ENTRIES:
+                        self._templates_written.popitem(last=False)
+            except Exception as e:
+                logger.warning(f"Could not store session template {key}: {e}")
+        self._remember_template(template_name, version, proposal_template)
+        return {"filename": template_name, "version": version}
+
+    def _remember_template(self, template_name: str, version: str, proposal_template: Dict[str, Any]):
+        with self._lock:
+            self._templates[(template_name, version)] = proposal_template
+            self._templates.move_to_end((template_name, version))
+            while len(self._templates) > SESSION_TEMPLATE_LOCAL_MAX_ENTRIES:
+                self._templates.popitem(last=False)
+
+    def load_template(self, template_ref: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Returns the template version a session refers to."""
+        template_name, version = template_ref.get("filename"), template_ref.get("version")
+        with self._lock:
+            proposal_template = self._templates.get((template_name, version))
+        if proposal_template is not None:
+            return proposal_template
+
+        try:
+            proposal_template = _decode(self._client.get(f"{TEMPLATE_KEY_PREFIX}:{template_name}:{version}"))
+        except Exception as e:
+            logger.warning(f"Could not read session template {template_name}: {e}")
+        if proposal_template is None and template_name:
+            # The version expired: sessions carry on with the current one.
+            from backend.core.config import load_proposal_template
+
+            logger.warning(f"Template version {version} of {template_name} not found, using the current one")
+            proposal_template = load_proposal_template(template_name)
+        if proposal_template is not None:
+            self._remember_template(template_name, version, proposal_template)
+        return proposal_template
+
+    # --- Sessions ---
+
+    def _encode_fields(self, data: Dict[str, Any]) -> Dict[str, str]:
+        data = dict(data)
+        fields = {}
+        proposal_template = data.pop("proposal_template", None)
+        if proposal_template is not None:
+            data["template_ref"] = self.intern_template(data.get("template_name"), proposal_template)
+        for name, content in (data.pop("generated_sections", None) or {}).items():
+            fields[f"{SECTION_FIELD_PREFIX}{name}"] = _encode(content)
+        fields.update({name: _encode(value) for name, value in data.items()})
+        return fields
+
+    def _write(self, session_id: str, fields: Dict[str, str]):
+        if not fields:
+            return
+        key = session_key(session_id)
+        # One MULTI/EXEC, so a hash is never left without its expiry.
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, self.ttl_seconds)
+        pipe.execute()
+
+    def create(self, session_id: str, data: Dict[str, Any]):
+        """Stores a new session. `proposal_template`, if present, is interned."""
+        self._write(session_id, self._encode_fields(data))
+
+    def load(self, session_id: str, with_template: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Returns the session data, or None if the session does not exist (or expired).
+        `generated_sections` is always present; `proposal_template` and
+        `template_version` are added when `with_template` is set.
+        """
+        fields = self._client.hgetall(session_key(session_id))
+        if fields:
+            data = {"generated_sections": {}}
+            for name, value in fields.items():
+                if isinstance(name, bytes):
+                    name = name.decode("utf-8")
+                if name.startswith(SECTION_FIELD_PREFIX):
+                    data["generated_sections"][name[len(SECTION_FIELD_PREFIX):]] = _decode(value)
+                else:
+                    data[name] = _decode(value)
+        else:
+            data = _decode(self._client.get(session_id))
+            if data is None:
+                return None
+            data.setdefault("generated_sections", {})
+
+        template_ref = data.get("template_ref")
+        if with_template and template_ref:
+            data["proposal_template"] = self.load_template(template_ref)
+            data["template_version"] = template_ref.get("version")
+        return data
+
+    def update(self, session_id: str, **values: Any):
+        """Writes the given top-level fields of a session, leaving the others untouched."""
+        self._migrate_legacy(session_id)
+        self._write(session_id, self._encode_fields(values))
+
+    def set_sections(self, session_id: str, sections: Dict[str, Any]):
+        """Writes generated sections, one field each."""
+        self.update(session_id, generated_sections=sections)
+
+    def _migrate_legacy(self, session_id: str):
+        if self._client.exists(session_key(session_id)):
+            return
+        legacy = self._client.get(session_id)
+        if legacy is None:
+            return
+        self.create(session_id, _decode(legacy))
+        self._client.delete(session_id)
+
+    def stats(self) -> dict:
+        """Returns the store counters, used by the health endpoint."""
+        with self._lock:
+            return {"interned_templates": len(self._templates)}
+
+
+session_store = SessionStore()
+
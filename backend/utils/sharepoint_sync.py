@@ -35,6 +35,7 @@ import threading
 from sqlalchemy import text
 
 from backend.core.db import get_engine
+from backend.core.db_pool import WORKLOAD_BACKGROUND, with_db_workload
 from backend.utils.sharepoint_connector import SharePointConnector
 
 # =============================================================================
@@ -791,7 +792,7 @@ def setup_sharepoint_sync_scheduler():
     for schedule_time in SCHEDULE_TIMES:
         logger.info(f"Scheduling SharePoint sync at {schedule_time}")
         schedule.every().day.at(schedule_time).do(
-            sync_sharepoint_files
+            with_db_workload(WORKLOAD_BACKGROUND, sync_sharepoint_files)
         ).tag('sharepoint-sync')
     
     # Start the scheduler in a background thread
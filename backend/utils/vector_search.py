@@ -0,0 +1,202 @@
+#  Standard Library
+import logging
+import math
+import os
+import re
+from typing import Any, List, Optional, Sequence
+
+#  Third-Party Libraries
+from sqlalchemy import text
+
+# This module implements the similarity search over the reference chunks
+# (`knowledge_card_reference_vectors`) used by the research step of knowledge cards.
+#
+# The embeddings carry an approximate nearest neighbour (ANN) index, HNSW by default
+# (see db/migrations/20261017_add_reference_vector_index.sql). A search first reads the
+# VECTOR_SEARCH_CANDIDATES chunks closest to the query from that index, over the whole
+# corpus, and adds the card's chunks matching the query's keywords (GIN index on the
+# `text_chunk_tsv` column). It then keeps the candidates of the knowledge card and ranks
+# them with the hybrid score (cosine similarity and full text rank). Filtering on the
+# card inside the ANN query would prevent Postgres from using the index, and scanning
+# every chunk made each research step slower as the corpus grew.
+#
+# When fewer than `limit` candidates belong to the card (a card whose references are a
+# small part of the corpus, or a query far from them), the search falls back to an exact
+# scan of the card's own chunks, which the reference_id index keeps small.
+#
+# Recall of the index is traded for latency with `hnsw.ef_search` (HNSW) or
+# `ivfflat.probes` (IVFFlat), set per transaction for each search.
+# `python3 backend/scripts/benchmark_vector_search.py` measures both against exact search.
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+VECTOR_SEARCH_CANDIDATES = int(os.getenv("VECTOR_SEARCH_CANDIDATES", "100"))
+VECTOR_SEARCH_EF_SEARCH = int(os.getenv("VECTOR_SEARCH_EF_SEARCH", "100"))
+VECTOR_SEARCH_PROBES = int(os.getenv("VECTOR_SEARCH_PROBES", "10"))
+VECTOR_SEARCH_LIMIT = 10
+FTS_MAX_AND_TERMS = int(os.getenv("FTS_MAX_AND_TERMS", "4"))
+
+INDEX_TYPES = ("hnsw", "ivfflat")
+HNSW_INDEX_NAME = "idx_kcrv_embedding_hnsw"
+IVFFLAT_INDEX_NAME = "idx_kcrv_embedding_ivfflat"
+
+# pgvector's <=> is the cosine distance, so 1 - distance is the cosine similarity.
+# text_chunk_tsv is maintained by a trigger; rows not yet backfilled are ranked on the fly.
+HYBRID_SCORE = """
+    (1 - (kcrv.embedding <=> :query_embedding)) * 0.5 +
+    COALESCE(ts_rank(
+        COALESCE(kcrv.text_chunk_tsv, to_tsvector('english', kcrv.text_chunk)),
+        websearch_to_tsquery('english', :fts_query)
+    ), 0) * 0.5
+"""
+
+# The ORDER BY ... LIMIT of the first branch must stay on the distance alone for the
+# vector index to be used. The second branch adds the card's chunks matching the
+# keywords (GIN index), which the ANN candidates could miss.
+ANN_SEARCH_QUERY = f"""
+    WITH candidates AS (
+        (SELECT id
+        FROM knowledge_card_reference_vectors
+        ORDER BY embedding <=> :query_embedding
+        LIMIT :candidates)
+        UNION
+        (SELECT kcrv.id
+        FROM knowledge_card_reference_vectors kcrv
+        JOIN knowledge_card_to_references kctr ON kcrv.reference_id = kctr.reference_id
+        WHERE kctr.knowledge_card_id = :kc_id
+            AND kcrv.text_chunk_tsv @@ websearch_to_tsquery('english', :fts_query)
+        LIMIT :candidates)
+    )
+    SELECT
+        kcrv.text_chunk,
+        kcr.url,
+        {HYBRID_SCORE} AS hybrid_score
+    FROM candidates c
+    JOIN knowledge_card_reference_vectors kcrv ON kcrv.id = c.id
+    JOIN knowledge_card_references kcr ON kcrv.reference_id = kcr.id
+    JOIN knowledge_card_to_references kctr ON kcr.id = kctr.reference_id
+    WHERE kctr.knowledge_card_id = :kc_id
+    ORDER BY hybrid_score DESC
+    LIMIT :limit
+"""
+
+EXACT_SEARCH_QUERY = f"""
+    SELECT
+        kcrv.text_chunk,
+        kcr.url,
+        {HYBRID_SCORE} AS hybrid_score
+    FROM knowledge_card_reference_vectors kcrv
+    JOIN knowledge_card_references kcr ON kcrv.reference_id = kcr.id
+    JOIN knowledge_card_to_references kctr ON kcr.id = kctr.reference_id
+    WHERE kctr.knowledge_card_id = :kc_id
+    ORDER BY hybrid_score DESC
+    LIMIT :limit
+"""
+
+
+def build_fts_query(search_query: str) -> str:
+    """
+    Returns the `websearch_to_tsquery` input for a search query.
+
+    Only the words are kept, so punctuation cannot produce an invalid query. Up to
+    FTS_MAX_AND_TERMS words must all match; longer queries, which would rarely match
+    every word, match any of them, and ts_rank favours the chunks matching the most.
+    """
+    words = [word for word in re.findall(r"\w+", search_query) if word.lower() != "or"]
+    if len(words) <= FTS_MAX_AND_TERMS:
+        return " ".join(words)
+    return " or ".join(words)
+
+
+def apply_search_params(connection, ef_search: Optional[int] = None, probes: Optional[int] = None, candidates: int = 0):
+    """
+    Sets the recall parameters of the index for the current transaction of `connection`.
+
+    HNSW returns at most `ef_search` rows, so it is raised to `candidates` if lower.
+    """
+    ef_search = max(ef_search or VECTOR_SEARCH_EF_SEARCH, candidates)
+    probes = probes or VECTOR_SEARCH_PROBES
+    connection.execute(
+        text("SELECT set_config('hnsw.ef_search', :ef_search, true), set_config('ivfflat.probes', :probes, true)"),
+        {"ef_search": str(ef_search), "probes": str(probes)},
+    )
+
+
+def search_reference_chunks(
+    connection,
+    query_embedding: Sequence[float],
+    fts_query: str,
+    knowledge_card_id: Any,
+    limit: int = VECTOR_SEARCH_LIMIT,
+    candidates: Optional[int] = None,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    exact: bool = False,
+    fallback: bool = True,
+) -> List[Any]:
+    """
+    Returns the `limit` best chunks of a knowledge card for a query, as rows of
+    (text_chunk, url, hybrid_score), best first. `fts_query` is built by `build_fts_query`.
+
+    Args:
+        candidates: Chunks read from the ANN index before filtering on the card.
+        ef_search, probes: Recall parameters of the index for this search.
+        exact: Skip the index and scan the card's chunks.
+        fallback: Scan the card's chunks when the index returns fewer than `limit` of them.
+    """
+    params = {
+        "kc_id": knowledge_card_id,
+        "query_embedding": str(list(query_embedding)),
+        "fts_query": fts_query,
+        "limit": limit,
+    }
+    if not exact:
+        candidates = max(candidates or VECTOR_SEARCH_CANDIDATES, limit)
+        apply_search_params(connection, ef_search, probes, candidates)
+        rows = connection.execute(text(ANN_SEARCH_QUERY), {**params, "candidates": candidates}).fetchall()
+        if len(rows) >= limit or not fallback:
+            return rows
+        logger.debug(
+            f"ANN search returned {len(rows)}/{limit} chunks of knowledge card {knowledge_card_id}, "
+            "falling back to exact search"
+        )
+    return connection.execute(text(EXACT_SEARCH_QUERY), params).fetchall()
+
+
+def ivfflat_lists(rows: int) -> int:
+    """Number of IVFFlat lists recommended by pgvector for a table of `rows` rows."""
+    if rows > 1_000_000:
+        return max(int(math.sqrt(rows)), 1)
+    return max(rows // 1000, 1)
+
+
+def rebuild_vector_index(connection, index_type: str = "hnsw", m: int = 16, ef_construction: int = 64) -> str:
+    """
+    Replaces the ANN index of the reference chunks with one of `index_type`, and returns
+    its DDL. IVFFlat lists are computed from the current number of chunks, so an IVFFlat
+    index should be rebuilt when the corpus has grown a lot; HNSW needs no rebuild.
+
+    The table is locked against writes while the index builds.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown vector index type '{index_type}', expected one of {INDEX_TYPES}")
+
+    if index_type == "hnsw":
+        ddl = (
+            f"CREATE INDEX {HNSW_INDEX_NAME} ON knowledge_card_reference_vectors "
+            f"USING hnsw (embedding vector_cosine_ops) WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+        )
+    else:
+        rows = connection.execute(text("SELECT count(*) FROM knowledge_card_reference_vectors")).scalar() or 0
+        ddl = (
+            f"CREATE INDEX {IVFFLAT_INDEX_NAME} ON knowledge_card_reference_vectors "
+            f"USING ivfflat (embedding vector_cosine_ops) WITH (lists = {ivfflat_lists(rows)})"
+        )
+
+    connection.execute(text(f"DROP INDEX IF EXISTS {HNSW_INDEX_NAME}"))
+    connection.execute(text(f"DROP INDEX IF EXISTS {IVFFLAT_INDEX_NAME}"))
+    connection.execute(text(ddl))
+    connection.execute(text("ANALYZE knowledge_card_reference_vectors"))
+    logger.info(f"Rebuilt the reference vector index: {ddl}")
+    return ddl
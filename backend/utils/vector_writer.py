@@ -0,0 +1,207 @@
+#  Standard Library
+import io
+import logging
+import time
+from typing import Any, Dict, Iterable, Iterator, Sequence, Set, Tuple
+
+#  Third-Party Libraries
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+#  Internal Modules
+from backend.utils.chunk_store import chunk_hash, vector_literal
+
+# This module writes the chunks and embeddings of a reference into
+# `knowledge_card_reference_vectors` in bulk.
+#
+# With the Postgres drivers of the application (psycopg2 locally and on Azure, pg8000 on
+# GCP), rows are streamed with `COPY ... FROM STDIN` in text format: each embedding is
+# sent once as its pgvector literal, without a statement per row or a bind parameter per
+# value, and the COPY buffer is produced while the server reads it, so a large reference
+# is never held twice in memory. Other dialects (SQLite in the tests) get multi-row
+# INSERT statements of VECTOR_INSERT_BATCH_ROWS rows.
+#
+# `replace_reference_vectors` deletes the previous chunks of the reference and writes the
+# new ones in one transaction (a savepoint when the caller already holds one), so
+# readers see either the old chunks or the new ones, never a reference half ingested.
+# `sync_reference_vectors` does the same incrementally: chunks are identified by their
+# content hash, the chunks the reference keeps are left in place, and only the vanished
+# ones are deleted and the new ones written.
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+VECTOR_INSERT_BATCH_ROWS = 500
+
+COPY_SQL = "COPY knowledge_card_reference_vectors (reference_id, text_chunk, embedding, content_hash) FROM STDIN"
+
+# Characters with a meaning in the COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_lines(reference_id: Any, rows: Iterable[Tuple[str, Sequence[float]]]) -> Iterator[bytes]:
+    reference_id = str(reference_id)
+    for chunk, embedding in rows:
+        chunk = chunk.replace("\x00", "")
+        line = f"{reference_id}\t{chunk.translate(_COPY_ESCAPES)}\t{vector_literal(embedding)}\t{chunk_hash(chunk)}\n"
+        yield line.encode("utf-8")
+
+
+class _CopyStream(io.RawIOBase):
+    """Binary file object reading the lines of a generator as the driver asks for them."""
+
+    def __init__(self, lines: Iterator[bytes]):
+        self._lines = lines
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while len(self._buffer) < len(buffer):
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def _sqlalchemy_connection(connection):
+    return connection.connection() if isinstance(connection, Session) else connection
+
+
+def copy_reference_vectors(connection, reference_id: Any, rows: Iterable[Tuple[str, Sequence[float]]]) -> int:
+    """
+    Streams (text_chunk, embedding) rows of a reference with COPY, on the DBAPI connection
+    of `connection` (a SQLAlchemy Connection or Session), within its current transaction.
+    Returns the number of rows written.
+    """
+    rows = list(rows)
+    connection = _sqlalchemy_connection(connection)
+    driver = connection.dialect.driver
+    stream = _CopyStream(_copy_lines(reference_id, rows))
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        if driver == "psycopg2":
+            cursor.copy_expert(COPY_SQL, stream)
+        elif driver == "pg8000":
+            cursor.execute(COPY_SQL, stream=stream)
+        else:
+            raise ValueError(f"COPY is not supported with the {driver} driver")
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+def insert_reference_vectors(connection, reference_id: Any, rows: Iterable[Tuple[str, Sequence[float]]]) -> int:
+    """Writes (text_chunk, embedding) rows of a reference with multi-row INSERT statements."""
+    rows = list(rows)
+    for start in range(0, len(rows), VECTOR_INSERT_BATCH_ROWS):
+        batch = rows[start:start + VECTOR_INSERT_BATCH_ROWS]
+        values = ", ".join(f"(:ref_id, :chunk_{i}, :embedding_{i}, :hash_{i})" for i in range(len(batch)))
+        params = {"ref_id": str(reference_id)}
+        for i, (chunk, embedding) in enumerate(batch):
+            params[f"chunk_{i}"] = chunk.replace("\x00", "")
+            params[f"embedding_{i}"] = vector_literal(embedding)
+            params[f"hash_{i}"] = chunk_hash(params[f"chunk_{i}"])
+        connection.execute(
+            text(
+                "INSERT INTO knowledge_card_reference_vectors (reference_id, text_chunk, embedding, content_hash) "
+                f"VALUES {values}"
+            ),
+            params,
+        )
+    return len(rows)
+
+
+def write_reference_vectors(connection, reference_id: Any, rows: Iterable[Tuple[str, Sequence[float]]]) -> int:
+    """Writes (text_chunk, embedding) rows of a reference with COPY when the driver allows it."""
+    driver = _sqlalchemy_connection(connection).dialect.driver
+    if driver in ("psycopg2", "pg8000"):
+        return copy_reference_vectors(connection, reference_id, rows)
+    return insert_reference_vectors(connection, reference_id, rows)
+
+
+def replace_reference_vectors(
+    connection, reference_id: Any, rows: Sequence[Tuple[str, Sequence[float]]]
+) -> int:
+    """
+    Replaces the chunks of a reference with `rows` atomically, and returns the number of
+    rows written. Runs in a savepoint if `connection` is already in a transaction, which
+    then publishes the new chunks when it commits.
+    """
+    started = time.perf_counter()
+    transaction = connection.begin_nested() if connection.in_transaction() else connection.begin()
+    with transaction:
+        connection.execute(
+            text("DELETE FROM knowledge_card_reference_vectors WHERE reference_id = :ref_id"),
+            {"ref_id": reference_id},
+        )
+        written = write_reference_vectors(connection, reference_id, rows)
+    logger.info(
+        f"Wrote {written} chunks for reference_id {reference_id} in {time.perf_counter() - started:.2f}s"
+    )
+    return written
+
+
+def reference_chunk_hashes(connection, reference_id: Any) -> Set[str]:
+    """Content hashes of the chunks currently stored for a reference."""
+    rows = connection.execute(
+        text(
+            "SELECT DISTINCT content_hash FROM knowledge_card_reference_vectors "
+            "WHERE reference_id = :ref_id AND content_hash IS NOT NULL"
+        ),
+        {"ref_id": reference_id},
+    )
+    return {row[0] for row in rows}
+
+
+def sync_reference_vectors(
+    connection, reference_id: Any, keep: Set[str], rows: Sequence[Tuple[str, Sequence[float]]]
+) -> Dict[str, int]:
+    """
+    Updates the chunks of a reference atomically: the stored chunks whose hash is not in
+    `keep` (and those stored without a hash) are deleted, and `rows` are written unless a
+    chunk with the same hash is already stored.
+
+    Returns:
+        The number of chunks "inserted", "kept" and "deleted".
+    """
+    transaction = connection.begin_nested() if connection.in_transaction() else connection.begin()
+    with transaction:
+        if _sqlalchemy_connection(connection).dialect.name == "postgresql":
+            # Serialises concurrent ingestions of the reference, which would insert the same chunks.
+            connection.execute(
+                text("SELECT id FROM knowledge_card_references WHERE id = :ref_id FOR UPDATE"),
+                {"ref_id": reference_id},
+            )
+        existing = reference_chunk_hashes(connection, reference_id)
+        vanished = existing - set(keep)
+
+        deleted = connection.execute(
+            text("DELETE FROM knowledge_card_reference_vectors WHERE reference_id = :ref_id AND content_hash IS NULL"),
+            {"ref_id": reference_id},
+        ).rowcount
+        if vanished:
+            deleted += connection.execute(
+                text(
+                    "DELETE FROM knowledge_card_reference_vectors "
+                    "WHERE reference_id = :ref_id AND content_hash IN :hashes"
+                ).bindparams(bindparam("hashes", expanding=True)),
+                {"ref_id": reference_id, "hashes": sorted(vanished)},
+            ).rowcount
+
+        new_rows, seen = [], set(existing)
+        for chunk, embedding in rows:
+            content_hash = chunk_hash(chunk.replace("\x00", ""))
+            if content_hash not in seen:
+                seen.add(content_hash)
+                new_rows.append((chunk, embedding))
+        inserted = write_reference_vectors(connection, reference_id, new_rows) if new_rows else 0
+
+    counts = {"inserted": inserted, "kept": len(existing & set(keep)), "deleted": deleted}
+    logger.info(f"Synced the chunks of reference_id {reference_id}: {counts}")
+    return counts
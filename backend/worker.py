@@ -0,0 +1,200 @@
+#  Standard Library
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import uuid
+
+#  Third-Party Libraries
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+#  Internal Modules
+from backend.core.db_pool import WORKLOAD_BACKGROUND, with_db_workload
+from backend.core.llm_rate_limiter import PRIORITY_BACKGROUND, llm_priority
+from backend.utils.job_queue import (
+    job_queue,
+    JOB_LEASE_SECONDS,
+    JOB_PROPOSAL_GENERATION,
+    JOB_PROPOSAL_REGENERATION,
+    JOB_KNOWLEDGE_CARD_GENERATION,
+)
+
+# This is the entry point of the generation worker:
+#
+#     python -m backend.worker --concurrency 2
+#
+# It runs the jobs enqueued by the API when GENERATION_JOB_BACKEND=queue, independently
+# of the web workers, so generation survives API restarts and can be scaled separately.
+# Its threads use the "background" database pool (see `backend.core.db_pool`).
+
+logger = logging.getLogger("backend.worker")
+
+
+def _run_proposal_generation(session_id, proposal_id, user_id, final_attempt=True):
+    from backend.api.proposals import generate_all_sections_background
+    generate_all_sections_background(
+        session_id, proposal_id, user_id, raise_errors=True, final_attempt=final_attempt
+    )
+
+
+def _run_proposal_regeneration(session_id, proposal_id, user_id, follow_up_instruction, run_id=None, final_attempt=True):
+    from backend.api.proposals import regenerate_all_sections_with_context
+    regenerate_all_sections_with_context(
+        session_id, proposal_id, user_id, follow_up_instruction, run_id,
+        raise_errors=True, final_attempt=final_attempt,
+    )
+
+
+def _run_knowledge_card_generation(card_id, final_attempt=True):
+    from backend.api.knowledge import generate_content_background
+    asyncio.run(
+        generate_content_background(uuid.UUID(str(card_id)), raise_errors=True, final_attempt=final_attempt)
+    )
+
+
+JOB_HANDLERS = {
+    JOB_PROPOSAL_GENERATION: _run_proposal_generation,
+    JOB_PROPOSAL_REGENERATION: _run_proposal_regeneration,
+    JOB_KNOWLEDGE_CARD_GENERATION: _run_knowledge_card_generation,
+}
+
+
+def _report_proposal_failure(payload, error):
+    from backend.api.proposals import report_generation_failure
+    report_generation_failure(payload["proposal_id"], error)
+
+
+def _report_knowledge_card_failure(payload, error):
+    from backend.api.knowledge import report_content_generation_failure
+    report_content_generation_failure(uuid.UUID(str(payload["card_id"])), error)
+
+
+# Report the failure of a job that never got to do it itself (its lease expired on the
+# final attempt), as its handler does on a last attempt that raises.
+JOB_FAILURE_REPORTERS = {
+    JOB_PROPOSAL_GENERATION: _report_proposal_failure,
+    JOB_PROPOSAL_REGENERATION: _report_proposal_failure,
+    JOB_KNOWLEDGE_CARD_GENERATION: _report_knowledge_card_failure,
+}
+
+
+def report_exhausted_job(job: dict):
+    """Marks the artifact of a job whose lease expired on its final attempt as failed."""
+    reporter = JOB_FAILURE_REPORTERS.get(job["job_type"])
+    if reporter is None:
+        return
+    try:
+        reporter(job["payload"], job["last_error"])
+    except Exception as e:
+        logger.error(f"Failed to report the failure of job {job['id']}: {e}", exc_info=True)
+
+
+def run_job(job: dict, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> str:
+    """
+    Runs a claimed job while a heartbeat thread keeps its lease alive.
+
+    Returns:
+        The final status recorded for the job.
+    """
+    handler = JOB_HANDLERS.get(job["job_type"])
+    if handler is None:
+        job_queue.fail(job["id"], worker_id, f"Unknown job type: {job['job_type']}")
+        return "failed"
+
+    stop_heartbeat = threading.Event()
+
+    def heartbeat():
+        while not stop_heartbeat.wait(lease_seconds / 3):
+            try:
+                if not job_queue.heartbeat(job["id"], worker_id, lease_seconds):
+                    logger.warning(f"Job {job['id']} is no longer leased by {worker_id} (cancelled?)")
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat failed for job {job['id']}: {e}")
+
+    heartbeat_thread = threading.Thread(target=with_db_workload(WORKLOAD_BACKGROUND, heartbeat), daemon=True)
+    heartbeat_thread.start()
+    logger.info(f"[{worker_id}] Running {job['job_type']} job {job['id']} (attempt {job['attempts']})")
+    try:
+        with llm_priority(PRIORITY_BACKGROUND):
+            # Handlers raise on failure so the queue retries the job; only the last
+            # attempt reports the failure to the user.
+            handler(**job["payload"], final_attempt=job["attempts"] >= job["max_attempts"])
+    except Exception as e:
+        logger.error(f"Job {job['id']} raised an error: {e}", exc_info=True)
+        return job_queue.fail(job["id"], worker_id, str(e))
+    finally:
+        stop_heartbeat.set()
+        heartbeat_thread.join()
+
+    if job_queue.complete(job["id"], worker_id):
+        logger.info(f"[{worker_id}] Job {job['id']} succeeded")
+        return "succeeded"
+    return "cancelled"
+
+
+def worker_loop(worker_id: str, stop_event: threading.Event, poll_interval: float):
+    """Claims and runs jobs until `stop_event` is set."""
+    while not stop_event.is_set():
+        try:
+            job = job_queue.claim(worker_id, on_exhausted=report_exhausted_job)
+        except Exception as e:
+            logger.error(f"[{worker_id}] Failed to claim a job: {e}")
+            job = None
+
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        run_job(job, worker_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run generation jobs from the job queue.")
+    parser.add_argument(
+        "--concurrency", type=int, default=int(os.getenv("WORKER_CONCURRENCY", "1")),
+        help="Number of jobs processed in parallel by this process.",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=float(os.getenv("WORKER_POLL_INTERVAL", "2")),
+        help="Seconds to wait between polls when the queue is empty.",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    stop_event = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info("Shutdown requested, finishing running jobs...")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    base_id = f"{socket.gethostname()}-{os.getpid()}"
+    threads = [
+        threading.Thread(
+            target=with_db_workload(WORKLOAD_BACKGROUND, worker_loop),
+            args=(f"{base_id}-{i}", stop_event, args.poll_interval),
+            name=f"worker-{i}",
+        )
+        for i in range(max(1, args.concurrency))
+    ]
+    logger.info(f"Starting {len(threads)} generation worker thread(s) as {base_id}")
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.info("Worker stopped.")
+
+
+if __name__ == "__main__":
+    main()
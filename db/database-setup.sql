@@ -146,7 +146,7 @@ CREATE TABLE IF NOT EXISTS proposals (
     created_by UUID NOT NULL REFERENCES users(id),
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     updated_by UUID NOT NULL REFERENCES users(id),
-    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
 
@@ -176,7 +176,7 @@ CREATE TABLE IF NOT EXISTS proposal_peer_reviews (
     type_of_comment TEXT,
     severity TEXT,
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Create Knowledge Cards table
@@ -194,7 +194,7 @@ CREATE TABLE IF NOT EXISTS knowledge_cards (
     created_by UUID NOT NULL REFERENCES users(id),
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     updated_by UUID NOT NULL REFERENCES users(id),
-    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT one_link_only CHECK (
         (CASE WHEN donor_id IS NOT NULL THEN 1 ELSE 0 END +
          CASE WHEN outcome_id IS NOT NULL THEN 1 ELSE 0 END +
@@ -253,9 +253,35 @@ CREATE TABLE IF NOT EXISTS knowledge_card_reference_vectors (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     reference_id UUID NOT NULL REFERENCES knowledge_card_references(id) ON DELETE CASCADE,
     text_chunk TEXT NOT NULL,
-    embedding vector(1536)
+    embedding vector(1536),
+    text_chunk_tsv tsvector,
+    content_hash TEXT -- SHA-256 of text_chunk, see backend/utils/chunk_store.py
 );
 
+-- Create Chunk Embeddings table: embeddings shared by identical chunks, per embedding model
+CREATE TABLE IF NOT EXISTS chunk_embeddings (
+    content_hash TEXT NOT NULL,
+    embedding_model TEXT NOT NULL,
+    embedding vector(1536) NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (content_hash, embedding_model)
+);
+
+-- Keep the full text vector of each chunk, used by the hybrid research search
+CREATE OR REPLACE FUNCTION update_reference_vector_tsv()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.text_chunk_tsv = to_tsvector('english', NEW.text_chunk);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_reference_vectors_tsv ON knowledge_card_reference_vectors;
+CREATE TRIGGER trg_reference_vectors_tsv
+    BEFORE INSERT OR UPDATE OF text_chunk ON knowledge_card_reference_vectors
+    FOR EACH ROW
+    EXECUTE FUNCTION update_reference_vector_tsv();
+
 -- Create RAG Evaluation Logs table
 CREATE TABLE IF NOT EXISTS rag_evaluation_logs (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -354,6 +380,10 @@ CREATE TABLE IF NOT EXISTS donor_template_comments (
 
 -- Create index for faster user lookup
 CREATE INDEX IF NOT EXISTS idx_proposals_user_id ON proposals(user_id);
+-- Keyset pagination of the list endpoints (newest first)
+CREATE INDEX IF NOT EXISTS idx_proposals_user_updated_at ON proposals(user_id, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_proposals_updated_at ON proposals(updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_knowledge_cards_updated_at ON knowledge_cards(updated_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email); 
 CREATE INDEX IF NOT EXISTS idx_knowledge_cards_donor_id ON knowledge_cards(donor_id);
 CREATE INDEX IF NOT EXISTS idx_knowledge_cards_outcome_id ON knowledge_cards(outcome_id);
@@ -361,6 +391,12 @@ CREATE INDEX IF NOT EXISTS idx_knowledge_cards_field_context_id ON knowledge_car
 
 CREATE INDEX IF NOT EXISTS idx_knowledge_card_to_references_card_id ON knowledge_card_to_references(knowledge_card_id);
 CREATE INDEX IF NOT EXISTS idx_knowledge_card_to_references_reference_id ON knowledge_card_to_references(reference_id);
+CREATE INDEX IF NOT EXISTS idx_kcrv_reference_id ON knowledge_card_reference_vectors(reference_id);
+CREATE INDEX IF NOT EXISTS idx_kcrv_reference_content_hash ON knowledge_card_reference_vectors(reference_id, content_hash);
+-- ANN index for the research vector search (pgvector >= 0.5.0), see backend/utils/vector_search.py
+CREATE INDEX IF NOT EXISTS idx_kcrv_embedding_hnsw ON knowledge_card_reference_vectors
+    USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+CREATE INDEX IF NOT EXISTS idx_kcrv_text_chunk_tsv ON knowledge_card_reference_vectors USING gin (text_chunk_tsv);
 
 CREATE INDEX IF NOT EXISTS idx_knowledge_card_history_knowledge_card_id ON knowledge_card_history(knowledge_card_id);
 CREATE INDEX IF NOT EXISTS idx_proposal_peer_reviews_proposal_id ON proposal_peer_reviews(proposal_id);
@@ -1967,3 +2003,62 @@ WHERE kc.id = src.knowledge_card_id;
 
 ---
 
+
+
+-- Create generation_jobs table (durable queue for proposal / knowledge card generation)
+CREATE TABLE IF NOT EXISTS generation_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_type TEXT NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status TEXT NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')),
+
+    -- Retry bookkeeping
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_error TEXT,
+
+    -- Lease held by the worker currently running the job
+    worker_id TEXT,
+    lease_expires_at TIMESTAMPTZ,
+    heartbeat_at TIMESTAMPTZ,
+
+    created_by UUID REFERENCES users(id) ON DELETE SET NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Workers only ever scan active jobs
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_claim
+    ON generation_jobs(status, run_after)
+    WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_created_by
+    ON generation_jobs(created_by, created_at DESC);
+
+-- Create artifact_run_sections table (LLM usage of each section generated in a run)
+CREATE TABLE IF NOT EXISTS artifact_run_sections (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    run_id UUID NOT NULL REFERENCES artifact_runs(id) ON DELETE CASCADE,
+    section_name TEXT NOT NULL,
+    agent_name TEXT,
+    model TEXT,
+
+    -- Token usage and cost
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    llm_calls INTEGER NOT NULL DEFAULT 0,
+    estimated_cost NUMERIC(10,6) DEFAULT 0.0,
+
+    -- Timing information
+    first_token_ms INTEGER,  -- Time to the first streamed token (or first response)
+    latency_ms INTEGER,      -- Total generation time of the section
+
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_artifact_run_sections_run_id ON artifact_run_sections(run_id);
+CREATE INDEX IF NOT EXISTS idx_artifact_run_sections_created_at ON artifact_run_sections(created_at);
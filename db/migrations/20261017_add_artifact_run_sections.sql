@@ -0,0 +1,28 @@
+-- Migration: Add per-section LLM usage of generation runs
+-- Created: 2026-10-17
+-- Description: Add the artifact_run_sections table filled by ArtifactRunLogger.log_section_usage
+
+-- Create artifact_run_sections table (LLM usage of each section generated in a run)
+CREATE TABLE IF NOT EXISTS artifact_run_sections (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    run_id UUID NOT NULL REFERENCES artifact_runs(id) ON DELETE CASCADE,
+    section_name TEXT NOT NULL,
+    agent_name TEXT,
+    model TEXT,
+
+    -- Token usage and cost
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    llm_calls INTEGER NOT NULL DEFAULT 0,
+    estimated_cost NUMERIC(10,6) DEFAULT 0.0,
+
+    -- Timing information
+    first_token_ms INTEGER,  -- Time to the first streamed token (or first response)
+    latency_ms INTEGER,      -- Total generation time of the section
+
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_artifact_run_sections_run_id ON artifact_run_sections(run_id);
+CREATE INDEX IF NOT EXISTS idx_artifact_run_sections_created_at ON artifact_run_sections(created_at);
@@ -0,0 +1,22 @@
+-- Migration: Content hash of the reference chunks and shared chunk embedding store
+-- Created: 2026-10-17
+-- Description: Identify each chunk of knowledge_card_reference_vectors by the SHA-256 of its text,
+-- so re-ingesting a reference keeps its unchanged chunks, and store embeddings once per
+-- (content hash, embedding model) in chunk_embeddings, so chunks repeated across references are
+-- embedded once (see backend/utils/chunk_store.py).
+--
+-- Adding the nullable column does not rewrite the table. Existing rows are filled afterwards, in
+-- batches, by backend/scripts/backfill_chunk_content_hash.py; until then a re-ingestion replaces
+-- their chunks instead of keeping the unchanged ones.
+
+ALTER TABLE knowledge_card_reference_vectors ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_kcrv_reference_content_hash ON knowledge_card_reference_vectors(reference_id, content_hash);
+
+CREATE TABLE IF NOT EXISTS chunk_embeddings (
+    content_hash TEXT NOT NULL,
+    embedding_model TEXT NOT NULL,
+    embedding vector(1536) NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (content_hash, embedding_model)
+);
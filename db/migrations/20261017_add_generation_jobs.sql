@@ -0,0 +1,36 @@
+-- Migration: Add generation job queue
+-- Created: 2026-10-17
+-- Description: Add the generation_jobs table used by backend/worker.py when GENERATION_JOB_BACKEND=queue
+
+-- Create generation_jobs table (durable queue for proposal / knowledge card generation)
+CREATE TABLE IF NOT EXISTS generation_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_type TEXT NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status TEXT NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')),
+
+    -- Retry bookkeeping
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_error TEXT,
+
+    -- Lease held by the worker currently running the job
+    worker_id TEXT,
+    lease_expires_at TIMESTAMPTZ,
+    heartbeat_at TIMESTAMPTZ,
+
+    created_by UUID REFERENCES users(id) ON DELETE SET NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Workers only ever scan active jobs
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_claim
+    ON generation_jobs(status, run_after)
+    WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_created_by
+    ON generation_jobs(created_by, created_at DESC);
@@ -0,0 +1,17 @@
+-- Migration: Keyset pagination of the list endpoints
+-- Created: 2026-10-17
+-- Description: Make updated_at non-null on the listed tables and index (updated_at, id)
+-- for the cursors of list-drafts, list-all-proposals, /proposals/reviews and /knowledge-cards
+
+-- Rows are paged on (updated_at, id), which a NULL updated_at would drop from every page
+UPDATE proposals SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+UPDATE knowledge_cards SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+UPDATE proposal_peer_reviews SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+
+ALTER TABLE proposals ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE knowledge_cards ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE proposal_peer_reviews ALTER COLUMN updated_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_proposals_user_updated_at ON proposals(user_id, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_proposals_updated_at ON proposals(updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_knowledge_cards_updated_at ON knowledge_cards(updated_at DESC, id DESC);
@@ -0,0 +1,14 @@
+-- Migration: ANN index on the reference chunk embeddings
+-- Created: 2026-10-17
+-- Description: Index knowledge_card_reference_vectors.embedding with HNSW (cosine distance),
+-- so the research step reads its candidate chunks from the index instead of scanning every chunk,
+-- and index reference_id for the per-card exact search and the deletes on re-ingestion.
+-- Requires pgvector >= 0.5.0. backend/utils/vector_search.py (rebuild_vector_index) can replace
+-- it with an IVFFlat index.
+
+CREATE INDEX IF NOT EXISTS idx_kcrv_reference_id ON knowledge_card_reference_vectors(reference_id);
+
+CREATE INDEX IF NOT EXISTS idx_kcrv_embedding_hnsw ON knowledge_card_reference_vectors
+    USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+
+ANALYZE knowledge_card_reference_vectors;
@@ -0,0 +1,27 @@
+-- Migration: Precomputed full text vector of the reference chunks
+-- Created: 2026-10-17
+-- Description: Store to_tsvector('english', text_chunk) in knowledge_card_reference_vectors.text_chunk_tsv,
+-- kept up to date by a trigger and indexed with GIN, so the hybrid score of the research search no
+-- longer parses every candidate chunk on every query.
+--
+-- Adding the nullable column does not rewrite the table. Existing rows are filled afterwards, in
+-- batches, by backend/scripts/backfill_chunk_tsvector.py; until then the search computes their
+-- vector on the fly.
+
+ALTER TABLE knowledge_card_reference_vectors ADD COLUMN IF NOT EXISTS text_chunk_tsv tsvector;
+
+CREATE OR REPLACE FUNCTION update_reference_vector_tsv()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.text_chunk_tsv = to_tsvector('english', NEW.text_chunk);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_reference_vectors_tsv ON knowledge_card_reference_vectors;
+CREATE TRIGGER trg_reference_vectors_tsv
+    BEFORE INSERT OR UPDATE OF text_chunk ON knowledge_card_reference_vectors
+    FOR EACH ROW
+    EXECUTE FUNCTION update_reference_vector_tsv();
+
+CREATE INDEX IF NOT EXISTS idx_kcrv_text_chunk_tsv ON knowledge_card_reference_vectors USING gin (text_chunk_tsv);